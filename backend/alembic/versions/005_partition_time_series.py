@@ -0,0 +1,138 @@
+"""Partition audit_log and risk_scores by month
+
+Revision ID: 005_partitioning
+Revises: 004_egrul
+Create Date: 2026-10-18
+
+Both tables are rebuilt as tables range-partitioned by month on their
+timestamp, with one partition per month that has data, the next
+MONTHS_AHEAD months and a DEFAULT partition. Indexes and outgoing foreign
+keys are carried over; the primary key becomes (id, <timestamp>). Foreign
+keys pointing at risk_scores.id (risk_justifications) are dropped, since a
+partitioned table cannot have a unique constraint on id alone.
+
+Later months are created by app.core.partitions (on startup and by the
+maintain_partitions task).
+"""
+import re
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005_partitioning'
+down_revision: Union[str, None] = '004_egrul'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONED_TABLES = {
+    'audit_log': 'created_at',
+    'risk_scores': 'calculated_at',
+}
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def _rebuild(table: str, partition_column: Union[str, None]) -> None:
+    """
+    Recreate `table` with its data, partitioned by month on `partition_column`
+    (or as a plain table when None), keeping indexes and foreign keys.
+    """
+    bind = op.get_bind()
+    old = f'{table}_rebuild'
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    indexes = bind.execute(
+        sa.text(
+            "SELECT i.indexdef FROM pg_indexes i "
+            "WHERE i.tablename = :old AND i.indexname NOT IN ("
+            "  SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:old))"
+        ),
+        {'old': old},
+    ).scalars().all()
+    foreign_keys = bind.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:old) AND contype = 'f'"
+        ),
+        {'old': old},
+    ).all()
+
+    if partition_column:
+        op.execute(f'UPDATE {old} SET {partition_column} = now() WHERE {partition_column} IS NULL')
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING STORAGE) '
+            f'PARTITION BY RANGE ({partition_column})'
+        )
+        first = bind.execute(sa.text(f'SELECT min({partition_column}) FROM {old}')).scalar()
+        now = datetime.now(timezone.utc)
+        month = date((first or now).year, (first or now).month, 1)
+        last = _add_months(date(now.year, now.month, 1), MONTHS_AHEAD)
+        while month <= last:
+            op.execute(
+                f'CREATE TABLE {table}_y{month.year:04d}m{month.month:02d} PARTITION OF {table} '
+                f'FOR VALUES FROM ({_bound(month)}) TO ({_bound(_add_months(month, 1))})'
+            )
+            month = _add_months(month, 1)
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+        primary_key = f'id, {partition_column}'
+    else:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING STORAGE)')
+        primary_key = 'id'
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'DROP TABLE {old} CASCADE')
+
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT pk_{table} PRIMARY KEY ({primary_key})')
+    for name, definition in foreign_keys:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    for definition in indexes:
+        op.execute(re.sub(rf' ON (\S+\.)?{old} ', rf' ON \g<1>{table} ', definition, count=1))
+
+
+def upgrade() -> None:
+    # Foreign keys to risk_scores.id cannot be kept once id is not unique on its own
+    op.execute(
+        """
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN
+                SELECT conname, conrelid::regclass AS tbl FROM pg_constraint
+                WHERE contype = 'f' AND confrelid = 'risk_scores'::regclass
+            LOOP
+                EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', r.tbl, r.conname);
+            END LOOP;
+        END $$;
+        """
+    )
+    for table, column in PARTITIONED_TABLES.items():
+        _rebuild(table, column)
+
+
+def downgrade() -> None:
+    for table in PARTITIONED_TABLES:
+        _rebuild(table, None)
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF to_regclass('risk_justifications') IS NOT NULL THEN
+                ALTER TABLE risk_justifications
+                    ADD CONSTRAINT risk_justifications_risk_score_id_fkey
+                    FOREIGN KEY (risk_score_id) REFERENCES risk_scores (id) ON DELETE SET NULL;
+            END IF;
+        END $$;
+        """
+    )
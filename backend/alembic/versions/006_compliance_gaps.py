@@ -0,0 +1,100 @@
+"""Add the maintained compliance gap index
+
+Revision ID: 006_compliance_gaps
+Revises: 005_partitioning
+Create Date: 2026-10-18
+
+compliance_gaps holds one row per control that is not fully implemented,
+with severity, framework name and evidence count precomputed. The
+application keeps it current (app.services.compliance_gaps); this
+migration fills it from the existing controls.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '006_compliance_gaps'
+down_revision: Union[str, None] = '005_partitioning'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORDER_COLUMNS = ['severity_rank', 'priority', 'control_ref', 'control_id']
+
+# Severity as computed by app.services.compliance_gaps.calculate_severity
+SEVERITY = """
+    CASE
+        WHEN coalesce(c.priority, 2) = 1
+             AND coalesce(c.implementation_status, 'NOT_ASSESSED') = 'NOT_IMPLEMENTED'
+            THEN 'CRITICAL'
+        WHEN coalesce(c.priority, 2) = 1
+             OR (coalesce(c.priority, 2) = 2
+                 AND coalesce(c.implementation_status, 'NOT_ASSESSED') = 'NOT_IMPLEMENTED')
+            THEN 'HIGH'
+        WHEN coalesce(c.priority, 2) = 2 THEN 'MEDIUM'
+        ELSE 'LOW'
+    END
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'compliance_gaps',
+        sa.Column('control_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('framework_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('control_ref', sa.String(50), nullable=False),
+        sa.Column('control_title', sa.String(500), nullable=False),
+        sa.Column('framework_name', sa.String(255), nullable=False),
+        sa.Column('category', sa.String(50), nullable=True),
+        sa.Column('status', sa.String(50), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('severity', sa.String(20), nullable=False),
+        sa.Column('severity_rank', sa.SmallInteger(), nullable=False),
+        sa.Column('evidence_count', sa.Integer(), nullable=True),
+        sa.Column(
+            'refreshed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(['control_id'], ['controls.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['framework_id'], ['frameworks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('control_id'),
+    )
+    op.create_index('ix_compliance_gaps_tenant_id', 'compliance_gaps', ['tenant_id'])
+    op.create_index(
+        'ix_compliance_gaps_tenant_order', 'compliance_gaps', ['tenant_id', *ORDER_COLUMNS]
+    )
+    op.create_index(
+        'ix_compliance_gaps_framework_order',
+        'compliance_gaps',
+        ['tenant_id', 'framework_id', *ORDER_COLUMNS],
+    )
+
+    op.execute(f"""
+        INSERT INTO compliance_gaps (
+            control_id, tenant_id, framework_id, control_ref, control_title, framework_name,
+            category, status, priority, severity, severity_rank, evidence_count
+        )
+        SELECT
+            c.id, c.tenant_id, c.framework_id, c.control_id, c.title, f.name,
+            c.category,
+            coalesce(c.implementation_status, 'NOT_ASSESSED'),
+            coalesce(c.priority, 2),
+            {SEVERITY},
+            CASE {SEVERITY}
+                WHEN 'CRITICAL' THEN 0 WHEN 'HIGH' THEN 1 WHEN 'MEDIUM' THEN 2 ELSE 3
+            END,
+            (SELECT count(*) FROM evidence_links e WHERE e.control_id = c.id)
+        FROM controls c
+        JOIN frameworks f ON f.id = c.framework_id
+        WHERE c.implementation_status != 'FULLY_IMPLEMENTED'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_compliance_gaps_framework_order', table_name='compliance_gaps')
+    op.drop_index('ix_compliance_gaps_tenant_order', table_name='compliance_gaps')
+    op.drop_index('ix_compliance_gaps_tenant_id', table_name='compliance_gaps')
+    op.drop_table('compliance_gaps')
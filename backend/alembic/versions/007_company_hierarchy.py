@@ -0,0 +1,109 @@
+"""Add the company hierarchy closure table and compliance rollups
+
+Revision ID: 007_company_hierarchy
+Revises: 006_compliance_gaps
+Create Date: 2026-10-18
+
+ru_company_profiles.parent_id places a company in a holding structure.
+ru_company_hierarchy is its closure table and ru_company_rollups holds the
+own and subtree document counts of every company. The application keeps
+both current (app.services.company_hierarchy); this migration fills them
+for the existing companies, which all start as top-level companies.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '007_company_hierarchy'
+down_revision: Union[str, None] = '006_compliance_gaps'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APPROVED = 'УТВЕРЖДЁН'
+
+
+def upgrade() -> None:
+    op.add_column(
+        'ru_company_profiles',
+        sa.Column('parent_id', postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        'fk_ru_company_profiles_parent_id',
+        'ru_company_profiles',
+        'ru_company_profiles',
+        ['parent_id'],
+        ['id'],
+        ondelete='SET NULL',
+    )
+    op.create_index('ix_ru_company_profiles_parent_id', 'ru_company_profiles', ['parent_id'])
+
+    op.create_table(
+        'ru_company_hierarchy',
+        sa.Column('ancestor_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('descendant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['ru_company_profiles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(
+            ['descendant_id'], ['ru_company_profiles.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+    )
+    op.create_index(
+        'ix_ru_company_hierarchy_descendant_id', 'ru_company_hierarchy', ['descendant_id']
+    )
+
+    op.create_table(
+        'ru_company_rollups',
+        sa.Column('company_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('documents_total', sa.Integer(), nullable=False),
+        sa.Column('documents_approved', sa.Integer(), nullable=False),
+        sa.Column('subtree_documents_total', sa.Integer(), nullable=False),
+        sa.Column('subtree_documents_approved', sa.Integer(), nullable=False),
+        sa.Column('subtree_companies', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['ru_company_profiles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('company_id'),
+    )
+    op.create_index('ix_ru_company_rollups_tenant_id', 'ru_company_rollups', ['tenant_id'])
+
+    op.execute("""
+        INSERT INTO ru_company_hierarchy (ancestor_id, descendant_id, depth)
+        SELECT id, id, 0 FROM ru_company_profiles
+    """)
+    op.execute(f"""
+        INSERT INTO ru_company_rollups (
+            company_id, tenant_id, documents_total, documents_approved,
+            subtree_documents_total, subtree_documents_approved, subtree_companies, updated_at
+        )
+        SELECT
+            c.id, c.tenant_id,
+            coalesce(d.total, 0), coalesce(d.approved, 0),
+            coalesce(d.total, 0), coalesce(d.approved, 0),
+            1, now()
+        FROM ru_company_profiles c
+        LEFT JOIN (
+            SELECT
+                company_id,
+                count(*) AS total,
+                count(*) FILTER (WHERE status = '{APPROVED}') AS approved
+            FROM ru_compliance_documents
+            GROUP BY company_id
+        ) d ON d.company_id = c.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ru_company_rollups_tenant_id', table_name='ru_company_rollups')
+    op.drop_table('ru_company_rollups')
+    op.drop_index('ix_ru_company_hierarchy_descendant_id', table_name='ru_company_hierarchy')
+    op.drop_table('ru_company_hierarchy')
+    op.drop_index('ix_ru_company_profiles_parent_id', table_name='ru_company_profiles')
+    op.drop_constraint(
+        'fk_ru_company_profiles_parent_id', 'ru_company_profiles', type_='foreignkey'
+    )
+    op.drop_column('ru_company_profiles', 'parent_id')
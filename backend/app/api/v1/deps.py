@@ -3,41 +3,49 @@ from uuid import UUID
 
 from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.identity_cache import identity_cache
 from app.core.security import Role, TokenPayload, decode_token, validate_token_type
 from app.models import Tenant, User
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+
+async def get_optional_token_payload(
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
+) -> TokenPayload | None:
+    """
+    Decode the bearer token, if any.
+    FastAPI caches dependency results per request, so the JWT is decoded once
+    and shared by tenant and user resolution.
+    """
+    if not credentials:
+        return None
+    return decode_token(credentials.credentials)
 
 
 async def get_current_tenant(
     request: Request,
     db: AsyncSession = Depends(get_db),
     x_tenant_id: str | None = Header(None),
-    credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
+    payload: TokenPayload | None = Depends(get_optional_token_payload),
 ) -> Tenant:
     """Get current tenant from header, token, or subdomain."""
     tenant_id = x_tenant_id
 
     # Try to get from JWT token if no header provided
-    if not tenant_id and credentials:
-        token = credentials.credentials
-        payload = decode_token(token)
-        if payload and payload.tenant_id:
-            tenant_id = payload.tenant_id
+    if not tenant_id and payload and payload.tenant_id:
+        tenant_id = payload.tenant_id
 
     if not tenant_id:
         # Try to get from subdomain
         host = request.headers.get("host", "")
         if "." in host:
             tenant_slug = host.split(".")[0]
-            result = await db.execute(
-                select(Tenant).where(Tenant.slug == tenant_slug, Tenant.is_active)
-            )
-            tenant = result.scalar_one_or_none()
+            tenant = await identity_cache.get_tenant_by_slug(db, tenant_slug)
             if tenant:
                 return tenant
 
@@ -50,8 +58,7 @@ async def get_current_tenant(
         tenant_uuid = UUID(tenant_id)
     except ValueError:
         # Maybe it's a slug
-        result = await db.execute(select(Tenant).where(Tenant.slug == tenant_id, Tenant.is_active))
-        tenant = result.scalar_one_or_none()
+        tenant = await identity_cache.get_tenant_by_slug(db, tenant_id)
         if tenant:
             return tenant
         raise HTTPException(
@@ -59,8 +66,7 @@ async def get_current_tenant(
             detail="Invalid tenant ID format",
         )
 
-    result = await db.execute(select(Tenant).where(Tenant.id == tenant_uuid, Tenant.is_active))
-    tenant = result.scalar_one_or_none()
+    tenant = await identity_cache.get_tenant(db, tenant_uuid)
 
     if not tenant:
         raise HTTPException(
@@ -73,11 +79,9 @@ async def get_current_tenant(
 
 async def get_token_payload(
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    payload: TokenPayload | None = Depends(get_optional_token_payload),
 ) -> TokenPayload:
     """Extract and validate token payload."""
-    token = credentials.credentials
-    payload = decode_token(token)
-
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -100,8 +104,7 @@ async def get_current_user(
     token: TokenPayload = Depends(get_token_payload),
 ) -> User:
     """Get current authenticated user."""
-    result = await db.execute(select(User).where(User.id == UUID(token.sub), User.is_active))
-    user = result.scalar_one_or_none()
+    user = await identity_cache.get_user(db, UUID(token.sub))
 
     if not user:
         raise HTTPException(
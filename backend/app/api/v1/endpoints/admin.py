@@ -4,10 +4,14 @@ from fastapi import APIRouter, HTTPException, Query, status
 from sqlalchemy import func, select
 
 from app.api.v1.deps import DB, CurrentTenant, RequireAdmin
+from app.core.metrics import REPORT_SORT_KEYS, metrics
+from app.core.query_detector import query_detector
 from app.core.security import Role, hash_password
+from app.middleware.request_validation import validation_metrics
 from app.models import AuditAction, AuditLog, Tenant, User
 from app.schemas.tenant import TenantCreate, TenantResponse, TenantUpdate
 from app.schemas.user import UserCreate, UserListResponse, UserResponse, UserUpdate
+from app.services.compliance_gaps import rebuild_gap_index
 
 router = APIRouter()
 
@@ -458,3 +462,71 @@ async def update_risk_weights(
     await db.refresh(tenant)
 
     return {"risk_weights": tenant.risk_weights}
+
+
+# Maintenance
+
+
+@router.post("/compliance-gaps/rebuild")
+async def rebuild_compliance_gaps(
+    db: DB,
+    current_user: RequireAdmin,
+    tenant: CurrentTenant,
+):
+    """
+    Re-derive the tenant's compliance gap index from its controls, e.g. after
+    controls were changed with bulk statements that bypass the ORM hooks.
+    """
+    gaps = await rebuild_gap_index(db, tenant.id)
+    await db.commit()
+    return {"tenant_id": str(tenant.id), "gaps": gaps}
+
+
+# Performance
+
+
+@router.get("/performance/endpoints")
+async def get_endpoint_performance(
+    current_user: RequireAdmin,
+    sort_by: str = Query("p95_ms", description=f"One of: {', '.join(REPORT_SORT_KEYS)}"),
+    limit: int = Query(20, ge=1, le=200),
+):
+    """
+    Slowest endpoints and endpoints with the most DB queries per request,
+    as observed by this worker process since startup.
+    """
+    try:
+        endpoints = metrics.endpoint_report(sort_by=sort_by, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    return {
+        "sort_by": sort_by,
+        "endpoints": endpoints,
+        "db": {
+            "queries_total": metrics.db_queries_total,
+            "time_total_ms": round(metrics.db_time_total * 1000, 2),
+        },
+        "cache": dict(metrics.cache),
+        "request_validation": validation_metrics.snapshot(),
+    }
+
+
+@router.get("/performance/repeated-queries")
+async def get_repeated_queries(
+    current_user: RequireAdmin,
+    limit: int = Query(50, ge=1, le=200),
+):
+    """
+    Statements recently executed more than the configured threshold within a
+    single request or task (possible N+1 patterns), with their call site.
+    Empty unless QUERY_DETECTOR_MODE is enabled.
+    """
+    return {
+        "mode": query_detector.mode.value,
+        "threshold": query_detector.threshold,
+        "findings": query_detector.report()[:limit],
+    }
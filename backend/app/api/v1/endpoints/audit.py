@@ -2,6 +2,7 @@ from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 
 from app.api.v1.deps import DB, CurrentTenant, CurrentUser, RequireAdmin
@@ -13,6 +14,8 @@ from app.schemas.audit import (
     AuditLogResponse,
     AuditLogSearchRequest,
 )
+from app.services.audit_archival import audit_archival
+from app.services.export_service import ExportFormat, audit_logs_dataset, export_service
 
 router = APIRouter()
 
@@ -101,8 +104,31 @@ async def search_audit_logs(
     tenant: CurrentTenant,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    include_archived: bool = Query(False, description="Also search archived logs"),
 ):
     """Search audit logs with advanced filters."""
+    if include_archived:
+        found = await audit_archival.search_logs(
+            db,
+            tenant.id,
+            page=page,
+            page_size=page_size,
+            user_id=search_data.user_id,
+            actions=search_data.actions,
+            resource_type=search_data.resource_type,
+            resource_id=search_data.resource_id,
+            start_date=search_data.start_date,
+            end_date=search_data.end_date,
+            success_only=search_data.success_only,
+        )
+        return AuditLogListResponse(
+            items=found["results"],
+            total=found["total"],
+            page=page,
+            page_size=page_size,
+            pages=found["pages"],
+        )
+
     query = select(AuditLog).where(AuditLog.tenant_id == tenant.id)
 
     if search_data.user_id:
@@ -218,3 +244,40 @@ async def export_audit_logs(
         download_url=None,  # Would be populated asynchronously
         record_count=count,
     )
+
+
+@router.get("/export/download")
+async def download_audit_logs(
+    db: DB,
+    current_user: RequireAdmin,
+    tenant: CurrentTenant,
+    start_date: datetime,
+    end_date: datetime,
+    actions: list[AuditAction] | None = Query(None),
+    format: ExportFormat = Query(ExportFormat.CSV),
+):
+    """Stream audit logs for a date range as CSV, NDJSON, XLSX, Parquet or Arrow IPC."""
+    dataset = audit_logs_dataset(tenant.id, start_date, end_date, actions)
+    try:
+        stream = export_service.stream(dataset, format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    audit = AuditLog(
+        tenant_id=tenant.id,
+        user_id=current_user.id,
+        user_email=current_user.email,
+        user_role=current_user.role,
+        action=AuditAction.EXPORT_AUDIT,
+        description=f"Audit log download for {start_date} to {end_date}",
+        context_data={
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "format": format.value,
+        },
+        success=True,
+    )
+    db.add(audit)
+    await db.commit()
+
+    return StreamingResponse(stream.body, media_type=stream.content_type, headers=stream.headers)
@@ -8,11 +8,13 @@ from typing import Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_current_user, get_db
+from app.core.config import settings
 from app.models.compliance.russian import (
     DocumentStatus,
     ISPDNCategory,
@@ -30,11 +32,14 @@ from app.models.compliance.russian import (
     RuFrameworkType,
 )
 from app.models.user import User
+from app.services.document_export import document_export_service
+from app.services.document_packages import BundleFormat, DocumentPackageService, bundle_chunks
 from app.services.russian_compliance import (
+    DocumentTemplateService,
     ProtectionLevelCalculator,
     get_company_by_inn_demo,
 )
-from app.services.ru_templates_152fz import get_all_fz152_templates, get_mandatory_templates
+from app.services.template_engine import TemplateSyntax, template_engine
 
 router = APIRouter(prefix="/onboarding", tags=["Russian Compliance Onboarding"])
 
@@ -136,6 +141,15 @@ class FullOnboardingRequest(BaseModel):
     task_deadline_days: int = 30
 
 
+class DocumentPackageBatchRequest(BaseModel):
+    """Batch generation of mandatory 152-ФЗ document packages."""
+
+    company_ids: list[UUID] = Field(..., min_length=1)
+    bundle_format: BundleFormat | None = Field(
+        None, description="Stream the package back as a ZIP of DOCX or PDF files"
+    )
+
+
 class OnboardingResult(BaseModel):
     """Result of onboarding process."""
 
@@ -374,24 +388,18 @@ async def complete_onboarding(
     # Step 4: Generate Documents
     documents_count = 0
     if data.generate_fz152_package:
+        from app.services.ru_templates_152fz import get_mandatory_templates
+
         templates = get_mandatory_templates()
+        company_fields = DocumentTemplateService.company_fields(company)
         for template_data in templates:
             # Populate template with company data
-            content = template_data["template_content"]
-            content = content.replace("{{company_name}}", company.full_name or "")
-            content = content.replace("{{company_short_name}}", company.short_name or company.full_name or "")
-            content = content.replace("{{inn}}", company.inn or "")
-            content = content.replace("{{kpp}}", company.kpp or "")
-            content = content.replace("{{ogrn}}", company.ogrn or "")
-            content = content.replace("{{legal_address}}", company.legal_address or "")
-            content = content.replace("{{actual_address}}", company.legal_address or "")
-            content = content.replace("{{director_name}}", company.director_name or "")
-            content = content.replace("{{director_position}}", company.director_position or "Генеральный директор")
-            content = content.replace("{{current_year}}", str(date.today().year))
-            content = content.replace("{{current_date}}", date.today().strftime("%d.%m.%Y"))
-            content = content.replace("{{phone}}", company.phone or "")
-            content = content.replace("{{email}}", company.email or "")
-            content = content.replace("{{website}}", company.website or "")
+            content = template_engine.render(
+                template_data["template_content"],
+                company_fields,
+                TemplateSyntax.PLACEHOLDER,
+                template_id=template_data["template_code"],
+            )
 
             document = RuComplianceDocument(
                 tenant_id=current_user.tenant_id,
@@ -484,6 +492,48 @@ async def complete_onboarding(
     )
 
 
+@router.post("/generate-documents/batch")
+async def generate_document_packages(
+    request: DocumentPackageBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Generate the mandatory 152-ФЗ document package for many companies at once.
+
+    Existing documents are kept. With `bundle_format`, the response is a ZIP
+    of the whole package (one folder per INN) instead of a summary.
+    """
+    if len(request.company_ids) > settings.DOCUMENT_PACKAGE_MAX_COMPANIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.DOCUMENT_PACKAGE_MAX_COMPANIES} companies per batch",
+        )
+    if request.bundle_format == BundleFormat.DOCX and not document_export_service.docx_available:
+        raise HTTPException(status_code=501, detail="DOCX export not available")
+    if request.bundle_format == BundleFormat.PDF and not document_export_service.pdf_available:
+        raise HTTPException(status_code=501, detail="PDF export not available")
+
+    result = await DocumentPackageService(db).generate(
+        request.company_ids,
+        current_user.tenant_id,
+        include_documents=request.bundle_format is not None,
+    )
+    await db.commit()
+
+    if request.bundle_format is None:
+        return {"success": True, **result.to_dict()}
+
+    return StreamingResponse(
+        bundle_chunks(result.documents, request.bundle_format),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": 'attachment; filename="152fz-documents.zip"',
+            "X-Documents-Created": str(result.documents_created),
+        },
+    )
+
+
 @router.post("/generate-documents/{company_id}")
 async def generate_document_package(
     company_id: UUID,
@@ -496,7 +546,10 @@ async def generate_document_package(
     if not company or company.tenant_id != current_user.tenant_id:
         raise HTTPException(status_code=404, detail="Company not found")
 
+    from app.services.ru_templates_152fz import get_mandatory_templates
+
     templates = get_mandatory_templates()
+    company_fields = DocumentTemplateService.company_fields(company)
     documents_created = []
 
     for template_data in templates:
@@ -511,18 +564,12 @@ async def generate_document_package(
             continue
 
         # Populate template
-        content = template_data["template_content"]
-        content = content.replace("{{company_name}}", company.full_name or "")
-        content = content.replace("{{company_short_name}}", company.short_name or company.full_name or "")
-        content = content.replace("{{inn}}", company.inn or "")
-        content = content.replace("{{kpp}}", company.kpp or "")
-        content = content.replace("{{ogrn}}", company.ogrn or "")
-        content = content.replace("{{legal_address}}", company.legal_address or "")
-        content = content.replace("{{director_name}}", company.director_name or "")
-        content = content.replace("{{director_position}}", company.director_position or "Генеральный директор")
-        content = content.replace("{{current_year}}", str(date.today().year))
-        content = content.replace("{{phone}}", company.phone or "")
-        content = content.replace("{{email}}", company.email or "")
+        content = template_engine.render(
+            template_data["template_content"],
+            company_fields,
+            TemplateSyntax.PLACEHOLDER,
+            template_id=template_data["template_code"],
+        )
 
         document = RuComplianceDocument(
             tenant_id=current_user.tenant_id,
@@ -599,6 +646,8 @@ async def get_available_document_packages(
     current_user: User = Depends(get_current_user),
 ):
     """Get available document packages."""
+    from app.services.ru_templates_152fz import get_all_fz152_templates
+
     templates = get_all_fz152_templates()
 
     # Group by category
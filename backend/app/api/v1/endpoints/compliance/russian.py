@@ -37,6 +37,12 @@ from app.models.compliance.russian import (
     ThreatType,
 )
 from app.models.user import User
+from app.services.company_hierarchy import (
+    company_tree,
+    get_rollup,
+    is_subsidiary,
+    rollup_summary,
+)
 from app.services.russian_compliance import (
     DocumentTemplateService,
     ProtectionLevelCalculator,
@@ -62,6 +68,7 @@ class CompanyProfileResponse(BaseModel):
     """Company profile response."""
 
     id: UUID
+    parent_id: UUID | None = None
     inn: str
     kpp: str | None
     ogrn: str | None
@@ -323,6 +330,41 @@ class DashboardStats(BaseModel):
     compliance_score: float
 
 
+class CompanyParentUpdate(BaseModel):
+    """Place a company in the holding structure."""
+
+    parent_id: UUID | None = Field(None, description="Parent company; null for a top-level company")
+
+
+class ConsolidatedCompliance(BaseModel):
+    """Own and consolidated (company and all subsidiaries) document compliance."""
+
+    documents_total: int
+    documents_approved: int
+    compliance_score: float
+    subtree_companies: int
+    consolidated_documents_total: int
+    consolidated_documents_approved: int
+    consolidated_score: float
+
+
+class ConsolidatedComplianceResponse(ConsolidatedCompliance):
+    """Consolidated compliance of one company."""
+
+    company_id: UUID
+
+
+class CompanyHierarchyNode(ConsolidatedCompliance):
+    """A company of the holding structure with its subsidiaries."""
+
+    id: UUID
+    parent_id: UUID | None
+    inn: str
+    full_name: str
+    depth: int
+    subsidiaries: list["CompanyHierarchyNode"]
+
+
 class INNLookupResponse(BaseModel):
     """INN lookup response."""
 
@@ -454,6 +496,66 @@ async def update_company_profile(
     return company
 
 
+@router.put("/companies/{company_id}/parent", response_model=CompanyProfileResponse)
+async def set_company_parent(
+    company_id: UUID,
+    data: CompanyParentUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Place a company under a parent company, or make it a top-level company.
+    Its subsidiaries move with it.
+    """
+    company = await db.get(RuCompanyProfile, company_id)
+    if not company or company.tenant_id != current_user.tenant_id:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    if data.parent_id is not None:
+        parent = await db.get(RuCompanyProfile, data.parent_id)
+        if not parent or parent.tenant_id != current_user.tenant_id:
+            raise HTTPException(status_code=404, detail="Parent company not found")
+        if await is_subsidiary(db, company.id, parent.id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A company cannot be placed under itself or its subsidiary",
+            )
+
+    company.parent_id = data.parent_id
+    await db.commit()
+    await db.refresh(company)
+    return company
+
+
+@router.get(
+    "/companies/{company_id}/consolidated-compliance",
+    response_model=ConsolidatedComplianceResponse,
+)
+async def get_consolidated_compliance(
+    company_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Document compliance of a company and of it together with all its subsidiaries."""
+    rollup = await get_rollup(db, company_id)
+    if not rollup or rollup.tenant_id != current_user.tenant_id:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return ConsolidatedComplianceResponse(company_id=company_id, **rollup_summary(rollup))
+
+
+@router.get("/companies/{company_id}/hierarchy", response_model=CompanyHierarchyNode)
+async def get_company_hierarchy(
+    company_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Subsidiary tree of a company with own and consolidated compliance per company."""
+    company = await db.get(RuCompanyProfile, company_id)
+    if not company or company.tenant_id != current_user.tenant_id:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return await company_tree(db, company_id)
+
+
 # ============================================================================
 # RESPONSIBLE PERSONS ENDPOINTS
 # ============================================================================
@@ -914,6 +1016,7 @@ async def export_compliance_document(
     """
     from fastapi.responses import StreamingResponse
     from app.services.document_export import document_export_service
+    from app.services.render_service import RenderTimeoutError
     import io
 
     document = await db.get(RuComplianceDocument, document_id)
@@ -927,28 +1030,31 @@ async def export_compliance_document(
     content = document.content or ""
     title = document.title
 
-    if format.lower() == "docx":
-        if not document_export_service.docx_available:
-            raise HTTPException(status_code=501, detail="DOCX export not available")
-        file_bytes = await document_export_service.export_to_docx(
-            content=content,
-            title=title,
-            company_name=company.full_name,
-        )
-        media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        filename = f"{document.document_code}.docx"
-    elif format.lower() == "pdf":
-        if not document_export_service.pdf_available:
-            raise HTTPException(status_code=501, detail="PDF export not available")
-        file_bytes = await document_export_service.export_to_pdf(
-            content=content,
-            title=title,
-            company_name=company.full_name,
-        )
-        media_type = "application/pdf"
-        filename = f"{document.document_code}.pdf"
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported format. Use 'docx' or 'pdf'")
+    try:
+        if format.lower() == "docx":
+            if not document_export_service.docx_available:
+                raise HTTPException(status_code=501, detail="DOCX export not available")
+            file_bytes = await document_export_service.export_to_docx(
+                content=content,
+                title=title,
+                company_name=company.full_name,
+            )
+            media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            filename = f"{document.document_code}.docx"
+        elif format.lower() == "pdf":
+            if not document_export_service.pdf_available:
+                raise HTTPException(status_code=501, detail="PDF export not available")
+            file_bytes = await document_export_service.export_to_pdf(
+                content=content,
+                title=title,
+                company_name=company.full_name,
+            )
+            media_type = "application/pdf"
+            filename = f"{document.document_code}.pdf"
+        else:
+            raise HTTPException(status_code=400, detail="Unsupported format. Use 'docx' or 'pdf'")
+    except RenderTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
 
     return StreamingResponse(
         io.BytesIO(file_bytes),
@@ -1461,22 +1567,18 @@ async def list_sme_templates(
     from app.services.template_registry import TemplateRegistry, TemplateCategory
 
     # Get all templates or filter by category
+    cat = None
     if category:
         try:
             cat = TemplateCategory(category)
-            templates = TemplateRegistry.list_templates(cat)
         except ValueError:
-            templates = TemplateRegistry.list_templates()
-    else:
-        templates = TemplateRegistry.list_templates()
+            cat = None
 
     # Apply search filter
     if search:
-        search_lower = search.lower()
-        templates = [
-            t for t in templates
-            if search_lower in t.get("name", "").lower() or search_lower in t.get("type", "").lower()
-        ]
+        templates = TemplateRegistry.search_templates(search, cat)
+    else:
+        templates = TemplateRegistry.list_templates(cat)
 
     return [
         SMETemplateResponse(
@@ -1536,11 +1638,8 @@ async def generate_sme_document(
         )
 
         # Get template name
-        all_templates = TemplateRegistry.list_templates()
-        template_name = next(
-            (t["name"] for t in all_templates if t.get("type") == request.template_id),
-            request.template_id,
-        )
+        template = TemplateRegistry.get_template(request.template_id)
+        template_name = template.name if template else request.template_id
 
         return DocumentGenerateResponse(
             content=content,
@@ -3,15 +3,26 @@
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_current_tenant_id
 from app.core.database import get_db
 from app.models.audit import AuditLog
-from app.models.compliance.framework import Control, Framework
+from app.models.compliance.framework import ComplianceGap, Framework
+from app.services.compliance_gaps import (
+    SEVERITIES,
+    SEVERITY_RANK,
+    gap_page,
+    top_gaps,
+)
+from app.services.compliance_scoring import (
+    compliance_score,
+    compliance_score_cache,
+    framework_mappings,
+)
 
 router = APIRouter()
 
@@ -65,6 +76,7 @@ class GapItem(BaseModel):
     status: str
     priority: int
     severity: str
+    evidence_count: int = 0
 
 
 class GapAnalysis(BaseModel):
@@ -77,6 +89,13 @@ class GapAnalysis(BaseModel):
     low: list[GapItem]
 
 
+class GapPage(BaseModel):
+    """A page of compliance gaps; pass next_cursor as `cursor` for the next page."""
+
+    items: list[GapItem]
+    next_cursor: str | None = None
+
+
 class FrameworkMapping(BaseModel):
     """Cross-framework control mapping."""
 
@@ -91,6 +110,20 @@ class FrameworkMapping(BaseModel):
 # ============================================================
 
 
+def gap_item(gap: ComplianceGap) -> GapItem:
+    return GapItem(
+        control_id=gap.control_ref,
+        control_title=gap.control_title,
+        framework_id=str(gap.framework_id),
+        framework_name=gap.framework_name,
+        category=gap.category or "UNKNOWN",
+        status=gap.status,
+        priority=gap.priority,
+        severity=gap.severity,
+        evidence_count=gap.evidence_count or 0,
+    )
+
+
 def calculate_grade(score: float) -> str:
     """Convert numeric score to letter grade."""
     if score >= 90:
@@ -105,18 +138,6 @@ def calculate_grade(score: float) -> str:
         return "F"
 
 
-def calculate_severity(priority: int, status: str) -> str:
-    """Calculate gap severity based on priority and status."""
-    if priority == 1 and status == "NOT_IMPLEMENTED":
-        return "CRITICAL"
-    elif priority == 1 or (priority == 2 and status == "NOT_IMPLEMENTED"):
-        return "HIGH"
-    elif priority == 2:
-        return "MEDIUM"
-    else:
-        return "LOW"
-
-
 # ============================================================
 # Endpoints
 # ============================================================
@@ -132,112 +153,43 @@ async def get_compliance_score(
     Get overall compliance score and per-framework breakdown.
 
     Returns real-time compliance percentage based on control implementation status.
+    Per-framework counts come from one grouped query, cached per tenant until
+    a control or framework changes.
     """
-    # Get all frameworks for tenant
-    frameworks_query = select(Framework).where(
-        Framework.tenant_id == tenant_id, Framework.is_active == True
-    )
+    counts = await compliance_score_cache.get_counts(db, tenant_id)
     if framework_id:
-        frameworks_query = frameworks_query.where(Framework.id == framework_id)
-
-    result = await db.execute(frameworks_query.order_by(Framework.name))
-    frameworks = result.scalars().all()
-
-    framework_scores = []
-    total_implemented = 0
-    total_partial = 0
-    total_not_impl = 0
-    total_not_assessed = 0
-    total_controls = 0
-
-    for fw in frameworks:
-        # Count controls by implementation status
-        impl_count = await db.execute(
-            select(func.count(Control.id)).where(
-                and_(
-                    Control.framework_id == fw.id,
-                    Control.tenant_id == tenant_id,
-                    Control.implementation_status == "FULLY_IMPLEMENTED",
-                )
-            )
-        )
-        implemented = impl_count.scalar() or 0
-
-        partial_count = await db.execute(
-            select(func.count(Control.id)).where(
-                and_(
-                    Control.framework_id == fw.id,
-                    Control.tenant_id == tenant_id,
-                    Control.implementation_status == "PARTIALLY_IMPLEMENTED",
-                )
-            )
-        )
-        partially = partial_count.scalar() or 0
-
-        not_impl_count = await db.execute(
-            select(func.count(Control.id)).where(
-                and_(
-                    Control.framework_id == fw.id,
-                    Control.tenant_id == tenant_id,
-                    Control.implementation_status == "NOT_IMPLEMENTED",
-                )
-            )
-        )
-        not_impl = not_impl_count.scalar() or 0
-
-        total_count = await db.execute(
-            select(func.count(Control.id)).where(
-                and_(Control.framework_id == fw.id, Control.tenant_id == tenant_id)
-            )
+        counts = [c for c in counts if c.framework_id == str(framework_id)]
+
+    framework_scores = [
+        FrameworkScore(
+            framework_id=c.framework_id,
+            framework_name=c.framework_name,
+            framework_type=c.framework_type,
+            total_controls=c.total_controls,
+            implemented=c.implemented,
+            partially_implemented=c.partially_implemented,
+            not_implemented=c.not_implemented,
+            not_assessed=c.not_assessed,
+            score=round(c.score, 1),
+            grade=calculate_grade(c.score),
         )
-        fw_total = total_count.scalar() or 0
-        not_assessed = fw_total - implemented - partially - not_impl
-
-        # Calculate score (fully = 100%, partial = 50%, not implemented = 0%)
-        if fw_total > 0:
-            score = ((implemented * 100) + (partially * 50)) / fw_total
-        else:
-            score = 0.0
-
-        framework_scores.append(
-            FrameworkScore(
-                framework_id=str(fw.id),
-                framework_name=fw.name,
-                framework_type=fw.type.value
-                if hasattr(fw.type, "value")
-                else (fw.type or "CUSTOM"),
-                total_controls=fw_total,
-                implemented=implemented,
-                partially_implemented=partially,
-                not_implemented=not_impl,
-                not_assessed=not_assessed,
-                score=round(score, 1),
-                grade=calculate_grade(score),
-            )
-        )
-
-        # Accumulate totals
-        total_implemented += implemented
-        total_partial += partially
-        total_not_impl += not_impl
-        total_not_assessed += not_assessed
-        total_controls += fw_total
+        for c in counts
+    ]
 
-    # Calculate overall score
-    if total_controls > 0:
-        overall = ((total_implemented * 100) + (total_partial * 50)) / total_controls
-    else:
-        overall = 0.0
+    total_implemented = sum(c.implemented for c in counts)
+    total_partial = sum(c.partially_implemented for c in counts)
+    total_controls = sum(c.total_controls for c in counts)
+    overall = compliance_score(total_implemented, total_partial, total_controls)
 
     return OverallScore(
         overall_score=round(overall, 1),
         overall_grade=calculate_grade(overall),
-        total_frameworks=len(frameworks),
+        total_frameworks=len(counts),
         total_controls=total_controls,
         implemented=total_implemented,
         partially_implemented=total_partial,
-        not_implemented=total_not_impl,
-        not_assessed=total_not_assessed,
+        not_implemented=sum(c.not_implemented for c in counts),
+        not_assessed=sum(c.not_assessed for c in counts),
         frameworks=framework_scores,
         trend={"direction": "up" if overall > 50 else "down", "change": 0.0, "period": "30d"},
     )
@@ -256,65 +208,17 @@ async def get_compliance_gaps(
     """
     Get compliance gaps - controls that are not fully implemented.
 
-    Returns gaps categorized by severity (CRITICAL, HIGH, MEDIUM, LOW).
+    Returns gaps categorized by severity (CRITICAL, HIGH, MEDIUM, LOW), up to
+    `limit` per severity, read from the maintained gap index.
     """
-    # Query controls that are NOT fully implemented
-    query = (
-        select(Control, Framework)
-        .join(Framework, Control.framework_id == Framework.id)
-        .where(
-            and_(
-                Control.tenant_id == tenant_id, Control.implementation_status != "FULLY_IMPLEMENTED"
-            )
-        )
+    buckets = await top_gaps(
+        db,
+        tenant_id,
+        framework_id=framework_id,
+        severities=[severity.upper()] if severity else None,
+        limit=limit,
     )
-
-    if framework_id:
-        query = query.where(Control.framework_id == framework_id)
-
-    result = await db.execute(query.order_by(Control.priority, Control.control_id).limit(limit * 4))
-    rows = result.all()
-
-    critical = []
-    high = []
-    medium = []
-    low = []
-
-    for control, framework in rows:
-        gap_severity = calculate_severity(
-            control.priority or 2, control.implementation_status or "NOT_ASSESSED"
-        )
-
-        # Filter by severity if specified
-        if severity and gap_severity != severity.upper():
-            continue
-
-        gap = GapItem(
-            control_id=control.control_id,
-            control_title=control.title,
-            framework_id=str(framework.id),
-            framework_name=framework.name,
-            category=control.category.value
-            if hasattr(control.category, "value")
-            else (control.category or "UNKNOWN"),
-            status=control.implementation_status or "NOT_ASSESSED",
-            priority=control.priority or 2,
-            severity=gap_severity,
-        )
-
-        if gap_severity == "CRITICAL":
-            if len(critical) < limit:
-                critical.append(gap)
-        elif gap_severity == "HIGH":
-            if len(high) < limit:
-                high.append(gap)
-        elif gap_severity == "MEDIUM":
-            if len(medium) < limit:
-                medium.append(gap)
-        else:
-            if len(low) < limit:
-                low.append(gap)
-
+    critical, high, medium, low = ([gap_item(gap) for gap in buckets[name]] for name in SEVERITIES)
     return GapAnalysis(
         total_gaps=len(critical) + len(high) + len(medium) + len(low),
         critical=critical,
@@ -324,6 +228,41 @@ async def get_compliance_gaps(
     )
 
 
+@router.get("/gaps/page", response_model=GapPage)
+async def list_compliance_gaps(
+    framework_id: UUID | None = Query(None, description="Filter by framework"),
+    severity: str | None = Query(
+        None, description="Filter by severity: CRITICAL, HIGH, MEDIUM, LOW"
+    ),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+):
+    """
+    Page through all compliance gaps, most severe first.
+
+    Pages are keyset-paginated over (severity, priority, control), so deep
+    pages cost the same as the first one.
+    """
+    if severity and severity.upper() not in SEVERITY_RANK:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid severity. Must be one of: {SEVERITIES}"
+        )
+    try:
+        gaps, next_cursor = await gap_page(
+            db,
+            tenant_id,
+            framework_id=framework_id,
+            severity=severity.upper() if severity else None,
+            limit=limit,
+            after=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return GapPage(items=[gap_item(gap) for gap in gaps], next_cursor=next_cursor)
+
+
 @router.get("/gaps/{framework_id}", response_model=GapAnalysis)
 async def get_framework_gaps(
     framework_id: UUID,
@@ -333,7 +272,9 @@ async def get_framework_gaps(
     """
     Get compliance gaps for a specific framework.
     """
-    return await get_compliance_gaps(framework_id=framework_id, db=db, tenant_id=tenant_id)
+    return await get_compliance_gaps(
+        framework_id=framework_id, severity=None, limit=50, db=db, tenant_id=tenant_id
+    )
 
 
 @router.get("/mapping")
@@ -347,50 +288,15 @@ async def get_framework_mapping(
     Shows how controls from one framework map to another,
     enabling "comply once, satisfy multiple frameworks" efficiency.
     """
-    # Get all frameworks
     result = await db.execute(
-        select(Framework)
+        select(Framework.id, Framework.name)
         .where(Framework.tenant_id == tenant_id, Framework.is_active == True)
         .order_by(Framework.name)
     )
-    frameworks = result.scalars().all()
-
-    # For now, return a simple mapping based on control categories
-    mappings = []
-
-    # Predefined category mappings between frameworks
-    # In a real implementation, this would use actual control mapping data
-    category_mappings = {
-        ("ISO/IEC 27001:2022", "SOC 2 Type II"): 0.85,
-        ("ISO/IEC 27001:2022", "152-FZ Personal Data Protection"): 0.60,
-        ("ISO/IEC 27001:2022", "GOST R 57580.1-2017 Financial Sector Security"): 0.75,
-        ("SOC 2 Type II", "ISO/IEC 27001:2022"): 0.85,
-        ("GDPR", "152-FZ Personal Data Protection"): 0.70,
-        ("PCI DSS v4.0", "CBR 382-P Banking Information Security"): 0.65,
-        ("152-FZ Personal Data Protection", "GDPR"): 0.70,
-        (
-            "CBR 382-P Banking Information Security",
-            "GOST R 57580.1-2017 Financial Sector Security",
-        ): 0.80,
-        ("187-FZ Critical Information Infrastructure", "ISO/IEC 27001:2022"): 0.55,
-    }
+    frameworks = result.all()
 
-    for fw1 in frameworks:
-        for fw2 in frameworks:
-            if fw1.id != fw2.id:
-                key = (fw1.name, fw2.name)
-                if key in category_mappings:
-                    efficiency = category_mappings[key]
-                    mappings.append(
-                        {
-                            "source_framework_id": str(fw1.id),
-                            "source_framework_name": fw1.name,
-                            "target_framework_id": str(fw2.id),
-                            "target_framework_name": fw2.name,
-                            "efficiency_score": efficiency,
-                            "description": f"Complying with {fw1.name} satisfies approximately {int(efficiency * 100)}% of {fw2.name} requirements",
-                        }
-                    )
+    # Predefined mappings between frameworks, precomputed per source framework
+    mappings = framework_mappings(frameworks)
 
     return {
         "total_frameworks": len(frameworks),
@@ -432,9 +338,10 @@ async def get_compliance_dashboard(
     # Get framework mapping summary
     mapping_data = await get_framework_mapping(db=db, tenant_id=tenant_id)
 
-    # Recent activity from audit log
+    # Recent activity from audit log. The last 90 days (only recent partitions
+    # scanned) normally fill the list; quieter tenants fall back to all history.
     compliance_resource_types = ["control", "framework", "policy", "evidence", "assessment", "gap"]
-    recent_activity_result = await db.execute(
+    recent_activity_query = (
         select(AuditLog)
         .where(
             and_(
@@ -446,7 +353,12 @@ async def get_compliance_dashboard(
         .order_by(AuditLog.created_at.desc())
         .limit(10)
     )
+    recent_activity_result = await db.execute(
+        recent_activity_query.where(AuditLog.created_at >= datetime.now(UTC) - timedelta(days=90))
+    )
     recent_logs = recent_activity_result.scalars().all()
+    if len(recent_logs) < 10:
+        recent_logs = (await db.execute(recent_activity_query)).scalars().all()
 
     recent_activity = [
         {
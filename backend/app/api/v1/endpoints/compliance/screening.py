@@ -6,7 +6,6 @@ Sanctions, PEP, and adverse media screening via OpenSanctions
 from datetime import UTC, datetime
 from uuid import UUID, uuid4
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy import and_, select
@@ -15,6 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.v1.deps import get_current_tenant_id, get_current_user
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.metrics import external_http_client
 from app.models.compliance.screening import (
     MatchDisposition,
     ScreeningMatch,
@@ -97,7 +97,7 @@ async def perform_screening(
     opensanctions_url = getattr(settings, "OPENSANCTIONS_URL", "http://opensanctions:8000")
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with external_http_client(timeout=30) as client:
             # Build search query
             search_params = {
                 "schema": "Person",
@@ -8,6 +8,7 @@ from decimal import Decimal
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -23,6 +24,7 @@ from app.models.compliance.transaction import (
     TransactionAlert,
     TransactionStatus,
 )
+from app.services.export_service import ExportFormat, export_service, transactions_dataset
 
 router = APIRouter()
 
@@ -188,6 +190,25 @@ async def list_transactions(
     return result.scalars().all()
 
 
+@router.get("/export")
+async def export_transactions(
+    format: ExportFormat = Query(ExportFormat.PARQUET),
+    start_date: datetime | None = Query(None),
+    end_date: datetime | None = Query(None),
+    status: str | None = Query(None),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+):
+    """Stream transactions, by default as Parquet for analytics."""
+    try:
+        stream = export_service.stream(
+            transactions_dataset(tenant_id, start_date, end_date, status), format
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return StreamingResponse(stream.body, media_type=stream.content_type, headers=stream.headers)
+
+
 @router.get("/alerts", response_model=list[AlertResponse])
 async def list_alerts(
     status: str | None = Query(None),
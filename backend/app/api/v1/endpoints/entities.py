@@ -1,18 +1,32 @@
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, or_, select
 
 from app.api.v1.deps import DB, CurrentTenant, CurrentUser, RequireWriter
+from app.core.job_registry import job_registry
 from app.models import AuditAction, AuditLog, Entity, EntityType
 from app.schemas.entity import (
+    EntityBulkDeleteRequest,
     EntityBulkImportRequest,
     EntityBulkImportResponse,
+    EntityBulkPatchRequest,
+    EntityBulkUpdateRequest,
     EntityCreate,
     EntityListResponse,
     EntityResponse,
     EntityUpdate,
 )
+from app.services.bulk_operations import (
+    BulkOperationType,
+    bulk_operations,
+    check_updatable_fields,
+    group_patches,
+    iter_csv_records,
+    iter_ndjson_records,
+)
+from app.services.export_service import ExportFormat, entities_dataset, export_service
 
 router = APIRouter()
 
@@ -68,6 +82,47 @@ async def list_entities(
     )
 
 
+@router.get("/export")
+async def export_entities(
+    db: DB,
+    current_user: CurrentUser,
+    tenant: CurrentTenant,
+    format: ExportFormat = Query(ExportFormat.CSV),
+    type: EntityType | None = None,
+    include_risks: bool = False,
+):
+    """
+    Download entities as CSV, NDJSON, XLSX, Parquet or Arrow IPC.
+
+    Rows are streamed from a server-side cursor, so exports of any size run
+    in constant memory.
+    """
+    try:
+        stream = export_service.stream(entities_dataset(tenant.id, type, include_risks), format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    audit = AuditLog(
+        tenant_id=tenant.id,
+        user_id=current_user.id,
+        user_email=current_user.email,
+        user_role=current_user.role,
+        action=AuditAction.ENTITY_EXPORT,
+        resource_type="entity",
+        description=f"Entity export ({format.value})",
+        context_data={
+            "format": format.value,
+            "type": type.value if type else None,
+            "include_risks": include_risks,
+        },
+        success=True,
+    )
+    db.add(audit)
+    await db.commit()
+
+    return StreamingResponse(stream.body, media_type=stream.content_type, headers=stream.headers)
+
+
 @router.get("/{entity_id}", response_model=EntityResponse)
 async def get_entity(
     entity_id: UUID,
@@ -284,3 +339,181 @@ async def bulk_import_entities(
         skipped=skipped,
         errors=errors,
     )
+
+
+@router.post("/bulk-import/file")
+async def bulk_import_entities_file(
+    db: DB,
+    current_user: RequireWriter,
+    tenant: CurrentTenant,
+    file: UploadFile = File(..., description="CSV (with header row) or NDJSON file"),
+    skip_duplicates: bool = Query(True),
+    update_existing: bool = Query(False),
+    resume: str | None = Query(
+        None, description="Id of an interrupted import of the same file to continue"
+    ),
+):
+    """
+    Bulk import entities from a CSV or NDJSON upload.
+
+    The file is streamed through the chunked import pipeline rather than
+    loaded into memory; progress and throughput are broadcast to the tenant
+    over WebSocket while the import runs, and checkpointed in the job
+    registry (see `/jobs/{id}`).
+    """
+    filename = (file.filename or "").lower()
+    content_type = (file.content_type or "").split(";")[0]
+    if filename.endswith(".csv") or content_type == "text/csv":
+        records = iter_csv_records(file.file)
+    elif filename.endswith((".ndjson", ".jsonl")) or content_type in (
+        "application/x-ndjson",
+        "application/jsonl",
+    ):
+        records = iter_ndjson_records(file.file)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Expected a .csv or .ndjson file",
+        )
+
+    try:
+        progress = await bulk_operations.import_entities_stream(
+            db,
+            tenant.id,
+            current_user.id,
+            records,
+            skip_duplicates=skip_duplicates,
+            update_existing=update_existing,
+            resume_operation_id=resume,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+    return progress.to_dict()
+
+
+@router.post("/bulk-update")
+async def bulk_update_entities(
+    request: EntityBulkUpdateRequest,
+    db: DB,
+    current_user: RequireWriter,
+    tenant: CurrentTenant,
+    background: bool = Query(False, description="Run as a background job and return at once"),
+):
+    """
+    Apply the same changes to many entities.
+
+    Ids that do not exist in the tenant are reported as failed items.
+    """
+    updates = request.updates.model_dump(exclude_unset=True)
+    if not updates:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update")
+    try:
+        check_updatable_fields(updates)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    if background:
+        progress = await bulk_operations.run_in_background(
+            BulkOperationType.UPDATE,
+            tenant.id,
+            len(request.entity_ids),
+            lambda session, operation_id: bulk_operations.bulk_update_entities(
+                session, tenant.id, current_user.id, request.entity_ids, updates, operation_id
+            ),
+        )
+    else:
+        progress = await bulk_operations.bulk_update_entities(
+            db, tenant.id, current_user.id, request.entity_ids, updates
+        )
+    return progress.to_dict()
+
+
+@router.post("/bulk-patch")
+async def bulk_patch_entities(
+    request: EntityBulkPatchRequest,
+    db: DB,
+    current_user: RequireWriter,
+    tenant: CurrentTenant,
+    background: bool = Query(False, description="Run as a background job and return at once"),
+):
+    """
+    Apply different changes to each entity in one request.
+
+    Each patch carries an entity id and the fields to change for it.
+    """
+    patches = [patch.model_dump(exclude_unset=True) for patch in request.patches]
+    if any(len(patch) < 2 for patch in patches):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Every patch needs an id and at least one field",
+        )
+    try:
+        group_patches(patches)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    if background:
+        progress = await bulk_operations.run_in_background(
+            BulkOperationType.UPDATE,
+            tenant.id,
+            len(patches),
+            lambda session, operation_id: bulk_operations.bulk_patch_entities(
+                session, tenant.id, current_user.id, patches, operation_id
+            ),
+        )
+    else:
+        progress = await bulk_operations.bulk_patch_entities(
+            db, tenant.id, current_user.id, patches
+        )
+    return progress.to_dict()
+
+
+@router.post("/bulk-delete")
+async def bulk_delete_entities(
+    request: EntityBulkDeleteRequest,
+    db: DB,
+    current_user: RequireWriter,
+    tenant: CurrentTenant,
+    background: bool = Query(False, description="Run as a background job and return at once"),
+):
+    """Delete (or, by default, deactivate) many entities."""
+    if background:
+        progress = await bulk_operations.run_in_background(
+            BulkOperationType.DELETE,
+            tenant.id,
+            len(request.entity_ids),
+            lambda session, operation_id: bulk_operations.bulk_delete_entities(
+                session,
+                tenant.id,
+                current_user.id,
+                request.entity_ids,
+                request.soft_delete,
+                operation_id,
+            ),
+        )
+    else:
+        progress = await bulk_operations.bulk_delete_entities(
+            db, tenant.id, current_user.id, request.entity_ids, request.soft_delete
+        )
+    return progress.to_dict()
+
+
+@router.get("/bulk-operations/{operation_id}")
+async def get_bulk_operation(
+    operation_id: str,
+    current_user: CurrentUser,
+    tenant: CurrentTenant,
+):
+    """Progress of a bulk operation (e.g. one started with `background=true`)."""
+    progress = bulk_operations.get_operation_status(operation_id)
+    if progress is not None and progress.tenant_id == tenant.id:
+        return progress.to_dict()
+
+    # Started on another worker
+    job = await job_registry.get(operation_id)
+    if job is None or not job.kind.startswith("bulk.") or job.tenant_id != str(tenant.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bulk operation not found",
+        )
+    return job.to_dict()
@@ -0,0 +1,92 @@
+"""
+Job API Endpoints (Phase 4.2)
+Uniform status for long-running jobs: bulk operations, simulations, audit
+archival and EGRUL dump imports, whichever worker or service runs them.
+"""
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.api.v1.deps import CurrentTenant, CurrentUser, RequireWriter
+from app.core.job_registry import JobRecord, JobStatus, job_registry
+from app.models import User
+from app.services.advanced_simulation import SimulationType, simulation_engine
+from app.services.audit_archival import ARCHIVE_JOB_KIND, audit_archival
+
+router = APIRouter()
+
+
+def _visible(job: JobRecord | None, tenant_id, user: User) -> bool:
+    """Tenant jobs are visible to the tenant; global jobs (EGRUL) to admins."""
+    if job is None:
+        return False
+    if job.tenant_id is None:
+        return user.is_admin
+    return job.tenant_id == str(tenant_id)
+
+
+@router.get("")
+async def list_jobs(
+    current_user: CurrentUser,
+    tenant: CurrentTenant,
+    kind: str | None = Query(None, description="Job kind or prefix, e.g. bulk or simulation"),
+    interrupted: bool = Query(False, description="Only jobs that stopped reporting progress"),
+    limit: int = Query(20, ge=1, le=200),
+):
+    """List the tenant's most recent jobs, newest first."""
+    jobs = await job_registry.recent(tenant_id=tenant.id, kind=kind, limit=limit)
+    if interrupted:
+        jobs = [job for job in jobs if job.interrupted]
+    return {"jobs": [job.to_dict(include_result=False) for job in jobs]}
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user: CurrentUser,
+    tenant: CurrentTenant,
+):
+    """Status, progress, throughput and checkpoint of a job."""
+    job = await job_registry.get(job_id)
+    if not _visible(job, tenant.id, current_user):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job.to_dict()
+
+
+@router.post("/{job_id}/resume", status_code=status.HTTP_202_ACCEPTED)
+async def resume_job(
+    job_id: str,
+    current_user: RequireWriter,
+    tenant: CurrentTenant,
+):
+    """
+    Resume an interrupted or failed job.
+
+    Monte Carlo simulations are re-run in the background from their recorded
+    seed; audit archival continues from its last archived day. Bulk imports need their input again: re-upload the file to
+    `/entities/bulk-import/file?resume=<job_id>`.
+    """
+    job = await job_registry.get(job_id)
+    if not _visible(job, tenant.id, current_user):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if not (job.status == JobStatus.FAILED or job.interrupted):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value}, only interrupted or failed jobs can be resumed",
+        )
+
+    resumers = {
+        f"simulation.{SimulationType.MONTE_CARLO.value}": simulation_engine.resume_in_background,
+        ARCHIVE_JOB_KIND: audit_archival.resume_in_background,
+    }
+    if job.kind in resumers:
+        try:
+            resumers[job.kind](job)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+        return job.to_dict(include_result=False)
+
+    if job.kind == "bulk.import":
+        detail = f"Re-upload the file to /entities/bulk-import/file?resume={job_id}"
+    else:
+        detail = f"Jobs of kind {job.kind} cannot be resumed from here"
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
@@ -2,6 +2,7 @@ from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 
 from app.api.v1.deps import DB, CurrentTenant, CurrentUser, RequireWriter
@@ -20,6 +21,7 @@ from app.schemas.risk import (
     RiskRegisterList,
     RiskRegisterSummary,
 )
+from app.services.export_service import ExportFormat, export_service, risk_scores_dataset
 
 router = APIRouter()
 
@@ -140,6 +142,23 @@ async def get_risk_trends(
     ]
 
 
+@router.get("/export")
+async def export_risk_scores(
+    current_user: CurrentUser,
+    tenant: CurrentTenant,
+    format: ExportFormat = Query(ExportFormat.PARQUET),
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+):
+    """Stream the risk score history, by default as Parquet for analytics."""
+    try:
+        stream = export_service.stream(risk_scores_dataset(tenant.id, start_date, end_date), format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    return StreamingResponse(stream.body, media_type=stream.content_type, headers=stream.headers)
+
+
 @router.get("/entity/{entity_id}", response_model=RiskScoreResponse)
 async def get_entity_risk(
     entity_id: UUID,
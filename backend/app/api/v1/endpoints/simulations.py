@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_current_user
 from app.core.database import get_db
+from app.core.job_registry import job_registry
 from app.models import User
 from app.services.advanced_simulation import (
     MonteCarloConfig,
@@ -176,13 +177,19 @@ async def get_simulation(
     current_user: User = Depends(get_current_user),
 ):
     """Get simulation result by ID."""
+    tenant_id = str(current_user.tenant_id)
     result = simulation_engine.get_simulation(simulation_id)
-    if not result:
+    if result and str(result.tenant_id) == tenant_id:
+        return result.to_dict()
+
+    # Run on another worker
+    job = await job_registry.get(simulation_id)
+    if not job or not job.kind.startswith("simulation.") or job.tenant_id != tenant_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Simulation not found",
         )
-    return result.to_dict()
+    return job.result or job.to_dict(include_result=False)
 
 
 @router.get("/")
@@ -193,7 +200,8 @@ async def list_simulations(
 ):
     """List recent simulations."""
     return {
-        "simulations": simulation_engine.list_simulations(
+        "simulations": await simulation_engine.list_simulations(
+            current_user.tenant_id,
             limit=limit,
             simulation_type=simulation_type,
         )
@@ -206,7 +214,7 @@ async def cancel_simulation(
     current_user: User = Depends(get_current_user),
 ):
     """Cancel a running simulation."""
-    success = await simulation_engine.cancel_simulation(simulation_id)
+    success = await simulation_engine.cancel_simulation(simulation_id, current_user.tenant_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
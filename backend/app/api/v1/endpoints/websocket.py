@@ -19,16 +19,20 @@ router = APIRouter()
 async def websocket_endpoint(
     websocket: WebSocket,
     token: str = Query(..., description="JWT access token"),
+    last_event_id: str | None = Query(
+        None, description="Id of the last alert received, to replay missed alerts"
+    ),
 ):
     """
     WebSocket endpoint for real-time alerts and notifications.
 
     Connect with: ws://host/v1/ws?token=<jwt_token>
+    Reconnect with: ws://host/v1/ws?token=<jwt_token>&last_event_id=<alert id>
 
     Message types received:
     - connected: Connection confirmed
     - alert: New alert/notification
-    - recent_alerts: Recent alerts on connect
+    - recent_alerts: Recent alerts on connect (or missed ones on reconnect)
     - heartbeat: Keep-alive ping
 
     Commands you can send:
@@ -45,7 +49,7 @@ async def websocket_endpoint(
     user_id = UUID(payload.sub)
     tenant_id = UUID(payload.tenant_id)
 
-    connection_id = await ws_manager.connect(websocket, user_id, tenant_id)
+    connection_id = await ws_manager.connect(websocket, user_id, tenant_id, last_event_id)
 
     try:
         while True:
@@ -63,7 +67,7 @@ async def websocket_endpoint(
                     await ws_manager.unsubscribe(connection_id, channel)
 
             elif action == "ping":
-                await websocket.send_json({"type": "pong"})
+                await ws_manager.send(connection_id, {"type": "pong"})
 
     except WebSocketDisconnect:
         await ws_manager.disconnect(connection_id)
@@ -77,6 +81,8 @@ async def get_websocket_stats():
     """Get WebSocket connection statistics."""
     return {
         "total_connections": ws_manager.get_connection_count(),
+        "queues": ws_manager.get_queue_stats(),
+        "broker": ws_manager.broker.stats() if ws_manager.broker else None,
         "status": "healthy",
     }
 
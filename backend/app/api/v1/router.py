@@ -13,6 +13,7 @@ from app.api.v1.endpoints import (
     dependencies,
     entities,
     history,
+    jobs,
     monitoring,
     risk_justification,
     risks,
@@ -83,6 +84,7 @@ api_router.include_router(monitoring.router, prefix="/monitoring", tags=["Monito
 # Phase 4-5: WebSocket and Advanced Features
 api_router.include_router(websocket.router, prefix="", tags=["Phase 4 - WebSocket"])
 api_router.include_router(simulations.router, prefix="/simulations", tags=["Phase 5 - Simulations"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
 
 # Compliance Platform Endpoints
 api_router.include_router(
@@ -12,6 +12,7 @@ from typing import Any, TypeVar
 import structlog
 
 from app.core.config import settings
+from app.core.metrics import metrics
 
 logger = structlog.get_logger()
 
@@ -61,10 +62,13 @@ class CacheManager:
             redis = await self._get_redis()
             if redis:
                 value = await redis.get(key)
+                metrics.record_cache(bool(value))
                 if value:
                     return json.loads(value)
             else:
-                return self._local_cache.get(key)
+                value = self._local_cache.get(key)
+                metrics.record_cache(value is not None)
+                return value
         except Exception as e:
             logger.warning("Cache get failed", key=key, error=str(e))
         return None
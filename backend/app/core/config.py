@@ -73,6 +73,10 @@ class Settings(BaseSettings):
     # Multi-tenant
     TENANT_HEADER: str = "X-Tenant-ID"
     DEFAULT_TENANT_SLUG: str = "default"
+    IDENTITY_CACHE_ENABLED: bool = True
+    IDENTITY_CACHE_TTL_SECONDS: int = 30
+    # Per-tenant compliance score counts; dropped on control/framework changes
+    COMPLIANCE_SCORE_CACHE_TTL_SECONDS: int = 300
 
     # Risk Engine
     RISK_CONSTRAINT_WEIGHT: float = 0.30
@@ -89,13 +93,51 @@ class Settings(BaseSettings):
     MEILISEARCH_URL: str = Field(default="http://meilisearch:7700", env="MEILISEARCH_URL")
     MEILISEARCH_API_KEY: str = Field(default="", env="MEILISEARCH_API_KEY")
 
+    # Observability
+    METRICS_ENABLED: bool = True
+    # N+1 query detection: off | log | raise (see app.core.query_detector)
+    QUERY_DETECTOR_MODE: str = "off"
+    QUERY_DETECTOR_THRESHOLD: int = 5
+
     # WebSocket (Phase 4)
     WEBSOCKET_ENABLED: bool = True
     WEBSOCKET_HEARTBEAT_INTERVAL: int = 30
+    # Fan-out across workers via Redis, with alert replay on reconnect
+    WEBSOCKET_BROKER_ENABLED: bool = True
+    WEBSOCKET_REPLAY_MAXLEN: int = 1000  # alerts kept per tenant stream
+    WEBSOCKET_REPLAY_LIMIT: int = 100  # max alerts replayed on reconnect
+    # Per-connection send queue; when full: drop_oldest | drop_newest | disconnect
+    WEBSOCKET_SEND_QUEUE_SIZE: int = 256
+    WEBSOCKET_SEND_TIMEOUT_SECONDS: float = 10.0
+    WEBSOCKET_SLOW_CONSUMER_POLICY: str = "drop_oldest"
+
+    # Job registry (bulk operations, simulations, EGRUL imports)
+    JOB_RETENTION_SECONDS: int = 7 * 24 * 3600
+    JOB_REGISTRY_MAX_JOBS: int = 1000  # newest jobs kept in the index
+    JOB_STALE_SECONDS: int = 300  # running jobs without progress are "interrupted"
+
+    # Monthly partitions of audit_log and risk_scores
+    PARTITION_MONTHS_AHEAD: int = 3
+    RISK_SCORE_RETENTION_MONTHS: int = 24  # 0 keeps all risk score history
 
     # Export (Phase 4)
     EXPORT_MAX_RECORDS: int = 10000
     EXPORT_TEMP_PATH: str = "/tmp/cortex-exports"
+    EXPORT_BATCH_SIZE: int = 1000  # rows per server-side cursor fetch when streaming
+    EXPORT_ROW_GROUP_SIZE: int = 100_000  # rows per Parquet row group / Arrow batch
+
+    # Document rendering pool (PDF/DOCX exports, batch document packages)
+    DOCUMENT_PACKAGE_MAX_COMPANIES: int = 1000
+    DOCUMENT_RENDER_WORKERS: int = 4  # worker processes
+    DOCUMENT_RENDER_MAX_PENDING: int = 32  # renders queued or running; more callers wait
+    DOCUMENT_RENDER_TIMEOUT_SECONDS: float = 60.0
+    DOCUMENT_RENDER_CACHE_MB: int = 64  # rendered documents cached by content hash
+    DOCUMENT_RENDER_POOL_MIN_COMPANIES: int = 20  # smaller package batches render in-process
+    # Build the template index at startup; by default it is built on first use
+    TEMPLATE_INDEX_PRELOAD: bool = False
+    # Versioned template bundles (scripts/build_template_store.py); modules are used without one
+    TEMPLATE_STORE_PATH: str = "data/templates"
+    TEMPLATE_STORE_CHECK_SECONDS: float = 30.0  # 0 disables checking for newer bundles
 
     # Simulation (Phase 5)
     SIMULATION_MAX_DEPTH: int = 10
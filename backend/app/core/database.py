@@ -1,11 +1,16 @@
 from collections.abc import AsyncGenerator
 from uuid import uuid4
 
+import structlog
 from sqlalchemy import MetaData, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.query_detector import instrument_engine as instrument_query_detector
+
+logger = structlog.get_logger()
 
 # Naming convention for constraints
 convention = {
@@ -30,6 +35,8 @@ engine = create_async_engine(
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     echo=settings.DEBUG,
 )
+instrument_engine(engine)
+instrument_query_detector(engine)
 
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -58,10 +65,30 @@ async def init_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    await _ensure_partitions()
+
     # Seed default tenant, admin user, and frameworks
     await _seed_default_data()
 
 
+async def _ensure_partitions() -> None:
+    """
+    Create the current and upcoming monthly partitions of the time-series
+    tables. A failure (e.g. rows of a new month already in the DEFAULT
+    partition) is logged and left to the scheduled maintenance; it must not
+    stop the application from starting.
+    """
+    from app.core.partitions import PARTITIONED_TABLES, ensure_partitions
+
+    async with AsyncSessionLocal() as session:
+        for table in PARTITIONED_TABLES:
+            try:
+                await ensure_partitions(session, table)
+            except Exception:
+                await session.rollback()
+                logger.exception("Partition maintenance failed at startup", table=table)
+
+
 async def _seed_default_data() -> None:
     """Seed default tenant, admin user, and compliance frameworks."""
     # Import here to avoid circular imports
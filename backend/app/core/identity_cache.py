@@ -0,0 +1,317 @@
+"""
+Identity Cache
+Short-TTL in-process cache of active tenant and user records for the API
+authentication dependencies, with cross-worker invalidation via Redis pub/sub.
+
+Records are cached as column snapshots and re-attached to the request's
+session without a query, so endpoints can still modify and commit them.
+"""
+
+import asyncio
+import contextlib
+import copy
+import json
+import time
+from typing import Any
+from uuid import UUID, uuid4
+
+import structlog
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from sqlalchemy.orm.util import identity_key
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models import Tenant, User
+
+logger = structlog.get_logger()
+
+INVALIDATION_CHANNEL = "cortex:identity:invalidate"
+
+# session.info key collecting identities changed in the current transaction
+_PENDING_KEY = "identity_cache_pending"
+
+_KIND_TENANT = "tenant"
+_KIND_USER = "user"
+
+
+class RecordCache:
+    """
+    TTL cache of ORM column snapshots keyed by primary key.
+    """
+
+    def __init__(self, model, ttl: float, max_entries: int = 10000):
+        self.model = model
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._columns = [attr.key for attr in inspect(model).column_attrs]
+        self._entries: dict[UUID, tuple[float, dict[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, record_id: UUID) -> dict[str, Any] | None:
+        """Return the cached snapshot for an id, or None if missing/expired."""
+        entry = self._entries.get(record_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[record_id]
+            self.misses += 1
+            metrics.record_cache(False)
+            return None
+        self.hits += 1
+        metrics.record_cache(True)
+        return entry[1]
+
+    def put(self, record) -> None:
+        """Store a snapshot of a freshly loaded record."""
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+        snapshot = {key: copy.deepcopy(getattr(record, key)) for key in self._columns}
+        self._entries[record.id] = (time.monotonic() + self.ttl, snapshot)
+
+    def invalidate(self, record_id: UUID) -> None:
+        self._entries.pop(record_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def restore(self, db: AsyncSession, snapshot: dict[str, Any]):
+        """
+        Re-attach a cached snapshot to a session as a persistent instance.
+        No SQL is emitted; later modifications are flushed as normal UPDATEs.
+        """
+        key = identity_key(self.model, snapshot["id"])
+        existing = db.identity_map.get(key)
+        if existing is not None:
+            return existing
+
+        record = self.model(**copy.deepcopy(snapshot))
+        make_transient_to_detached(record)
+        db.add(record)
+        return record
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest ones if still full."""
+        now = time.monotonic()
+        for record_id in [k for k, (expires, _) in self._entries.items() if expires < now]:
+            del self._entries[record_id]
+        overflow = len(self._entries) - self.max_entries + 1
+        if overflow > 0:
+            for record_id in list(self._entries)[:overflow]:
+                del self._entries[record_id]
+
+    def stats(self) -> dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class IdentityCache:
+    """
+    Cache of active tenants and users used by `app.api.v1.deps`.
+    """
+
+    def __init__(self, ttl: float | None = None, enabled: bool | None = None):
+        ttl = settings.IDENTITY_CACHE_TTL_SECONDS if ttl is None else ttl
+        self.enabled = settings.IDENTITY_CACHE_ENABLED if enabled is None else enabled
+        self.tenants = RecordCache(Tenant, ttl)
+        self.users = RecordCache(User, ttl)
+        self._tenant_slugs: dict[str, tuple[float, UUID]] = {}
+        self._ttl = ttl
+        self._worker_id = str(uuid4())
+        self._redis = None
+        self._listener_task: asyncio.Task | None = None
+        self._publish_tasks: set[asyncio.Task] = set()
+
+    # Lookups
+
+    async def get_tenant(self, db: AsyncSession, tenant_id: UUID) -> Tenant | None:
+        """Get an active tenant by id."""
+        if self.enabled:
+            snapshot = self.tenants.get(tenant_id)
+            if snapshot is not None:
+                return self.tenants.restore(db, snapshot)
+
+        result = await db.execute(select(Tenant).where(Tenant.id == tenant_id, Tenant.is_active))
+        tenant = result.scalar_one_or_none()
+        if tenant is not None and self.enabled:
+            self._remember_tenant(tenant)
+        return tenant
+
+    async def get_tenant_by_slug(self, db: AsyncSession, slug: str) -> Tenant | None:
+        """Get an active tenant by slug."""
+        if self.enabled:
+            entry = self._tenant_slugs.get(slug)
+            if entry is not None and entry[0] >= time.monotonic():
+                snapshot = self.tenants.get(entry[1])
+                if snapshot is not None:
+                    return self.tenants.restore(db, snapshot)
+
+        result = await db.execute(select(Tenant).where(Tenant.slug == slug, Tenant.is_active))
+        tenant = result.scalar_one_or_none()
+        if tenant is not None and self.enabled:
+            self._remember_tenant(tenant)
+        return tenant
+
+    async def get_user(self, db: AsyncSession, user_id: UUID) -> User | None:
+        """Get an active user by id."""
+        if self.enabled:
+            snapshot = self.users.get(user_id)
+            if snapshot is not None:
+                return self.users.restore(db, snapshot)
+
+        result = await db.execute(select(User).where(User.id == user_id, User.is_active))
+        user = result.scalar_one_or_none()
+        if user is not None and self.enabled:
+            self.users.put(user)
+        return user
+
+    def _remember_tenant(self, tenant: Tenant) -> None:
+        self.tenants.put(tenant)
+        self._tenant_slugs[tenant.slug] = (time.monotonic() + self._ttl, tenant.id)
+
+    # Invalidation
+
+    def invalidate(self, kind: str, record_id: UUID) -> None:
+        """Invalidate a record in this process only."""
+        if kind == _KIND_TENANT:
+            self.tenants.invalidate(record_id)
+            for slug, (_, tenant_id) in list(self._tenant_slugs.items()):
+                if tenant_id == record_id:
+                    del self._tenant_slugs[slug]
+        elif kind == _KIND_USER:
+            self.users.invalidate(record_id)
+
+    def clear(self) -> None:
+        self.tenants.clear()
+        self.users.clear()
+        self._tenant_slugs.clear()
+
+    async def publish_invalidation(self, keys: set[tuple[str, UUID]]) -> None:
+        """Tell other workers to drop the given records."""
+        try:
+            redis = await self._get_redis()
+            await redis.publish(
+                INVALIDATION_CHANNEL,
+                json.dumps(
+                    {
+                        "worker": self._worker_id,
+                        "keys": [[kind, str(record_id)] for kind, record_id in keys],
+                    }
+                ),
+            )
+        except Exception as e:
+            # Other workers fall back to TTL expiry
+            logger.warning("Identity cache invalidation publish failed", error=str(e))
+
+    def _schedule_publish(self, keys: set[tuple[str, UUID]]) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.publish_invalidation(keys))
+        self._publish_tasks.add(task)
+        task.add_done_callback(self._publish_tasks.discard)
+
+    async def start_listener(self) -> None:
+        """Start the background pub/sub listener for remote invalidations."""
+        if self.enabled and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop_listener(self) -> None:
+        """Stop the listener and close the Redis connection."""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener_task
+            self._listener_task = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def _get_redis(self):
+        if self._redis is None:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(
+                settings.REDIS_URL,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+        return self._redis
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                redis = await self._get_redis()
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            self._handle_message(message["data"])
+                finally:
+                    await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Identity cache listener error, retrying", error=str(e))
+                # Anything published while disconnected is missed
+                self.clear()
+                await asyncio.sleep(5)
+
+    def _handle_message(self, data: str) -> None:
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if payload.get("worker") == self._worker_id:
+            return
+        for kind, record_id in payload.get("keys", []):
+            try:
+                self.invalidate(kind, UUID(record_id))
+            except ValueError:
+                continue
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "tenants": self.tenants.stats(),
+            "users": self.users.stats(),
+        }
+
+
+# Global identity cache instance
+identity_cache = IdentityCache()
+
+
+# ORM hooks: any committed change to a tenant or user invalidates its entry
+# locally and on every other worker.
+
+
+def _track_change(kind: str):
+    def listener(mapper, connection, target) -> None:
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_PENDING_KEY, set()).add((kind, target.id))
+
+    return listener
+
+
+for _kind, _model in ((_KIND_TENANT, Tenant), (_KIND_USER, User)):
+    event.listen(_model, "after_update", _track_change(_kind))
+    event.listen(_model, "after_delete", _track_change(_kind))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for kind, record_id in pending:
+        identity_cache.invalidate(kind, record_id)
+    identity_cache._schedule_publish(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,296 @@
+"""
+Job Registry (Phase 4.2)
+Shared state for long-running jobs: bulk entity operations, simulations and
+EGRUL dump imports.
+
+Job records are stored in Redis as JSON (`cortex:jobs:<id>`) with a TTL,
+plus a sorted index by start time that is trimmed to a fixed size, so any
+worker can answer a status request and retention is bounded. Each record
+carries a checkpoint - whatever the job needs to continue after a crash
+(e.g. rows already committed) - and the parameters it was started with.
+
+When Redis is unreachable, records are kept in a small in-process LRU so a
+single worker keeps working.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+JOB_KEY_PREFIX = "cortex:jobs:"
+JOB_INDEX_KEY = f"{JOB_KEY_PREFIX}index"
+
+# Errors kept on a record; the full count is in `failed`
+MAX_JOB_ERRORS = 20
+
+# After a Redis error, use the local store only for this long
+REDIS_RETRY_SECONDS = 30
+
+_DATETIME_FIELDS = ("started_at", "updated_at", "completed_at")
+
+
+def job_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{job_id}"
+
+
+def tenant_index_key(tenant_id: UUID | str | None) -> str:
+    return f"{JOB_KEY_PREFIX}tenant:{tenant_id or 'global'}"
+
+
+class JobStatus(str, Enum):
+    """Uniform job status across job kinds."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+@dataclass
+class JobRecord:
+    """Snapshot of a job's progress, as stored in the registry."""
+
+    job_id: str
+    kind: str
+    status: JobStatus
+    tenant_id: str | None = None
+    total: int = 0
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    started_at: datetime | None = None
+    updated_at: datetime | None = None
+    completed_at: datetime | None = None
+    checkpoint: dict[str, Any] = field(default_factory=dict)
+    params: dict[str, Any] = field(default_factory=dict)
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    result: dict[str, Any] | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def interrupted(self) -> bool:
+        """Still marked as running, but no worker has reported progress lately."""
+        if self.finished or self.updated_at is None:
+            return False
+        idle = (datetime.now(UTC) - self.updated_at).total_seconds()
+        return idle > settings.JOB_STALE_SECONDS
+
+    @property
+    def progress_percentage(self) -> float:
+        if self.total == 0:
+            return 100.0 if self.status == JobStatus.COMPLETED else 0.0
+        return min(self.processed / self.total, 1.0) * 100
+
+    @property
+    def items_per_second(self) -> float:
+        if not self.started_at:
+            return 0.0
+        end = self.completed_at or self.updated_at or datetime.now(UTC)
+        elapsed = (end - self.started_at).total_seconds()
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> float | None:
+        rate = self.items_per_second
+        if self.finished or rate <= 0 or self.total <= self.processed:
+            return None
+        return (self.total - self.processed) / rate
+
+    def to_dict(self, include_result: bool = True) -> dict[str, Any]:
+        data = {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "interrupted": self.interrupted,
+            "tenant_id": self.tenant_id,
+            "total": self.total,
+            "processed": self.processed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "progress_percentage": round(self.progress_percentage, 2),
+            "items_per_second": round(self.items_per_second, 1),
+            "eta_seconds": round(self.eta_seconds, 1) if self.eta_seconds is not None else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "duration_seconds": (
+                (self.completed_at - self.started_at).total_seconds()
+                if self.completed_at and self.started_at
+                else None
+            ),
+            "checkpoint": self.checkpoint,
+            "errors": self.errors,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["status"] = self.status.value
+        for name in _DATETIME_FIELDS:
+            value = data[name]
+            data[name] = value.isoformat() if value else None
+        return json.dumps(data, default=str)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "JobRecord":
+        data = json.loads(raw)
+        data["status"] = JobStatus(data["status"])
+        for name in _DATETIME_FIELDS:
+            value = data.get(name)
+            if value:
+                parsed = datetime.fromisoformat(value)
+                data[name] = parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+        known = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    """Job services use naive UTC timestamps; the registry stores aware ones."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=UTC)
+
+
+class JobRegistry:
+    """
+    Redis-backed job store with bounded retention.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        retention_seconds: int | None = None,
+        max_jobs: int | None = None,
+        local_max: int = 200,
+    ):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.retention_seconds = retention_seconds or settings.JOB_RETENTION_SECONDS
+        self.max_jobs = max_jobs or settings.JOB_REGISTRY_MAX_JOBS
+        self._redis: redis.Redis | None = None
+        self._redis_down_until = 0.0
+        self._local: OrderedDict[str, JobRecord] = OrderedDict()
+        self._local_max = local_max
+
+    async def get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(
+                self.redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+        return self._redis
+
+    async def _client(self) -> redis.Redis | None:
+        """Redis client, or None while backing off after an error."""
+        if time.monotonic() < self._redis_down_until:
+            return None
+        return await self.get_redis()
+
+    def _redis_failed(self, action: str, error: Exception, **fields: Any) -> None:
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        logger.warning(f"Job registry {action} failed", error=str(error), **fields)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    def _remember(self, record: JobRecord) -> None:
+        self._local[record.job_id] = record
+        self._local.move_to_end(record.job_id)
+        while len(self._local) > self._local_max:
+            self._local.popitem(last=False)
+
+    async def save(self, record: JobRecord) -> None:
+        """Store a job snapshot; never raises (job progress must not fail the job)."""
+        record.updated_at = datetime.now(UTC)
+        record.started_at = as_utc(record.started_at) or record.updated_at
+        record.completed_at = as_utc(record.completed_at)
+        record.errors = record.errors[:MAX_JOB_ERRORS]
+        self._remember(record)
+
+        score = record.started_at.timestamp()
+        try:
+            client = await self._client()
+            if client is None:
+                return
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(job_key(record.job_id), record.to_json(), ex=self.retention_seconds)
+                for index in (JOB_INDEX_KEY, tenant_index_key(record.tenant_id)):
+                    pipe.zadd(index, {record.job_id: score})
+                    # Keep the newest `max_jobs`; dropped records expire via their TTL
+                    pipe.zremrangebyrank(index, 0, -self.max_jobs - 1)
+                    pipe.expire(index, self.retention_seconds)
+                await pipe.execute()
+        except Exception as e:
+            self._redis_failed("save", e, job_id=record.job_id)
+
+    async def get(self, job_id: str) -> JobRecord | None:
+        try:
+            client = await self._client()
+            if client is not None:
+                raw = await client.get(job_key(job_id))
+                if raw:
+                    return JobRecord.from_json(raw)
+        except Exception as e:
+            self._redis_failed("lookup", e, job_id=job_id)
+        return self._local.get(job_id)
+
+    async def recent(
+        self,
+        tenant_id: UUID | str | None = None,
+        kind: str | None = None,
+        limit: int = 20,
+    ) -> list[JobRecord]:
+        """Most recently started jobs of a tenant (or all jobs), newest first."""
+        index = tenant_index_key(tenant_id) if tenant_id else JOB_INDEX_KEY
+        records: list[JobRecord] | None = None
+        try:
+            client = await self._client()
+            if client is not None:
+                job_ids = await client.zrevrange(index, 0, self.max_jobs - 1)
+                raws = await client.mget([job_key(job_id) for job_id in job_ids]) if job_ids else []
+                records = [JobRecord.from_json(raw) for raw in raws if raw]
+        except Exception as e:
+            self._redis_failed("list", e)
+        if records is None:
+            records = sorted(
+                (r for r in self._local.values() if not tenant_id or r.tenant_id == str(tenant_id)),
+                key=lambda r: r.started_at or datetime.min.replace(tzinfo=UTC),
+                reverse=True,
+            )
+
+        if kind:
+            records = [r for r in records if r.kind == kind or r.kind.startswith(f"{kind}.")]
+        return records[:limit]
+
+    async def interrupted(self, kind: str | None = None) -> list[JobRecord]:
+        """Jobs left running by a worker that stopped reporting (e.g. crashed)."""
+        return [r for r in await self.recent(kind=kind, limit=self.max_jobs) if r.interrupted]
+
+
+# Global instance
+job_registry = JobRegistry()
@@ -0,0 +1,312 @@
+"""
+Request Metrics (Phase 5.2)
+Per-request performance instrumentation: endpoint latency, DB query count and
+time (via SQLAlchemy engine events), cache hits and external call time.
+
+Exposed as Prometheus text on /metrics and as a slow-endpoint report for
+admins. Metrics are process-local: each worker exposes its own registry and
+Prometheus aggregates across scrapes.
+"""
+
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+from sqlalchemy import event
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500)
+
+# Route label for requests that did not match any route (keeps label cardinality bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+
+@dataclass
+class RequestStats:
+    """Counters accumulated while a single request is being served."""
+
+    db_queries: int = 0
+    db_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    external_calls: int = 0
+    external_time: float = 0.0
+
+
+_current_request: ContextVar[RequestStats | None] = ContextVar("cortex_request_stats", default=None)
+
+
+def start_request() -> tuple[RequestStats, Token]:
+    """Begin collecting stats for the current request context."""
+    stats = RequestStats()
+    return stats, _current_request.set(stats)
+
+
+def end_request(token: Token) -> None:
+    """Stop collecting stats for the current request context."""
+    _current_request.reset(token)
+
+
+def current_request_stats() -> RequestStats | None:
+    """Stats of the request being served, or None outside a request."""
+    return _current_request.get()
+
+
+class Histogram:
+    """Cumulative-bucket histogram compatible with the Prometheus text format."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside the matching bucket."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, bucket_count in zip(self.buckets, self.counts, strict=True):
+            if bucket_count and seen + bucket_count >= rank:
+                return min(lower + (bound - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+            lower = bound
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+@dataclass
+class EndpointStats:
+    """Aggregated metrics for one (method, route) pair."""
+
+    requests: int = 0
+    errors: int = 0
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    db_queries: Histogram = field(default_factory=lambda: Histogram(QUERY_COUNT_BUCKETS))
+    db_time: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    external_time: float = 0.0
+    cache_hits: int = 0
+
+    def to_report(self, method: str, route: str) -> dict[str, Any]:
+        return {
+            "method": method,
+            "route": route,
+            "requests": self.requests,
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "avg_ms": round(self.latency.mean * 1000, 2),
+            "p95_ms": round(self.latency.quantile(0.95) * 1000, 2),
+            "max_ms": round(self.latency.max * 1000, 2),
+            "avg_queries": round(self.db_queries.mean, 2),
+            "max_queries": int(self.db_queries.max),
+            "avg_db_ms": round(self.db_time.mean * 1000, 2),
+            "db_time_share": round(self.db_time.sum / self.latency.sum, 4)
+            if self.latency.sum
+            else 0.0,
+            "avg_external_ms": round(self.external_time / self.requests * 1000, 2)
+            if self.requests
+            else 0.0,
+            "cache_hits": self.cache_hits,
+        }
+
+
+REPORT_SORT_KEYS = ("p95_ms", "avg_ms", "max_ms", "avg_queries", "max_queries", "avg_db_ms")
+
+
+class MetricsRegistry:
+    """
+    In-process metrics registry.
+    """
+
+    def __init__(self):
+        self.endpoints: dict[tuple[str, str], EndpointStats] = {}
+        self.responses: Counter[tuple[str, str, int]] = Counter()
+        self.cache: Counter[str] = Counter()
+        self.external: dict[str, Histogram] = {}
+        self.db_queries_total = 0
+        self.db_time_total = 0.0
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        duration: float,
+        stats: RequestStats,
+    ) -> None:
+        """Record a finished request."""
+        key = (method, route)
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            endpoint = self.endpoints[key] = EndpointStats()
+        endpoint.requests += 1
+        if status_code >= 500:
+            endpoint.errors += 1
+        endpoint.latency.observe(duration)
+        endpoint.db_queries.observe(stats.db_queries)
+        endpoint.db_time.observe(stats.db_time)
+        endpoint.external_time += stats.external_time
+        endpoint.cache_hits += stats.cache_hits
+        self.responses[(method, route, status_code)] += 1
+
+    def record_db_query(self, elapsed: float) -> None:
+        self.db_queries_total += 1
+        self.db_time_total += elapsed
+        stats = _current_request.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_time += elapsed
+
+    def record_cache(self, hit: bool) -> None:
+        self.cache["hit" if hit else "miss"] += 1
+        stats = _current_request.get()
+        if stats is not None:
+            if hit:
+                stats.cache_hits += 1
+            else:
+                stats.cache_misses += 1
+
+    def record_external_call(self, host: str, elapsed: float) -> None:
+        histogram = self.external.get(host)
+        if histogram is None:
+            histogram = self.external[host] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(elapsed)
+        stats = _current_request.get()
+        if stats is not None:
+            stats.external_calls += 1
+            stats.external_time += elapsed
+
+    def endpoint_report(self, sort_by: str = "p95_ms", limit: int = 20) -> list[dict[str, Any]]:
+        """Slowest / most query-heavy endpoints, worst first."""
+        if sort_by not in REPORT_SORT_KEYS:
+            raise ValueError(f"sort_by must be one of: {', '.join(REPORT_SORT_KEYS)}")
+        rows = [stats.to_report(method, route) for (method, route), stats in self.endpoints.items()]
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows[:limit]
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        lines.append("# HELP cortex_http_requests_total Total HTTP requests by route and status.")
+        lines.append("# TYPE cortex_http_requests_total counter")
+        for (method, route, status_code), count in sorted(self.responses.items()):
+            labels = _labels(method=method, route=route, status=str(status_code))
+            lines.append(f"cortex_http_requests_total{labels} {count}")
+
+        endpoints = sorted(self.endpoints.items())
+        for name, help_text, attr in (
+            ("cortex_http_request_duration_seconds", "Request latency.", "latency"),
+            ("cortex_http_request_db_queries", "DB queries per request.", "db_queries"),
+            ("cortex_http_request_db_seconds", "DB time per request.", "db_time"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), stats in endpoints:
+                _render_histogram(lines, name, getattr(stats, attr), method=method, route=route)
+
+        lines.append("# HELP cortex_external_call_seconds Outbound HTTP call latency by host.")
+        lines.append("# TYPE cortex_external_call_seconds histogram")
+        for host, histogram in sorted(self.external.items()):
+            _render_histogram(lines, "cortex_external_call_seconds", histogram, host=host)
+
+        lines.append("# HELP cortex_cache_requests_total Cache lookups by result.")
+        lines.append("# TYPE cortex_cache_requests_total counter")
+        for result, count in sorted(self.cache.items()):
+            lines.append(f"cortex_cache_requests_total{_labels(result=result)} {count}")
+
+        lines.append("# HELP cortex_db_queries_total DB queries executed by this process.")
+        lines.append("# TYPE cortex_db_queries_total counter")
+        lines.append(f"cortex_db_queries_total {self.db_queries_total}")
+        lines.append("# HELP cortex_db_query_seconds_total DB time spent by this process.")
+        lines.append("# TYPE cortex_db_query_seconds_total counter")
+        lines.append(f"cortex_db_query_seconds_total {self.db_time_total:.6f}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        self.__init__()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _render_histogram(lines: list[str], name: str, histogram: Histogram, **labels: str) -> None:
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts, strict=True):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=f'{bound:g}')} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
+
+
+def route_label(scope: dict) -> str:
+    """Route template for a served request (e.g. /v1/entities/{entity_id})."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def instrument_engine(engine) -> None:
+    """Count and time every statement executed through an engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start_time"].pop()
+        metrics.record_db_query(time.perf_counter() - started)
+
+
+async def _on_external_request(request: httpx.Request) -> None:
+    request.extensions["cortex_started"] = time.perf_counter()
+
+
+async def _on_external_response(response: httpx.Response) -> None:
+    started = response.request.extensions.get("cortex_started")
+    if started is not None:
+        metrics.record_external_call(response.request.url.host, time.perf_counter() - started)
+
+
+def external_http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    httpx.AsyncClient that records outbound call time (until response headers)
+    in the request metrics. Accepts the same arguments as httpx.AsyncClient.
+    """
+    hooks = kwargs.pop("event_hooks", {}) or {}
+    kwargs["event_hooks"] = {
+        "request": [_on_external_request, *hooks.get("request", [])],
+        "response": [_on_external_response, *hooks.get("response", [])],
+    }
+    return httpx.AsyncClient(**kwargs)
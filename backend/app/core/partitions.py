@@ -0,0 +1,155 @@
+"""
+Partition Maintenance (Phase 4.2)
+Monthly range partitions for the append-only time-series tables.
+
+`audit_log` and `risk_scores` are partitioned by month on their timestamp
+(see `partitioned_by_month`). Partitions are named `<table>_yYYYYmMM` and
+created PARTITION_MONTHS_AHEAD months in advance, so rows never land in the
+DEFAULT partition. Queries filtering on the timestamp only touch the
+matching partitions, and retention removes whole months with
+DETACH + DROP instead of row-by-row deletes.
+"""
+
+import re
+from datetime import UTC, date, datetime
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    "audit_log": "created_at",
+    "risk_scores": "calculated_at",
+}
+
+_PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    """Month covered by a partition, from its name (None for the DEFAULT partition)."""
+    match = _PARTITION_SUFFIX.search(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+async def is_partitioned(db: AsyncSession, table: str) -> bool:
+    kind = await db.scalar(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    )
+    return kind == "p"
+
+
+async def list_partitions(db: AsyncSession, table: str) -> dict[date, str]:
+    """Monthly partitions of a table by month."""
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": table},
+    )
+    partitions = {}
+    for (name,) in result:
+        month = partition_month(name)
+        if month is not None:
+            partitions[month] = name
+    return partitions
+
+
+async def ensure_partitions(
+    db: AsyncSession,
+    table: str,
+    months_ahead: int | None = None,
+    today: date | None = None,
+) -> list[str]:
+    """Create the partitions for the current month and the next `months_ahead` months."""
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+    if not await is_partitioned(db, table):
+        return []
+
+    existing = await list_partitions(db, table)
+    current = month_start(today or datetime.now(UTC))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month in existing:
+            continue
+        name = partition_name(table, month)
+        await db.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})"
+            )
+        )
+        created.append(name)
+    await db.commit()
+
+    if created:
+        logger.info("Partitions created", table=table, partitions=created)
+    return created
+
+
+async def drop_partition(db: AsyncSession, table: str, month: date) -> str | None:
+    """Detach and drop one month of a table; O(1) regardless of its row count."""
+    name = (await list_partitions(db, table)).get(month)
+    if name is None:
+        return None
+    await db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+    await db.execute(text(f'DROP TABLE "{name}"'))
+    await db.commit()
+    logger.info("Partition dropped", table=table, partition=name)
+    return name
+
+
+async def drop_partitions_before(db: AsyncSession, table: str, before: date) -> list[str]:
+    """Drop every monthly partition that ends on or before `before`."""
+    if not await is_partitioned(db, table):
+        return []
+    dropped = []
+    for month in sorted(await list_partitions(db, table)):
+        if add_months(month, 1) > before:
+            break
+        name = await drop_partition(db, table, month)
+        if name:
+            dropped.append(name)
+    return dropped
+
+
+async def maintain_partitions(db: AsyncSession, today: date | None = None) -> dict[str, list[str]]:
+    """
+    Create upcoming partitions of all partitioned tables and drop risk score
+    months past RISK_SCORE_RETENTION_MONTHS. Old audit_log months are removed
+    by audit archival, which writes them to archive files first.
+    """
+    summary = {}
+    for table in PARTITIONED_TABLES:
+        summary[f"{table}_created"] = await ensure_partitions(db, table, today=today)
+
+    if settings.RISK_SCORE_RETENTION_MONTHS:
+        current = month_start(today or datetime.now(UTC))
+        cutoff = add_months(current, -settings.RISK_SCORE_RETENTION_MONTHS)
+        summary["risk_scores_dropped"] = await drop_partitions_before(db, "risk_scores", cutoff)
+    return summary
@@ -0,0 +1,253 @@
+"""
+N+1 Query Detector (Phase 5.2)
+Opt-in detection of repeated identical statements within one request or
+background task, built on the same SQLAlchemy engine events as the metrics.
+
+Statements are grouped by their parameterized SQL text; a group executed more
+than the threshold number of times is reported together with the application
+frame that issued it. Modes (QUERY_DETECTOR_MODE):
+
+- off:   nothing is tracked (default)
+- log:   findings from requests and Celery tasks are logged and kept for the
+         admin performance report
+- raise: as log, and the pytest hook fails any test that produced findings
+         (tests/conftest.py)
+
+`detect_queries()` blocks are always tracked and raise NPlusOneDetected,
+whatever the mode, so a test can pin down a specific code path.
+"""
+
+import sys
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+import structlog
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Frames under this directory count as "application" frames for origin lookup
+PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+_SKIP_FILES = {
+    __file__,
+    str(Path(__file__).with_name("metrics.py")),
+    str(Path(__file__).with_name("database.py")),
+}
+
+# Statement text is truncated to this length in reports
+MAX_STATEMENT_LENGTH = 500
+
+
+class QueryDetectorMode(str, Enum):
+    """What to do when a repeated statement is found."""
+
+    OFF = "off"
+    LOG = "log"
+    RAISE = "raise"
+
+
+@dataclass
+class StatementGroup:
+    """Executions of one parameterized statement within a scope."""
+
+    count: int = 0
+    origin: str | None = None
+
+
+@dataclass
+class RepeatedQuery:
+    """A statement executed more often than the threshold."""
+
+    scope: str
+    statement: str
+    count: int
+    origin: str | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "scope": self.scope,
+            "statement": self.statement[:MAX_STATEMENT_LENGTH],
+            "count": self.count,
+            "origin": self.origin,
+        }
+
+    def __str__(self) -> str:
+        statement = " ".join(self.statement.split())[:200]
+        return f"{self.count}x at {self.origin or 'unknown'}: {statement}"
+
+
+class NPlusOneDetected(Exception):
+    """Raised when a checked scope executed repeated statements."""
+
+    def __init__(self, findings: list[RepeatedQuery]):
+        self.findings = findings
+        lines = "\n".join(f"  {finding}" for finding in findings)
+        super().__init__(f"Repeated queries in {findings[0].scope}:\n{lines}")
+
+
+@dataclass
+class QueryScope:
+    """Statements executed while serving one request or running one task."""
+
+    label: str
+    threshold: int
+    groups: dict[str, StatementGroup] = field(default_factory=dict)
+
+    def record(self, statement: str) -> None:
+        group = self.groups.get(statement)
+        if group is None:
+            group = self.groups[statement] = StatementGroup()
+        group.count += 1
+        # Walking the stack is comparatively expensive: only do it once per
+        # group, when the group first crosses the threshold
+        if group.count == self.threshold + 1:
+            group.origin = find_origin()
+
+    def findings(self) -> list[RepeatedQuery]:
+        found = [
+            RepeatedQuery(self.label, statement, group.count, group.origin)
+            for statement, group in self.groups.items()
+            if group.count > self.threshold
+        ]
+        found.sort(key=lambda finding: finding.count, reverse=True)
+        return found
+
+
+_current_scope: ContextVar[QueryScope | None] = ContextVar("cortex_query_scope", default=None)
+
+
+def find_origin() -> str | None:
+    """
+    First project frame (outside this module and the DB plumbing) that led to
+    the statement being executed, as "path:line in function".
+
+    Under the async engine the cursor events run inside SQLAlchemy's
+    greenlet, whose own stack ends at the driver call; the awaiting
+    coroutine chain is reached through the parent greenlet's frame.
+    """
+    frame = sys._getframe(1)
+    current = _current_greenlet()
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PROJECT_ROOT) and filename not in _SKIP_FILES:
+            relative = filename[len(PROJECT_ROOT) + 1 :]
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+        if frame is None and current is not None and current.parent is not None:
+            frame = current.parent.gr_frame
+            current = current.parent
+    return None
+
+
+def _current_greenlet():
+    greenlet = sys.modules.get("greenlet")
+    return greenlet.getcurrent() if greenlet is not None else None
+
+
+class QueryDetector:
+    """
+    Process-wide detector configuration and recent findings.
+    """
+
+    def __init__(
+        self,
+        mode: QueryDetectorMode | str | None = None,
+        threshold: int | None = None,
+        max_findings: int = 200,
+    ):
+        self.mode = QueryDetectorMode(mode or settings.QUERY_DETECTOR_MODE)
+        self.threshold = settings.QUERY_DETECTOR_THRESHOLD if threshold is None else threshold
+        self.recent: deque[RepeatedQuery] = deque(maxlen=max_findings)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != QueryDetectorMode.OFF
+
+    def configure(self, mode: QueryDetectorMode | str, threshold: int | None = None) -> None:
+        self.mode = QueryDetectorMode(mode)
+        if threshold is not None:
+            self.threshold = threshold
+
+    def start(self, label: str, threshold: int | None = None):
+        """Open a scope for the current context. Returns a token for `finish`."""
+        scope = QueryScope(label, self.threshold if threshold is None else threshold)
+        return scope, _current_scope.set(scope)
+
+    def finish(
+        self, scope: QueryScope, token, raise_on_findings: bool = False
+    ) -> list[RepeatedQuery]:
+        """Close a scope and either raise or log and keep its findings."""
+        _current_scope.reset(token)
+        findings = scope.findings()
+        if findings and raise_on_findings:
+            raise NPlusOneDetected(findings)
+        for finding in findings:
+            self.recent.append(finding)
+            logger.warning(
+                "Repeated query detected (possible N+1)",
+                scope=finding.scope,
+                count=finding.count,
+                origin=finding.origin,
+                statement=" ".join(finding.statement.split())[:200],
+            )
+        return findings
+
+    def report(self) -> list[dict[str, Any]]:
+        """Recent findings, most repeated first."""
+        return sorted(
+            (finding.to_dict() for finding in self.recent),
+            key=lambda finding: finding["count"],
+            reverse=True,
+        )
+
+    def reset(self) -> None:
+        self.recent.clear()
+
+
+# Global detector instance
+query_detector = QueryDetector()
+
+
+def current_query_scope() -> QueryScope | None:
+    """Scope of the request/task being served, or None when not tracking."""
+    return _current_scope.get()
+
+
+@contextmanager
+def detect_queries(label: str = "block", threshold: int | None = None, raise_on_findings=True):
+    """
+    Track statements executed inside the block, regardless of the configured
+    mode. Raises NPlusOneDetected on exit if any statement was repeated more
+    than `threshold` times (unless raise_on_findings is False).
+
+        with detect_queries("risk recalculation", threshold=3):
+            await engine.calculate_all(tenant_id)
+    """
+    scope, token = query_detector.start(label, threshold)
+    try:
+        yield scope
+    except BaseException:
+        query_detector.finish(scope, token)
+        raise
+    query_detector.finish(scope, token, raise_on_findings=raise_on_findings)
+
+
+def instrument_engine(engine) -> None:
+    """Feed every statement executed through an engine to the current scope."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        # executemany() batches are already set-based
+        if executemany:
+            return
+        scope = _current_scope.get()
+        if scope is not None:
+            scope.record(statement)
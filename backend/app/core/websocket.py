@@ -1,19 +1,29 @@
 """
 WebSocket Manager (Phase 4.1)
 Implements real-time communication for alerts and notifications.
+
+With a broker (app.core.websocket_broker) messages are fanned out through
+Redis, so a broadcast from any worker reaches clients connected to every
+worker, and alert replay on reconnect is shared. Without one (or while Redis
+is unreachable) delivery and alert history are local to the process.
 """
 
 import asyncio
+import contextlib
+import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import structlog
 from fastapi import WebSocket
 from starlette.websockets import WebSocketState
 
+from app.core.config import settings
+from app.core.websocket_broker import WebSocketBroker
+
 logger = structlog.get_logger()
 
 
@@ -39,15 +49,36 @@ class AlertPriority(str, Enum):
     CRITICAL = "critical"
 
 
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a connection's send queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
 @dataclass
 class WebSocketConnection:
-    """Represents a WebSocket connection."""
+    """
+    Represents a WebSocket connection.
+
+    Outgoing messages are queued as serialized text and written by a
+    dedicated writer task, so a slow client only delays itself.
+    """
 
     websocket: WebSocket
     user_id: UUID
     tenant_id: UUID
+    connection_id: str = field(default_factory=lambda: uuid4().hex)
     subscriptions: set[str] = field(default_factory=set)
     connected_at: datetime = field(default_factory=datetime.utcnow)
+    # Entries are [coalesce key | None, text]
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    # Coalesce key -> entry still waiting in the queue
+    pending: dict[str, list] = field(default_factory=dict)
+    writer: asyncio.Task | None = None
+    dropped: int = 0
+    coalesced: int = 0
 
 
 @dataclass
@@ -79,14 +110,30 @@ class Alert:
 class WebSocketManager:
     """
     Manages WebSocket connections and broadcasts.
-    Supports per-tenant and per-user messaging.
+    Supports per-tenant, per-user and per-channel messaging, with any number
+    of connections per user (one per browser tab).
     """
 
-    def __init__(self):
-        # Active connections by user ID
+    def __init__(
+        self,
+        broker: WebSocketBroker | None = None,
+        queue_size: int | None = None,
+        send_timeout: float | None = None,
+        slow_consumer_policy: SlowConsumerPolicy | str | None = None,
+    ):
+        # Cross-worker fan-out (None: deliver locally only)
+        self.broker = broker
+        self.queue_size = queue_size or settings.WEBSOCKET_SEND_QUEUE_SIZE
+        self.send_timeout = send_timeout or settings.WEBSOCKET_SEND_TIMEOUT_SECONDS
+        self.slow_consumer_policy = SlowConsumerPolicy(
+            slow_consumer_policy or settings.WEBSOCKET_SLOW_CONSUMER_POLICY
+        )
+        # Active connections by connection ID
         self._connections: dict[str, WebSocketConnection] = {}
-        # Tenant -> user IDs mapping
-        self._tenant_users: dict[str, set[str]] = {}
+        # Indexes: user / tenant / channel -> connection IDs
+        self._user_connections: dict[str, set[str]] = {}
+        self._tenant_connections: dict[str, set[str]] = {}
+        self._channel_connections: dict[str, set[str]] = {}
         # Alert history (for reconnection)
         self._alert_history: list[Alert] = []
         self._max_history = 100
@@ -98,6 +145,7 @@ class WebSocketManager:
         websocket: WebSocket,
         user_id: UUID,
         tenant_id: UUID,
+        last_event_id: str | None = None,
     ) -> str:
         """
         Accept and register a WebSocket connection.
@@ -106,36 +154,43 @@ class WebSocketManager:
             websocket: The WebSocket connection
             user_id: User's ID
             tenant_id: Tenant's ID
+            last_event_id: Id of the last alert the client received, to
+                replay everything after it
 
         Returns:
             Connection ID
         """
         await websocket.accept()
 
-        connection_id = str(user_id)
         connection = WebSocketConnection(
             websocket=websocket,
             user_id=user_id,
             tenant_id=tenant_id,
+            queue=asyncio.Queue(maxsize=self.queue_size),
         )
+        connection_id = connection.connection_id
+        connection.writer = asyncio.create_task(self._writer(connection))
 
         self._connections[connection_id] = connection
+        self._user_connections.setdefault(str(user_id), set()).add(connection_id)
 
-        # Track tenant users
+        # Track tenant connections
         tenant_key = str(tenant_id)
-        if tenant_key not in self._tenant_users:
-            self._tenant_users[tenant_key] = set()
-        self._tenant_users[tenant_key].add(connection_id)
+        if tenant_key not in self._tenant_connections:
+            self._tenant_connections[tenant_key] = set()
+            await self._join_tenant(tenant_id)
+        self._tenant_connections[tenant_key].add(connection_id)
 
         logger.info(
             "WebSocket connected",
             user_id=str(user_id),
             tenant_id=str(tenant_id),
+            connection_id=connection_id,
             total_connections=len(self._connections),
         )
 
         # Send connection confirmation
-        await self._send_to_connection(
+        await self.send(
             connection_id,
             {
                 "type": "connected",
@@ -145,7 +200,7 @@ class WebSocketManager:
         )
 
         # Send recent alerts
-        await self._send_recent_alerts(connection_id, tenant_id)
+        await self._send_recent_alerts(connection_id, user_id, tenant_id, last_event_id)
 
         return connection_id
 
@@ -156,23 +211,28 @@ class WebSocketManager:
         Args:
             connection_id: The connection ID to remove
         """
-        if connection_id in self._connections:
-            connection = self._connections[connection_id]
-            tenant_key = str(connection.tenant_id)
+        connection = self._connections.pop(connection_id, None)
+        if connection is None:
+            return
 
-            # Remove from tenant tracking
-            if tenant_key in self._tenant_users:
-                self._tenant_users[tenant_key].discard(connection_id)
-                if not self._tenant_users[tenant_key]:
-                    del self._tenant_users[tenant_key]
+        _discard(self._user_connections, str(connection.user_id), connection_id)
+        for channel in connection.subscriptions:
+            _discard(self._channel_connections, channel, connection_id)
+        tenant_key = str(connection.tenant_id)
+        _discard(self._tenant_connections, tenant_key, connection_id)
+        if tenant_key not in self._tenant_connections:
+            await self._leave_tenant(connection.tenant_id)
 
-            del self._connections[connection_id]
+        if connection.writer is not None and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
 
-            logger.info(
-                "WebSocket disconnected",
-                user_id=str(connection.user_id),
-                total_connections=len(self._connections),
-            )
+        logger.info(
+            "WebSocket disconnected",
+            user_id=str(connection.user_id),
+            connection_id=connection_id,
+            dropped_messages=connection.dropped,
+            total_connections=len(self._connections),
+        )
 
     async def subscribe(self, connection_id: str, channel: str):
         """
@@ -184,7 +244,8 @@ class WebSocketManager:
         """
         if connection_id in self._connections:
             self._connections[connection_id].subscriptions.add(channel)
-            await self._send_to_connection(
+            self._channel_connections.setdefault(channel, set()).add(connection_id)
+            await self.send(
                 connection_id,
                 {
                     "type": "subscribed",
@@ -202,7 +263,8 @@ class WebSocketManager:
         """
         if connection_id in self._connections:
             self._connections[connection_id].subscriptions.discard(channel)
-            await self._send_to_connection(
+            _discard(self._channel_connections, channel, connection_id)
+            await self.send(
                 connection_id,
                 {
                     "type": "unsubscribed",
@@ -217,68 +279,72 @@ class WebSocketManager:
         Args:
             alert: The alert to broadcast
         """
-        # Store in history
-        self._alert_history.append(alert)
-        if len(self._alert_history) > self._max_history:
-            self._alert_history = self._alert_history[-self._max_history :]
-
-        message = {
-            "type": "alert",
+        envelope = {
+            "kind": "alert",
+            "tenant_id": str(alert.tenant_id) if alert.tenant_id else None,
+            "user_id": str(alert.user_id) if alert.user_id else None,
             "alert": alert.to_dict(),
         }
+        if await self._publish(envelope, alert.tenant_id, durable=True):
+            return
 
-        sent_count = 0
-
-        # If user-specific, send only to that user
-        if alert.user_id:
-            connection_id = str(alert.user_id)
-            if connection_id in self._connections:
-                await self._send_to_connection(connection_id, message)
-                sent_count = 1
-        # If tenant-specific, broadcast to tenant
-        elif alert.tenant_id:
-            tenant_key = str(alert.tenant_id)
-            if tenant_key in self._tenant_users:
-                for connection_id in self._tenant_users[tenant_key]:
-                    await self._send_to_connection(connection_id, message)
-                    sent_count += 1
-        # Global broadcast
-        else:
-            for connection_id in self._connections:
-                await self._send_to_connection(connection_id, message)
-                sent_count += 1
-
-        logger.info(
-            "Alert broadcast",
-            alert_type=alert.type.value,
-            priority=alert.priority.value,
-            recipients=sent_count,
-        )
+        # Local only: store in history
+        self._alert_history.append(alert)
+        if len(self._alert_history) > self._max_history:
+            self._alert_history = self._alert_history[-self._max_history :]
+        await self._deliver(None, envelope)
 
-    async def send_to_user(self, user_id: UUID, message: dict[str, Any]):
+    async def send_to_user(
+        self,
+        user_id: UUID,
+        message: dict[str, Any],
+        tenant_id: UUID | None = None,
+        coalesce_key: str | None = None,
+    ):
         """
-        Send a message to a specific user.
+        Send a message to every connection of a specific user.
 
         Args:
             user_id: User's ID
             message: Message to send
+            tenant_id: User's tenant (routes the message to the tenant's
+                channel only; otherwise it goes through the global channel)
+            coalesce_key: Messages with the same key replace each other while
+                still queued for a client (e.g. progress updates)
         """
-        connection_id = str(user_id)
-        if connection_id in self._connections:
-            await self._send_to_connection(connection_id, message)
+        envelope = {
+            "kind": "message",
+            "user_id": str(user_id),
+            "tenant_id": str(tenant_id) if tenant_id else None,
+            "coalesce": coalesce_key,
+            "message": message,
+        }
+        if not await self._publish(envelope, tenant_id):
+            await self._deliver(None, envelope)
 
-    async def broadcast_to_tenant(self, tenant_id: UUID, message: dict[str, Any]):
+    async def broadcast_to_tenant(
+        self,
+        tenant_id: UUID,
+        message: dict[str, Any],
+        coalesce_key: str | None = None,
+    ):
         """
         Broadcast a message to all users in a tenant.
 
         Args:
             tenant_id: Tenant's ID
             message: Message to broadcast
+            coalesce_key: Messages with the same key replace each other while
+                still queued for a client (e.g. progress updates)
         """
-        tenant_key = str(tenant_id)
-        if tenant_key in self._tenant_users:
-            for connection_id in self._tenant_users[tenant_key]:
-                await self._send_to_connection(connection_id, message)
+        envelope = {
+            "kind": "message",
+            "tenant_id": str(tenant_id),
+            "coalesce": coalesce_key,
+            "message": message,
+        }
+        if not await self._publish(envelope, tenant_id):
+            await self._deliver(None, envelope)
 
     async def broadcast_to_channel(self, channel: str, message: dict[str, Any]):
         """
@@ -288,44 +354,237 @@ class WebSocketManager:
             channel: Channel name
             message: Message to broadcast
         """
-        for connection_id, connection in self._connections.items():
-            if channel in connection.subscriptions:
-                await self._send_to_connection(connection_id, message)
+        envelope = {"kind": "message", "channel": channel, "message": message}
+        if not await self._publish(envelope, None):
+            await self._deliver(None, envelope)
 
-    async def _send_to_connection(self, connection_id: str, message: dict[str, Any]):
-        """Send a message to a specific connection."""
-        if connection_id not in self._connections:
-            return
+    async def send(self, connection_id: str, message: dict[str, Any]):
+        """Queue a message for a single connection."""
+        await self._enqueue_many([connection_id], json.dumps(message, default=str))
 
-        connection = self._connections[connection_id]
+    async def _publish(
+        self, envelope: dict[str, Any], tenant_id: UUID | None, durable=False
+    ) -> bool:
+        """
+        Hand a message to the broker. Returns False if it must be delivered
+        locally instead (no broker, or Redis unreachable).
+        """
+        if self.broker is None:
+            return False
         try:
-            if connection.websocket.client_state == WebSocketState.CONNECTED:
-                await connection.websocket.send_json(message)
+            await self.broker.publish(envelope, tenant_id, durable=durable)
+            return True
         except Exception as e:
-            logger.error(
-                "Failed to send WebSocket message",
-                connection_id=connection_id,
-                error=str(e),
+            logger.warning("WebSocket broker publish failed, delivering locally", error=str(e))
+            return False
+
+    async def _deliver(self, event_id: str | None, envelope: dict[str, Any]):
+        """Deliver a published message to this worker's matching connections."""
+        tenant_id = envelope.get("tenant_id")
+        user_id = envelope.get("user_id")
+        channel = envelope.get("channel")
+
+        if envelope.get("kind") == "alert":
+            alert = dict(envelope["alert"])
+            if event_id:
+                alert["id"] = event_id
+            message = {"type": "alert", "alert": alert}
+        else:
+            message = envelope["message"]
+
+        # If user-specific, send only to that user
+        if user_id:
+            targets = self._user_connections.get(user_id, ())
+        # If tenant-specific, broadcast to tenant
+        elif tenant_id:
+            targets = self._tenant_connections.get(tenant_id, ())
+        elif channel:
+            targets = self._channel_connections.get(channel, ())
+        # Global broadcast
+        else:
+            targets = self._connections.keys()
+
+        # Serialized once, whatever the number of recipients
+        sent_count = await self._enqueue_many(
+            list(targets), json.dumps(message, default=str), envelope.get("coalesce")
+        )
+
+        if envelope.get("kind") == "alert":
+            logger.info(
+                "Alert broadcast",
+                alert_type=envelope["alert"]["type"],
+                priority=envelope["alert"]["priority"],
+                recipients=sent_count,
             )
-            await self.disconnect(connection_id)
-
-    async def _send_recent_alerts(self, connection_id: str, tenant_id: UUID):
-        """Send recent alerts to a newly connected client."""
-        tenant_alerts = [
-            alert
-            for alert in self._alert_history
-            if alert.tenant_id == tenant_id or alert.tenant_id is None
-        ][-10:]  # Last 10 alerts
-
-        if tenant_alerts:
-            await self._send_to_connection(
+
+    async def _enqueue_many(
+        self, connection_ids: list[str], text: str, coalesce_key: str | None = None
+    ) -> int:
+        """Queue serialized text for several connections without waiting on any."""
+        queued = 0
+        slow = []
+        for connection_id in connection_ids:
+            connection = self._connections.get(connection_id)
+            if connection is None:
+                continue
+            if self._enqueue(connection, text, coalesce_key):
+                queued += 1
+            elif self.slow_consumer_policy == SlowConsumerPolicy.DISCONNECT:
+                slow.append(connection)
+        for connection in slow:
+            await self._drop_slow_consumer(connection)
+        return queued
+
+    def _enqueue(
+        self, connection: WebSocketConnection, text: str, coalesce_key: str | None
+    ) -> bool:
+        """
+        Queue one message, applying the slow-consumer policy if the queue is
+        full. Returns False if the message was not queued.
+        """
+        if coalesce_key is not None:
+            entry = connection.pending.get(coalesce_key)
+            if entry is not None:
+                # Still waiting to be written: only the latest value matters
+                entry[1] = text
+                connection.coalesced += 1
+                return True
+
+        queue = connection.queue
+        if queue.full():
+            if self.slow_consumer_policy != SlowConsumerPolicy.DROP_OLDEST:
+                connection.dropped += 1
+                return False
+            oldest = queue.get_nowait()
+            queue.task_done()
+            if oldest[0] is not None and connection.pending.get(oldest[0]) is oldest:
+                del connection.pending[oldest[0]]
+            connection.dropped += 1
+
+        entry = [coalesce_key, text]
+        queue.put_nowait(entry)
+        if coalesce_key is not None:
+            connection.pending[coalesce_key] = entry
+        return True
+
+    async def _writer(self, connection: WebSocketConnection):
+        """Write a connection's queued messages, one at a time."""
+        websocket = connection.websocket
+        queue = connection.queue
+        while True:
+            entry = await queue.get()
+            coalesce_key = entry[0]
+            if coalesce_key is not None and connection.pending.get(coalesce_key) is entry:
+                del connection.pending[coalesce_key]
+            try:
+                if websocket.client_state == WebSocketState.CONNECTED:
+                    await asyncio.wait_for(websocket.send_text(entry[1]), self.send_timeout)
+            except Exception as e:
+                logger.error(
+                    "Failed to send WebSocket message",
+                    connection_id=connection.connection_id,
+                    error=str(e) or type(e).__name__,
+                )
+                await self.disconnect(connection.connection_id)
+                return
+            finally:
+                queue.task_done()
+
+    async def _drop_slow_consumer(self, connection: WebSocketConnection):
+        logger.warning(
+            "Disconnecting slow WebSocket consumer",
+            connection_id=connection.connection_id,
+            queued=connection.queue.qsize(),
+        )
+        await self.disconnect(connection.connection_id)
+        with contextlib.suppress(Exception):
+            # 1013: try again later
+            await asyncio.wait_for(connection.websocket.close(code=1013), self.send_timeout)
+
+    async def drain(self, timeout: float = 5.0):
+        """Wait until every queued message has been written (or timeout)."""
+        waiters = [
+            asyncio.ensure_future(connection.queue.join())
+            for connection in self._connections.values()
+        ]
+        if waiters:
+            _, pending = await asyncio.wait(waiters, timeout=timeout)
+            for waiter in pending:
+                waiter.cancel()
+
+    async def _send_recent_alerts(
+        self,
+        connection_id: str,
+        user_id: UUID,
+        tenant_id: UUID,
+        last_event_id: str | None = None,
+    ):
+        """
+        Send recent alerts to a newly connected client: everything after
+        `last_event_id` when resuming, otherwise the last 10.
+        """
+        if self.broker is not None and self.broker.connected:
+            try:
+                alerts = await self._replay_alerts(user_id, tenant_id, last_event_id)
+            except Exception as e:
+                logger.warning("WebSocket alert replay failed", error=str(e))
+                alerts = []
+        else:
+            alerts = [
+                alert.to_dict()
+                for alert in self._alert_history
+                if (alert.tenant_id == tenant_id or alert.tenant_id is None)
+                and (alert.user_id is None or alert.user_id == user_id)
+            ][-10:]  # Last 10 alerts
+
+        if alerts:
+            await self.send(
                 connection_id,
                 {
                     "type": "recent_alerts",
-                    "alerts": [alert.to_dict() for alert in tenant_alerts],
+                    "alerts": alerts,
                 },
             )
 
+    async def _replay_alerts(
+        self, user_id: UUID, tenant_id: UUID, last_event_id: str | None
+    ) -> list[dict[str, Any]]:
+        limit = settings.WEBSOCKET_REPLAY_LIMIT if last_event_id else 10
+        alerts = []
+        for event_id, envelope in await self.broker.replay(tenant_id, last_event_id, limit):
+            if envelope.get("user_id") not in (None, str(user_id)):
+                continue
+            alerts.append({**envelope["alert"], "id": event_id})
+        return alerts
+
+    async def _join_tenant(self, tenant_id: UUID):
+        if self.broker is not None:
+            try:
+                await self.broker.join_tenant(tenant_id)
+            except Exception as e:
+                logger.warning("WebSocket broker subscribe failed", error=str(e))
+
+    async def _leave_tenant(self, tenant_id: UUID):
+        if self.broker is not None:
+            try:
+                await self.broker.leave_tenant(tenant_id)
+            except Exception as e:
+                logger.warning("WebSocket broker unsubscribe failed", error=str(e))
+
+    async def start(self):
+        """Start receiving messages published by other workers."""
+        if self.broker is not None:
+            await self.broker.start(self._deliver)
+
+    async def stop(self):
+        """Stop the heartbeat, the connection writers and the broker listener."""
+        await self.stop_heartbeat()
+        for connection in self._connections.values():
+            if connection.writer is not None:
+                connection.writer.cancel()
+        if self.broker is not None:
+            await self.broker.stop()
+
     def get_connection_count(self) -> int:
         """Get total number of active connections."""
         return len(self._connections)
@@ -333,7 +592,20 @@ class WebSocketManager:
     def get_tenant_connection_count(self, tenant_id: UUID) -> int:
         """Get number of connections for a tenant."""
         tenant_key = str(tenant_id)
-        return len(self._tenant_users.get(tenant_key, set()))
+        return len(self._tenant_connections.get(tenant_key, set()))
+
+    def get_user_connection_count(self, user_id: UUID) -> int:
+        """Get number of open connections (tabs) of a user."""
+        return len(self._user_connections.get(str(user_id), set()))
+
+    def get_queue_stats(self) -> dict[str, int]:
+        """Queued, dropped and coalesced messages across connections."""
+        connections = self._connections.values()
+        return {
+            "queued": sum(connection.queue.qsize() for connection in connections),
+            "dropped": sum(connection.dropped for connection in connections),
+            "coalesced": sum(connection.coalesced for connection in connections),
+        }
 
     async def start_heartbeat(self, interval: int = 30):
         """Start heartbeat task to keep connections alive."""
@@ -342,8 +614,11 @@ class WebSocketManager:
             while True:
                 await asyncio.sleep(interval)
                 message = {"type": "heartbeat", "timestamp": datetime.utcnow().isoformat()}
-                for connection_id in list(self._connections.keys()):
-                    await self._send_to_connection(connection_id, message)
+                # A client that has not taken the previous heartbeat yet only
+                # gets the latest one
+                await self._enqueue_many(
+                    list(self._connections), json.dumps(message), coalesce_key="heartbeat"
+                )
 
         self._heartbeat_task = asyncio.create_task(heartbeat())
 
@@ -354,8 +629,19 @@ class WebSocketManager:
             self._heartbeat_task = None
 
 
+def _discard(index: dict[str, set[str]], key: str, connection_id: str) -> None:
+    """Remove a connection from an index entry, dropping the entry when empty."""
+    connection_ids = index.get(key)
+    if connection_ids is not None:
+        connection_ids.discard(connection_id)
+        if not connection_ids:
+            del index[key]
+
+
 # Global WebSocket manager instance
-ws_manager = WebSocketManager()
+ws_manager = WebSocketManager(
+    broker=WebSocketBroker() if settings.WEBSOCKET_BROKER_ENABLED else None,
+)
 
 
 # Helper functions for common alerts
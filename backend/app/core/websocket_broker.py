@@ -0,0 +1,241 @@
+"""
+WebSocket Broker (Phase 4.1)
+Redis-backed fan-out for WebSocket messages across uvicorn workers.
+
+Every message is published to a Redis pub/sub channel; each worker subscribes
+to the global channel and to the channel of every tenant it currently has
+connections for, and delivers what it receives to its local sockets.
+
+Alerts are additionally appended to a capped Redis stream per tenant (plus one
+for global alerts). Stream entry ids are sent to clients with each alert, so a
+reconnecting client can pass the last id it saw and have everything after it
+replayed, whichever worker it lands on.
+"""
+
+import asyncio
+import contextlib
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+CHANNEL_PREFIX = "cortex:ws:"
+GLOBAL_SCOPE = "global"
+
+# Pub/sub payload is "<stream id> <json>"; "-" when the message is not stored
+NO_EVENT_ID = "-"
+
+# Append to the capped stream and publish in a single round trip, so the
+# published message carries its stream id.
+PUBLISH_DURABLE_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[2])
+redis.call('PUBLISH', KEYS[2], id .. ' ' .. ARGV[2])
+return id
+"""
+
+MessageHandler = Callable[[str | None, dict[str, Any]], Awaitable[None]]
+
+
+def channel_name(tenant_id: UUID | None) -> str:
+    """Pub/sub channel for a tenant (or global messages)."""
+    scope = str(tenant_id) if tenant_id else GLOBAL_SCOPE
+    return f"{CHANNEL_PREFIX}{scope}"
+
+
+def stream_name(tenant_id: UUID | None) -> str:
+    """Replay stream for a tenant's (or global) alerts."""
+    scope = str(tenant_id) if tenant_id else GLOBAL_SCOPE
+    return f"{CHANNEL_PREFIX}stream:{scope}"
+
+
+def stream_id_key(event_id: str) -> tuple[int, int]:
+    """Sort key for Redis stream ids ("<ms>-<seq>")."""
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def parse_payload(data: str) -> tuple[str | None, dict[str, Any]] | None:
+    """Split a pub/sub payload into (event id, envelope)."""
+    event_id, _, body = data.partition(" ")
+    try:
+        envelope = json.loads(body)
+    except ValueError:
+        return None
+    return (None if event_id == NO_EVENT_ID else event_id), envelope
+
+
+class WebSocketBroker:
+    """
+    Cross-worker message bus for the WebSocket manager.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        replay_maxlen: int | None = None,
+    ):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.replay_maxlen = replay_maxlen or settings.WEBSOCKET_REPLAY_MAXLEN
+        self._redis: redis.Redis | None = None
+        self._pubsub = None
+        self._publish_durable = None
+        self._handler: MessageHandler | None = None
+        self._listener_task: asyncio.Task | None = None
+        self._tenants: set[str] = set()
+        self.published = 0
+        self.received = 0
+
+    @property
+    def connected(self) -> bool:
+        """True while the listener is subscribed and receiving."""
+        return self._pubsub is not None
+
+    async def get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(
+                self.redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+            self._publish_durable = self._redis.register_script(PUBLISH_DURABLE_SCRIPT)
+        return self._redis
+
+    # Lifecycle
+
+    async def start(self, handler: MessageHandler) -> None:
+        """Start listening; `handler(event_id, envelope)` is called per message."""
+        self._handler = handler
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener_task
+            self._listener_task = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    async def join_tenant(self, tenant_id: UUID) -> None:
+        """Receive messages for a tenant (first local connection of that tenant)."""
+        key = str(tenant_id)
+        if key in self._tenants:
+            return
+        self._tenants.add(key)
+        if self._pubsub is not None:
+            await self._pubsub.subscribe(channel_name(tenant_id))
+
+    async def leave_tenant(self, tenant_id: UUID) -> None:
+        """Stop receiving a tenant's messages (last local connection closed)."""
+        key = str(tenant_id)
+        if key not in self._tenants:
+            return
+        self._tenants.discard(key)
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(channel_name(tenant_id))
+
+    # Publishing
+
+    async def publish(
+        self,
+        envelope: dict[str, Any],
+        tenant_id: UUID | None = None,
+        durable: bool = False,
+    ) -> str | None:
+        """
+        Publish a message to every worker serving the tenant.
+        Durable messages are also stored for replay; returns their stream id.
+        """
+        client = await self.get_redis()
+        body = json.dumps(envelope, default=str)
+        self.published += 1
+        if durable:
+            return await self._publish_durable(
+                keys=[stream_name(tenant_id), channel_name(tenant_id)],
+                args=[self.replay_maxlen, body],
+                client=client,
+            )
+        await client.publish(channel_name(tenant_id), f"{NO_EVENT_ID} {body}")
+        return None
+
+    async def replay(
+        self,
+        tenant_id: UUID,
+        last_event_id: str | None = None,
+        limit: int = 10,
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """
+        Stored messages for a tenant (including global ones), oldest first.
+        With `last_event_id`, everything after it; otherwise the latest `limit`.
+        """
+        client = await self.get_redis()
+        entries: list[tuple[str, dict[str, str]]] = []
+        for stream in (stream_name(tenant_id), stream_name(None)):
+            if last_event_id:
+                entries.extend(await client.xrange(stream, f"({last_event_id}", "+", count=limit))
+            else:
+                entries.extend(reversed(await client.xrevrange(stream, "+", "-", count=limit)))
+
+        entries.sort(key=lambda entry: stream_id_key(entry[0]))
+        entries = entries[:limit] if last_event_id else entries[-limit:]
+
+        replayed = []
+        for event_id, fields in entries:
+            try:
+                replayed.append((event_id, json.loads(fields["data"])))
+            except (KeyError, ValueError):
+                continue
+        return replayed
+
+    # Listening
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                client = await self.get_redis()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(
+                    channel_name(None),
+                    *(channel_name(UUID(tenant)) for tenant in self._tenants),
+                )
+                self._pubsub = pubsub
+                logger.info("WebSocket broker subscribed", tenants=len(self._tenants))
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            await self._dispatch(message["data"])
+                finally:
+                    self._pubsub = None
+                    await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("WebSocket broker listener error, retrying", error=str(e))
+                await asyncio.sleep(5)
+
+    async def _dispatch(self, data: str) -> None:
+        parsed = parse_payload(data)
+        if parsed is None or self._handler is None:
+            return
+        self.received += 1
+        try:
+            await self._handler(*parsed)
+        except Exception as e:
+            logger.error("WebSocket broker delivery failed", error=str(e))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "tenants": len(self._tenants),
+            "published": self.published,
+            "received": self.received,
+        }
@@ -6,16 +6,23 @@ Government-grade Sanctions & Constraint Intelligence Platform
 from contextlib import asynccontextmanager
 
 import structlog
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.database import init_db
+from app.core.identity_cache import identity_cache
+from app.core.job_registry import job_registry
+from app.core.metrics import metrics
+from app.core.websocket import ws_manager
 from app.middleware.rate_limit import RateLimitMiddleware, rate_limiter
-from app.middleware.request_validation import RequestValidationMiddleware
+from app.middleware.request_validation import RequestValidationMiddleware, validation_metrics
 from app.middleware.security import RequestLoggingMiddleware, SecurityHeadersMiddleware
+from app.services.render_service import render_service
+from app.services.template_registry import TemplateRegistry
 
 # Configure structured logging
 structlog.configure(
@@ -50,6 +57,11 @@ async def lifespan(app: FastAPI):
     )
     await init_db()
     logger.info("Database initialized")
+    await identity_cache.start_listener()
+    await ws_manager.start()
+    if settings.TEMPLATE_INDEX_PRELOAD:
+        TemplateRegistry.index()
+        logger.info("Template index built", templates=TemplateRegistry.get_template_count())
 
     yield
 
@@ -57,6 +69,10 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down CORTEX-CI")
     await rate_limiter.close()
     logger.info("Rate limiter closed")
+    await identity_cache.stop_listener()
+    await ws_manager.stop()
+    await job_registry.close()
+    render_service.shutdown()
 
 
 app = FastAPI(
@@ -167,6 +183,17 @@ async def health_check():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus metrics for this worker process."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return PlainTextResponse(
+        metrics.render_prometheus() + validation_metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -5,12 +5,12 @@ Implements sliding window rate limiting with Redis backend.
 
 import hashlib
 import time
-from collections.abc import Callable
 
 import redis.asyncio as redis
 import structlog
 from fastapi import Request, Response, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 
@@ -133,23 +133,34 @@ class RateLimiter:
 rate_limiter = RateLimiter()
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
     Rate limiting middleware for FastAPI.
     """
 
-    def __init__(self, app, limiter: RateLimiter = None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = None):
+        self.app = app
         self.limiter = limiter or rate_limiter
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request with rate limiting."""
-        if not settings.RATE_LIMIT_ENABLED:
-            return await call_next(request)
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
 
         # Skip rate limiting for health checks
-        if request.url.path in ("/health", "/", "/v1/docs", "/v1/redoc", "/v1/openapi.json"):
-            return await call_next(request)
+        if scope["path"] in (
+            "/health",
+            "/metrics",
+            "/",
+            "/v1/docs",
+            "/v1/redoc",
+            "/v1/openapi.json",
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
 
         # Get client identifier
         identifier = self._get_identifier(request)
@@ -169,7 +180,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         )
 
         if is_limited:
-            return Response(
+            response = Response(
                 content='{"detail": "Rate limit exceeded. Please try again later."}',
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 media_type="application/json",
@@ -180,16 +191,20 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "Retry-After": str(info["reset"] - int(time.time())),
                 },
             )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_rate_limit_headers(message: Message) -> None:
+            # Add rate limit headers to response
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(info["limit"])
+                headers["X-RateLimit-Remaining"] = str(info["remaining"])
+                headers["X-RateLimit-Reset"] = str(info["reset"])
+            await send(message)
 
         # Process request
-        response = await call_next(request)
-
-        # Add rate limit headers to response
-        response.headers["X-RateLimit-Limit"] = str(info["limit"])
-        response.headers["X-RateLimit-Remaining"] = str(info["remaining"])
-        response.headers["X-RateLimit-Reset"] = str(info["reset"])
-
-        return response
+        await self.app(scope, receive, send_with_rate_limit_headers)
 
     def _get_identifier(self, request: Request) -> str:
         """Get unique identifier for rate limiting."""
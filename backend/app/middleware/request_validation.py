@@ -4,11 +4,17 @@ Implements input sanitization and validation.
 """
 
 import re
-from collections.abc import Callable
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from time import perf_counter_ns
+from urllib.parse import parse_qsl, unquote_plus
 
 import structlog
-from fastapi import Request, Response, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Response, status
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import _labels
 
 logger = structlog.get_logger()
 
@@ -34,108 +40,249 @@ DANGEROUS_PATTERNS = [
 # Compiled patterns for performance
 COMPILED_PATTERNS = [re.compile(p, re.IGNORECASE) for p in DANGEROUS_PATTERNS]
 
+# All patterns fused into a single alternation so each request is scanned in
+# one pass; the named group that matched identifies the offending pattern.
+COMBINED_PATTERN = re.compile(
+    "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(DANGEROUS_PATTERNS)),
+    re.IGNORECASE,
+)
+
+# Separates the raw request target from its decoded query in the scan view.
+# Neither \w nor \s match it, so no pattern can match across the boundary.
+_VIEW_SEPARATOR = "\x00"
+
 # Maximum sizes
 MAX_BODY_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_URL_LENGTH = 2048
 MAX_HEADER_SIZE = 8192
 
+VALID_CONTENT_TYPES = (
+    "application/json",
+    "application/x-www-form-urlencoded",
+    "multipart/form-data",
+    "text/plain",
+)
+
+
+@dataclass
+class ValidationCheckStats:
+    """Timing and outcome counters for one validation check."""
+
+    calls: int = 0
+    rejected: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "total_ms": round(self.total_ns / 1_000_000, 3),
+            "avg_us": round(self.total_ns / self.calls / 1000, 3) if self.calls else 0.0,
+            "max_us": round(self.max_ns / 1000, 3),
+        }
+
+
+class ValidationMetrics:
+    """
+    Per-check timing metrics for request validation.
+    Process-local; cheap enough to record on every request.
+    """
+
+    def __init__(self):
+        self.checks: dict[str, ValidationCheckStats] = defaultdict(ValidationCheckStats)
+        self.pattern_hits: Counter[str] = Counter()
+
+    def record(self, check: str, elapsed_ns: int, rejected: bool = False) -> None:
+        stats = self.checks[check]
+        stats.calls += 1
+        stats.total_ns += elapsed_ns
+        if elapsed_ns > stats.max_ns:
+            stats.max_ns = elapsed_ns
+        if rejected:
+            stats.rejected += 1
+
+    def record_pattern_hit(self, group_name: str) -> None:
+        self.pattern_hits[DANGEROUS_PATTERNS[int(group_name[1:])]] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "checks": {name: stats.to_dict() for name, stats in self.checks.items()},
+            "pattern_hits": dict(self.pattern_hits),
+        }
+
+    def render_prometheus(self) -> str:
+        """Render the counters in the Prometheus text exposition format."""
+        checks = sorted(self.checks.items())
+        lines: list[str] = []
+        for name, help_text, attr in (
+            ("cortex_request_validation_checks_total", "Validation checks run.", "calls"),
+            ("cortex_request_validation_rejected_total", "Rejections by check.", "rejected"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for check, stats in checks:
+                lines.append(f"{name}{_labels(check=check)} {getattr(stats, attr)}")
+
+        name = "cortex_request_validation_seconds_total"
+        lines.append(f"# HELP {name} Time spent in a validation check.")
+        lines.append(f"# TYPE {name} counter")
+        for check, stats in checks:
+            lines.append(f"{name}{_labels(check=check)} {stats.total_ns / 1e9:.6f}")
+
+        name = "cortex_request_validation_pattern_hits_total"
+        lines.append(f"# HELP {name} Rejections by dangerous pattern.")
+        lines.append(f"# TYPE {name} counter")
+        for pattern, count in sorted(self.pattern_hits.items()):
+            lines.append(f"{name}{_labels(pattern=pattern)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        self.checks.clear()
+        self.pattern_hits.clear()
+
+
+validation_metrics = ValidationMetrics()
+
+
+def build_scan_view(path: str, query_string: str) -> tuple[str, int]:
+    """
+    Build the text scanned for dangerous patterns.
+
+    The view is the request target (path + raw query) followed by the
+    percent-decoded query, so encoded payloads are caught without decoding
+    or stringifying the URL more than once.
+
+    Returns:
+        Tuple of (view, boundary) where matches before `boundary` are in the
+        request target and matches after it are in the decoded query.
+    """
+    if not query_string:
+        return path, len(path)
+    target = f"{path}?{query_string}"
+    return f"{target}{_VIEW_SEPARATOR}{unquote_plus(query_string)}", len(target)
+
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
+def _json_error(detail: str, status_code: int) -> Response:
+    """Build the JSON error response returned for rejected requests."""
+    return Response(
+        content=f'{{"detail": "{detail}"}}',
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+class RequestValidationMiddleware:
     """
     Validate and sanitize incoming requests.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp, metrics: ValidationMetrics | None = None) -> None:
+        self.app = app
+        self.metrics = metrics or validation_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Validate request before processing."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response = self._validate(scope)
+        if response is not None:
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def _validate(self, scope: Scope) -> Response | None:
+        """Return an error response if the request is rejected, else None."""
+        metrics = self.metrics
+        client = scope["client"][0] if scope.get("client") else "unknown"
+        path = scope["path"]
+        query_string = scope.get("query_string", b"").decode("latin-1")
+
         # Check URL length
-        if len(str(request.url)) > MAX_URL_LENGTH:
-            logger.warning("URL too long", path=str(request.url)[:100])
-            return Response(
-                content='{"detail": "URL too long"}',
-                status_code=status.HTTP_414_REQUEST_URI_TOO_LONG,
-                media_type="application/json",
-            )
+        started = perf_counter_ns()
+        url_length = len(path) + (len(query_string) + 1 if query_string else 0)
+        too_long = url_length > MAX_URL_LENGTH
+        metrics.record("url_length", perf_counter_ns() - started, too_long)
+        if too_long:
+            logger.warning("URL too long", path=path[:100])
+            return _json_error("URL too long", status.HTTP_414_REQUEST_URI_TOO_LONG)
 
-        # Check for dangerous patterns in URL
-        url_str = str(request.url)
-        if self._contains_dangerous_pattern(url_str):
+        # Check for dangerous patterns in URL and decoded query parameters
+        started = perf_counter_ns()
+        view, boundary = build_scan_view(path, query_string)
+        match = COMBINED_PATTERN.search(view)
+        metrics.record("dangerous_patterns", perf_counter_ns() - started, match is not None)
+        if match is not None:
+            metrics.record_pattern_hit(match.lastgroup)
+            if match.start() < boundary:
+                logger.warning("Dangerous pattern in URL", path=path, client=client)
+                return _json_error("Invalid request", status.HTTP_400_BAD_REQUEST)
             logger.warning(
-                "Dangerous pattern in URL",
-                path=str(request.url.path),
-                client=request.client.host if request.client else "unknown",
-            )
-            return Response(
-                content='{"detail": "Invalid request"}',
-                status_code=status.HTTP_400_BAD_REQUEST,
-                media_type="application/json",
+                "Dangerous pattern in query params",
+                param=self._offending_param(query_string),
+                client=client,
             )
+            return _json_error("Invalid request parameters", status.HTTP_400_BAD_REQUEST)
 
-        # Check query parameters
-        for key, value in request.query_params.items():
-            if self._contains_dangerous_pattern(f"{key}={value}"):
-                logger.warning(
-                    "Dangerous pattern in query params",
-                    param=key,
-                    client=request.client.host if request.client else "unknown",
-                )
-                return Response(
-                    content='{"detail": "Invalid request parameters"}',
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    media_type="application/json",
-                )
+        headers = Headers(scope=scope)
 
         # Check Content-Length header
-        content_length = request.headers.get("Content-Length")
+        content_length = headers.get("Content-Length")
         if content_length:
+            started = perf_counter_ns()
             try:
-                if int(content_length) > MAX_BODY_SIZE:
-                    logger.warning(
-                        "Request body too large",
-                        size=content_length,
-                        client=request.client.host if request.client else "unknown",
-                    )
-                    return Response(
-                        content='{"detail": "Request body too large"}',
-                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        media_type="application/json",
-                    )
+                too_large = int(content_length) > MAX_BODY_SIZE
             except ValueError:
-                pass
-
-        # Validate Content-Type for POST/PUT/PATCH
-        if request.method in ("POST", "PUT", "PATCH"):
-            content_type = request.headers.get("Content-Type", "")
-            if content_type and not self._is_valid_content_type(content_type):
+                too_large = False
+            metrics.record("content_length", perf_counter_ns() - started, too_large)
+            if too_large:
                 logger.warning(
-                    "Invalid content type",
-                    content_type=content_type,
-                    client=request.client.host if request.client else "unknown",
+                    "Request body too large",
+                    size=content_length,
+                    client=client,
                 )
-                return Response(
-                    content='{"detail": "Invalid content type"}',
-                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                    media_type="application/json",
+                return _json_error(
+                    "Request body too large", status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
                 )
 
-        return await call_next(request)
+        # Validate Content-Type for POST/PUT/PATCH
+        if scope["method"] in ("POST", "PUT", "PATCH"):
+            content_type = headers.get("Content-Type", "")
+            if content_type:
+                started = perf_counter_ns()
+                invalid = not self._is_valid_content_type(content_type)
+                metrics.record("content_type", perf_counter_ns() - started, invalid)
+                if invalid:
+                    logger.warning(
+                        "Invalid content type",
+                        content_type=content_type,
+                        client=client,
+                    )
+                    return _json_error(
+                        "Invalid content type", status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+                    )
+
+        return None
 
     def _contains_dangerous_pattern(self, text: str) -> bool:
         """Check if text contains dangerous patterns."""
-        for pattern in COMPILED_PATTERNS:
-            if pattern.search(text):
-                return True
-        return False
+        return COMBINED_PATTERN.search(text) is not None
+
+    def _offending_param(self, query_string: str) -> str | None:
+        """Find the first query parameter containing a dangerous pattern (for logging)."""
+        for key, value in parse_qsl(query_string, keep_blank_values=True):
+            if self._contains_dangerous_pattern(f"{key}={value}"):
+                return key
+        return None
 
     def _is_valid_content_type(self, content_type: str) -> bool:
         """Check if content type is valid."""
-        valid_types = [
-            "application/json",
-            "application/x-www-form-urlencoded",
-            "multipart/form-data",
-            "text/plain",
-        ]
-        for valid in valid_types:
-            if valid in content_type.lower():
+        content_type = content_type.lower()
+        for valid in VALID_CONTENT_TYPES:
+            if valid in content_type:
                 return True
         return False
 
@@ -1,126 +1,187 @@
 """
 Security Headers Middleware (Phase 3)
 Implements security headers for XSS, clickjacking, and content type protection.
+
+Both middlewares are pure ASGI: they hook the ``http.response.start`` message
+instead of wrapping the response in a BaseHTTPMiddleware task/stream, so
+streaming responses pass through untouched.
 """
 
-from collections.abc import Callable
+import time
 
 import structlog
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
+from app.core.metrics import end_request, metrics, route_label, start_request
+from app.core.query_detector import query_detector
 
 logger = structlog.get_logger()
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# Content Security Policy
+CSP_DIRECTIVES = [
+    "default-src 'self'",
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'",
+    "style-src 'self' 'unsafe-inline'",
+    "img-src 'self' data: https:",
+    "font-src 'self' data:",
+    "connect-src 'self' ws: wss:",
+    "frame-ancestors 'self'",
+    "base-uri 'self'",
+    "form-action 'self'",
+]
+
+# Permissions policy
+PERMISSIONS_POLICY = [
+    "accelerometer=()",
+    "camera=()",
+    "geolocation=()",
+    "gyroscope=()",
+    "magnetometer=()",
+    "microphone=()",
+    "payment=()",
+    "usb=()",
+]
+
+# Headers added to every response (built once at import time)
+SECURITY_HEADERS: list[tuple[str, str]] = [
+    ("Content-Security-Policy", "; ".join(CSP_DIRECTIVES)),
+    # Prevent XSS attacks
+    ("X-XSS-Protection", "1; mode=block"),
+    # Prevent MIME type sniffing
+    ("X-Content-Type-Options", "nosniff"),
+    # Prevent clickjacking
+    ("X-Frame-Options", "SAMEORIGIN"),
+    # Referrer policy
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    ("Permissions-Policy", ", ".join(PERMISSIONS_POLICY)),
+]
+
+HSTS_HEADER = ("Strict-Transport-Security", "max-age=31536000; includeSubDomains; preload")
+
+# Cache control for sensitive data
+NO_STORE_HEADERS: list[tuple[str, str]] = [
+    ("Cache-Control", "no-store, no-cache, must-revalidate, private"),
+    ("Pragma", "no-cache"),
+    ("Expires", "0"),
+]
+
+
+def get_client_ip(headers: Headers, scope: Scope) -> str:
+    """Resolve the client IP, honouring X-Forwarded-For."""
+    forwarded = headers.get("X-Forwarded-For")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class SecurityHeadersMiddleware:
     """
     Add security headers to all responses.
     Implements OWASP recommended security headers.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Add security headers to response."""
-        response = await call_next(request)
-
-        # Content Security Policy
-        csp_directives = [
-            "default-src 'self'",
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'",
-            "style-src 'self' 'unsafe-inline'",
-            "img-src 'self' data: https:",
-            "font-src 'self' data:",
-            "connect-src 'self' ws: wss:",
-            "frame-ancestors 'self'",
-            "base-uri 'self'",
-            "form-action 'self'",
-        ]
-        response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
-
-        # Prevent XSS attacks
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "SAMEORIGIN"
-
-        # Referrer policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Permissions policy
-        permissions = [
-            "accelerometer=()",
-            "camera=()",
-            "geolocation=()",
-            "gyroscope=()",
-            "magnetometer=()",
-            "microphone=()",
-            "payment=()",
-            "usb=()",
-        ]
-        response.headers["Permissions-Policy"] = ", ".join(permissions)
-
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.headers = list(SECURITY_HEADERS)
         # HSTS in production
         if settings.is_production():
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains; preload"
-            )
+            self.headers.append(HSTS_HEADER)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Add security headers to response."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        no_store = "/auth" in path or "/admin" in path
 
-        # Cache control for sensitive data
-        if "/auth" in request.url.path or "/admin" in request.url.path:
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self.headers:
+                    headers[name] = value
+                if no_store:
+                    for name, value in NO_STORE_HEADERS:
+                        headers[name] = value
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_headers)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
     Log all requests with security-relevant information.
+    Also records per-request performance metrics (latency, DB queries,
+    cache hits, external call time) in the metrics registry and, when
+    enabled, checks the request for repeated (N+1) queries.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Log request and response details."""
-        import time
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Get client info
-        forwarded = request.headers.get("X-Forwarded-For")
-        client_ip = (
-            forwarded.split(",")[0].strip()
-            if forwarded
-            else (request.client.host if request.client else "unknown")
-        )
+        headers = Headers(scope=scope)
+        client_ip = get_client_ip(headers, scope)
+        method = scope["method"]
+        path = scope["path"]
 
         # Log request
         logger.info(
             "Request started",
-            method=request.method,
-            path=request.url.path,
+            method=method,
+            path=path,
             client_ip=client_ip,
-            user_agent=request.headers.get("User-Agent", "unknown")[:100],
+            user_agent=headers.get("User-Agent", "unknown")[:100],
         )
 
-        # Process request
-        response = await call_next(request)
+        status_code = 500
 
-        # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Process request
+        stats, token = start_request()
+        detector_scope = None
+        if query_detector.enabled:
+            detector_scope, detector_token = query_detector.start(f"{method} {path}")
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            end_request(token)
+            if detector_scope is not None:
+                # The response is already sent: findings are logged, not raised
+                detector_scope.label = f"{method} {route_label(scope)}"
+                query_detector.finish(detector_scope, detector_token)
+            duration = time.perf_counter() - start_time
+            metrics.observe_request(method, route_label(scope), status_code, duration, stats)
 
         # Log response
-        log_level = "warning" if response.status_code >= 400 else "info"
+        log_level = "warning" if status_code >= 400 else "info"
         getattr(logger, log_level)(
             "Request completed",
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
-            duration_ms=round(duration_ms, 2),
+            method=method,
+            path=path,
+            status_code=status_code,
+            duration_ms=round(duration * 1000, 2),
+            db_queries=stats.db_queries,
+            db_time_ms=round(stats.db_time * 1000, 2),
+            cache_hits=stats.cache_hits,
+            external_ms=round(stats.external_time * 1000, 2),
             client_ip=client_ip,
         )
-
-        return response
@@ -29,6 +29,7 @@ from app.models.compliance import (
     CaseStatus,
     CaseTask,
     CaseType,
+    ComplianceGap,
     ContractStatus,
     Control,
     ControlCategory,
@@ -119,6 +120,8 @@ from app.models.compliance import (
     RuTaskPriority,
     RuTaskStatus,
     RuCompanyProfile,
+    RuCompanyHierarchy,
+    RuCompanyRollup,
     RuResponsiblePerson,
     RuISPDN,
     RuComplianceDocument,
@@ -194,6 +197,7 @@ __all__ = [
     "Assessment",
     "AssessmentStatus",
     "AssessmentResult",
+    "ComplianceGap",
     # Phase 3: Compliance Platform - Customers
     "Customer",
     "CustomerType",
@@ -293,6 +297,8 @@ __all__ = [
     "RuTaskPriority",
     "RuTaskStatus",
     "RuCompanyProfile",
+    "RuCompanyHierarchy",
+    "RuCompanyRollup",
     "RuResponsiblePerson",
     "RuISPDN",
     "RuComplianceDocument",
@@ -9,7 +9,7 @@ from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
-from app.models.base import TenantMixin
+from app.models.base import TenantMixin, partitioned_by_month
 
 
 class AuditAction(str, Enum):
@@ -79,6 +79,8 @@ class AuditLog(Base, TenantMixin):
     """Immutable audit log for all actions in the system."""
 
     __tablename__ = "audit_log"
+    # Monthly partitions; the primary key includes the partition key
+    __table_args__ = partitioned_by_month("created_at")
 
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
 
@@ -86,7 +88,7 @@ class AuditLog(Base, TenantMixin):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(UTC),
-        nullable=False,
+        primary_key=True,
         index=True,
     )
 
@@ -127,6 +129,8 @@ class AuditLog(Base, TenantMixin):
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
 
+    __mapper_args__ = {"primary_key": [id]}
+
     def __repr__(self) -> str:
         return f"<AuditLog {self.action.value} by {self.user_email} at {self.created_at}>"
 
@@ -1,11 +1,34 @@
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Table, event, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 
+def partitioned_by_month(column: str) -> dict:
+    """
+    Table options for native range partitioning by month on `column`.
+
+    The column must be part of the primary key. Monthly partitions are created
+    ahead of time by app.core.partitions; a DEFAULT partition, created along
+    with the table, catches rows outside them.
+    """
+    return {"postgresql_partition_by": f"RANGE ({column})"}
+
+
+@event.listens_for(Table, "after_create")
+def _create_default_partition(table: Table, connection, **kwargs) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    if table.dialect_options["postgresql"].get("partition_by"):
+        connection.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{table.name}_default" PARTITION OF "{table.name}" DEFAULT'
+            )
+        )
+
+
 class TimestampMixin:
     """Mixin for created_at and updated_at timestamps."""
 
@@ -43,6 +43,7 @@ from app.models.compliance.framework import (
     Assessment,
     AssessmentResult,
     AssessmentStatus,
+    ComplianceGap,
     Control,
     ControlCategory,
     ControlMapping,
@@ -118,7 +119,9 @@ from app.models.compliance.russian import (
     KIICategory,
     ProtectionLevel,
     ResponsibleRole,
+    RuCompanyHierarchy,
     RuCompanyProfile,
+    RuCompanyRollup,
     RuComplianceDocument,
     RuComplianceTask,
     RuDocumentTemplate,
@@ -151,6 +154,7 @@ __all__ = [
     "Assessment",
     "AssessmentStatus",
     "AssessmentResult",
+    "ComplianceGap",
     # Customers
     "Customer",
     "CustomerType",
@@ -250,6 +254,8 @@ __all__ = [
     "RuTaskPriority",
     "RuTaskStatus",
     "RuCompanyProfile",
+    "RuCompanyHierarchy",
+    "RuCompanyRollup",
     "RuResponsiblePerson",
     "RuISPDN",
     "RuComplianceDocument",
@@ -3,11 +3,23 @@ Regulatory Framework Models
 Supports: NIST 800-53, NIST CSF, ISO 27001, SOC 2, PCI-DSS, HIPAA, GDPR, CIS Controls, MITRE ATT&CK
 """
 
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, Date, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -309,3 +321,57 @@ class Assessment(Base, TimestampMixin, TenantMixin):
 
     # Relationships
     framework = relationship("Framework", back_populates="assessments")
+
+
+class ComplianceGap(Base, TenantMixin):
+    """
+    Maintained gap index: one row per control that is not fully implemented,
+    with its severity precomputed (see app.services.compliance_gaps).
+    Rows are refreshed in the transaction that changes their control,
+    framework or evidence links.
+    """
+
+    __tablename__ = "compliance_gaps"
+    __table_args__ = (
+        # Keyset pagination in (severity, priority, control) order, per tenant and per framework
+        Index(
+            "ix_compliance_gaps_tenant_order",
+            "tenant_id",
+            "severity_rank",
+            "priority",
+            "control_ref",
+            "control_id",
+        ),
+        Index(
+            "ix_compliance_gaps_framework_order",
+            "tenant_id",
+            "framework_id",
+            "severity_rank",
+            "priority",
+            "control_ref",
+            "control_id",
+        ),
+    )
+
+    control_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("controls.id", ondelete="CASCADE"), primary_key=True
+    )
+    framework_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("frameworks.id", ondelete="CASCADE"), nullable=False
+    )
+
+    # Denormalized control and framework fields shown in gap listings
+    control_ref: Mapped[str] = mapped_column(String(50), nullable=False)  # Control.control_id
+    control_title: Mapped[str] = mapped_column(String(500), nullable=False)
+    framework_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    category: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    status: Mapped[str] = mapped_column(String(50), nullable=False)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    severity: Mapped[str] = mapped_column(String(20), nullable=False)
+    severity_rank: Mapped[int] = mapped_column(SmallInteger, nullable=False)  # 0 = CRITICAL
+    evidence_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
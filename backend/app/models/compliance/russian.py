@@ -154,6 +154,14 @@ class RuCompanyProfile(Base, TimestampMixin, TenantMixin):
 
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
 
+    # Holding structure: the parent company of a subsidiary
+    parent_id: Mapped[UUID | None] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("ru_company_profiles.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+
     # Primary identifiers (auto-filled from EGRUL)
     inn: Mapped[str] = mapped_column(String(12), nullable=False, unique=True, index=True)
     kpp: Mapped[str | None] = mapped_column(String(9), nullable=True)
@@ -225,6 +233,57 @@ class RuCompanyProfile(Base, TimestampMixin, TenantMixin):
     )
 
 
+class RuCompanyHierarchy(Base):
+    """
+    Closure table of the holding structure: one row per (ancestor,
+    descendant) pair, with every company its own ancestor at depth 0.
+    Maintained by app.services.company_hierarchy.
+    """
+
+    __tablename__ = "ru_company_hierarchy"
+
+    ancestor_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("ru_company_profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    descendant_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("ru_company_profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class RuCompanyRollup(Base, TenantMixin):
+    """
+    Document counts of a company and of its whole subtree (the company and
+    all its subsidiaries), kept current incrementally so the consolidated
+    compliance of a holding is a single row read.
+    Maintained by app.services.company_hierarchy.
+    """
+
+    __tablename__ = "ru_company_rollups"
+
+    company_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("ru_company_profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # The company's own documents
+    documents_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    documents_approved: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # The company and all its subsidiaries
+    subtree_documents_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    subtree_documents_approved: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    subtree_companies: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
 # ============================================================================
 # RESPONSIBLE PERSONS
 # ============================================================================
@@ -9,7 +9,7 @@ from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
-from app.models.base import TenantMixin, TimestampMixin
+from app.models.base import TenantMixin, TimestampMixin, partitioned_by_month
 
 
 class RiskLevel(str, Enum):
@@ -60,6 +60,8 @@ class RiskScore(Base, TimestampMixin, TenantMixin):
     """Calculated risk score for an entity."""
 
     __tablename__ = "risk_scores"
+    # Monthly partitions; the primary key includes the partition key
+    __table_args__ = partitioned_by_month("calculated_at")
 
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
 
@@ -90,7 +92,7 @@ class RiskScore(Base, TimestampMixin, TenantMixin):
     calculated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(UTC),
-        nullable=False,
+        primary_key=True,
     )
     calculation_version: Mapped[str] = mapped_column(String(50), default="1.0", nullable=False)
 
@@ -101,6 +103,8 @@ class RiskScore(Base, TimestampMixin, TenantMixin):
     # Relationships
     entity = relationship("Entity", back_populates="risk_scores")
 
+    __mapper_args__ = {"primary_key": [id]}
+
     def __repr__(self) -> str:
         return f"<RiskScore {self.entity_id}: {self.score} ({self.level.value})>"
 
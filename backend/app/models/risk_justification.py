@@ -34,11 +34,8 @@ class RiskJustification(Base, TimestampMixin, TenantMixin):
         nullable=False,
         index=True,
     )
-    risk_score_id: Mapped[UUID | None] = mapped_column(
-        PGUUID(as_uuid=True),
-        ForeignKey("risk_scores.id", ondelete="SET NULL"),
-        nullable=True,
-    )
+    # No foreign key: risk_scores is partitioned, so `id` alone is not unique there
+    risk_score_id: Mapped[UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
 
     # The score being justified
     risk_score: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
@@ -77,7 +74,10 @@ class RiskJustification(Base, TimestampMixin, TenantMixin):
 
     # Relationships
     entity: Mapped[Entity] = relationship("Entity")
-    risk_score_obj: Mapped[RiskScore | None] = relationship("RiskScore")
+    risk_score_obj: Mapped[RiskScore | None] = relationship(
+        "RiskScore",
+        primaryjoin="foreign(RiskJustification.risk_score_id) == RiskScore.id",
+    )
 
     def __repr__(self) -> str:
         return f"<RiskJustification entity={self.entity_id} score={self.risk_score}>"
@@ -95,3 +95,29 @@ class EntityBulkImportResponse(BaseModel):
     imported: int
     skipped: int
     errors: list[dict[str, Any]]
+
+
+class EntityBulkUpdateRequest(BaseModel):
+    """Apply the same changes to many entities."""
+
+    entity_ids: list[UUID] = Field(..., min_length=1)
+    updates: EntityUpdate
+
+
+class EntityPatch(EntityUpdate):
+    """Changes for a single entity in a bulk patch."""
+
+    id: UUID
+
+
+class EntityBulkPatchRequest(BaseModel):
+    """Apply different changes to each entity."""
+
+    patches: list[EntityPatch] = Field(..., min_length=1)
+
+
+class EntityBulkDeleteRequest(BaseModel):
+    """Delete (or deactivate) many entities."""
+
+    entity_ids: list[UUID] = Field(..., min_length=1)
+    soft_delete: bool = True
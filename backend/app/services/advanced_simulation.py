@@ -1,21 +1,27 @@
 """
 Advanced Simulation Engine (Phase 5.1)
 Monte Carlo simulations, what-if analysis, cascade modeling.
+
+Runs are tracked in the shared job registry (kind `simulation.<type>`), so
+their status is visible from every worker. Monte Carlo runs always use a
+recorded seed; an interrupted run is resumed by re-running it with the same
+seed and parameters under the same id, which reproduces the same result.
 """
 
 import asyncio
 import random
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
 from uuid import UUID, uuid4
 
-import numpy as np
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import AsyncSessionLocal
+from app.core.job_registry import JobRecord, JobStatus, as_utc, job_registry
 from app.models import Constraint, Dependency, Entity
 
 logger = structlog.get_logger()
@@ -58,6 +64,9 @@ class SimulationResult:
     cascade_paths: list[list[str]] = field(default_factory=list)
     confidence_interval: dict[str, float] = field(default_factory=dict)
     errors: list[str] = field(default_factory=list)
+    tenant_id: UUID | None = None
+    # Parameters needed to run the simulation again (Monte Carlo resume)
+    params: dict[str, Any] = field(default_factory=dict)
 
     @property
     def progress(self) -> float:
@@ -86,6 +95,32 @@ class SimulationResult:
             ),
         }
 
+    @property
+    def finished(self) -> bool:
+        return self.status in (
+            SimulationStatus.COMPLETED,
+            SimulationStatus.FAILED,
+            SimulationStatus.CANCELLED,
+        )
+
+    def to_job_record(self) -> JobRecord:
+        """Registry snapshot; the full result is stored once the run has finished."""
+        return JobRecord(
+            job_id=self.simulation_id,
+            kind=f"simulation.{self.simulation_type.value}",
+            status=JobStatus(self.status.value),
+            tenant_id=str(self.tenant_id) if self.tenant_id else None,
+            total=self.total_iterations,
+            processed=self.iterations,
+            succeeded=self.iterations,
+            started_at=self.started_at,
+            completed_at=self.completed_at,
+            checkpoint={"iterations": self.iterations},
+            params=self.params,
+            errors=[{"error": error} for error in self.errors],
+            result=self.to_dict() if self.finished else None,
+        )
+
 
 @dataclass
 class MonteCarloConfig:
@@ -114,8 +149,12 @@ class AdvancedSimulationEngine:
     """
 
     def __init__(self):
+        # Runs started on this worker; other workers' are in the job registry
         self._simulations: dict[str, SimulationResult] = {}
+        self._max_local_simulations = 100
         self._running_tasks: dict[str, asyncio.Task] = {}
+        # Registry updates per Monte Carlo run
+        self._checkpoints_per_run = 20
 
     async def run_monte_carlo(
         self,
@@ -123,6 +162,7 @@ class AdvancedSimulationEngine:
         tenant_id: UUID,
         entity_ids: list[UUID] | None = None,
         config: MonteCarloConfig | None = None,
+        simulation_id: str | None = None,
     ) -> SimulationResult:
         """
         Run Monte Carlo simulation for risk score distribution.
@@ -132,24 +172,35 @@ class AdvancedSimulationEngine:
             tenant_id: Tenant ID
             entity_ids: Specific entities to simulate (all if None)
             config: Simulation configuration
+            simulation_id: Id to run under (when resuming an interrupted run)
 
         Returns:
             SimulationResult with probabilistic outcomes
         """
+        import numpy as np
+
         config = config or MonteCarloConfig()
-        if config.seed:
-            np.random.seed(config.seed)
-            random.seed(config.seed)
+        # Always seeded, so an interrupted run can be reproduced exactly
+        seed = config.seed if config.seed is not None else random.randrange(2**32)
+        np.random.seed(seed)
+        random.seed(seed)
 
-        simulation_id = str(uuid4())
+        simulation_id = simulation_id or str(uuid4())
         result = SimulationResult(
             simulation_id=simulation_id,
             simulation_type=SimulationType.MONTE_CARLO,
             status=SimulationStatus.RUNNING,
             started_at=datetime.utcnow(),
             total_iterations=config.iterations,
+            params={
+                "entity_ids": [str(entity_id) for entity_id in entity_ids or []],
+                "iterations": config.iterations,
+                "confidence_level": config.confidence_level,
+                "risk_volatility": config.risk_volatility,
+                "seed": seed,
+            },
         )
-        self._simulations[simulation_id] = result
+        await self._register(result, tenant_id)
 
         try:
             # Get entities
@@ -167,9 +218,11 @@ class AdvancedSimulationEngine:
                 result.status = SimulationStatus.COMPLETED
                 result.completed_at = datetime.utcnow()
                 result.results = {"message": "No entities to simulate"}
+                await self._track(result)
                 return result
 
             # Run Monte Carlo iterations
+            checkpoint_every = max(config.iterations // self._checkpoints_per_run, 1)
             risk_distributions: dict[str, list[float]] = {str(e.id): [] for e in entities}
             portfolio_scores: list[float] = []
 
@@ -185,6 +238,10 @@ class AdvancedSimulationEngine:
 
                 portfolio_scores.append(np.mean(iteration_scores))
                 result.iterations = i + 1
+                if result.iterations % checkpoint_every == 0:
+                    await self._track(result)
+                    if result.status == SimulationStatus.CANCELLED:
+                        return result
 
             # Calculate statistics
             entity_stats = {}
@@ -253,6 +310,7 @@ class AdvancedSimulationEngine:
             result.errors.append(str(e))
             result.completed_at = datetime.utcnow()
 
+        await self._track(result)
         return result
 
     async def run_cascade_analysis(
@@ -281,7 +339,7 @@ class AdvancedSimulationEngine:
             status=SimulationStatus.RUNNING,
             started_at=datetime.utcnow(),
         )
-        self._simulations[simulation_id] = result
+        await self._register(result, tenant_id)
 
         try:
             # Get trigger entity
@@ -408,6 +466,7 @@ class AdvancedSimulationEngine:
             result.errors.append(str(e))
             result.completed_at = datetime.utcnow()
 
+        await self._track(result)
         return result
 
     async def run_what_if_analysis(
@@ -434,7 +493,7 @@ class AdvancedSimulationEngine:
             status=SimulationStatus.RUNNING,
             started_at=datetime.utcnow(),
         )
-        self._simulations[simulation_id] = result
+        await self._register(result, tenant_id)
 
         try:
             # Get current state
@@ -564,6 +623,7 @@ class AdvancedSimulationEngine:
             result.errors.append(str(e))
             result.completed_at = datetime.utcnow()
 
+        await self._track(result)
         return result
 
     async def run_stress_test(
@@ -583,6 +643,8 @@ class AdvancedSimulationEngine:
         Returns:
             SimulationResult with stress test outcomes
         """
+        import numpy as np
+
         simulation_id = str(uuid4())
         result = SimulationResult(
             simulation_id=simulation_id,
@@ -590,7 +652,7 @@ class AdvancedSimulationEngine:
             status=SimulationStatus.RUNNING,
             started_at=datetime.utcnow(),
         )
-        self._simulations[simulation_id] = result
+        await self._register(result, tenant_id)
 
         default_scenarios = stress_scenarios or [
             "regulatory_crackdown",
@@ -673,6 +735,7 @@ class AdvancedSimulationEngine:
             result.errors.append(str(e))
             result.completed_at = datetime.utcnow()
 
+        await self._track(result)
         return result
 
     def _get_stress_config(self, scenario_name: str) -> dict[str, Any]:
@@ -711,6 +774,8 @@ class AdvancedSimulationEngine:
 
     def _calculate_resilience(self, scenario_results: dict[str, dict]) -> dict[str, Any]:
         """Calculate overall resilience score from stress test results."""
+        import numpy as np
+
         critical_counts = [r["entities_at_critical"] for r in scenario_results.values()]
         high_risk_counts = [r["entities_at_high_risk"] for r in scenario_results.values()]
 
@@ -745,36 +810,118 @@ class AdvancedSimulationEngine:
         else:
             return "NEUTRAL: Minimal impact on overall risk profile."
 
+    async def resume_monte_carlo(self, db: AsyncSession, job: JobRecord) -> SimulationResult:
+        """Re-run an interrupted Monte Carlo simulation from its recorded parameters."""
+        if job.kind != f"simulation.{SimulationType.MONTE_CARLO.value}" or not job.params:
+            raise ValueError(f"Simulation {job.job_id} cannot be resumed")
+        params = job.params
+        return await self.run_monte_carlo(
+            db,
+            UUID(job.tenant_id),
+            entity_ids=[UUID(entity_id) for entity_id in params["entity_ids"]] or None,
+            config=MonteCarloConfig(
+                iterations=params["iterations"],
+                confidence_level=params["confidence_level"],
+                risk_volatility=params["risk_volatility"],
+                seed=params["seed"],
+            ),
+            simulation_id=job.job_id,
+        )
+
+    def resume_in_background(self, job: JobRecord) -> None:
+        """Start `resume_monte_carlo` as a task with its own database session."""
+        if job.job_id in self._running_tasks:
+            raise ValueError(f"Simulation {job.job_id} is already running")
+
+        async def runner():
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.resume_monte_carlo(db, job)
+            finally:
+                self._running_tasks.pop(job.job_id, None)
+
+        self._running_tasks[job.job_id] = asyncio.create_task(runner())
+
+    async def _register(self, result: SimulationResult, tenant_id: UUID) -> None:
+        """Track a new run locally (bounded) and in the job registry."""
+        result.tenant_id = tenant_id
+        self._simulations[result.simulation_id] = result
+        excess = len(self._simulations) - self._max_local_simulations
+        if excess > 0:
+            finished = sorted(
+                (s for s in self._simulations.values() if s.finished),
+                key=lambda s: s.started_at,
+            )
+            for old in finished[:excess]:
+                del self._simulations[old.simulation_id]
+        await self._track(result)
+
+    async def _track(self, result: SimulationResult) -> None:
+        if not result.finished:
+            # Cancelled through another worker
+            job = await job_registry.get(result.simulation_id)
+            if job is not None and job.status == JobStatus.CANCELLED:
+                result.status = SimulationStatus.CANCELLED
+                result.completed_at = datetime.utcnow()
+        await job_registry.save(result.to_job_record())
+        # Let status requests and cancellation in between long runs
+        await asyncio.sleep(0)
+
     def get_simulation(self, simulation_id: str) -> SimulationResult | None:
-        """Get simulation result by ID."""
+        """Get simulation result by ID (runs started on this worker)."""
         return self._simulations.get(simulation_id)
 
-    def list_simulations(
+    async def list_simulations(
         self,
+        tenant_id: UUID,
         limit: int = 20,
         simulation_type: SimulationType | None = None,
     ) -> list[dict[str, Any]]:
-        """List recent simulations."""
-        simulations = list(self._simulations.values())
-
-        if simulation_type:
-            simulations = [s for s in simulations if s.simulation_type == simulation_type]
-
-        simulations.sort(key=lambda x: x.started_at, reverse=True)
-        return [s.to_dict() for s in simulations[:limit]]
+        """List a tenant's recent simulations, including runs on other workers."""
+        local = {
+            s.simulation_id: s
+            for s in self._simulations.values()
+            if s.tenant_id == tenant_id
+            and (simulation_type is None or s.simulation_type == simulation_type)
+        }
+        kind = f"simulation.{simulation_type.value}" if simulation_type else "simulation"
+        runs = [(as_utc(s.started_at), s.to_dict()) for s in local.values()]
+        for job in await job_registry.recent(tenant_id=tenant_id, kind=kind, limit=limit):
+            if job.job_id not in local:
+                runs.append((job.started_at, job.result or job.to_dict(include_result=False)))
 
-    async def cancel_simulation(self, simulation_id: str) -> bool:
-        """Cancel a running simulation."""
-        if simulation_id in self._running_tasks:
-            self._running_tasks[simulation_id].cancel()
-            del self._running_tasks[simulation_id]
+        runs.sort(key=lambda run: run[0] or datetime.min.replace(tzinfo=UTC), reverse=True)
+        return [data for _, data in runs[:limit]]
 
-        if simulation_id in self._simulations:
-            self._simulations[simulation_id].status = SimulationStatus.CANCELLED
-            self._simulations[simulation_id].completed_at = datetime.utcnow()
+    async def cancel_simulation(self, simulation_id: str, tenant_id: UUID) -> bool:
+        """
+        Cancel a tenant's running simulation. A run on another worker is marked
+        cancelled in the job registry and stops at its next progress update.
+        """
+        simulation = self._simulations.get(simulation_id)
+        if simulation is not None:
+            if simulation.tenant_id != tenant_id:
+                return False
+            if simulation_id in self._running_tasks:
+                self._running_tasks[simulation_id].cancel()
+                del self._running_tasks[simulation_id]
+            simulation.status = SimulationStatus.CANCELLED
+            simulation.completed_at = datetime.utcnow()
+            await self._track(simulation)
             return True
 
-        return False
+        job = await job_registry.get(simulation_id)
+        if (
+            job is None
+            or not job.kind.startswith("simulation.")
+            or job.tenant_id != str(tenant_id)
+            or job.finished
+        ):
+            return False
+        job.status = JobStatus.CANCELLED
+        job.completed_at = datetime.now(UTC)
+        await job_registry.save(job)
+        return True
 
 
 # Global instance
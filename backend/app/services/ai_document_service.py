@@ -1,8 +1,8 @@
 """AI-powered document generation service for Russian compliance."""
 
 from typing import Optional
-import httpx
 from app.core.config import settings
+from app.core.metrics import external_http_client
 
 
 class AIDocumentService:
@@ -107,7 +107,7 @@ The document must be in formal Russian legal language and comply with {framework
         }
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with external_http_client(timeout=60.0) as client:
                 response = await client.post(
                     f"https://api-inference.huggingface.co/models/{self.hf_model}",
                     headers=headers,
@@ -132,7 +132,7 @@ The document must be in formal Russian legal language and comply with {framework
         }
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            async with external_http_client(timeout=120.0) as client:
                 response = await client.post(
                     f"{self.ollama_url}/api/generate",
                     json=payload,
@@ -1,23 +1,71 @@
 """
 Audit Log Archival Service (Phase 3.7)
 Implements audit log archival, retention, and export functionality.
+
+Archives are gzipped NDJSON files, one per day (and tenant, when archiving a
+single tenant), written incrementally so archival runs in constant memory.
+Each archive has a sidecar block index (see audit_archive_index), which lets
+search_logs query archived logs alongside the live table.
 """
 
-import gzip
+import asyncio
 import json
-from datetime import datetime, timedelta
+import os
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime, time, timedelta
 from pathlib import Path
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import structlog
 from sqlalchemy import and_, delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import AsyncSessionLocal
+from app.core.job_registry import JobRecord, JobStatus, job_registry
+from app.core.partitions import (
+    add_months,
+    drop_partition,
+    is_partitioned,
+    list_partitions,
+    month_start,
+)
 from app.models.audit import AuditAction, AuditLog
+from app.services.audit_archive_index import (
+    ARCHIVE_GLOB,
+    DEFAULT_BLOCK_RECORDS,
+    ArchiveCatalog,
+    ArchiveQuery,
+    ArchiveWriter,
+    index_path,
+    sort_key,
+)
 
 logger = structlog.get_logger()
 
+ARCHIVE_JOB_KIND = "audit.archive"
+
+AUDIT_TABLE = AuditLog.__tablename__
+
+# Columns kept in archive files (see _serialize_log)
+ARCHIVE_COLUMNS = [
+    AuditLog.id,
+    AuditLog.created_at,
+    AuditLog.tenant_id,
+    AuditLog.user_id,
+    AuditLog.user_email,
+    AuditLog.user_role,
+    AuditLog.action,
+    AuditLog.resource_type,
+    AuditLog.resource_id,
+    AuditLog.resource_name,
+    AuditLog.description,
+    AuditLog.success,
+    AuditLog.error_message,
+    AuditLog.ip_address,
+    AuditLog.changes,
+]
+
 
 class AuditArchivalService:
     """
@@ -30,85 +78,289 @@ class AuditArchivalService:
         archive_path: str | None = None,
         retention_days: int = 90,
         archive_after_days: int = 30,
+        batch_size: int = 5000,
+        delete_batch_size: int = 10000,
+        block_records: int = DEFAULT_BLOCK_RECORDS,
     ):
         self.archive_path = Path(archive_path or "/var/cortex-ci/audit-archives")
         self.retention_days = retention_days
         self.archive_after_days = archive_after_days
+        self.batch_size = batch_size
+        self.delete_batch_size = delete_batch_size
+        self.block_records = block_records
+        self.archive_index = ArchiveCatalog(self.archive_path)
+        self._running_tasks: dict[str, asyncio.Task] = {}
 
     async def archive_old_logs(
         self,
         db: AsyncSession,
         tenant_id: UUID | None = None,
         force: bool = False,
+        job_id: str | None = None,
     ) -> dict[str, Any]:
         """
         Archive audit logs older than archive_after_days.
 
+        Works one day at a time, oldest first: the day's rows are streamed
+        from a server-side cursor into an NDJSON.gz file, which is fsynced and
+        renamed into place before the rows are deleted in bounded batches.
+        Only whole days are archived, so each day ends up in a single file.
+        When archiving all tenants, months that lie entirely before the cutoff
+        are removed by dropping their audit_log partition once written.
+        Progress is checkpointed in the job registry; passing the `job_id` of
+        an interrupted or failed run continues where it stopped.
+
         Args:
             db: Database session
             tenant_id: Optional tenant ID to filter
-            force: Force archive even if recently archived
+            force: Start even if another archival of the same scope is running
+            job_id: Archival job to resume
 
         Returns:
             Archive summary
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=self.archive_after_days)
-
-        # Build query
-        query = select(AuditLog).where(AuditLog.created_at < cutoff_date)
-        if tenant_id:
-            query = query.where(AuditLog.tenant_id == tenant_id)
-
-        result = await db.execute(query)
-        logs = result.scalars().all()
-
-        if not logs:
-            return {"archived": 0, "message": "No logs to archive"}
-
-        # Group by date for daily archives
-        daily_logs: dict[str, list[dict]] = {}
-        for log in logs:
-            date_key = log.created_at.strftime("%Y-%m-%d")
-            if date_key not in daily_logs:
-                daily_logs[date_key] = []
-            daily_logs[date_key].append(self._serialize_log(log))
+        if job_id:
+            job = await job_registry.get(job_id)
+            if job is None or job.kind != ARCHIVE_JOB_KIND:
+                raise ValueError(f"Unknown archival job {job_id}")
+            if job.status == JobStatus.COMPLETED:
+                raise ValueError(f"Archival job {job_id} already completed")
+            tenant_id = UUID(job.params["tenant_id"]) if job.params.get("tenant_id") else None
+            cutoff = datetime.fromisoformat(job.params["cutoff"])
+            job.status = JobStatus.RUNNING
+        else:
+            if not force:
+                running = await self._running_job(tenant_id)
+                if running is not None:
+                    return {
+                        "archived": 0,
+                        "message": "Archival already running",
+                        "job_id": running.job_id,
+                    }
+            cutoff_day = (datetime.now(UTC) - timedelta(days=self.archive_after_days)).date()
+            cutoff = datetime.combine(cutoff_day, time.min, tzinfo=UTC)
+            job = JobRecord(
+                job_id=str(uuid4()),
+                kind=ARCHIVE_JOB_KIND,
+                status=JobStatus.RUNNING,
+                tenant_id=str(tenant_id) if tenant_id else None,
+                params={
+                    "tenant_id": str(tenant_id) if tenant_id else None,
+                    "cutoff": cutoff.isoformat(),
+                },
+            )
+        await job_registry.save(job)
 
-        # Create archive files
         self.archive_path.mkdir(parents=True, exist_ok=True)
-        archived_count = 0
-        archive_files = []
-
-        for date_key, log_entries in daily_logs.items():
-            tenant_suffix = f"_{tenant_id}" if tenant_id else ""
-            archive_file = self.archive_path / f"audit_{date_key}{tenant_suffix}.json.gz"
-
-            # Compress and write
-            with gzip.open(archive_file, "wt", encoding="utf-8") as f:
-                json.dump(log_entries, f, default=str)
-
-            archived_count += len(log_entries)
-            archive_files.append(str(archive_file))
+        archive_files: list[str] = list(job.result.get("files", [])) if job.result else []
+        days: list[str] = []
+        # Whole months before the cutoff are dropped as partitions instead of deleted
+        droppable = await self._droppable_months(db, tenant_id, cutoff)
+        checkpoint = job.checkpoint
+        pending_drop = (
+            date.fromisoformat(checkpoint["pending_drop"])
+            if checkpoint.get("pending_drop")
+            else None
+        )
+        try:
+            day = await self._next_day(db, self._resume_from(checkpoint), cutoff, tenant_id)
+            while day is not None:
+                month = month_start(day)
+                if pending_drop and pending_drop != month:
+                    await self._drop_month(db, job, pending_drop)
+                    pending_drop = None
+
+                start = datetime.combine(day, time.min, tzinfo=UTC)
+                end = start + timedelta(days=1)
+                window = self._window(start, end, tenant_id)
+
+                if checkpoint.get("day") == day.isoformat() and checkpoint.get("phase") == "delete":
+                    # The file was completed before the interruption
+                    logger.info("Resuming archive deletes", day=str(day), file=checkpoint["file"])
+                else:
+                    path = self._archive_file(day, tenant_id)
+                    written = await self._write_day(db, window, path)
+                    await db.commit()  # end the cursor's transaction
+                    job.processed += written
+                    archive_files.append(str(path))
+                    job.checkpoint = {"day": day.isoformat(), "phase": "delete", "file": str(path)}
+                    job.result = {"files": archive_files}
+                    if month in droppable:
+                        # Removed with the partition once the month is written
+                        job.succeeded += written
+                        job.checkpoint["pending_drop"] = month.isoformat()
+                    await job_registry.save(job)
+
+                if month in droppable:
+                    pending_drop = month
+                else:
+                    async for deleted in self._delete_window(db, window):
+                        job.succeeded += deleted
+                        await job_registry.save(job)
+
+                days.append(day.isoformat())
+                job.checkpoint = checkpoint = {
+                    "day": day.isoformat(),
+                    "phase": "done",
+                    "pending_drop": pending_drop.isoformat() if pending_drop else None,
+                }
+                day = await self._next_day(db, end, cutoff, tenant_id)
+
+            if pending_drop:
+                await self._drop_month(db, job, pending_drop)
+        except Exception as e:
+            await db.rollback()
+            job.status = JobStatus.FAILED
+            job.errors.append({"error": str(e), "checkpoint": job.checkpoint})
+            await job_registry.save(job)
+            logger.error("Audit log archival failed", job_id=job.job_id, error=str(e))
+            raise
+
+        summary: dict[str, Any] = {
+            "job_id": job.job_id,
+            "archived": job.processed,
+            "deleted": job.succeeded,
+            "files": archive_files,
+        }
+        if days:
+            summary["date_range"] = {"from": days[0], "to": days[-1]}
+        else:
+            summary["message"] = "No logs to archive"
 
-        # Delete archived logs from database
-        delete_stmt = delete(AuditLog).where(AuditLog.id.in_([log.id for log in logs]))
-        await db.execute(delete_stmt)
-        await db.commit()
+        job.status = JobStatus.COMPLETED
+        job.completed_at = datetime.now(UTC)
+        job.result = summary
+        await job_registry.save(job)
 
         logger.info(
             "Audit logs archived",
-            count=archived_count,
+            count=job.processed,
             files=len(archive_files),
             tenant_id=str(tenant_id) if tenant_id else "all",
         )
+        return summary
 
-        return {
-            "archived": archived_count,
-            "files": archive_files,
-            "date_range": {
-                "from": min(daily_logs.keys()),
-                "to": max(daily_logs.keys()),
-            },
-        }
+    def resume_in_background(self, job: JobRecord) -> None:
+        """Resume an archival job as a task with its own database session."""
+        if job.job_id in self._running_tasks:
+            raise ValueError(f"Archival job {job.job_id} is already running")
+
+        async def runner():
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.archive_old_logs(db, job_id=job.job_id)
+            finally:
+                self._running_tasks.pop(job.job_id, None)
+
+        self._running_tasks[job.job_id] = asyncio.create_task(runner())
+
+    @staticmethod
+    def _resume_from(checkpoint: dict[str, Any]) -> datetime | None:
+        """Where a resumed run continues: the checkpoint day, or the day after it."""
+        if not checkpoint.get("day"):
+            return None
+        start = datetime.combine(date.fromisoformat(checkpoint["day"]), time.min, tzinfo=UTC)
+        return start if checkpoint.get("phase") == "delete" else start + timedelta(days=1)
+
+    async def _droppable_months(
+        self, db: AsyncSession, tenant_id: UUID | None, cutoff: datetime
+    ) -> set[date]:
+        """Monthly audit_log partitions entirely before the cutoff (all-tenant runs only)."""
+        if tenant_id or not await is_partitioned(db, AUDIT_TABLE):
+            return set()
+        months = await list_partitions(db, AUDIT_TABLE)
+        return {month for month in months if add_months(month, 1) <= cutoff.date()}
+
+    async def _drop_month(self, db: AsyncSession, job: JobRecord, month: date) -> None:
+        await drop_partition(db, AUDIT_TABLE, month)
+        job.checkpoint["pending_drop"] = None
+        await job_registry.save(job)
+
+    async def _running_job(self, tenant_id: UUID | None) -> JobRecord | None:
+        """An archival of the same scope that is still making progress."""
+        scope = str(tenant_id) if tenant_id else None
+        for job in await job_registry.recent(tenant_id=tenant_id, kind=ARCHIVE_JOB_KIND):
+            if job.params.get("tenant_id") == scope and not job.finished and not job.interrupted:
+                return job
+        return None
+
+    @staticmethod
+    def _window(start: datetime, end: datetime, tenant_id: UUID | None) -> list:
+        conditions = [AuditLog.created_at >= start, AuditLog.created_at < end]
+        if tenant_id:
+            conditions.append(AuditLog.tenant_id == tenant_id)
+        return conditions
+
+    async def _next_day(
+        self,
+        db: AsyncSession,
+        after: datetime | None,
+        cutoff: datetime,
+        tenant_id: UUID | None,
+    ) -> date | None:
+        """Day of the oldest log in [after, cutoff), skipping empty days in one query."""
+        query = select(func.min(AuditLog.created_at)).where(AuditLog.created_at < cutoff)
+        if after:
+            query = query.where(AuditLog.created_at >= after)
+        if tenant_id:
+            query = query.where(AuditLog.tenant_id == tenant_id)
+        oldest = await db.scalar(query)
+        return oldest.astimezone(UTC).date() if oldest else None
+
+    def _archive_file(self, day: date, tenant_id: UUID | None) -> Path:
+        """Archive file for a day; a day archived again gets a numbered file."""
+        tenant_suffix = f"_{tenant_id}" if tenant_id else ""
+        path = self.archive_path / f"audit_{day.isoformat()}{tenant_suffix}.ndjson.gz"
+        n = 1
+        while path.exists():
+            path = self.archive_path / f"audit_{day.isoformat()}{tenant_suffix}.{n}.ndjson.gz"
+            n += 1
+        return path
+
+    async def _write_day(self, db: AsyncSession, window: list, path: Path) -> int:
+        """
+        Stream one day of logs into `path` in compressed blocks and write its
+        sidecar index; the file only appears once complete.
+        """
+        query = (
+            select(*ARCHIVE_COLUMNS)
+            .where(*window)
+            .order_by(AuditLog.created_at, AuditLog.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        partial = path.with_name(f"{path.name}.part")
+        count = 0
+        try:
+            with open(partial, "wb") as raw:
+                writer = ArchiveWriter(raw, self.block_records)
+                result = await db.stream(query)
+                async for batch in result.partitions():
+                    entries = [self._serialize_log(row) for row in batch]
+                    await asyncio.to_thread(writer.write, entries)
+                    count += len(batch)
+                await asyncio.to_thread(writer.close)
+                raw.flush()
+                os.fsync(raw.fileno())
+            # An archive left without its index is indexed on the next search
+            await asyncio.to_thread(writer.index(path).save, index_path(path))
+            partial.replace(path)
+        finally:
+            partial.unlink(missing_ok=True)
+        return count
+
+    async def _delete_window(self, db: AsyncSession, window: list) -> AsyncIterator[int]:
+        """Delete a window's rows `delete_batch_size` at a time, one commit per batch."""
+        while True:
+            batch = select(AuditLog.id).where(*window).limit(self.delete_batch_size)
+            result = await db.execute(
+                delete(AuditLog)
+                .where(AuditLog.id.in_(batch.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            yield result.rowcount
+            if result.rowcount < self.delete_batch_size:
+                return
 
     async def cleanup_old_archives(self) -> dict[str, Any]:
         """
@@ -123,13 +375,14 @@ class AuditArchivalService:
         if not self.archive_path.exists():
             return {"deleted": 0, "message": "No archive directory"}
 
-        for archive_file in self.archive_path.glob("audit_*.json.gz"):
-            # Extract date from filename
+        for archive_file in self.archive_path.glob(ARCHIVE_GLOB):
+            # Extract date from filename (audit_<date>[_<tenant>][.<n>].[nd]json.gz)
             try:
-                date_str = archive_file.stem.split("_")[1]
+                date_str = archive_file.name.split("_")[1][:10]
                 file_date = datetime.strptime(date_str, "%Y-%m-%d")
                 if file_date < cutoff_date:
                     archive_file.unlink()
+                    index_path(archive_file).unlink(missing_ok=True)
                     deleted_files.append(str(archive_file))
             except (IndexError, ValueError):
                 continue
@@ -291,9 +544,24 @@ class AuditArchivalService:
         query_text: str | None = None,
         page: int = 1,
         page_size: int = 50,
+        user_id: UUID | None = None,
+        actions: list[AuditAction] | None = None,
+        resource_type: str | None = None,
+        resource_id: UUID | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        success_only: bool = False,
+        include_archived: bool = True,
     ) -> dict[str, Any]:
         """
-        Search audit logs with full-text search.
+        Search audit logs with full-text search, across the live table and
+        archive files.
+
+        Archives are searched through their sidecar indexes, reading only the
+        blocks whose time range and bloom filters can match. Live and archived
+        results are merged newest first; each side contributes at most
+        page * page_size entries. Live entries carry every audit log field,
+        archived ones the ARCHIVE_COLUMNS.
 
         Args:
             db: Database session
@@ -301,6 +569,14 @@ class AuditArchivalService:
             query_text: Search query
             page: Page number
             page_size: Results per page
+            user_id: Filter by user
+            actions: Filter by action types
+            resource_type: Filter by resource type
+            resource_id: Filter by resource
+            start_date: Start of date range
+            end_date: End of date range
+            success_only: Only successful operations
+            include_archived: Also search archive files
 
         Returns:
             Search results
@@ -314,28 +590,82 @@ class AuditArchivalService:
                 | (AuditLog.user_email.ilike(search_pattern))
                 | (AuditLog.resource_name.ilike(search_pattern))
             )
+        if user_id:
+            base_query = base_query.where(AuditLog.user_id == user_id)
+        if actions:
+            base_query = base_query.where(AuditLog.action.in_(actions))
+        if resource_type:
+            base_query = base_query.where(AuditLog.resource_type == resource_type)
+        if resource_id:
+            base_query = base_query.where(AuditLog.resource_id == resource_id)
+        if start_date:
+            base_query = base_query.where(AuditLog.created_at >= start_date)
+        if end_date:
+            base_query = base_query.where(AuditLog.created_at <= end_date)
+        if success_only:
+            base_query = base_query.where(AuditLog.success)
 
         # Count total
         count_query = select(func.count()).select_from(base_query.subquery())
         count_result = await db.execute(count_query)
         total = count_result.scalar()
 
-        # Get page
         offset = (page - 1) * page_size
-        page_query = base_query.order_by(AuditLog.created_at.desc()).offset(offset).limit(page_size)
+        page_query = base_query.order_by(AuditLog.created_at.desc())
+        if include_archived:
+            # Newest entries up to the end of the requested page, merged below
+            page_query = page_query.limit(offset + page_size)
+        else:
+            page_query = page_query.offset(offset).limit(page_size)
         result = await db.execute(page_query)
-        logs = result.scalars().all()
+        entries = [self._serialize_live_log(log) for log in result.scalars().all()]
+
+        archived_total = 0
+        if include_archived:
+            archive_query = ArchiveQuery(
+                tenant_id=str(tenant_id),
+                text=query_text,
+                user_id=str(user_id) if user_id else None,
+                actions=[AuditAction(a).value for a in actions] if actions else None,
+                resource_type=resource_type,
+                resource_id=str(resource_id) if resource_id else None,
+                start=start_date,
+                end=end_date,
+                success_only=success_only,
+            )
+            archived = await asyncio.to_thread(
+                self.archive_index.search, archive_query, offset + page_size
+            )
+            archived_total = archived.total
+            total += archived_total
+            entries = sorted(entries + archived.entries, key=sort_key, reverse=True)
+            logger.debug(
+                "Audit archives searched",
+                matches=archived.total,
+                blocks_read=archived.blocks_read,
+                blocks_total=archived.blocks_total,
+            )
 
         return {
             "total": total,
+            "archived_total": archived_total,
             "page": page,
             "page_size": page_size,
             "pages": (total + page_size - 1) // page_size,
-            "results": [self._serialize_log(log) for log in logs],
+            "results": entries[offset : offset + page_size] if include_archived else entries,
+        }
+
+    def _serialize_live_log(self, log: AuditLog) -> dict[str, Any]:
+        """Serialize a live audit log, including the fields archives do not keep."""
+        return {
+            **self._serialize_log(log),
+            "before_state": log.before_state,
+            "after_state": log.after_state,
+            "context_data": log.context_data,
         }
 
-    def _serialize_log(self, log: AuditLog) -> dict[str, Any]:
-        """Serialize audit log for export."""
+    def _serialize_log(self, log: Any) -> dict[str, Any]:
+        """Serialize an audit log (ORM object or ARCHIVE_COLUMNS row) for export."""
         return {
             "id": str(log.id),
             "created_at": log.created_at.isoformat() if log.created_at else None,
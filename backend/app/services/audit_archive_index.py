@@ -0,0 +1,464 @@
+"""
+Audit Archive Index (Phase 3.7)
+Sidecar indexes that make archived audit logs searchable.
+
+Archive files are written as a sequence of independently gzipped blocks
+(concatenated gzip members, still readable with `gzip.open`). Next to each
+archive, `<archive>.idx.json` records the file's time range and, per block,
+its byte offset and length, time range and bloom filters over tenant, user,
+action and resource. A search reads only the blocks whose time range and
+filters can match, seeking straight to them.
+
+Archives written before blocks were introduced are indexed on first search
+as a single block covering the whole file.
+"""
+
+import base64
+import gzip
+import hashlib
+import heapq
+import json
+import math
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import structlog
+
+logger = structlog.get_logger()
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx.json"
+ARCHIVE_GLOB = "audit_*json.gz"
+
+DEFAULT_BLOCK_RECORDS = 1000
+BLOOM_FALSE_POSITIVE_RATE = 0.01
+# Floor for small filters, which cannot reach the target rate with a few bits
+MIN_BLOOM_BITS = 64
+
+# Fields with a bloom filter per block
+INDEXED_FIELDS = ("tenant_id", "user_id", "action", "resource")
+
+
+def index_path(archive: Path) -> Path:
+    return archive.with_name(f"{archive.name}{INDEX_SUFFIX}")
+
+
+def _timestamp(value: str | datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def _indexed_values(entry: dict[str, Any]) -> dict[str, list[str]]:
+    """Bloom filter keys of an archived entry; resources by type and by type:id."""
+    values: dict[str, list[str]] = {
+        "tenant_id": [entry["tenant_id"]] if entry.get("tenant_id") else [],
+        "user_id": [entry["user_id"]] if entry.get("user_id") else [],
+        "action": [entry["action"]] if entry.get("action") else [],
+        "resource": [],
+    }
+    if entry.get("resource_type"):
+        values["resource"].append(entry["resource_type"])
+        if entry.get("resource_id"):
+            values["resource"].append(f"{entry['resource_type']}:{entry['resource_id']}")
+    return values
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter probing positions taken from one BLAKE2b digest.
+
+    Filters of indexes written before independent probes were introduced
+    (no `probes` key) keep using double hashing, so their blocks stay
+    searchable without re-indexing.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        hashes: int,
+        bits: bytearray | None = None,
+        double_hashing: bool = False,
+    ):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bits if bits is not None else bytearray((size + 7) // 8)
+        self.double_hashing = double_hashing
+
+    @classmethod
+    def for_capacity(
+        cls, capacity: int, false_positive_rate: float = BLOOM_FALSE_POSITIVE_RATE
+    ) -> "BloomFilter":
+        capacity = max(capacity, 1)
+        size = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        size = max(size, MIN_BLOOM_BITS)
+        # The floor makes the optimal count too high for small filters
+        max_hashes = math.ceil(-math.log2(false_positive_rate))
+        hashes = max(1, min(round(size / capacity * math.log(2)), max_hashes))
+        return cls(size, hashes)
+
+    @classmethod
+    def of(cls, values: Iterable[str]) -> "BloomFilter":
+        values = set(values)
+        bloom = cls.for_capacity(len(values))
+        for value in values:
+            bloom.add(value)
+        return bloom
+
+    def _positions(self, value: str) -> Iterator[int]:
+        if self.double_hashing:
+            digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+            h1 = int.from_bytes(digest[:8], "little")
+            h2 = int.from_bytes(digest[8:], "little") | 1
+            for i in range(self.hashes):
+                yield (h1 + i * h2) % self.size
+            return
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=4 * self.hashes).digest()
+        for i in range(0, len(digest), 4):
+            yield int.from_bytes(digest[i : i + 4], "little") % self.size
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "hashes": self.hashes,
+            "probes": "double" if self.double_hashing else "independent",
+            "bits": base64.b64encode(self.bits).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BloomFilter":
+        return cls(
+            data["size"],
+            data["hashes"],
+            bytearray(base64.b64decode(data["bits"])),
+            double_hashing=data.get("probes", "double") == "double",
+        )
+
+
+@dataclass
+class ArchiveBlock:
+    """A separately compressed run of records within an archive file."""
+
+    offset: int
+    length: int
+    records: int
+    min_ts: datetime | None
+    max_ts: datetime | None
+    blooms: dict[str, BloomFilter]
+
+    @classmethod
+    def from_entries(cls, offset: int, length: int, entries: list[dict]) -> "ArchiveBlock":
+        keys: dict[str, set[str]] = {name: set() for name in INDEXED_FIELDS}
+        timestamps = []
+        for entry in entries:
+            for name, values in _indexed_values(entry).items():
+                keys[name].update(values)
+            if entry.get("created_at"):
+                timestamps.append(_timestamp(entry["created_at"]))
+        return cls(
+            offset=offset,
+            length=length,
+            records=len(entries),
+            min_ts=min(timestamps, default=None),
+            max_ts=max(timestamps, default=None),
+            blooms={name: BloomFilter.of(values) for name, values in keys.items()},
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "offset": self.offset,
+            "length": self.length,
+            "records": self.records,
+            "min_ts": self.min_ts.isoformat() if self.min_ts else None,
+            "max_ts": self.max_ts.isoformat() if self.max_ts else None,
+            "blooms": {name: bloom.to_dict() for name, bloom in self.blooms.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ArchiveBlock":
+        return cls(
+            offset=data["offset"],
+            length=data["length"],
+            records=data["records"],
+            min_ts=_timestamp(data["min_ts"]),
+            max_ts=_timestamp(data["max_ts"]),
+            blooms={name: BloomFilter.from_dict(b) for name, b in data["blooms"].items()},
+        )
+
+
+@dataclass
+class ArchiveIndex:
+    """Sidecar index of one archive file."""
+
+    file: str
+    size: int
+    format: str  # "ndjson", or "json" for single-array archives
+    blocks: list[ArchiveBlock]
+
+    @property
+    def records(self) -> int:
+        return sum(block.records for block in self.blocks)
+
+    @property
+    def min_ts(self) -> datetime | None:
+        return min((b.min_ts for b in self.blocks if b.min_ts), default=None)
+
+    @property
+    def max_ts(self) -> datetime | None:
+        return max((b.max_ts for b in self.blocks if b.max_ts), default=None)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "file": self.file,
+            "size": self.size,
+            "format": self.format,
+            "records": self.records,
+            "min_ts": self.min_ts.isoformat() if self.min_ts else None,
+            "max_ts": self.max_ts.isoformat() if self.max_ts else None,
+            "blocks": [block.to_dict() for block in self.blocks],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ArchiveIndex":
+        return cls(
+            file=data["file"],
+            size=data["size"],
+            format=data["format"],
+            blocks=[ArchiveBlock.from_dict(b) for b in data["blocks"]],
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the index next to its archive, atomically."""
+        partial = path.with_name(f"{path.name}.part")
+        try:
+            with open(partial, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            partial.replace(path)
+        finally:
+            partial.unlink(missing_ok=True)
+
+
+class ArchiveWriter:
+    """
+    Writes archive entries as gzip members of `block_records` records each,
+    collecting the block index as it goes.
+    """
+
+    def __init__(self, raw: BinaryIO, block_records: int = DEFAULT_BLOCK_RECORDS):
+        self.raw = raw
+        self.block_records = block_records
+        self.blocks: list[ArchiveBlock] = []
+        self.size = 0
+        self._pending: list[dict] = []
+
+    def write(self, entries: Iterable[dict]) -> None:
+        for entry in entries:
+            self._pending.append(entry)
+            if len(self._pending) >= self.block_records:
+                self._flush()
+
+    def close(self) -> None:
+        if self._pending:
+            self._flush()
+
+    def index(self, archive: Path) -> ArchiveIndex:
+        return ArchiveIndex(file=archive.name, size=self.size, format="ndjson", blocks=self.blocks)
+
+    def _flush(self) -> None:
+        entries, self._pending = self._pending, []
+        data = "".join(json.dumps(entry, default=str) + "\n" for entry in entries)
+        block = gzip.compress(data.encode("utf-8"))
+        self.raw.write(block)
+        self.blocks.append(ArchiveBlock.from_entries(self.size, len(block), entries))
+        self.size += len(block)
+
+
+def build_index(archive: Path) -> ArchiveIndex:
+    """Index an archive written without one, as a single block."""
+    with gzip.open(archive, "rt", encoding="utf-8") as f:
+        content = f.read()
+    if content.lstrip().startswith("["):
+        format, entries = "json", json.loads(content)
+    else:
+        format, entries = "ndjson", [json.loads(line) for line in content.splitlines() if line]
+    size = archive.stat().st_size
+    return ArchiveIndex(
+        file=archive.name,
+        size=size,
+        format=format,
+        blocks=[ArchiveBlock.from_entries(0, size, entries)],
+    )
+
+
+@dataclass
+class ArchiveQuery:
+    """Filters applied to archived entries, mirroring AuditArchivalService.search_logs."""
+
+    tenant_id: str
+    text: str | None = None
+    user_id: str | None = None
+    actions: list[str] | None = None
+    resource_type: str | None = None
+    resource_id: str | None = None
+    start: datetime | None = None
+    end: datetime | None = None
+    success_only: bool = False
+
+    def __post_init__(self):
+        self.start = _timestamp(self.start)
+        self.end = _timestamp(self.end)
+        self._text = self.text.casefold() if self.text else None
+
+    def overlaps(self, min_ts: datetime | None, max_ts: datetime | None) -> bool:
+        if min_ts is None or max_ts is None:
+            return True
+        if self.start and max_ts < self.start:
+            return False
+        return not (self.end and min_ts > self.end)
+
+    def may_match(self, block: ArchiveBlock) -> bool:
+        """Whether a block can hold matches, from its time range and bloom filters."""
+        if not self.overlaps(block.min_ts, block.max_ts):
+            return False
+        blooms = block.blooms
+        if self.tenant_id not in blooms["tenant_id"]:
+            return False
+        if self.user_id and self.user_id not in blooms["user_id"]:
+            return False
+        if self.actions and not any(action in blooms["action"] for action in self.actions):
+            return False
+        if self.resource_type:
+            resource = self.resource_type
+            if self.resource_id:
+                resource = f"{resource}:{self.resource_id}"
+            if resource not in blooms["resource"]:
+                return False
+        return True
+
+    def matches(self, entry: dict[str, Any]) -> bool:
+        if entry.get("tenant_id") != self.tenant_id:
+            return False
+        if self.user_id and entry.get("user_id") != self.user_id:
+            return False
+        if self.actions and entry.get("action") not in self.actions:
+            return False
+        if self.resource_type and entry.get("resource_type") != self.resource_type:
+            return False
+        if self.resource_id and entry.get("resource_id") != self.resource_id:
+            return False
+        if self.success_only and not entry.get("success"):
+            return False
+        if self.start or self.end:
+            created_at = _timestamp(entry.get("created_at"))
+            if created_at is None or not self.overlaps(created_at, created_at):
+                return False
+        if self._text:
+            fields = (entry.get("description"), entry.get("user_email"), entry.get("resource_name"))
+            return any(value and self._text in value.casefold() for value in fields)
+        return True
+
+
+def sort_key(entry: dict[str, Any]) -> tuple[datetime, str]:
+    return _timestamp(entry["created_at"]) or datetime.min.replace(tzinfo=UTC), entry["id"]
+
+
+@dataclass
+class ArchiveSearchResult:
+    total: int
+    entries: list[dict]  # newest first
+    blocks_total: int = 0
+    blocks_read: int = 0
+
+
+@dataclass
+class ArchiveCatalog:
+    """Indexes of the archives in a directory, cached until a file changes."""
+
+    archive_path: Path
+    _cache: dict[Path, tuple[int, ArchiveIndex]] = field(default_factory=dict)
+
+    def indexes(self) -> list[tuple[Path, ArchiveIndex]]:
+        """Index of every archive, building and saving missing or stale ones."""
+        if not self.archive_path.exists():
+            return []
+        indexes = []
+        archives = sorted(self.archive_path.glob(ARCHIVE_GLOB))
+        for archive in archives:
+            try:
+                indexes.append((archive, self._index(archive)))
+            except (OSError, EOFError, ValueError) as e:
+                logger.warning("Audit archive not indexable", file=str(archive), error=str(e))
+        for stale in set(self._cache) - set(archives):
+            del self._cache[stale]
+        return indexes
+
+    def _index(self, archive: Path) -> ArchiveIndex:
+        sidecar = index_path(archive)
+        size = archive.stat().st_size
+        cached = self._cache.get(archive)
+        if cached and cached[0] == size:
+            return cached[1]
+
+        index = None
+        if sidecar.exists():
+            data = json.loads(sidecar.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION and data.get("size") == size:
+                index = ArchiveIndex.from_dict(data)
+        if index is None:
+            index = build_index(archive)
+            index.save(sidecar)
+            logger.info("Audit archive indexed", file=archive.name, records=index.records)
+        self._cache[archive] = (size, index)
+        return index
+
+    def scan(self, query: ArchiveQuery, result: ArchiveSearchResult) -> Iterator[dict]:
+        """Matching entries, reading only the blocks that may contain them."""
+        for archive, index in self.indexes():
+            result.blocks_total += len(index.blocks)
+            if not query.overlaps(index.min_ts, index.max_ts):
+                continue
+            candidates = [block for block in index.blocks if query.may_match(block)]
+            if not candidates:
+                continue
+            with open(archive, "rb") as f:
+                for block in candidates:
+                    result.blocks_read += 1
+                    for entry in _read_block(f, block, index.format):
+                        if query.matches(entry):
+                            yield entry
+
+    def search(self, query: ArchiveQuery, limit: int) -> ArchiveSearchResult:
+        """Count all matches and keep the newest `limit` of them."""
+        result = ArchiveSearchResult(total=0, entries=[])
+
+        def counted() -> Iterator[dict]:
+            for entry in self.scan(query, result):
+                result.total += 1
+                yield entry
+
+        result.entries = heapq.nlargest(limit, counted(), key=sort_key)
+        return result
+
+
+def _read_block(f: BinaryIO, block: ArchiveBlock, format: str) -> list[dict]:
+    f.seek(block.offset)
+    content = gzip.decompress(f.read(block.length)).decode("utf-8")
+    if format == "json":
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line]
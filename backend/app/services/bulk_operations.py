@@ -1,26 +1,357 @@
 """
 Bulk Operations Service (Phase 4.2)
 Handles batch import, update, and delete operations with progress tracking.
+
+Entity imports run as a chunked pipeline: input is streamed (CSV / NDJSON),
+each chunk is validated in Python, COPYed into a transaction-local staging
+table and merged into `entities` with set-based statements, so duplicates
+are resolved with one anti-join per chunk instead of one SELECT per row.
+
+Updates and deletes are set-based as well: one statement per chunk of ids
+(`WHERE id = ANY(:ids) ... RETURNING id`), or `UPDATE ... FROM (VALUES ...)`
+for patches with different values per entity. Large operations can run as
+background tasks and be polled by operation id.
+
+Operation progress is checkpointed to the shared job registry after every
+chunk, so any worker can report it and an interrupted import can be resumed
+from the last committed row.
 """
 
+import asyncio
 import csv
 import io
 import json
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import UTC, datetime
 from enum import Enum
-from typing import Any
+from itertools import islice
+from typing import IO, Any
 from uuid import UUID, uuid4
 
 import structlog
-from sqlalchemy import delete, select, update
+from sqlalchemy import any_, bindparam, cast, column, delete, text, update, values
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import AsyncSessionLocal
+from app.core.job_registry import JobRecord, JobStatus, job_registry
 from app.core.websocket import Alert, AlertPriority, AlertType, ws_manager
 from app.models import AuditAction, AuditLog, Entity, EntityType
 
 logger = structlog.get_logger()
 
+# Staging table for entity imports (dropped at the end of each chunk's transaction)
+IMPORT_STAGING_TABLE = "entity_import_staging"
+IMPORT_STAGING_COLUMNS = (
+    "row_no",
+    "id",
+    "type",
+    "name",
+    "aliases",
+    "external_id",
+    "registration_number",
+    "tax_id",
+    "country_code",
+    "address",
+    "category",
+    "subcategory",
+    "tags",
+    "criticality",
+    "custom_data",
+    "notes",
+)
+_OPTIONAL_TEXT_COLUMNS = (
+    "external_id",
+    "registration_number",
+    "tax_id",
+    "country_code",
+    "address",
+    "category",
+    "subcategory",
+    "notes",
+)
+# Keys accepted by earlier versions of the import format
+_LEGACY_KEYS = {"country": "country_code", "description": "notes"}
+_LEGACY_CUSTOM_DATA_KEYS = ("metadata", "identifiers")
+# Separator for list columns (aliases, tags) in CSV files
+CSV_LIST_SEPARATOR = ";"
+
+_ENTITY_TYPE_ENUM = Entity.__table__.c.type.type.name
+_ENTITY_TYPES = {member.value for member in EntityType}
+
+_CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE IF NOT EXISTS {IMPORT_STAGING_TABLE} (
+    row_no integer NOT NULL,
+    id uuid NOT NULL,
+    type text NOT NULL,
+    name text NOT NULL,
+    aliases text[],
+    external_id text,
+    registration_number text,
+    tax_id text,
+    country_code text,
+    address text,
+    category text,
+    subcategory text,
+    tags text[],
+    criticality integer,
+    custom_data jsonb,
+    notes text
+) ON COMMIT DROP
+"""
+
+# First occurrence of each name in the chunk
+_STAGED_ROWS_SQL = f"""
+SELECT DISTINCT ON (name) * FROM {IMPORT_STAGING_TABLE} ORDER BY name, row_no
+"""
+
+_EXISTING_CONDITION = "e.tenant_id = :tenant_id AND e.name = s.name"
+
+_INSERT_FROM_STAGING_SQL = f"""
+INSERT INTO entities (
+    id, tenant_id, type, name, aliases, external_id, registration_number, tax_id,
+    country_code, address, category, subcategory, tags, criticality, custom_data,
+    is_active, notes, created_at, updated_at
+)
+SELECT
+    s.id, :tenant_id, CAST(s.type AS {_ENTITY_TYPE_ENUM}), s.name,
+    COALESCE(s.aliases, '{{}}'), s.external_id, s.registration_number, s.tax_id,
+    s.country_code, s.address, s.category, s.subcategory, COALESCE(s.tags, '{{}}'),
+    COALESCE(s.criticality, 3), COALESCE(s.custom_data, '{{}}'::jsonb),
+    true, s.notes, :now, :now
+FROM ({_STAGED_ROWS_SQL}) s
+WHERE NOT EXISTS (SELECT 1 FROM entities e WHERE {_EXISTING_CONDITION})
+RETURNING name
+"""
+
+# Only columns present in the input overwrite existing values
+_UPDATE_FROM_STAGING_SQL = f"""
+UPDATE entities e SET
+    type = CAST(s.type AS {_ENTITY_TYPE_ENUM}),
+    aliases = COALESCE(s.aliases, e.aliases),
+    tags = COALESCE(s.tags, e.tags),
+    criticality = COALESCE(s.criticality, e.criticality),
+    custom_data = COALESCE(s.custom_data, e.custom_data),
+    {", ".join(f"{column} = COALESCE(s.{column}, e.{column})" for column in _OPTIONAL_TEXT_COLUMNS)},
+    updated_at = :now
+FROM ({_STAGED_ROWS_SQL}) s
+WHERE {_EXISTING_CONDITION}
+RETURNING e.name
+"""
+
+# Rows whose name already exists, or repeats an earlier row of the chunk
+_CONFLICTS_SQL = f"""
+SELECT s.row_no, s.name FROM {IMPORT_STAGING_TABLE} s
+WHERE EXISTS (SELECT 1 FROM entities e WHERE {_EXISTING_CONDITION})
+   OR EXISTS (
+       SELECT 1 FROM {IMPORT_STAGING_TABLE} d WHERE d.name = s.name AND d.row_no < s.row_no
+   )
+"""
+
+
+def iter_csv_records(stream: IO[bytes] | IO[str]) -> Iterator[dict[str, Any]]:
+    """Stream rows of a CSV file (header row required) without loading it."""
+    if isinstance(stream, io.TextIOBase):
+        text_stream = stream
+    else:
+        text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    for row in csv.DictReader(text_stream):
+        # Empty cells mean "not provided"
+        yield {key: value for key, value in row.items() if key and value not in (None, "")}
+
+
+class _UnparsableRecord(dict):
+    """Stand-in for an input line that could not be parsed; fails row validation."""
+
+    def __init__(self, error: str):
+        super().__init__()
+        self.error = error
+
+
+def iter_ndjson_records(stream: IO[bytes] | IO[str]) -> Iterator[dict[str, Any]]:
+    """
+    Stream objects of a newline-delimited JSON file without loading it.
+    Malformed lines are yielded as records that fail validation, so they are
+    reported as failed rows instead of aborting the import.
+    """
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield _UnparsableRecord(f"Line {line_no}: invalid JSON ({e})")
+            continue
+        if not isinstance(record, dict):
+            yield _UnparsableRecord(f"Line {line_no}: expected a JSON object")
+            continue
+        yield record
+
+
+def _list_value(value: Any, field_name: str) -> list[str] | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(CSV_LIST_SEPARATOR) if part.strip()]
+    if isinstance(value, list | tuple):
+        return [str(part) for part in value]
+    raise ValueError(f"Invalid {field_name}: expected a list")
+
+
+def normalize_entity_row(row_no: int, item: dict[str, Any]) -> tuple:
+    """
+    Validate one input record and convert it to a staging-table record.
+    Raises ValueError with a readable message for invalid input.
+    """
+    if isinstance(item, _UnparsableRecord):
+        raise ValueError(item.error)
+    item = dict(item)
+    for legacy, target in _LEGACY_KEYS.items():
+        if legacy in item and target not in item:
+            item[target] = item[legacy]
+
+    name = item.get("name")
+    if not name or not str(name).strip():
+        raise ValueError("Missing required field: name")
+    name = str(name).strip()
+    if len(name) > 500:
+        raise ValueError("Field 'name' exceeds 500 characters")
+
+    entity_type = item.get("type")
+    if not entity_type:
+        raise ValueError("Missing required field: type")
+    entity_type = entity_type.value if isinstance(entity_type, EntityType) else str(entity_type)
+    entity_type = entity_type.strip().upper()
+    if entity_type not in _ENTITY_TYPES:
+        raise ValueError(f"Invalid entity type: {item['type']}")
+
+    criticality = item.get("criticality")
+    if criticality is not None:
+        try:
+            criticality = int(criticality)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid criticality: {criticality}")
+        if not 1 <= criticality <= 5:
+            raise ValueError("Criticality must be between 1 and 5")
+
+    custom_data = item.get("custom_data")
+    if isinstance(custom_data, str):
+        try:
+            custom_data = json.loads(custom_data)
+        except ValueError:
+            raise ValueError("Invalid custom_data: expected a JSON object")
+    legacy_data = {key: item[key] for key in _LEGACY_CUSTOM_DATA_KEYS if item.get(key)}
+    if legacy_data:
+        custom_data = {**legacy_data, **(custom_data or {})}
+    if custom_data is not None and not isinstance(custom_data, dict):
+        raise ValueError("Invalid custom_data: expected a JSON object")
+
+    country_code = item.get("country_code")
+    if country_code is not None and len(str(country_code)) > 3:
+        raise ValueError(f"Invalid country_code: {country_code}")
+
+    optional = {
+        column: str(item[column]) if item.get(column) is not None else None
+        for column in _OPTIONAL_TEXT_COLUMNS
+    }
+    return (
+        row_no,
+        uuid4(),
+        entity_type,
+        name,
+        _list_value(item.get("aliases"), "aliases"),
+        optional["external_id"],
+        optional["registration_number"],
+        optional["tax_id"],
+        optional["country_code"],
+        optional["address"],
+        optional["category"],
+        optional["subcategory"],
+        _list_value(item.get("tags"), "tags"),
+        criticality,
+        json.dumps(custom_data) if custom_data is not None else None,
+        optional["notes"],
+    )
+
+
+def _chunks(
+    records: Iterable[dict[str, Any]], size: int, start: int = 1
+) -> Iterator[list[tuple[int, Any]]]:
+    """Numbered records in lists of `size` (row numbers start at `start`)."""
+    numbered = enumerate(records, start=start)
+    while chunk := list(islice(numbered, size)):
+        yield chunk
+
+
+# Columns that bulk update / patch may change
+BULK_UPDATABLE_FIELDS = frozenset(
+    c.name
+    for c in Entity.__table__.c
+    if c.name not in {"id", "tenant_id", "created_at", "updated_at"}
+)
+
+
+def check_updatable_fields(fields: Iterable[str]) -> None:
+    """Reject bulk changes to unknown or protected entity columns."""
+    invalid = sorted(set(fields) - BULK_UPDATABLE_FIELDS)
+    if invalid:
+        raise ValueError(f"Fields cannot be bulk updated: {', '.join(invalid)}")
+
+
+def group_patches(patches: Iterable[dict[str, Any]]) -> dict[tuple[str, ...], list[dict[str, Any]]]:
+    """
+    Group per-entity patches by the fields they change, so each group can be
+    applied with a single `UPDATE ... FROM (VALUES ...)` per chunk. A later
+    patch for the same id replaces an earlier one.
+    """
+    latest: dict[Any, dict[str, Any]] = {}
+    for patch in patches:
+        if patch.get("id") is None:
+            raise ValueError("Every patch needs an id")
+        fields = set(patch) - {"id"}
+        if not fields:
+            raise ValueError(f"Patch for {patch['id']} changes no fields")
+        check_updatable_fields(fields)
+        latest.pop(patch["id"], None)
+        latest[patch["id"]] = patch
+
+    groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+    for patch in latest.values():
+        fields = tuple(sorted(set(patch) - {"id"}))
+        groups.setdefault(fields, []).append(patch)
+    return groups
+
+
+def _id_chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _ids_param(ids: Sequence[UUID]):
+    """`ids` bound as a single uuid[] parameter, for `id = ANY(:ids)`."""
+    return bindparam("ids", list(ids), type_=ARRAY(PGUUID(as_uuid=True)))
+
+
+def _record_affected(
+    progress: "BulkOperationProgress", chunk: Sequence[UUID], affected: set[UUID]
+) -> None:
+    """Count a chunk's results; ids the statement did not return are failures."""
+    progress.processed_items += len(chunk)
+    progress.successful_items += len(affected)
+    for entity_id in chunk:
+        if entity_id not in affected:
+            progress.failed_items += 1
+            progress.errors.append(
+                {
+                    "entity_id": str(entity_id),
+                    "error": f"Entity {entity_id} not found or access denied",
+                }
+            )
+
 
 class BulkOperationType(str, Enum):
     """Types of bulk operations."""
@@ -56,6 +387,8 @@ class BulkOperationProgress:
     started_at: datetime | None = None
     completed_at: datetime | None = None
     result_file: str | None = None
+    skipped_items: int = 0
+    tenant_id: UUID | None = None
 
     @property
     def progress_percentage(self) -> float:
@@ -63,6 +396,13 @@ class BulkOperationProgress:
             return 0
         return (self.processed_items / self.total_items) * 100
 
+    @property
+    def items_per_second(self) -> float:
+        if not self.started_at:
+            return 0.0
+        elapsed = ((self.completed_at or datetime.utcnow()) - self.started_at).total_seconds()
+        return self.processed_items / elapsed if elapsed > 0 else 0.0
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "operation_id": self.operation_id,
@@ -72,6 +412,8 @@ class BulkOperationProgress:
             "processed_items": self.processed_items,
             "successful_items": self.successful_items,
             "failed_items": self.failed_items,
+            "skipped_items": self.skipped_items,
+            "items_per_second": round(self.items_per_second, 1),
             "progress_percentage": round(self.progress_percentage, 2),
             "errors": self.errors[:10],  # Only first 10 errors
             "error_count": len(self.errors),
@@ -84,6 +426,61 @@ class BulkOperationProgress:
             ),
         }
 
+    @property
+    def finished(self) -> bool:
+        return self.status in (
+            BulkOperationStatus.COMPLETED,
+            BulkOperationStatus.FAILED,
+            BulkOperationStatus.CANCELLED,
+        )
+
+    def to_job_record(self) -> JobRecord:
+        """
+        Registry snapshot of this operation. Input items are consumed in
+        order, so the checkpoint is simply how many have been handled.
+        """
+        status = (
+            JobStatus.RUNNING
+            if self.status == BulkOperationStatus.PROCESSING
+            else JobStatus(self.status.value)
+        )
+        return JobRecord(
+            job_id=self.operation_id,
+            kind=f"bulk.{self.operation_type.value}",
+            status=status,
+            tenant_id=str(self.tenant_id) if self.tenant_id else None,
+            total=self.total_items,
+            processed=self.processed_items,
+            succeeded=self.successful_items,
+            failed=self.failed_items,
+            skipped=self.skipped_items,
+            started_at=self.started_at,
+            completed_at=self.completed_at,
+            checkpoint={"items_done": self.processed_items},
+            errors=self.errors[:10],
+        )
+
+
+def _progress_from_job(job: JobRecord, operation_type: BulkOperationType) -> BulkOperationProgress:
+    """Rebuild an operation's progress from its registry record (to resume it)."""
+    return BulkOperationProgress(
+        operation_id=job.job_id,
+        operation_type=operation_type,
+        status=BulkOperationStatus.PROCESSING,
+        total_items=job.total,
+        processed_items=job.checkpoint.get("items_done", job.processed),
+        successful_items=job.succeeded,
+        failed_items=job.failed,
+        skipped_items=job.skipped,
+        errors=list(job.errors),
+        started_at=(
+            job.started_at.astimezone(UTC).replace(tzinfo=None)
+            if job.started_at
+            else datetime.utcnow()
+        ),
+        tenant_id=UUID(job.tenant_id) if job.tenant_id else None,
+    )
+
 
 class BulkOperationsService:
     """
@@ -91,8 +488,14 @@ class BulkOperationsService:
     """
 
     def __init__(self):
+        # Operations started on this worker; other workers' are in the job registry
         self._operations: dict[str, BulkOperationProgress] = {}
+        self._max_local_operations = 100
         self._batch_size = 100
+        self._import_chunk_size = 2000
+        # Ids per set-based UPDATE / DELETE statement
+        self._set_chunk_size = 5000
+        self._background_tasks: set[asyncio.Task] = set()
 
     async def import_entities(
         self,
@@ -117,84 +520,94 @@ class BulkOperationsService:
         Returns:
             Operation progress
         """
-        operation_id = str(uuid4())
+        return await self.import_entities_stream(
+            db,
+            tenant_id,
+            user_id,
+            data,
+            skip_duplicates=skip_duplicates,
+            update_existing=update_existing,
+            total_items=len(data),
+        )
+
+    async def import_entities_stream(
+        self,
+        db: AsyncSession,
+        tenant_id: UUID,
+        user_id: UUID,
+        records: Iterable[dict[str, Any]],
+        skip_duplicates: bool = True,
+        update_existing: bool = False,
+        total_items: int | None = None,
+        resume_operation_id: str | None = None,
+    ) -> BulkOperationProgress:
+        """
+        Bulk import entities from a stream of records (e.g. `iter_csv_records`).
+
+        Records are consumed chunk by chunk and each chunk is committed on
+        its own, so memory use is bounded by the chunk size and a failure
+        only affects the rows of one chunk. Entities are matched to existing
+        ones by name within the tenant.
+
+        After each chunk the number of consumed rows is checkpointed in the
+        job registry. Passing `resume_operation_id` with the same input
+        continues an interrupted import after its last checkpoint.
+
+        Args:
+            db: Database session (PostgreSQL/asyncpg)
+            tenant_id: Tenant ID
+            user_id: User performing the operation
+            records: Entity records, consumed lazily
+            skip_duplicates: Skip entities that already exist
+            update_existing: Update existing entities instead of skipping
+            total_items: Number of records, if known (for progress percentage)
+            resume_operation_id: Interrupted import to continue
+
+        Returns:
+            Operation progress
+
+        Raises:
+            ValueError: `resume_operation_id` is unknown, not an import, or neither
+                failed nor interrupted
+        """
         progress = BulkOperationProgress(
-            operation_id=operation_id,
+            operation_id=str(uuid4()),
             operation_type=BulkOperationType.IMPORT,
             status=BulkOperationStatus.PROCESSING,
-            total_items=len(data),
+            total_items=total_items or 0,
             started_at=datetime.utcnow(),
+            tenant_id=tenant_id,
         )
-        self._operations[operation_id] = progress
+        if resume_operation_id:
+            job = await job_registry.get(resume_operation_id)
+            if job is None or job.kind != "bulk.import" or job.tenant_id != str(tenant_id):
+                raise ValueError(f"Import {resume_operation_id} not found")
+            # A running import may still be writing on another worker
+            if not (job.status == JobStatus.FAILED or job.interrupted):
+                raise ValueError(
+                    f"Import {resume_operation_id} is {job.status.value}, "
+                    "only interrupted or failed imports can be resumed"
+                )
+            progress = _progress_from_job(job, BulkOperationType.IMPORT)
+            progress.total_items = max(progress.total_items, total_items or 0)
+            records = islice(records, progress.processed_items, None)
+            logger.info(
+                "Resuming bulk import",
+                operation_id=progress.operation_id,
+                items_done=progress.processed_items,
+            )
+        operation_id = progress.operation_id
+        self._remember(progress)
 
         try:
-            for i, item in enumerate(data):
-                try:
-                    # Validate required fields
-                    if "name" not in item:
-                        raise ValueError("Missing required field: name")
-                    if "type" not in item:
-                        raise ValueError("Missing required field: type")
-
-                    # Check for existing entity
-                    existing = await db.execute(
-                        select(Entity).where(
-                            Entity.tenant_id == tenant_id,
-                            Entity.name == item["name"],
-                        )
-                    )
-                    existing_entity = existing.scalar_one_or_none()
-
-                    if existing_entity:
-                        if update_existing:
-                            # Update existing entity
-                            for key, value in item.items():
-                                if key not in ["id", "tenant_id", "created_at"]:
-                                    setattr(existing_entity, key, value)
-                            progress.successful_items += 1
-                        elif skip_duplicates:
-                            progress.processed_items += 1
-                            continue
-                        else:
-                            raise ValueError(f"Entity '{item['name']}' already exists")
-                    else:
-                        # Create new entity
-                        entity = Entity(
-                            tenant_id=tenant_id,
-                            name=item["name"],
-                            type=EntityType(item["type"])
-                            if isinstance(item["type"], str)
-                            else item["type"],
-                            country=item.get("country"),
-                            description=item.get("description"),
-                            aliases=item.get("aliases", []),
-                            identifiers=item.get("identifiers", {}),
-                            metadata=item.get("metadata", {}),
-                        )
-                        db.add(entity)
-                        progress.successful_items += 1
-
-                    progress.processed_items += 1
-
-                    # Commit in batches
-                    if progress.processed_items % self._batch_size == 0:
-                        await db.commit()
-                        # Broadcast progress
-                        await self._broadcast_progress(tenant_id, progress)
-
-                except Exception as e:
-                    progress.failed_items += 1
-                    progress.processed_items += 1
-                    progress.errors.append(
-                        {
-                            "row": i + 1,
-                            "item": item.get("name", "Unknown"),
-                            "error": str(e),
-                        }
-                    )
-
-            # Final commit
-            await db.commit()
+            start = progress.processed_items + 1
+            for chunk in _chunks(records, self._import_chunk_size, start=start):
+                await self._import_chunk(
+                    db, tenant_id, chunk, progress, skip_duplicates, update_existing
+                )
+                if progress.processed_items > progress.total_items:
+                    progress.total_items = progress.processed_items
+                await self._report_progress(tenant_id, progress)
 
             progress.status = BulkOperationStatus.COMPLETED
             progress.completed_at = datetime.utcnow()
@@ -205,23 +618,103 @@ class BulkOperationsService:
                 user_id=user_id,
                 action=AuditAction.BULK_CREATE,
                 resource_type="entity",
-                description=f"Bulk import: {progress.successful_items} created, {progress.failed_items} failed",
+                description=(
+                    f"Bulk import: {progress.successful_items} created or updated, "
+                    f"{progress.skipped_items} skipped, {progress.failed_items} failed"
+                ),
                 success=progress.failed_items == 0,
             )
             db.add(audit)
             await db.commit()
 
+            logger.info(
+                "Bulk import completed",
+                operation_id=operation_id,
+                processed=progress.processed_items,
+                items_per_second=round(progress.items_per_second, 1),
+            )
+
             # Broadcast completion
-            await self._broadcast_completion(tenant_id, progress)
+            await self._report_completion(tenant_id, progress)
 
         except Exception as e:
             logger.error("Bulk import failed", error=str(e), operation_id=operation_id)
+            await db.rollback()
             progress.status = BulkOperationStatus.FAILED
             progress.completed_at = datetime.utcnow()
             progress.errors.append({"error": str(e), "type": "system"})
+            await job_registry.save(progress.to_job_record())
 
         return progress
 
+    async def _import_chunk(
+        self,
+        db: AsyncSession,
+        tenant_id: UUID,
+        chunk: list[tuple[int, dict[str, Any]]],
+        progress: BulkOperationProgress,
+        skip_duplicates: bool,
+        update_existing: bool,
+    ) -> None:
+        """Validate, stage and merge one chunk of import records in one transaction."""
+        started = time.perf_counter()
+        staged = []
+        for row_no, item in chunk:
+            try:
+                staged.append(normalize_entity_row(row_no, item))
+            except (ValueError, TypeError) as e:
+                progress.failed_items += 1
+                progress.errors.append(
+                    {"row": row_no, "item": item.get("name", "Unknown"), "error": str(e)}
+                )
+        progress.processed_items += len(chunk)
+        if not staged:
+            return
+
+        params = {"tenant_id": tenant_id, "now": datetime.now(UTC)}
+        try:
+            conn = await db.connection()
+            await conn.execute(text(_CREATE_STAGING_SQL))
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                IMPORT_STAGING_TABLE, records=staged, columns=IMPORT_STAGING_COLUMNS
+            )
+
+            updated: set[str] = set()
+            conflicts: list = []
+            if update_existing:
+                result = await conn.execute(text(_UPDATE_FROM_STAGING_SQL), params)
+                updated = set(result.scalars())
+            elif not skip_duplicates:
+                conflicts = (await conn.execute(text(_CONFLICTS_SQL), params)).all()
+            inserted = set((await conn.execute(text(_INSERT_FROM_STAGING_SQL), params)).scalars())
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.warning("Bulk import chunk failed", error=str(e), rows=len(staged))
+            progress.failed_items += len(staged)
+            progress.errors.append(
+                {"row": staged[0][0], "rows": len(staged), "error": str(e), "type": "chunk"}
+            )
+            return
+
+        for row_no, name in conflicts:
+            progress.errors.append(
+                {"row": row_no, "item": name, "error": f"Entity '{name}' already exists"}
+            )
+        succeeded = len(inserted) + len(updated)
+        progress.successful_items += succeeded
+        progress.failed_items += len(conflicts)
+        progress.skipped_items += len(staged) - succeeded - len(conflicts)
+
+        logger.debug(
+            "Bulk import chunk merged",
+            rows=len(chunk),
+            inserted=len(inserted),
+            updated=len(updated),
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
     async def bulk_update_entities(
         self,
         db: AsyncSession,
@@ -229,70 +722,127 @@ class BulkOperationsService:
         user_id: UUID,
         entity_ids: list[UUID],
         updates: dict[str, Any],
+        operation_id: str | None = None,
     ) -> BulkOperationProgress:
         """
         Bulk update multiple entities with the same changes.
 
+        Runs one `UPDATE ... WHERE id = ANY(:ids) RETURNING id` per chunk of
+        ids; ids not returned were not found in the tenant and are reported
+        as failures.
+
         Args:
             db: Database session
             tenant_id: Tenant ID
             user_id: User performing the operation
             entity_ids: List of entity IDs to update
             updates: Dictionary of field updates
+            operation_id: Existing (pending) operation to report progress on
 
         Returns:
             Operation progress
         """
-        operation_id = str(uuid4())
-        progress = BulkOperationProgress(
-            operation_id=operation_id,
-            operation_type=BulkOperationType.UPDATE,
-            status=BulkOperationStatus.PROCESSING,
-            total_items=len(entity_ids),
-            started_at=datetime.utcnow(),
+        ids = list(dict.fromkeys(entity_ids))
+        progress = self._start_operation(
+            BulkOperationType.UPDATE, tenant_id, len(ids), operation_id
         )
-        self._operations[operation_id] = progress
 
         try:
-            # Validate entity IDs belong to tenant
-            result = await db.execute(
-                select(Entity.id).where(
-                    Entity.id.in_(entity_ids),
-                    Entity.tenant_id == tenant_id,
+            check_updatable_fields(updates)
+            for chunk in _id_chunks(ids, self._set_chunk_size):
+                result = await db.execute(
+                    update(Entity)
+                    .where(Entity.tenant_id == tenant_id, Entity.id == any_(_ids_param(chunk)))
+                    .values(**updates, updated_at=datetime.now(UTC))
+                    .returning(Entity.id)
+                    .execution_options(synchronize_session=False)
                 )
+                _record_affected(progress, chunk, set(result.scalars()))
+                await db.commit()
+                await self._report_progress(tenant_id, progress)
+
+            progress.status = BulkOperationStatus.COMPLETED
+            progress.completed_at = datetime.utcnow()
+
+            # Audit log
+            audit = AuditLog(
+                tenant_id=tenant_id,
+                user_id=user_id,
+                action=AuditAction.BULK_UPDATE,
+                resource_type="entity",
+                description=f"Bulk update: {progress.successful_items} updated",
+                changes={"updates": updates, "entity_count": len(ids)},
+                success=progress.failed_items == 0,
             )
-            valid_ids = {row[0] for row in result}
+            db.add(audit)
+            await db.commit()
 
-            for entity_id in entity_ids:
-                try:
-                    if entity_id not in valid_ids:
-                        raise ValueError(f"Entity {entity_id} not found or access denied")
+            await self._report_completion(tenant_id, progress)
 
-                    # Update entity
-                    await db.execute(
-                        update(Entity)
-                        .where(Entity.id == entity_id)
-                        .values(**updates, updated_at=datetime.utcnow())
-                    )
-                    progress.successful_items += 1
-                    progress.processed_items += 1
-
-                except Exception as e:
-                    progress.failed_items += 1
-                    progress.processed_items += 1
-                    progress.errors.append(
-                        {
-                            "entity_id": str(entity_id),
-                            "error": str(e),
-                        }
-                    )
+        except Exception as e:
+            logger.error("Bulk update failed", error=str(e), operation_id=progress.operation_id)
+            await db.rollback()
+            progress.status = BulkOperationStatus.FAILED
+            progress.completed_at = datetime.utcnow()
+            progress.errors.append({"error": str(e), "type": "system"})
+            await job_registry.save(progress.to_job_record())
+
+        return progress
+
+    async def bulk_patch_entities(
+        self,
+        db: AsyncSession,
+        tenant_id: UUID,
+        user_id: UUID,
+        patches: list[dict[str, Any]],
+        operation_id: str | None = None,
+    ) -> BulkOperationProgress:
+        """
+        Bulk update entities with different values per entity.
+
+        Each patch is a dict with an `id` plus the fields to change. Patches
+        are grouped by the set of fields they change, and each group is
+        applied in chunks with `UPDATE entities ... FROM (VALUES ...)`, so
+        a chunk costs one statement however many rows it touches.
+
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            user_id: User performing the operation
+            patches: Per-entity changes, each with an `id`
+            operation_id: Existing (pending) operation to report progress on
+
+        Returns:
+            Operation progress
+        """
+        progress = self._start_operation(
+            BulkOperationType.UPDATE, tenant_id, len(patches), operation_id
+        )
+        table = Entity.__table__
 
-                # Commit in batches
-                if progress.processed_items % self._batch_size == 0:
+        try:
+            groups = group_patches(patches)
+            progress.total_items = sum(len(rows) for rows in groups.values())
+            for fields, rows in groups.items():
+                for chunk in _id_chunks(rows, self._set_chunk_size):
+                    patch = values(
+                        column("id", table.c.id.type),
+                        *(column(name, table.c[name].type) for name in fields),
+                        name="patch",
+                    ).data([(row["id"], *(row[name] for name in fields)) for row in chunk])
+                    result = await db.execute(
+                        update(table)
+                        .where(table.c.id == patch.c.id, table.c.tenant_id == tenant_id)
+                        .values(
+                            {name: cast(patch.c[name], table.c[name].type) for name in fields},
+                            updated_at=datetime.now(UTC),
+                        )
+                        .returning(table.c.id)
+                    )
+                    _record_affected(progress, [row["id"] for row in chunk], set(result.scalars()))
                     await db.commit()
-                    await self._broadcast_progress(tenant_id, progress)
+                    await self._report_progress(tenant_id, progress)
 
-            await db.commit()
             progress.status = BulkOperationStatus.COMPLETED
             progress.completed_at = datetime.utcnow()
 
@@ -302,19 +852,22 @@ class BulkOperationsService:
                 user_id=user_id,
                 action=AuditAction.BULK_UPDATE,
                 resource_type="entity",
-                description=f"Bulk update: {progress.successful_items} updated",
-                changes={"updates": updates, "entity_count": len(entity_ids)},
-                success=True,
+                description=f"Bulk patch: {progress.successful_items} updated",
+                changes={"fields": sorted({name for fields in groups for name in fields})},
+                success=progress.failed_items == 0,
             )
             db.add(audit)
             await db.commit()
 
-            await self._broadcast_completion(tenant_id, progress)
+            await self._report_completion(tenant_id, progress)
 
         except Exception as e:
-            logger.error("Bulk update failed", error=str(e))
+            logger.error("Bulk patch failed", error=str(e), operation_id=progress.operation_id)
+            await db.rollback()
             progress.status = BulkOperationStatus.FAILED
             progress.completed_at = datetime.utcnow()
+            progress.errors.append({"error": str(e), "type": "system"})
+            await job_registry.save(progress.to_job_record())
 
         return progress
 
@@ -325,54 +878,50 @@ class BulkOperationsService:
         user_id: UUID,
         entity_ids: list[UUID],
         soft_delete: bool = True,
+        operation_id: str | None = None,
     ) -> BulkOperationProgress:
         """
         Bulk delete multiple entities.
 
+        Deletes (or deactivates) in chunks with `WHERE id = ANY(:ids)
+        RETURNING id`; ids not returned are reported as failures.
+
         Args:
             db: Database session
             tenant_id: Tenant ID
             user_id: User performing the operation
             entity_ids: List of entity IDs to delete
             soft_delete: If True, mark as inactive; if False, hard delete
+            operation_id: Existing (pending) operation to report progress on
 
         Returns:
             Operation progress
         """
-        operation_id = str(uuid4())
-        progress = BulkOperationProgress(
-            operation_id=operation_id,
-            operation_type=BulkOperationType.DELETE,
-            status=BulkOperationStatus.PROCESSING,
-            total_items=len(entity_ids),
-            started_at=datetime.utcnow(),
+        ids = list(dict.fromkeys(entity_ids))
+        progress = self._start_operation(
+            BulkOperationType.DELETE, tenant_id, len(ids), operation_id
         )
-        self._operations[operation_id] = progress
 
         try:
-            if soft_delete:
-                # Soft delete - mark as inactive
-                await db.execute(
-                    update(Entity)
-                    .where(
-                        Entity.id.in_(entity_ids),
-                        Entity.tenant_id == tenant_id,
-                    )
-                    .values(is_active=False, updated_at=datetime.utcnow())
-                )
-            else:
-                # Hard delete
-                await db.execute(
-                    delete(Entity).where(
-                        Entity.id.in_(entity_ids),
-                        Entity.tenant_id == tenant_id,
+            for chunk in _id_chunks(ids, self._set_chunk_size):
+                condition = (Entity.tenant_id == tenant_id, Entity.id == any_(_ids_param(chunk)))
+                if soft_delete:
+                    # Soft delete - mark as inactive
+                    stmt = (
+                        update(Entity)
+                        .where(*condition)
+                        .values(is_active=False, updated_at=datetime.now(UTC))
                     )
+                else:
+                    # Hard delete
+                    stmt = delete(Entity).where(*condition)
+                result = await db.execute(
+                    stmt.returning(Entity.id).execution_options(synchronize_session=False)
                 )
+                _record_affected(progress, chunk, set(result.scalars()))
+                await db.commit()
+                await self._report_progress(tenant_id, progress)
 
-            await db.commit()
-
-            progress.successful_items = len(entity_ids)
-            progress.processed_items = len(entity_ids)
             progress.status = BulkOperationStatus.COMPLETED
             progress.completed_at = datetime.utcnow()
 
@@ -382,22 +931,95 @@ class BulkOperationsService:
                 user_id=user_id,
                 action=AuditAction.BULK_DELETE,
                 resource_type="entity",
-                description=f"Bulk {'soft ' if soft_delete else ''}delete: {len(entity_ids)} entities",
-                success=True,
+                description=(
+                    f"Bulk {'soft ' if soft_delete else ''}delete: "
+                    f"{progress.successful_items} entities"
+                ),
+                success=progress.failed_items == 0,
             )
             db.add(audit)
             await db.commit()
 
-            await self._broadcast_completion(tenant_id, progress)
+            await self._report_completion(tenant_id, progress)
 
         except Exception as e:
-            logger.error("Bulk delete failed", error=str(e))
+            logger.error("Bulk delete failed", error=str(e), operation_id=progress.operation_id)
+            await db.rollback()
             progress.status = BulkOperationStatus.FAILED
-            progress.failed_items = len(entity_ids)
             progress.completed_at = datetime.utcnow()
+            progress.errors.append({"error": str(e), "type": "system"})
+            await job_registry.save(progress.to_job_record())
+
+        return progress
+
+    async def run_in_background(
+        self,
+        operation_type: BulkOperationType,
+        tenant_id: UUID,
+        total_items: int,
+        run: Callable[[AsyncSession, str], Awaitable[BulkOperationProgress]],
+    ) -> BulkOperationProgress:
+        """
+        Start a bulk operation as a background task and return at once.
+
+        `run(db, operation_id)` is called with its own database session once
+        the task starts; the returned progress is pending until then and is
+        updated in place, so it can be polled via `get_operation_status` (or
+        the job registry, from any worker).
+        """
+        progress = BulkOperationProgress(
+            operation_id=str(uuid4()),
+            operation_type=operation_type,
+            status=BulkOperationStatus.PENDING,
+            total_items=total_items,
+            tenant_id=tenant_id,
+        )
+        self._remember(progress)
+        await job_registry.save(progress.to_job_record())
+
+        async def runner():
+            async with AsyncSessionLocal() as db:
+                await run(db, progress.operation_id)
 
+        task = asyncio.create_task(runner())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
         return progress
 
+    def _start_operation(
+        self,
+        operation_type: BulkOperationType,
+        tenant_id: UUID,
+        total_items: int,
+        operation_id: str | None = None,
+    ) -> BulkOperationProgress:
+        """Register a new operation, or pick up a pending background one."""
+        progress = self._operations.get(operation_id) if operation_id else None
+        if progress is None:
+            progress = BulkOperationProgress(
+                operation_id=operation_id or str(uuid4()),
+                operation_type=operation_type,
+                status=BulkOperationStatus.PENDING,
+                tenant_id=tenant_id,
+            )
+            self._remember(progress)
+        progress.status = BulkOperationStatus.PROCESSING
+        progress.total_items = total_items
+        progress.started_at = datetime.utcnow()
+        return progress
+
+    def _remember(self, progress: BulkOperationProgress) -> None:
+        """Track an operation locally, forgetting the oldest finished ones."""
+        self._operations[progress.operation_id] = progress
+        excess = len(self._operations) - self._max_local_operations
+        if excess > 0:
+            finished = sorted(
+                (op for op in self._operations.values() if op.finished),
+                key=lambda op: op.started_at or datetime.min,
+            )
+            for op in finished[:excess]:
+                del self._operations[op.operation_id]
+
     async def parse_csv(self, csv_content: str) -> list[dict[str, Any]]:
         """
         Parse CSV content into a list of dictionaries.
@@ -439,10 +1061,21 @@ class BulkOperationsService:
         limit: int = 10,
     ) -> list[dict[str, Any]]:
         """List recent bulk operations."""
-        operations = list(self._operations.values())
+        operations = [
+            op for op in self._operations.values() if tenant_id is None or op.tenant_id == tenant_id
+        ]
         operations.sort(key=lambda x: x.started_at or datetime.min, reverse=True)
         return [op.to_dict() for op in operations[:limit]]
 
+    async def _report_progress(self, tenant_id: UUID, progress: BulkOperationProgress):
+        """Checkpoint progress in the job registry and broadcast it."""
+        await job_registry.save(progress.to_job_record())
+        await self._broadcast_progress(tenant_id, progress)
+
+    async def _report_completion(self, tenant_id: UUID, progress: BulkOperationProgress):
+        await job_registry.save(progress.to_job_record())
+        await self._broadcast_completion(tenant_id, progress)
+
     async def _broadcast_progress(self, tenant_id: UUID, progress: BulkOperationProgress):
         """Broadcast operation progress via WebSocket."""
         await ws_manager.broadcast_to_tenant(
@@ -451,6 +1084,8 @@ class BulkOperationsService:
                 "type": "bulk_operation_progress",
                 "operation": progress.to_dict(),
             },
+            # Slow clients only need the latest progress of an operation
+            coalesce_key=f"bulk_progress:{progress.operation_id}",
         )
 
     async def _broadcast_completion(self, tenant_id: UUID, progress: BulkOperationProgress):
@@ -0,0 +1,430 @@
+"""
+Company Hierarchy (Phase 7)
+Persistent holding structure of Russian company profiles with incrementally
+maintained consolidated compliance.
+
+- `ru_company_hierarchy` is a closure table: every (ancestor, descendant)
+  pair of the tree, so a subtree or the ancestors of a company are one
+  indexed lookup, at any depth.
+- `ru_company_rollups` holds the document counts of each company and of its
+  whole subtree. A parent's consolidated view is a single row read.
+- A change to a company's documents updates its own counts and the subtree
+  counts of its ancestors in one statement each, O(depth) rows. Moving a
+  company moves its subtree's closure rows and counts from the old
+  ancestors to the new ones.
+
+The tables are kept current by ORM hooks in the same transaction as the
+change. Bulk statements that bypass the ORM report their document counts
+through `apply_bulk_document_deltas`; `rebuild_rollups` re-derives a whole
+tenant from its documents.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Connection, and_, delete, event, func, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, object_session
+
+from app.models.compliance.russian import (
+    DocumentStatus,
+    RuCompanyHierarchy,
+    RuCompanyProfile,
+    RuCompanyRollup,
+    RuComplianceDocument,
+)
+
+# session.info key collecting per-company document deltas of the current flush
+_PENDING_KEY = "company_rollup_pending"
+
+
+class HierarchyError(ValueError):
+    """A hierarchy change would make a company its own ancestor."""
+
+
+def document_score(approved: int, total: int) -> float:
+    """Share of approved documents in percent, as on the compliance dashboard."""
+    if total <= 0:
+        return 0.0
+    return round(approved * 100 / total, 1)
+
+
+@dataclass
+class DocumentDelta:
+    """Change of a company's total and approved document counts."""
+
+    total: int = 0
+    approved: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.total or self.approved)
+
+
+# Maintenance, on the flushing connection
+
+
+def _ancestors(company_id: UUID, include_self: bool = True):
+    """Ids of the company's ancestors, as a subquery."""
+    query = select(RuCompanyHierarchy.ancestor_id).where(
+        RuCompanyHierarchy.descendant_id == company_id
+    )
+    if not include_self:
+        query = query.where(RuCompanyHierarchy.depth > 0)
+    return query
+
+
+def _subtree_counts(connection: Connection, company_id: UUID) -> tuple[int, int, int]:
+    row = connection.execute(
+        select(
+            RuCompanyRollup.subtree_documents_total,
+            RuCompanyRollup.subtree_documents_approved,
+            RuCompanyRollup.subtree_companies,
+        ).where(RuCompanyRollup.company_id == company_id)
+    ).first()
+    return tuple(row) if row is not None else (0, 0, 0)
+
+
+def _add_to_subtrees(
+    connection: Connection, ancestors, total: int, approved: int, companies: int = 0
+) -> None:
+    if not (total or approved or companies):
+        return
+    connection.execute(
+        update(RuCompanyRollup)
+        .where(RuCompanyRollup.company_id.in_(ancestors))
+        .values(
+            subtree_documents_total=RuCompanyRollup.subtree_documents_total + total,
+            subtree_documents_approved=RuCompanyRollup.subtree_documents_approved + approved,
+            subtree_companies=RuCompanyRollup.subtree_companies + companies,
+            updated_at=func.now(),
+        )
+    )
+
+
+def is_in_subtree(connection: Connection, ancestor_id: UUID, company_id: UUID) -> bool:
+    """Whether `company_id` is `ancestor_id` or one of its subsidiaries."""
+    return (
+        connection.execute(
+            select(RuCompanyHierarchy.depth).where(
+                RuCompanyHierarchy.ancestor_id == ancestor_id,
+                RuCompanyHierarchy.descendant_id == company_id,
+            )
+        ).first()
+        is not None
+    )
+
+
+def _attach(connection: Connection, company_id: UUID, parent_id: UUID) -> None:
+    """Link the company's subtree below the parent and its ancestors."""
+    if is_in_subtree(connection, company_id, parent_id):
+        raise HierarchyError("A company cannot be placed under itself or its subsidiary")
+    above = aliased(RuCompanyHierarchy)
+    below = aliased(RuCompanyHierarchy)
+    connection.execute(
+        insert(RuCompanyHierarchy).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            # Every ancestor of the parent (itself included) x every company of the subtree
+            select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+            .join(below, below.ancestor_id == company_id)
+            .where(above.descendant_id == parent_id),
+        )
+    )
+    _add_to_subtrees(connection, _ancestors(parent_id), *_subtree_counts(connection, company_id))
+
+
+def _detach(connection: Connection, company_id: UUID) -> None:
+    """Unlink the company's subtree from its ancestors, making it a root."""
+    ancestors = list(connection.execute(_ancestors(company_id, include_self=False)).scalars())
+    if not ancestors:
+        return
+    total, approved, companies = _subtree_counts(connection, company_id)
+    _add_to_subtrees(connection, ancestors, -total, -approved, -companies)
+    subtree = select(RuCompanyHierarchy.descendant_id).where(
+        RuCompanyHierarchy.ancestor_id == company_id
+    )
+    connection.execute(
+        delete(RuCompanyHierarchy).where(
+            RuCompanyHierarchy.descendant_id.in_(subtree),
+            RuCompanyHierarchy.ancestor_id.in_(ancestors),
+        )
+    )
+
+
+def add_company(
+    connection: Connection, company_id: UUID, tenant_id: UUID, parent_id: UUID | None = None
+) -> None:
+    """Register a new company (without documents), optionally below a parent."""
+    connection.execute(
+        insert(RuCompanyRollup).values(
+            company_id=company_id,
+            tenant_id=tenant_id,
+            documents_total=0,
+            documents_approved=0,
+            subtree_documents_total=0,
+            subtree_documents_approved=0,
+            subtree_companies=1,
+            updated_at=func.now(),
+        )
+    )
+    connection.execute(
+        insert(RuCompanyHierarchy).values(ancestor_id=company_id, descendant_id=company_id, depth=0)
+    )
+    if parent_id is not None:
+        _attach(connection, company_id, parent_id)
+
+
+def move_company(connection: Connection, company_id: UUID, parent_id: UUID | None) -> None:
+    """Move a company, with its subsidiaries, below another parent (None: make it a root)."""
+    if parent_id is not None and is_in_subtree(connection, company_id, parent_id):
+        raise HierarchyError("A company cannot be placed under itself or its subsidiary")
+    _detach(connection, company_id)
+    if parent_id is not None:
+        _attach(connection, company_id, parent_id)
+
+
+def remove_company(connection: Connection, company_id: UUID) -> None:
+    """
+    Take a company about to be deleted out of its ancestors' counts. Its
+    subsidiaries become roots; its own closure and rollup rows go with it
+    by cascade.
+    """
+    _detach(connection, company_id)
+
+
+def apply_document_deltas(connection: Connection, deltas: Mapping[UUID, DocumentDelta]) -> None:
+    """Apply document count changes to the companies and all their ancestors."""
+    for company_id, delta in deltas.items():
+        if not delta:
+            continue
+        connection.execute(
+            update(RuCompanyRollup)
+            .where(RuCompanyRollup.company_id == company_id)
+            .values(
+                documents_total=RuCompanyRollup.documents_total + delta.total,
+                documents_approved=RuCompanyRollup.documents_approved + delta.approved,
+            )
+        )
+        _add_to_subtrees(connection, _ancestors(company_id), delta.total, delta.approved)
+
+
+async def apply_bulk_document_deltas(
+    db: AsyncSession, deltas: Mapping[UUID, DocumentDelta]
+) -> None:
+    """apply_document_deltas for documents written with bulk statements."""
+    await db.run_sync(lambda session: apply_document_deltas(session.connection(), deltas))
+
+
+def rebuild_statements(tenant_id: UUID) -> list[Any]:
+    """
+    Statements re-deriving a tenant's rollups from its documents and the
+    closure table, for data loaded behind the ORM's back.
+    """
+    own = (
+        select(
+            RuComplianceDocument.company_id,
+            func.count().label("total"),
+            func.count()
+            .filter(RuComplianceDocument.status == DocumentStatus.APPROVED)
+            .label("approved"),
+        )
+        .where(RuComplianceDocument.tenant_id == tenant_id)
+        .group_by(RuComplianceDocument.company_id)
+        .subquery()
+    )
+    companies = select(RuCompanyProfile.id).where(RuCompanyProfile.tenant_id == tenant_id)
+    subtree = (
+        select(
+            RuCompanyHierarchy.ancestor_id,
+            func.coalesce(func.sum(own.c.total), 0).label("total"),
+            func.coalesce(func.sum(own.c.approved), 0).label("approved"),
+            func.count().label("companies"),
+        )
+        .outerjoin(own, own.c.company_id == RuCompanyHierarchy.descendant_id)
+        .where(RuCompanyHierarchy.ancestor_id.in_(companies))
+        .group_by(RuCompanyHierarchy.ancestor_id)
+        .subquery()
+    )
+    tenant_rollups = RuCompanyRollup.tenant_id == tenant_id
+    return [
+        update(RuCompanyRollup)
+        .where(tenant_rollups)
+        .values(
+            documents_total=func.coalesce(
+                select(own.c.total)
+                .where(own.c.company_id == RuCompanyRollup.company_id)
+                .scalar_subquery(),
+                0,
+            ),
+            documents_approved=func.coalesce(
+                select(own.c.approved)
+                .where(own.c.company_id == RuCompanyRollup.company_id)
+                .scalar_subquery(),
+                0,
+            ),
+        ),
+        update(RuCompanyRollup)
+        .where(and_(tenant_rollups, RuCompanyRollup.company_id == subtree.c.ancestor_id))
+        .values(
+            subtree_documents_total=subtree.c.total,
+            subtree_documents_approved=subtree.c.approved,
+            subtree_companies=subtree.c.companies,
+            updated_at=func.now(),
+        ),
+    ]
+
+
+async def rebuild_rollups(db: AsyncSession, tenant_id: UUID) -> None:
+    """Re-derive every rollup of a tenant."""
+    for statement in rebuild_statements(tenant_id):
+        await db.execute(statement)
+
+
+# Reads
+
+
+async def get_rollup(db: AsyncSession, company_id: UUID) -> RuCompanyRollup | None:
+    """Own and consolidated counts of a company, one row."""
+    return await db.get(RuCompanyRollup, company_id)
+
+
+def rollup_summary(rollup: RuCompanyRollup) -> dict[str, Any]:
+    return {
+        "documents_total": rollup.documents_total,
+        "documents_approved": rollup.documents_approved,
+        "compliance_score": document_score(rollup.documents_approved, rollup.documents_total),
+        "subtree_companies": rollup.subtree_companies,
+        "consolidated_documents_total": rollup.subtree_documents_total,
+        "consolidated_documents_approved": rollup.subtree_documents_approved,
+        "consolidated_score": document_score(
+            rollup.subtree_documents_approved, rollup.subtree_documents_total
+        ),
+    }
+
+
+async def company_tree(db: AsyncSession, root_id: UUID) -> dict[str, Any] | None:
+    """The company and all its subsidiaries with their rollups, from one query."""
+    result = await db.execute(
+        select(
+            RuCompanyProfile.id,
+            RuCompanyProfile.parent_id,
+            RuCompanyProfile.inn,
+            RuCompanyProfile.full_name,
+            RuCompanyHierarchy.depth,
+            RuCompanyRollup,
+        )
+        .join(RuCompanyHierarchy, RuCompanyHierarchy.descendant_id == RuCompanyProfile.id)
+        .join(RuCompanyRollup, RuCompanyRollup.company_id == RuCompanyProfile.id)
+        .where(RuCompanyHierarchy.ancestor_id == root_id)
+        .order_by(RuCompanyHierarchy.depth, RuCompanyProfile.full_name)
+    )
+    nodes: dict[UUID, dict[str, Any]] = {}
+    root = None
+    # Ordered by depth, so parents come before their subsidiaries
+    for company_id, parent_id, inn, full_name, depth, rollup in result.all():
+        node = {
+            "id": company_id,
+            "parent_id": parent_id,
+            "inn": inn,
+            "full_name": full_name,
+            "depth": depth,
+            **rollup_summary(rollup),
+            "subsidiaries": [],
+        }
+        nodes[company_id] = node
+        if depth == 0:
+            root = node
+        elif parent_id in nodes:
+            nodes[parent_id]["subsidiaries"].append(node)
+    return root
+
+
+async def is_subsidiary(db: AsyncSession, ancestor_id: UUID, company_id: UUID) -> bool:
+    """Whether `company_id` is `ancestor_id` or one of its subsidiaries."""
+    return await db.run_sync(
+        lambda session: is_in_subtree(session.connection(), ancestor_id, company_id)
+    )
+
+
+# ORM hooks: company and document changes update the hierarchy in the same transaction
+
+
+def _committed(target: Any, attribute: str) -> Any:
+    """Value of the attribute before the current flush."""
+    history = inspect(target).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, attribute)
+
+
+def _is_approved(status: Any) -> int:
+    return int(status == DocumentStatus.APPROVED)
+
+
+def _pending(session: Session) -> dict[UUID, DocumentDelta]:
+    return session.info.setdefault(_PENDING_KEY, {})
+
+
+def _record(session: Session, company_id: UUID | None, total: int, approved: int) -> None:
+    if company_id is None:
+        return
+    delta = _pending(session).setdefault(company_id, DocumentDelta())
+    delta.total += total
+    delta.approved += approved
+
+
+@event.listens_for(RuCompanyProfile, "after_insert")
+def _company_inserted(mapper, connection: Connection, target: RuCompanyProfile) -> None:
+    add_company(connection, target.id, target.tenant_id, target.parent_id)
+
+
+@event.listens_for(RuCompanyProfile, "after_update")
+def _company_updated(mapper, connection: Connection, target: RuCompanyProfile) -> None:
+    if inspect(target).attrs.parent_id.history.has_changes():
+        move_company(connection, target.id, target.parent_id)
+
+
+@event.listens_for(RuCompanyProfile, "before_delete")
+def _company_deleted(mapper, connection: Connection, target: RuCompanyProfile) -> None:
+    remove_company(connection, target.id)
+
+
+@event.listens_for(RuComplianceDocument, "after_insert")
+def _document_inserted(mapper, connection, target: RuComplianceDocument) -> None:
+    session = object_session(target)
+    if session is not None:
+        _record(session, target.company_id, 1, _is_approved(target.status))
+
+
+@event.listens_for(RuComplianceDocument, "after_delete")
+def _document_deleted(mapper, connection, target: RuComplianceDocument) -> None:
+    session = object_session(target)
+    if session is not None:
+        status = _committed(target, "status")
+        _record(session, _committed(target, "company_id"), -1, -_is_approved(status))
+
+
+@event.listens_for(RuComplianceDocument, "after_update")
+def _document_updated(mapper, connection, target: RuComplianceDocument) -> None:
+    state = inspect(target)
+    session = object_session(target)
+    if session is None or not any(
+        state.attrs[name].history.has_changes() for name in ("status", "company_id")
+    ):
+        return
+    previous = _is_approved(_committed(target, "status"))
+    _record(session, _committed(target, "company_id"), -1, -previous)
+    _record(session, target.company_id, 1, _is_approved(target.status))
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_flushed(session: Session, flush_context) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        apply_document_deltas(session.connection(), pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
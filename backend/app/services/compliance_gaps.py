@@ -0,0 +1,321 @@
+"""
+Compliance Gap Index (Phase 5.2)
+Maintains `compliance_gaps`: one row per control that is not fully
+implemented, with its severity, framework name and evidence count
+precomputed, so gap listings are indexed range scans instead of a join
+over every control sorted in Python.
+
+- Rows are refreshed set-based in the same transaction as the change:
+  ORM hooks collect the controls touched by a flush (control inserts,
+  deletes and status/priority/title/category/framework changes, evidence
+  links added or removed, framework renames) and re-derive just those rows.
+  Assessments move gaps through the control status they set.
+- Listings are paginated by keyset over (severity, priority, control id),
+  matching the table's indexes.
+- `rebuild_gap_index` re-derives a whole tenant (`POST /admin/compliance-gaps/rebuild`),
+  for data loaded with bulk statements that bypass the ORM.
+"""
+
+import base64
+import json
+from collections.abc import Iterable
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import (
+    and_,
+    case,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    or_,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.sql import ColumnElement, Select
+
+from app.models.compliance.evidence import EvidenceLink
+from app.models.compliance.framework import (
+    AssessmentResult,
+    ComplianceGap,
+    Control,
+    Framework,
+)
+
+# Severities in listing order; the index stores the position as severity_rank
+SEVERITIES = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITIES)}
+
+DEFAULT_PRIORITY = 2
+DEFAULT_STATUS = AssessmentResult.NOT_ASSESSED.value
+
+# Controls per refresh statement
+REFRESH_BATCH_SIZE = 1000
+
+# session.info key collecting controls and frameworks changed in the current flush
+_PENDING_KEY = "compliance_gaps_pending"
+
+
+def calculate_severity(priority: int, status: str) -> str:
+    """Calculate gap severity based on priority and status."""
+    if priority == 1 and status == "NOT_IMPLEMENTED":
+        return "CRITICAL"
+    elif priority == 1 or (priority == 2 and status == "NOT_IMPLEMENTED"):
+        return "HIGH"
+    elif priority == 2:
+        return "MEDIUM"
+    else:
+        return "LOW"
+
+
+def severity_expression(priority: ColumnElement, status: ColumnElement) -> ColumnElement:
+    """SQL equivalent of calculate_severity."""
+    not_implemented = status == "NOT_IMPLEMENTED"
+    return case(
+        (and_(priority == 1, not_implemented), "CRITICAL"),
+        (or_(priority == 1, and_(priority == 2, not_implemented)), "HIGH"),
+        (priority == 2, "MEDIUM"),
+        else_="LOW",
+    )
+
+
+# Columns filled by gap_rows, in select order
+GAP_COLUMNS = [
+    "control_id",
+    "tenant_id",
+    "framework_id",
+    "control_ref",
+    "control_title",
+    "framework_name",
+    "category",
+    "status",
+    "priority",
+    "severity",
+    "severity_rank",
+    "evidence_count",
+]
+
+
+def gap_rows(*conditions: ColumnElement) -> Select:
+    """Gap rows derived from controls matching the conditions."""
+    priority = func.coalesce(Control.priority, DEFAULT_PRIORITY)
+    status = func.coalesce(Control.implementation_status, DEFAULT_STATUS)
+    severity = severity_expression(priority, status)
+    evidence_count = (
+        select(func.count(EvidenceLink.id))
+        .where(EvidenceLink.control_id == Control.id)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Control.id,
+            Control.tenant_id,
+            Control.framework_id,
+            Control.control_id,
+            Control.title,
+            Framework.name,
+            Control.category,
+            status,
+            priority,
+            severity,
+            case(SEVERITY_RANK, value=severity),
+            evidence_count,
+        )
+        .join(Framework, Control.framework_id == Framework.id)
+        .where(Control.implementation_status != AssessmentResult.FULLY_IMPLEMENTED.value)
+        .where(*conditions)
+    )
+
+
+def _batches(ids: Iterable[UUID]) -> list[list[UUID]]:
+    ids = list(ids)
+    return [ids[i : i + REFRESH_BATCH_SIZE] for i in range(0, len(ids), REFRESH_BATCH_SIZE)]
+
+
+def refresh_statements(
+    control_ids: Iterable[UUID] = (), framework_ids: Iterable[UUID] = ()
+) -> list[Any]:
+    """DELETE + INSERT ... SELECT pairs re-deriving the gaps of the given controls/frameworks."""
+    statements = []
+    for ids in _batches(control_ids):
+        statements.append(delete(ComplianceGap).where(ComplianceGap.control_id.in_(ids)))
+        statements.append(
+            insert(ComplianceGap).from_select(GAP_COLUMNS, gap_rows(Control.id.in_(ids)))
+        )
+    for ids in _batches(framework_ids):
+        statements.append(delete(ComplianceGap).where(ComplianceGap.framework_id.in_(ids)))
+        statements.append(
+            insert(ComplianceGap).from_select(GAP_COLUMNS, gap_rows(Control.framework_id.in_(ids)))
+        )
+    return statements
+
+
+async def rebuild_gap_index(db: AsyncSession, tenant_id: UUID) -> int:
+    """Re-derive every gap of a tenant; returns the number of gaps."""
+    await db.execute(delete(ComplianceGap).where(ComplianceGap.tenant_id == tenant_id))
+    await db.execute(
+        insert(ComplianceGap).from_select(GAP_COLUMNS, gap_rows(Control.tenant_id == tenant_id))
+    )
+    result = await db.execute(
+        select(func.count()).select_from(ComplianceGap).where(ComplianceGap.tenant_id == tenant_id)
+    )
+    return result.scalar_one()
+
+
+# Queries
+
+
+def _filtered(
+    query: Select, tenant_id: UUID, framework_id: UUID | None, severity: str | None
+) -> Select:
+    query = query.where(ComplianceGap.tenant_id == tenant_id)
+    if framework_id is not None:
+        query = query.where(ComplianceGap.framework_id == framework_id)
+    if severity is not None:
+        query = query.where(ComplianceGap.severity_rank == SEVERITY_RANK[severity])
+    return query
+
+
+_ORDER = (
+    ComplianceGap.severity_rank,
+    ComplianceGap.priority,
+    ComplianceGap.control_ref,
+    ComplianceGap.control_id,
+)
+
+
+async def top_gaps(
+    db: AsyncSession,
+    tenant_id: UUID,
+    framework_id: UUID | None = None,
+    severities: list[str] | None = None,
+    limit: int = 50,
+) -> dict[str, list[ComplianceGap]]:
+    """Up to `limit` gaps per severity, highest priority first, in one round-trip."""
+    severities = [s for s in (severities or SEVERITIES) if s in SEVERITY_RANK]
+    buckets: dict[str, list[ComplianceGap]] = {severity: [] for severity in SEVERITIES}
+    if not severities:
+        return buckets
+    per_severity = [
+        _filtered(select(ComplianceGap), tenant_id, framework_id, severity)
+        .order_by(*_ORDER)
+        .limit(limit)
+        for severity in severities
+    ]
+    statement = per_severity[0] if len(per_severity) == 1 else union_all(*per_severity)
+    result = await db.execute(select(ComplianceGap).from_statement(statement))
+    for gap in result.scalars():
+        buckets[gap.severity].append(gap)
+    return buckets
+
+
+def encode_cursor(gap: ComplianceGap) -> str:
+    raw = json.dumps([gap.severity_rank, gap.priority, gap.control_ref, str(gap.control_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[int, int, str, UUID]:
+    """Keyset position of a cursor; ValueError when it is malformed."""
+    try:
+        rank, priority, control_ref, control_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return int(rank), int(priority), str(control_ref), UUID(control_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid gap cursor") from e
+
+
+async def gap_page(
+    db: AsyncSession,
+    tenant_id: UUID,
+    framework_id: UUID | None = None,
+    severity: str | None = None,
+    limit: int = 50,
+    after: str | None = None,
+) -> tuple[list[ComplianceGap], str | None]:
+    """
+    One page of gaps in (severity, priority, control) order, starting after
+    the cursor; returns the gaps and the cursor of the next page (None at
+    the end).
+    """
+    query = _filtered(select(ComplianceGap), tenant_id, framework_id, severity)
+    if after is not None:
+        query = query.where(tuple_(*_ORDER) > tuple_(*decode_cursor(after)))
+    result = await db.execute(query.order_by(*_ORDER).limit(limit + 1))
+    gaps = list(result.scalars())
+    if len(gaps) <= limit:
+        return gaps, None
+    return gaps[:limit], encode_cursor(gaps[limit - 1])
+
+
+# ORM hooks: a flush that changes gap inputs refreshes the affected rows before commit
+
+
+def _pending(session: Session) -> dict[str, set[UUID]]:
+    return session.info.setdefault(_PENDING_KEY, {"controls": set(), "frameworks": set()})
+
+
+def _changed(target: Any, attributes: tuple[str, ...]) -> bool:
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+def _track_control(*attributes: str):
+    def listener(mapper, connection, target: Control) -> None:
+        session = object_session(target)
+        if session is not None and (not attributes or _changed(target, attributes)):
+            _pending(session)["controls"].add(target.id)
+
+    return listener
+
+
+def _track_evidence_link(changed_only: bool = False):
+    def listener(mapper, connection, target: EvidenceLink) -> None:
+        session = object_session(target)
+        history = inspect(target).attrs.control_id.history
+        if session is None or (changed_only and not history.has_changes()):
+            return
+        # Both the previous and the current control of a moved link
+        controls = _pending(session)["controls"]
+        controls.update(c for c in (*history.deleted, target.control_id) if c is not None)
+
+    return listener
+
+
+def _track_framework(mapper, connection, target: Framework) -> None:
+    session = object_session(target)
+    if session is not None and _changed(target, ("name",)):
+        _pending(session)["frameworks"].add(target.id)
+
+
+event.listen(Control, "after_insert", _track_control())
+event.listen(Control, "after_delete", _track_control())
+event.listen(
+    Control,
+    "after_update",
+    _track_control(
+        "implementation_status", "priority", "title", "category", "control_id", "framework_id"
+    ),
+)
+event.listen(EvidenceLink, "after_insert", _track_evidence_link())
+event.listen(EvidenceLink, "after_delete", _track_evidence_link())
+event.listen(EvidenceLink, "after_update", _track_evidence_link(changed_only=True))
+event.listen(Framework, "after_update", _track_framework)
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_flushed(session: Session, flush_context) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    connection = session.connection()
+    for statement in refresh_statements(pending["controls"], pending["frameworks"]):
+        connection.execute(statement)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
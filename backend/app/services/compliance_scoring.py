@@ -0,0 +1,236 @@
+"""
+Compliance Scoring (Phase 5.2)
+Per-framework control counts for compliance scores and the dashboard.
+
+- Counts for all of a tenant's frameworks come from one grouped aggregate
+  (`COUNT(*) FILTER (WHERE implementation_status = ...)` per status,
+  grouped by framework) instead of four COUNT queries per framework.
+- Counts are cached per tenant in the shared cache; any committed insert,
+  delete or status change of a control, or change to a framework, drops
+  the tenant's entry.
+- The cross-framework mapping matrix is built once at import: each
+  framework name maps to its targets, so mapping a tenant's frameworks is
+  a lookup per framework instead of a scan over every pair.
+"""
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import and_, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import cache_manager
+from app.core.config import settings
+from app.models.compliance.framework import AssessmentResult, Control, Framework
+
+# session.info key collecting tenants whose scores changed in the current transaction
+_PENDING_KEY = "compliance_score_pending"
+
+
+@dataclass
+class FrameworkCounts:
+    """Control counts of one framework by implementation status."""
+
+    framework_id: str
+    framework_name: str
+    framework_type: str
+    total_controls: int
+    implemented: int
+    partially_implemented: int
+    not_implemented: int
+
+    @property
+    def not_assessed(self) -> int:
+        assessed = self.implemented + self.partially_implemented + self.not_implemented
+        return self.total_controls - assessed
+
+    @property
+    def score(self) -> float:
+        """Fully implemented = 100%, partially = 50%, anything else = 0%."""
+        return compliance_score(self.implemented, self.partially_implemented, self.total_controls)
+
+
+def compliance_score(implemented: int, partially_implemented: int, total: int) -> float:
+    if total <= 0:
+        return 0.0
+    return ((implemented * 100) + (partially_implemented * 50)) / total
+
+
+def _status_count(status: AssessmentResult):
+    return func.count(Control.id).filter(Control.implementation_status == status.value)
+
+
+async def load_framework_counts(db: AsyncSession, tenant_id: UUID) -> list[FrameworkCounts]:
+    """Counts of every active framework of the tenant, by name, in one query."""
+    result = await db.execute(
+        select(
+            Framework.id,
+            Framework.name,
+            Framework.type,
+            func.count(Control.id),
+            _status_count(AssessmentResult.FULLY_IMPLEMENTED),
+            _status_count(AssessmentResult.PARTIALLY_IMPLEMENTED),
+            _status_count(AssessmentResult.NOT_IMPLEMENTED),
+        )
+        .outerjoin(
+            Control,
+            and_(Control.framework_id == Framework.id, Control.tenant_id == tenant_id),
+        )
+        .where(Framework.tenant_id == tenant_id, Framework.is_active == True)  # noqa: E712
+        .group_by(Framework.id)
+        .order_by(Framework.name)
+    )
+    # Columns after id, name and type are the counts, in FrameworkCounts field order
+    return [
+        FrameworkCounts(
+            str(framework_id),
+            name,
+            getattr(framework_type, "value", framework_type) or "CUSTOM",
+            *status_counts,
+        )
+        for framework_id, name, framework_type, *status_counts in result.all()
+    ]
+
+
+class ComplianceScoreCache:
+    """
+    Framework counts per tenant in the shared (Redis) cache, so every
+    worker sees an invalidation at once.
+    """
+
+    def __init__(self, ttl: int | None = None):
+        self.ttl = ttl or settings.COMPLIANCE_SCORE_CACHE_TTL_SECONDS
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def key(tenant_id: UUID) -> str:
+        return f"compliance_score:{tenant_id}"
+
+    async def get_counts(self, db: AsyncSession, tenant_id: UUID) -> list[FrameworkCounts]:
+        """Cached framework counts of the tenant, loaded on a miss."""
+        cached = await cache_manager.get(self.key(tenant_id))
+        if cached is not None:
+            return [FrameworkCounts(**counts) for counts in cached]
+        counts = await load_framework_counts(db, tenant_id)
+        await cache_manager.set(self.key(tenant_id), [asdict(c) for c in counts], self.ttl)
+        return counts
+
+    async def invalidate(self, tenant_id: UUID) -> None:
+        await cache_manager.delete(self.key(tenant_id))
+
+    def _schedule_invalidation(self, tenant_ids: set[UUID]) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside the event loop (scripts); entries expire with their TTL
+            return
+        for tenant_id in tenant_ids:
+            task = loop.create_task(self.invalidate(tenant_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+
+# Global instance
+compliance_score_cache = ComplianceScoreCache()
+
+
+# ORM hooks: committed changes that move a tenant's counts drop its cached scores
+
+
+def _track_change(*attributes: str):
+    def listener(mapper, connection, target) -> None:
+        if attributes:
+            state = inspect(target)
+            if not any(state.attrs[name].history.has_changes() for name in attributes):
+                return
+        session = object_session(target)
+        if session is not None and target.tenant_id is not None:
+            session.info.setdefault(_PENDING_KEY, set()).add(target.tenant_id)
+
+    return listener
+
+
+for _model, _attributes in (
+    (Control, ("implementation_status", "framework_id", "tenant_id")),
+    (Framework, ("name", "type", "is_active", "tenant_id")),
+):
+    event.listen(_model, "after_insert", _track_change())
+    event.listen(_model, "after_delete", _track_change())
+    event.listen(_model, "after_update", _track_change(*_attributes))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        compliance_score_cache._schedule_invalidation(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# Approximate share of the target framework's requirements satisfied by
+# complying with the source framework
+FRAMEWORK_MAPPINGS: dict[tuple[str, str], float] = {
+    ("ISO/IEC 27001:2022", "SOC 2 Type II"): 0.85,
+    ("ISO/IEC 27001:2022", "152-FZ Personal Data Protection"): 0.60,
+    ("ISO/IEC 27001:2022", "GOST R 57580.1-2017 Financial Sector Security"): 0.75,
+    ("SOC 2 Type II", "ISO/IEC 27001:2022"): 0.85,
+    ("GDPR", "152-FZ Personal Data Protection"): 0.70,
+    ("PCI DSS v4.0", "CBR 382-P Banking Information Security"): 0.65,
+    ("152-FZ Personal Data Protection", "GDPR"): 0.70,
+    (
+        "CBR 382-P Banking Information Security",
+        "GOST R 57580.1-2017 Financial Sector Security",
+    ): 0.80,
+    ("187-FZ Critical Information Infrastructure", "ISO/IEC 27001:2022"): 0.55,
+}
+
+
+def _mapping_matrix() -> dict[str, list[tuple[str, float]]]:
+    """Source framework name -> (target name, efficiency), targets sorted by name."""
+    matrix: dict[str, list[tuple[str, float]]] = {}
+    for (source, target), efficiency in FRAMEWORK_MAPPINGS.items():
+        matrix.setdefault(source, []).append((target, efficiency))
+    for targets in matrix.values():
+        targets.sort()
+    return matrix
+
+
+MAPPING_MATRIX = _mapping_matrix()
+
+
+def framework_mappings(frameworks: list[tuple[UUID, str]]) -> list[dict[str, Any]]:
+    """
+    Mappings between the given (id, name) frameworks, in source then target
+    name order when the frameworks are given by name.
+    """
+    by_name: dict[str, list[tuple[UUID, str]]] = {}
+    for framework in frameworks:
+        by_name.setdefault(framework[1], []).append(framework)
+
+    mappings = []
+    for source_id, source_name in frameworks:
+        for target_name, efficiency in MAPPING_MATRIX.get(source_name, ()):
+            for target_id, _ in by_name.get(target_name, ()):
+                if target_id == source_id:
+                    continue
+                mappings.append(
+                    {
+                        "source_framework_id": str(source_id),
+                        "source_framework_name": source_name,
+                        "target_framework_id": str(target_id),
+                        "target_framework_name": target_name,
+                        "efficiency_score": efficiency,
+                        "description": (
+                            f"Complying with {source_name} satisfies approximately "
+                            f"{int(efficiency * 100)}% of {target_name} requirements"
+                        ),
+                    }
+                )
+    return mappings
@@ -4,14 +4,88 @@ Supports DOCX and PDF export formats
 """
 
 import io
-from datetime import date
+from datetime import date, datetime
+from functools import cache
+from importlib.util import find_spec
+from pathlib import Path
 from typing import Any
 from uuid import UUID
 
 import structlog
 
+from app.services.render_service import RenderKind, render_service
+
 logger = structlog.get_logger()
 
+# TrueType font with Cyrillic glyphs for reportlab PDFs; the built-in fonts have none
+PDF_FONT_NAME = "DejaVuSans"
+PDF_FONT_PATHS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+)
+
+
+@cache
+def pdf_font() -> str | None:
+    """Register the Cyrillic PDF font once per process; None when not installed."""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    for path in PDF_FONT_PATHS:
+        if Path(path).exists():
+            pdfmetrics.registerFont(TTFont(PDF_FONT_NAME, path))
+            return PDF_FONT_NAME
+    return None
+
+
+@cache
+def pdf_styles() -> dict[str, Any]:
+    """Paragraph styles for reportlab PDFs, built once per process."""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    styles = getSampleStyleSheet()
+    font = {"fontName": pdf_font()} if pdf_font() else {}
+
+    return {
+        "normal": ParagraphStyle('RuNormal', parent=styles['Normal'], **font),
+        "title": ParagraphStyle(
+            'RuTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            alignment=1,  # Center
+            spaceAfter=20,
+            **font,
+        ),
+        "heading": ParagraphStyle(
+            'RuHeading',
+            parent=styles['Heading2'],
+            fontSize=12,
+            spaceBefore=12,
+            spaceAfter=6,
+            **font,
+        ),
+        "body": ParagraphStyle(
+            'RuBody',
+            parent=styles['Normal'],
+            fontSize=10,
+            leading=14,
+            spaceBefore=6,
+            spaceAfter=6,
+            **font,
+        ),
+    }
+
+
+def warm_up() -> None:
+    """Load the DOCX and PDF renderers, fonts and styles (render pool initializer)."""
+    if document_export_service.docx_available:
+        import docx  # noqa: F401
+    if document_export_service.pdf_available:
+        import reportlab.platypus  # noqa: F401
+
+        pdf_styles()
+
 
 class DocumentExportService:
     """
@@ -24,18 +98,13 @@ class DocumentExportService:
         self._check_dependencies()
 
     def _check_dependencies(self):
-        """Check if export dependencies are available."""
-        try:
-            from docx import Document
-            self._docx_available = True
-        except ImportError:
+        """Check if export dependencies are installed, without importing them."""
+        self._docx_available = find_spec("docx") is not None
+        if not self._docx_available:
             logger.warning("python-docx not installed, DOCX export disabled")
 
-        try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.pdfgen import canvas
-            self._pdf_available = True
-        except ImportError:
+        self._pdf_available = find_spec("reportlab") is not None
+        if not self._pdf_available:
             logger.warning("reportlab not installed, PDF export disabled")
 
     async def export_to_docx(
@@ -48,6 +117,8 @@ class DocumentExportService:
         """
         Export document content to DOCX format.
 
+        Rendering runs in the render pool; unchanged documents come from its cache.
+
         Args:
             content: Document text content
             title: Document title
@@ -60,8 +131,41 @@ class DocumentExportService:
         if not self._docx_available:
             raise RuntimeError("python-docx is not installed")
 
+        return await render_service.render(
+            RenderKind.DOCX, {"content": content, "title": title, "company_name": company_name}
+        )
+
+    async def export_to_pdf(
+        self,
+        content: str,
+        title: str,
+        company_name: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> bytes:
+        """
+        Export document content to PDF format.
+
+        Rendering runs in the render pool; unchanged documents come from its cache.
+
+        Args:
+            content: Document text content
+            title: Document title
+            company_name: Company name for header
+            metadata: Additional document metadata
+
+        Returns:
+            PDF file as bytes
+        """
+        if not self._pdf_available:
+            raise RuntimeError("reportlab is not installed")
+
+        return await render_service.render(
+            RenderKind.TEXT_PDF, {"content": content, "title": title, "company_name": company_name}
+        )
+
+    def build_docx(self, content: str, title: str, company_name: str | None = None) -> bytes:
+        """Render a DOCX file (blocking; called in render pool workers)."""
         from docx import Document
-        from docx.shared import Inches, Pt
         from docx.enum.text import WD_ALIGN_PARAGRAPH
 
         doc = Document()
@@ -71,7 +175,7 @@ class DocumentExportService:
         core_properties.title = title
         if company_name:
             core_properties.author = company_name
-        core_properties.created = date.today()
+        core_properties.created = datetime.now()
 
         # Add header with company name
         if company_name:
@@ -115,34 +219,11 @@ class DocumentExportService:
         buffer.seek(0)
         return buffer.getvalue()
 
-    async def export_to_pdf(
-        self,
-        content: str,
-        title: str,
-        company_name: str | None = None,
-        metadata: dict[str, Any] | None = None,
-    ) -> bytes:
-        """
-        Export document content to PDF format.
-
-        Args:
-            content: Document text content
-            title: Document title
-            company_name: Company name for header
-            metadata: Additional document metadata
-
-        Returns:
-            PDF file as bytes
-        """
-        if not self._pdf_available:
-            raise RuntimeError("reportlab is not installed")
-
+    def build_pdf(self, content: str, title: str, company_name: str | None = None) -> bytes:
+        """Render a PDF file with reportlab (blocking; called in render pool workers)."""
         from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.units import cm
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
 
         buffer = io.BytesIO()
 
@@ -156,45 +237,18 @@ class DocumentExportService:
             bottomMargin=2*cm,
         )
 
-        # Get styles
-        styles = getSampleStyleSheet()
-
-        # Create custom styles for Russian text
-        title_style = ParagraphStyle(
-            'RuTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            alignment=1,  # Center
-            spaceAfter=20,
-        )
-
-        heading_style = ParagraphStyle(
-            'RuHeading',
-            parent=styles['Heading2'],
-            fontSize=12,
-            spaceBefore=12,
-            spaceAfter=6,
-        )
-
-        body_style = ParagraphStyle(
-            'RuBody',
-            parent=styles['Normal'],
-            fontSize=10,
-            leading=14,
-            spaceBefore=6,
-            spaceAfter=6,
-        )
+        styles = pdf_styles()
 
         # Build content
         story = []
 
         # Add company name header
         if company_name:
-            story.append(Paragraph(company_name, styles['Normal']))
+            story.append(Paragraph(company_name, styles['normal']))
             story.append(Spacer(1, 0.5*cm))
 
         # Add title
-        story.append(Paragraph(title, title_style))
+        story.append(Paragraph(title, styles['title']))
         story.append(Spacer(1, 0.5*cm))
 
         # Process content
@@ -204,11 +258,11 @@ class DocumentExportService:
             if not stripped:
                 story.append(Spacer(1, 0.3*cm))
             elif stripped.isupper() and len(stripped) < 100:
-                story.append(Paragraph(f"<b>{stripped}</b>", heading_style))
+                story.append(Paragraph(f"<b>{stripped}</b>", styles['heading']))
             else:
                 # Escape special characters for reportlab
                 escaped = stripped.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                story.append(Paragraph(escaped, body_style))
+                story.append(Paragraph(escaped, styles['body']))
 
         # Build PDF
         doc.build(story)
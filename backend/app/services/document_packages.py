@@ -0,0 +1,316 @@
+"""
+Document Package Generation (Phase 7)
+Generates every mandatory 152-ФЗ document for many companies in one job.
+
+Templates and companies are loaded once, existing documents are found with
+a single query, and the templates are rendered for all companies at once -
+split into chunks across a process pool for large batches. New documents
+are written with bulk INSERTs, and the package can be streamed back as a
+ZIP of DOCX or PDF files.
+"""
+
+import asyncio
+import math
+import tempfile
+import zipfile
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from enum import Enum
+from functools import partial
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+import structlog
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.compliance.russian import (
+    DocumentStatus,
+    RuCompanyProfile,
+    RuComplianceDocument,
+    RuFrameworkType,
+    TaskPriority,
+)
+from app.services.company_hierarchy import DocumentDelta, apply_bulk_document_deltas
+from app.services.document_export import document_export_service
+from app.services.render_service import RenderService, render_service
+from app.services.russian_compliance import DocumentTemplateService
+from app.services.template_engine import render_batch
+
+logger = structlog.get_logger()
+
+# Rows per bulk INSERT statement
+INSERT_BATCH_SIZE = 500
+
+# Bytes per chunk when streaming the finished bundle
+BUNDLE_CHUNK_SIZE = 64 * 1024
+
+
+def document_code(template_code: str, company: RuCompanyProfile) -> str:
+    return f"{template_code}-{company.inn}"
+
+
+class BundleFormat(str, Enum):
+    """File format of the documents in a package bundle."""
+
+    DOCX = "docx"
+    PDF = "pdf"
+
+
+@dataclass
+class PackageDocument:
+    """A document of a generated package, as placed in the bundle."""
+
+    company_id: UUID
+    company_name: str
+    inn: str
+    document_code: str
+    title: str
+    content: str
+
+
+@dataclass
+class PackageResult:
+    """Outcome of a batch package generation."""
+
+    companies: int
+    documents_created: int
+    documents_skipped: int
+    missing_company_ids: list[UUID] = field(default_factory=list)
+    documents: list[PackageDocument] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "companies": self.companies,
+            "documents_created": self.documents_created,
+            "documents_skipped": self.documents_skipped,
+            "missing_company_ids": [str(c) for c in self.missing_company_ids],
+        }
+
+
+class DocumentPackageService:
+    """
+    Batch generation of mandatory 152-ФЗ document packages.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        renderer: RenderService | None = None,
+        pool_min_companies: int | None = None,
+    ):
+        self.db = db
+        self.renderer = renderer or render_service
+        self.pool_min_companies = (
+            pool_min_companies
+            if pool_min_companies is not None
+            else settings.DOCUMENT_RENDER_POOL_MIN_COMPANIES
+        )
+
+    async def _load_companies(
+        self, company_ids: list[UUID], tenant_id: UUID
+    ) -> list[RuCompanyProfile]:
+        result = await self.db.execute(
+            select(RuCompanyProfile).where(
+                RuCompanyProfile.id.in_(company_ids),
+                RuCompanyProfile.tenant_id == tenant_id,
+            )
+        )
+        by_id = {company.id: company for company in result.scalars()}
+        return [
+            by_id[company_id] for company_id in dict.fromkeys(company_ids) if company_id in by_id
+        ]
+
+    async def _existing_codes(
+        self, companies: list[RuCompanyProfile], template_codes: list[str]
+    ) -> set[tuple[UUID, str]]:
+        """(company_id, document_code) of package documents that already exist."""
+        if not companies:
+            return set()
+        result = await self.db.execute(
+            select(RuComplianceDocument.company_id, RuComplianceDocument.document_code).where(
+                RuComplianceDocument.company_id.in_([c.id for c in companies]),
+                RuComplianceDocument.document_code.in_(
+                    [document_code(code, c) for code in template_codes for c in companies]
+                ),
+            )
+        )
+        return {(company_id, code) for company_id, code in result.all()}
+
+    async def _render(
+        self, templates: list[tuple[str, str | None, str]], rows: list[dict[str, str]]
+    ) -> list[list[str]]:
+        """Render [template][row]; large batches are split across the process pool."""
+        if len(rows) < max(self.pool_min_companies, 1):
+            return render_batch(templates, rows)
+
+        size = math.ceil(len(rows) / self.renderer.workers)
+        chunks = [rows[i : i + size] for i in range(0, len(rows), size)]
+        results = await asyncio.gather(
+            *(self.renderer.run(render_batch, templates, chunk) for chunk in chunks)
+        )
+        return [
+            [content for chunk in results for content in chunk[t]] for t in range(len(templates))
+        ]
+
+    async def generate(
+        self,
+        company_ids: list[UUID],
+        tenant_id: UUID,
+        include_documents: bool = False,
+    ) -> PackageResult:
+        """
+        Create the missing mandatory documents for every company.
+
+        Documents that already exist (same company and document code) are
+        skipped. With `include_documents`, the result carries the whole
+        package - new and existing documents - for bundling.
+        """
+        from app.services.ru_templates_152fz import get_mandatory_templates
+
+        templates = get_mandatory_templates()
+        template_codes = [t["template_code"] for t in templates]
+        companies = await self._load_companies(company_ids, tenant_id)
+        found = {c.id for c in companies}
+
+        existing = await self._existing_codes(companies, template_codes)
+        # Only companies with at least one missing document are rendered
+        pending = [
+            c
+            for c in companies
+            if any((c.id, document_code(code, c)) not in existing for code in template_codes)
+        ]
+
+        rendered = await self._render(
+            [(t["template_code"], t.get("version"), t["template_content"]) for t in templates],
+            [DocumentTemplateService.company_fields(c) for c in pending],
+        )
+
+        due_date = date.today() + timedelta(days=30)
+        rows = []
+        for t, contents in zip(templates, rendered, strict=True):
+            for company, content in zip(pending, contents, strict=True):
+                code = document_code(t["template_code"], company)
+                if (company.id, code) in existing:
+                    continue
+                rows.append(
+                    {
+                        "tenant_id": tenant_id,
+                        "company_id": company.id,
+                        "document_code": code,
+                        "title": t["title"],
+                        "document_type": t["document_type"],
+                        "framework": RuFrameworkType.FZ_152,
+                        "requirement_ref": t.get("requirement_ref"),
+                        "content": content,
+                        "status": DocumentStatus.DRAFT,
+                        "priority": TaskPriority.HIGH
+                        if t.get("is_mandatory")
+                        else TaskPriority.MEDIUM,
+                        "due_date": due_date,
+                    }
+                )
+
+        for i in range(0, len(rows), INSERT_BATCH_SIZE):
+            await self.db.execute(insert(RuComplianceDocument), rows[i : i + INSERT_BATCH_SIZE])
+        # Bulk INSERTs bypass the ORM hooks that keep the holding rollups current
+        deltas: dict[UUID, DocumentDelta] = {}
+        for row in rows:
+            deltas.setdefault(row["company_id"], DocumentDelta()).total += 1
+        await apply_bulk_document_deltas(self.db, deltas)
+
+        skipped = len(companies) * len(templates) - len(rows)
+        logger.info(
+            "Document packages generated",
+            companies=len(companies),
+            rendered_companies=len(pending),
+            created=len(rows),
+            skipped=skipped,
+        )
+
+        result = PackageResult(
+            companies=len(companies),
+            documents_created=len(rows),
+            documents_skipped=skipped,
+            missing_company_ids=[c for c in dict.fromkeys(company_ids) if c not in found],
+        )
+        if include_documents:
+            result.documents = await self._package_documents(companies, template_codes)
+        return result
+
+    async def _package_documents(
+        self, companies: list[RuCompanyProfile], template_codes: list[str]
+    ) -> list[PackageDocument]:
+        """All package documents of the companies, in company then template order."""
+        if not companies:
+            return []
+        by_id = {c.id: c for c in companies}
+        result = await self.db.execute(
+            select(
+                RuComplianceDocument.company_id,
+                RuComplianceDocument.document_code,
+                RuComplianceDocument.title,
+                RuComplianceDocument.content,
+            ).where(
+                RuComplianceDocument.company_id.in_(by_id),
+                RuComplianceDocument.document_code.in_(
+                    [document_code(code, c) for code in template_codes for c in companies]
+                ),
+            )
+        )
+        documents = []
+        for company_id, document_code, title, content in result.all():
+            company = by_id[company_id]
+            documents.append(
+                PackageDocument(
+                    company_id=company_id,
+                    company_name=company.full_name,
+                    inn=company.inn,
+                    document_code=document_code,
+                    title=title,
+                    content=content or "",
+                )
+            )
+        position = {company_id: i for i, company_id in enumerate(by_id)}
+        order = {code: i for i, code in enumerate(template_codes)}
+        documents.sort(
+            key=lambda d: (position[d.company_id], order[d.document_code.rsplit("-", 1)[0]])
+        )
+        return documents
+
+
+async def bundle_chunks(
+    documents: list[PackageDocument], format: BundleFormat
+) -> AsyncIterator[bytes]:
+    """
+    ZIP of the package documents as DOCX or PDF files, one folder per
+    company INN. Files are rendered in the render pool, a pool's worth at a
+    time; the archive is built in a temporary file and streamed.
+    """
+    export = (
+        document_export_service.export_to_docx
+        if format == BundleFormat.DOCX
+        else document_export_service.export_to_pdf
+    )
+    export_dir = Path(settings.EXPORT_TEMP_PATH)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    batch_size = render_service.max_pending
+    with tempfile.TemporaryFile(dir=export_dir, suffix=".zip") as tmp:
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for i in range(0, len(documents), batch_size):
+                batch = documents[i : i + batch_size]
+                files = await asyncio.gather(
+                    *(
+                        export(content=d.content, title=d.title, company_name=d.company_name)
+                        for d in batch
+                    )
+                )
+                for document, data in zip(batch, files, strict=True):
+                    name = f"{document.inn}/{document.document_code}.{format.value}"
+                    await asyncio.to_thread(partial(archive.writestr, name, data))
+        tmp.seek(0)
+        while chunk := await asyncio.to_thread(tmp.read, BUNDLE_CHUNK_SIZE):
+            yield chunk
@@ -4,11 +4,11 @@ Fetches Russian company data from the local EGRUL service.
 """
 
 import os
-import httpx
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
 from datetime import date, datetime
 from functools import lru_cache
+from app.core.metrics import external_http_client
 
 # EGRUL Service Configuration
 EGRUL_SERVICE_URL = os.getenv("EGRUL_SERVICE_URL", "http://localhost:8200")
@@ -64,7 +64,7 @@ class EgrulClient:
         try:
             params = {"force_refresh": force_refresh}
 
-            async with httpx.AsyncClient() as client:
+            async with external_http_client() as client:
                 response = await client.get(
                     f"{self.base_url}/api/company/{inn}",
                     params=params,
@@ -108,7 +108,7 @@ class EgrulClient:
                 "offset": offset
             }
 
-            async with httpx.AsyncClient() as client:
+            async with external_http_client() as client:
                 response = await client.get(
                     f"{self.base_url}/api/search",
                     params=params,
@@ -140,7 +140,7 @@ class EgrulClient:
             Dict with found companies and missing INNs
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with external_http_client() as client:
                 response = await client.post(
                     f"{self.base_url}/api/batch/lookup",
                     json=inns,
@@ -162,7 +162,7 @@ class EgrulClient:
     async def start_bulk_import(self, source_url: Optional[str] = None) -> bool:
         """Start bulk import from EGRUL dump."""
         try:
-            async with httpx.AsyncClient() as client:
+            async with external_http_client() as client:
                 response = await client.post(
                     f"{self.base_url}/api/bulk-import/start",
                     params={"source_url": source_url} if source_url else {},
@@ -177,7 +177,7 @@ class EgrulClient:
     async def get_import_status(self) -> Dict[str, Any]:
         """Get status of bulk import."""
         try:
-            async with httpx.AsyncClient() as client:
+            async with external_http_client() as client:
                 response = await client.get(
                     f"{self.base_url}/api/bulk-import/status",
                     timeout=10.0
@@ -194,7 +194,7 @@ class EgrulClient:
     async def get_stats(self) -> Dict[str, Any]:
         """Get EGRUL database statistics."""
         try:
-            async with httpx.AsyncClient() as client:
+            async with external_http_client() as client:
                 response = await client.get(
                     f"{self.base_url}/api/stats",
                     timeout=10.0
@@ -211,7 +211,7 @@ class EgrulClient:
     async def health_check(self) -> bool:
         """Check if EGRUL service is healthy."""
         try:
-            async with httpx.AsyncClient() as client:
+            async with external_http_client() as client:
                 response = await client.get(
                     f"{self.base_url}/health",
                     timeout=5.0
@@ -14,6 +14,7 @@ from bs4 import BeautifulSoup
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import external_http_client
 from app.models.compliance.egrul import (
     CompanyStatus,
     DataSource,
@@ -109,7 +110,7 @@ class EGRULScraperService:
         )
 
         try:
-            async with httpx.AsyncClient(
+            async with external_http_client(
                 headers=self.HEADERS,
                 follow_redirects=True,
                 timeout=30.0,
@@ -1,33 +1,441 @@
 """
 Multi-Format Export Service (Phase 4.3)
-Supports export to CSV, Excel, JSON, and PDF formats.
+Supports export to CSV, Excel, JSON, PDF and the columnar Parquet / Arrow IPC
+formats.
+
+Large exports are streamed: rows are read from a server-side cursor in
+batches and encoded incrementally (CSV, NDJSON, write-only XLSX), so memory
+use does not depend on the number of rows. Each exportable table is
+described once as an `ExportDataset` (typed columns plus query), shared by
+the streaming and the in-memory formats.
+
+Parquet and Arrow IPC files (pyarrow) keep the column types - UUIDs,
+decimals with their precision, UTC timestamps - and are written one row
+group of EXPORT_ROW_GROUP_SIZE rows at a time.
 """
 
+import asyncio
 import csv
+import importlib.util
 import io
 import json
-from datetime import datetime
+import tempfile
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from decimal import Decimal
 from enum import Enum
+from functools import partial
 from pathlib import Path
 from typing import Any
 from uuid import UUID
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
-from app.models import AuditLog, Constraint, Entity
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import AuditAction, AuditLog, Constraint, Entity, RiskScore, Transaction
 
 logger = structlog.get_logger()
 
+# Bytes per chunk when streaming a finished file (XLSX) back to the client
+FILE_CHUNK_SIZE = 64 * 1024
+
 
 class ExportFormat(str, Enum):
     """Supported export formats."""
 
     CSV = "csv"
     JSON = "json"
+    NDJSON = "ndjson"
     EXCEL = "xlsx"
     PDF = "pdf"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+COLUMNAR_FORMATS = {ExportFormat.PARQUET, ExportFormat.ARROW}
+
+STREAMING_FORMATS = {
+    ExportFormat.CSV,
+    ExportFormat.NDJSON,
+    ExportFormat.EXCEL,
+    *COLUMNAR_FORMATS,
+}
+
+CONTENT_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.JSON: "application/json",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.EXCEL: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportFormat.PDF: "application/pdf",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+    ExportFormat.ARROW: "application/vnd.apache.arrow.file",
+}
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """An exported column: output name, SQL expression and value kind."""
+
+    name: str
+    expr: ColumnElement
+    # uuid | str | int | float | decimal | bool | datetime | date | list
+    kind: str = "str"
+
+
+@dataclass
+class ExportDataset:
+    """Columns and filtered query of one export."""
+
+    name: str
+    columns: list[ExportColumn]
+    query: Select
+
+    @property
+    def header(self) -> list[str]:
+        return [column.name for column in self.columns]
+
+
+@dataclass
+class ExportStream:
+    """A streamed export; `body` yields the encoded file in chunks."""
+
+    filename: str
+    content_type: str
+    body: AsyncIterator[bytes]
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Content-Disposition": f'attachment; filename="{self.filename}"'}
+
+
+def _dataset(
+    name: str, columns: list[ExportColumn], build: Callable[[Select], Select]
+) -> ExportDataset:
+    return ExportDataset(
+        name=name,
+        columns=columns,
+        query=build(select(*(column.expr.label(column.name) for column in columns))),
+    )
+
+
+def _latest_risk_scores(tenant_id: UUID):
+    """Most recent risk score per entity."""
+    return (
+        select(
+            RiskScore.entity_id,
+            RiskScore.score,
+            RiskScore.level,
+            RiskScore.calculated_at,
+        )
+        .where(RiskScore.tenant_id == tenant_id)
+        .distinct(RiskScore.entity_id)
+        .order_by(RiskScore.entity_id, RiskScore.calculated_at.desc())
+        .subquery("latest_risk")
+    )
+
+
+def entities_dataset(
+    tenant_id: UUID,
+    entity_type: str | None = None,
+    include_risks: bool = False,
+) -> ExportDataset:
+    columns = [
+        ExportColumn("id", Entity.id, "uuid"),
+        ExportColumn("name", Entity.name),
+        ExportColumn("type", Entity.type),
+        ExportColumn("country", Entity.country_code),
+        ExportColumn("description", Entity.notes),
+        ExportColumn("aliases", Entity.aliases, "list"),
+        ExportColumn("created_at", Entity.created_at, "datetime"),
+        ExportColumn("updated_at", Entity.updated_at, "datetime"),
+    ]
+    latest = _latest_risk_scores(tenant_id) if include_risks else None
+    if latest is not None:
+        columns += [
+            ExportColumn("risk_score", latest.c.score, "decimal"),
+            ExportColumn("risk_level", latest.c.level),
+        ]
+
+    def build(query: Select) -> Select:
+        query = query.where(
+            Entity.tenant_id == tenant_id,
+            Entity.is_active == True,  # noqa: E712
+        )
+        if entity_type:
+            query = query.where(Entity.type == entity_type)
+        if latest is not None:
+            query = query.outerjoin(latest, latest.c.entity_id == Entity.id)
+        return query
+
+    return _dataset("entities", columns, build)
+
+
+def constraints_dataset(tenant_id: UUID, constraint_type: str | None = None) -> ExportDataset:
+    columns = [
+        ExportColumn("id", Constraint.id, "uuid"),
+        ExportColumn("name", Constraint.name),
+        ExportColumn("type", Constraint.type),
+        ExportColumn("severity", Constraint.severity),
+        ExportColumn("description", Constraint.description),
+        ExportColumn("source", Constraint.source_document),
+        ExportColumn("effective_date", Constraint.effective_date, "date"),
+        ExportColumn("expiry_date", Constraint.expiry_date, "date"),
+    ]
+
+    def build(query: Select) -> Select:
+        query = query.where(
+            Constraint.tenant_id == tenant_id,
+            Constraint.is_active == True,  # noqa: E712
+        )
+        if constraint_type:
+            query = query.where(Constraint.type == constraint_type)
+        return query
+
+    return _dataset("constraints", columns, build)
+
+
+def audit_logs_dataset(
+    tenant_id: UUID,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    actions: Sequence[AuditAction] | None = None,
+) -> ExportDataset:
+    columns = [
+        ExportColumn("id", AuditLog.id, "uuid"),
+        ExportColumn("created_at", AuditLog.created_at, "datetime"),
+        ExportColumn("user_email", AuditLog.user_email),
+        ExportColumn("action", AuditLog.action),
+        ExportColumn("resource_type", AuditLog.resource_type),
+        ExportColumn("resource_id", AuditLog.resource_id, "uuid"),
+        ExportColumn("description", AuditLog.description),
+        ExportColumn("success", AuditLog.success, "bool"),
+        ExportColumn("ip_address", AuditLog.ip_address),
+    ]
+
+    def build(query: Select) -> Select:
+        query = query.where(AuditLog.tenant_id == tenant_id)
+        if start_date:
+            query = query.where(AuditLog.created_at >= start_date)
+        if end_date:
+            query = query.where(AuditLog.created_at <= end_date)
+        if actions:
+            query = query.where(AuditLog.action.in_(actions))
+        return query.order_by(AuditLog.created_at.desc())
+
+    return _dataset("audit_logs", columns, build)
+
+
+def risk_report_dataset(tenant_id: UUID) -> ExportDataset:
+    latest = _latest_risk_scores(tenant_id)
+    columns = [
+        ExportColumn("entity_id", Entity.id, "uuid"),
+        ExportColumn("entity_name", Entity.name),
+        ExportColumn("entity_type", Entity.type),
+        ExportColumn("country", Entity.country_code),
+        ExportColumn("risk_score", latest.c.score, "decimal"),
+        ExportColumn("risk_level", latest.c.level),
+        ExportColumn("last_risk_update", latest.c.calculated_at, "datetime"),
+    ]
+
+    def build(query: Select) -> Select:
+        return (
+            query.join(latest, latest.c.entity_id == Entity.id)
+            .where(
+                Entity.tenant_id == tenant_id,
+                Entity.is_active == True,  # noqa: E712
+            )
+            .order_by(latest.c.score.desc())
+        )
+
+    return _dataset("risk_report", columns, build)
+
+
+def risk_scores_dataset(
+    tenant_id: UUID,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+) -> ExportDataset:
+    """Full risk score history (one row per calculation)."""
+    columns = [
+        ExportColumn("id", RiskScore.id, "uuid"),
+        ExportColumn("entity_id", RiskScore.entity_id, "uuid"),
+        ExportColumn("score", RiskScore.score, "decimal"),
+        ExportColumn("level", RiskScore.level),
+        ExportColumn("direct_match_score", RiskScore.direct_match_score, "decimal"),
+        ExportColumn("indirect_match_score", RiskScore.indirect_match_score, "decimal"),
+        ExportColumn("country_risk_score", RiskScore.country_risk_score, "decimal"),
+        ExportColumn("dependency_risk_score", RiskScore.dependency_risk_score, "decimal"),
+        ExportColumn("previous_score", RiskScore.previous_score, "decimal"),
+        ExportColumn("calculated_at", RiskScore.calculated_at, "datetime"),
+    ]
+
+    def build(query: Select) -> Select:
+        query = query.where(RiskScore.tenant_id == tenant_id)
+        if start_date:
+            query = query.where(RiskScore.calculated_at >= start_date)
+        if end_date:
+            query = query.where(RiskScore.calculated_at <= end_date)
+        return query.order_by(RiskScore.calculated_at)
+
+    return _dataset("risk_scores", columns, build)
+
+
+def transactions_dataset(
+    tenant_id: UUID,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    status: str | None = None,
+) -> ExportDataset:
+    columns = [
+        ExportColumn("id", Transaction.id, "uuid"),
+        ExportColumn("transaction_ref", Transaction.transaction_ref),
+        ExportColumn("customer_id", Transaction.customer_id, "uuid"),
+        ExportColumn("transaction_type", Transaction.transaction_type),
+        ExportColumn("status", Transaction.status),
+        ExportColumn("direction", Transaction.direction),
+        ExportColumn("amount", Transaction.amount, "decimal"),
+        ExportColumn("currency", Transaction.currency),
+        ExportColumn("amount_usd", Transaction.amount_usd, "decimal"),
+        ExportColumn("originator_name", Transaction.originator_name),
+        ExportColumn("originator_bank_country", Transaction.originator_bank_country),
+        ExportColumn("beneficiary_name", Transaction.beneficiary_name),
+        ExportColumn("beneficiary_bank_country", Transaction.beneficiary_bank_country),
+        ExportColumn("channel", Transaction.channel),
+        ExportColumn("risk_score", Transaction.risk_score, "float"),
+        ExportColumn("risk_factors", Transaction.risk_factors, "list"),
+        ExportColumn("has_alert", Transaction.has_alert, "bool"),
+        ExportColumn("alert_count", Transaction.alert_count, "int"),
+        ExportColumn("initiated_at", Transaction.initiated_at, "datetime"),
+        ExportColumn("completed_at", Transaction.completed_at, "datetime"),
+    ]
+
+    def build(query: Select) -> Select:
+        query = query.where(Transaction.tenant_id == tenant_id)
+        if start_date:
+            query = query.where(Transaction.initiated_at >= start_date)
+        if end_date:
+            query = query.where(Transaction.initiated_at <= end_date)
+        if status:
+            query = query.where(Transaction.status == status)
+        return query.order_by(Transaction.initiated_at)
+
+    return _dataset("transactions", columns, build)
+
+
+def _text_value(value: Any) -> Any:
+    """Cell value for CSV."""
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, list | tuple):
+        return ", ".join(str(v) for v in value)
+    return value
+
+
+def _json_value(value: Any) -> Any:
+    """JSON-compatible value for JSON / NDJSON."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, list | tuple):
+        return [_json_value(v) for v in value]
+    if value is not None and not isinstance(value, str | int | float | bool | dict):
+        return str(value)
+    return value
+
+
+def _xlsx_value(value: Any) -> Any:
+    """Cell value for openpyxl (no timezones, no UUIDs or lists)."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(UTC).replace(tzinfo=None)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list | tuple):
+        return ", ".join(str(v) for v in value)
+    if value is not None and not isinstance(value, str | int | float | bool | Decimal | date):
+        return str(value)
+    return value
+
+
+def _arrow_type(column: ExportColumn):
+    """Arrow type for an export column."""
+    import pyarrow as pa
+
+    if column.kind == "uuid":
+        # Canonical arrow.uuid extension type (pyarrow >= 18), else its storage type
+        return pa.uuid() if hasattr(pa, "uuid") else pa.binary(16)
+    if column.kind == "decimal":
+        precision = getattr(column.expr.type, "precision", None)
+        if precision is None:
+            return pa.float64()
+        return pa.decimal128(precision, column.expr.type.scale or 0)
+    return {
+        "str": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "datetime": pa.timestamp("us", tz="UTC"),
+        "date": pa.date32(),
+        "list": pa.list_(pa.string()),
+    }[column.kind]
+
+
+def arrow_schema(dataset: ExportDataset):
+    import pyarrow as pa
+
+    return pa.schema([pa.field(column.name, _arrow_type(column)) for column in dataset.columns])
+
+
+def _arrow_value(kind: str, value: Any) -> Any:
+    """Python value accepted by pyarrow for a column kind."""
+    if value is None:
+        return None
+    if kind == "uuid":
+        return value.bytes
+    if kind == "list":
+        return [_text_value(v) for v in value]
+    if kind == "str":
+        return value.value if isinstance(value, Enum) else str(value)
+    if kind == "decimal" and not isinstance(value, Decimal):
+        return Decimal(str(value))
+    return value
+
+
+def _arrow_table(dataset: ExportDataset, schema, rows: list[Sequence[Any]]):
+    """Column-wise conversion of buffered rows into a pyarrow Table."""
+    import pyarrow as pa
+
+    arrays = []
+    for index, (column, field) in enumerate(zip(dataset.columns, schema, strict=True)):
+        values = [_arrow_value(column.kind, row[index]) for row in rows]
+        if isinstance(field.type, pa.BaseExtensionType):
+            storage = pa.array(values, type=field.type.storage_type)
+            arrays.append(pa.ExtensionArray.from_storage(field.type, storage))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _module_available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+async def _file_chunks(f) -> AsyncIterator[bytes]:
+    while chunk := await asyncio.to_thread(f.read, FILE_CHUNK_SIZE):
+        yield chunk
 
 
 class ExportService:
@@ -35,9 +443,157 @@ class ExportService:
     Service for exporting data in multiple formats.
     """
 
-    def __init__(self, export_dir: str | None = None):
-        self.export_dir = Path(export_dir or "/tmp/cortex-exports")
+    def __init__(
+        self,
+        export_dir: str | None = None,
+        session_factory: Callable[[], AsyncSession] | None = None,
+        batch_size: int | None = None,
+        row_group_size: int | None = None,
+    ):
+        self.export_dir = Path(export_dir or settings.EXPORT_TEMP_PATH)
         self.export_dir.mkdir(parents=True, exist_ok=True)
+        # Streamed exports outlive the request's session, so they open their own
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+        self.row_group_size = row_group_size or settings.EXPORT_ROW_GROUP_SIZE
+
+    # Streaming exports
+
+    def stream(self, dataset: ExportDataset, format: ExportFormat) -> ExportStream:
+        """
+        Stream a dataset as CSV, NDJSON, XLSX, Parquet or Arrow IPC.
+
+        Nothing is read until `body` is iterated; the rows are fetched from a
+        server-side cursor `batch_size` at a time.
+        """
+        if format not in STREAMING_FORMATS:
+            raise ValueError(f"Format {format.value} cannot be streamed")
+        if format in COLUMNAR_FORMATS and not _module_available("pyarrow"):
+            raise ValueError(f"Format {format.value} requires pyarrow")
+        if format == ExportFormat.EXCEL and not _module_available("openpyxl"):
+            logger.warning("openpyxl not installed, falling back to CSV")
+            format = ExportFormat.CSV
+
+        encoders = {
+            ExportFormat.CSV: self._csv_chunks,
+            ExportFormat.NDJSON: self._ndjson_chunks,
+            ExportFormat.EXCEL: self._xlsx_chunks,
+            ExportFormat.PARQUET: partial(self._columnar_chunks, format=ExportFormat.PARQUET),
+            ExportFormat.ARROW: partial(self._columnar_chunks, format=ExportFormat.ARROW),
+        }
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        return ExportStream(
+            filename=f"{dataset.name}_{timestamp}.{format.value}",
+            content_type=CONTENT_TYPES[format],
+            body=encoders[format](dataset),
+        )
+
+    async def iter_batches(self, dataset: ExportDataset) -> AsyncIterator[Sequence[Sequence[Any]]]:
+        """Rows of a dataset in batches, from a server-side cursor on a new session."""
+        rows = 0
+        async with self.session_factory() as db:
+            result = await db.stream(dataset.query.execution_options(yield_per=self.batch_size))
+            async for batch in result.partitions():
+                rows += len(batch)
+                yield batch
+        logger.info("Export streamed", dataset=dataset.name, rows=rows)
+
+    async def _csv_chunks(self, dataset: ExportDataset) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(dataset.header)
+        async for batch in self.iter_batches(dataset):
+            writer.writerows([_text_value(value) for value in row] for row in batch)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    async def _ndjson_chunks(self, dataset: ExportDataset) -> AsyncIterator[bytes]:
+        header = dataset.header
+        async for batch in self.iter_batches(dataset):
+            lines = (
+                json.dumps(
+                    {name: _json_value(value) for name, value in zip(header, row, strict=True)},
+                    ensure_ascii=False,
+                )
+                for row in batch
+            )
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+    async def _xlsx_chunks(self, dataset: ExportDataset) -> AsyncIterator[bytes]:
+        """
+        Write-only workbook: rows go to a temporary file as they arrive and the
+        finished file is streamed back from disk, so memory stays flat.
+        """
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Font, PatternFill
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Export")
+        header_font = Font(bold=True)
+        header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+        header = []
+        for name in dataset.header:
+            cell = WriteOnlyCell(ws, value=name)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = Alignment(horizontal="center")
+            header.append(cell)
+        ws.append(header)
+
+        async for batch in self.iter_batches(dataset):
+            for row in batch:
+                ws.append([_xlsx_value(value) for value in row])
+
+        with tempfile.TemporaryFile(dir=self.export_dir, suffix=".xlsx") as tmp:
+            await asyncio.to_thread(wb.save, tmp)
+            tmp.seek(0)
+            async for chunk in _file_chunks(tmp):
+                yield chunk
+
+    async def _columnar_chunks(
+        self, dataset: ExportDataset, format: ExportFormat
+    ) -> AsyncIterator[bytes]:
+        """
+        Parquet / Arrow IPC file. Cursor batches are buffered up to one row
+        group, converted column-wise and appended to a temporary file; both
+        formats need their footer written before the file can be read.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = arrow_schema(dataset)
+        with tempfile.TemporaryDirectory(dir=self.export_dir) as tmp_dir:
+            path = str(Path(tmp_dir) / f"export.{format.value}")
+            if format == ExportFormat.PARQUET:
+                writer = pq.ParquetWriter(path, schema, compression="zstd")
+            else:
+                options = pa.ipc.IpcWriteOptions(compression="zstd")
+                writer = pa.ipc.new_file(path, schema, options=options)
+
+            def write(rows: list[Sequence[Any]]) -> None:
+                writer.write_table(_arrow_table(dataset, schema, rows))
+
+            try:
+                rows: list[Sequence[Any]] = []
+                async for batch in self.iter_batches(dataset):
+                    rows.extend(batch)
+                    if len(rows) >= self.row_group_size:
+                        await asyncio.to_thread(write, rows)
+                        rows = []
+                if rows:
+                    await asyncio.to_thread(write, rows)
+            finally:
+                await asyncio.to_thread(writer.close)
+
+            with open(path, "rb") as f:
+                async for chunk in _file_chunks(f):
+                    yield chunk
+
+    # In-memory exports (JSON document, PDF and callers that need the content)
 
     async def export_entities(
         self,
@@ -60,36 +616,9 @@ class ExportService:
         Returns:
             Export result with file path or data
         """
-        query = select(Entity).where(
-            Entity.tenant_id == tenant_id,
-            Entity.is_active == True,  # noqa: E712
-        )
-        if entity_type:
-            query = query.where(Entity.type == entity_type)
-
-        result = await db.execute(query)
-        entities = result.scalars().all()
-
-        data = []
-        for entity in entities:
-            row = {
-                "id": str(entity.id),
-                "name": entity.name,
-                "type": entity.type.value if entity.type else None,
-                "country": entity.country,
-                "description": entity.description,
-                "aliases": ", ".join(entity.aliases) if entity.aliases else "",
-                "created_at": entity.created_at.isoformat() if entity.created_at else None,
-                "updated_at": entity.updated_at.isoformat() if entity.updated_at else None,
-            }
-
-            if include_risks and entity.current_risk_score is not None:
-                row["risk_score"] = entity.current_risk_score
-                row["risk_level"] = entity.risk_level
-
-            data.append(row)
-
-        return await self._export_data(data, format, "entities")
+        dataset = entities_dataset(tenant_id, entity_type, include_risks)
+        data, truncated = await self._collect(db, dataset)
+        return await self._export_data(data, format, dataset.name, truncated)
 
     async def export_constraints(
         self,
@@ -110,36 +639,9 @@ class ExportService:
         Returns:
             Export result
         """
-        query = select(Constraint).where(
-            Constraint.tenant_id == tenant_id,
-            Constraint.is_active == True,  # noqa: E712
-        )
-        if constraint_type:
-            query = query.where(Constraint.type == constraint_type)
-
-        result = await db.execute(query)
-        constraints = result.scalars().all()
-
-        data = []
-        for constraint in constraints:
-            data.append(
-                {
-                    "id": str(constraint.id),
-                    "name": constraint.name,
-                    "type": constraint.type.value if constraint.type else None,
-                    "severity": constraint.severity.value if constraint.severity else None,
-                    "description": constraint.description,
-                    "source": constraint.source,
-                    "effective_date": constraint.effective_date.isoformat()
-                    if constraint.effective_date
-                    else None,
-                    "expiry_date": constraint.expiry_date.isoformat()
-                    if constraint.expiry_date
-                    else None,
-                }
-            )
-
-        return await self._export_data(data, format, "constraints")
+        dataset = constraints_dataset(tenant_id, constraint_type)
+        data, truncated = await self._collect(db, dataset)
+        return await self._export_data(data, format, dataset.name, truncated)
 
     async def export_audit_logs(
         self,
@@ -162,35 +664,9 @@ class ExportService:
         Returns:
             Export result
         """
-        query = select(AuditLog).where(AuditLog.tenant_id == tenant_id)
-
-        if start_date:
-            query = query.where(AuditLog.created_at >= start_date)
-        if end_date:
-            query = query.where(AuditLog.created_at <= end_date)
-
-        query = query.order_by(AuditLog.created_at.desc())
-
-        result = await db.execute(query)
-        logs = result.scalars().all()
-
-        data = []
-        for log in logs:
-            data.append(
-                {
-                    "id": str(log.id),
-                    "created_at": log.created_at.isoformat() if log.created_at else None,
-                    "user_email": log.user_email,
-                    "action": log.action.value if log.action else None,
-                    "resource_type": log.resource_type,
-                    "resource_id": str(log.resource_id) if log.resource_id else None,
-                    "description": log.description,
-                    "success": log.success,
-                    "ip_address": str(log.ip_address) if log.ip_address else None,
-                }
-            )
-
-        return await self._export_data(data, format, "audit_logs")
+        dataset = audit_logs_dataset(tenant_id, start_date, end_date)
+        data, truncated = await self._collect(db, dataset)
+        return await self._export_data(data, format, dataset.name, truncated)
 
     async def export_risk_report(
         self,
@@ -209,43 +685,33 @@ class ExportService:
         Returns:
             Export result
         """
-        # Get entities with risk scores
-        query = (
-            select(Entity)
-            .where(
-                Entity.tenant_id == tenant_id,
-                Entity.is_active == True,  # noqa: E712
-                Entity.current_risk_score.isnot(None),
-            )
-            .order_by(Entity.current_risk_score.desc())
-        )
-
-        result = await db.execute(query)
-        entities = result.scalars().all()
-
-        data = []
-        for entity in entities:
-            data.append(
-                {
-                    "entity_id": str(entity.id),
-                    "entity_name": entity.name,
-                    "entity_type": entity.type.value if entity.type else None,
-                    "country": entity.country,
-                    "risk_score": entity.current_risk_score,
-                    "risk_level": entity.risk_level,
-                    "last_risk_update": entity.risk_score_updated_at.isoformat()
-                    if entity.risk_score_updated_at
-                    else None,
-                }
-            )
+        dataset = risk_report_dataset(tenant_id)
+        data, truncated = await self._collect(db, dataset)
+        return await self._export_data(data, format, dataset.name, truncated)
 
-        return await self._export_data(data, format, "risk_report")
+    async def _collect(
+        self, db: AsyncSession, dataset: ExportDataset
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Load a dataset into memory, capped at EXPORT_MAX_RECORDS rows.
+        Also returns whether the dataset had more rows than the cap.
+        """
+        limit = settings.EXPORT_MAX_RECORDS
+        result = await db.execute(dataset.query.limit(limit + 1))
+        rows = result.all()
+        header = dataset.header
+        data = [
+            {name: _json_value(value) for name, value in zip(header, row, strict=True)}
+            for row in rows[:limit]
+        ]
+        return data, len(rows) > limit
 
     async def _export_data(
         self,
         data: list[dict[str, Any]],
         format: ExportFormat,
         name: str,
+        truncated: bool = False,
     ) -> dict[str, Any]:
         """
         Export data in the specified format.
@@ -254,24 +720,32 @@ class ExportService:
             data: List of dictionaries to export
             format: Export format
             name: Base name for the export file
+            truncated: The data was capped at EXPORT_MAX_RECORDS rows
 
         Returns:
-            Export result with content or file path
+            Export result with content or file path, and a `truncated` flag
         """
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         filename = f"{name}_{timestamp}"
 
         if format == ExportFormat.CSV:
-            return await self._to_csv(data, filename)
+            result = await self._to_csv(data, filename)
         elif format == ExportFormat.JSON:
-            return await self._to_json(data, filename)
+            result = await self._to_json(data, filename)
+        elif format == ExportFormat.NDJSON:
+            result = await self._to_ndjson(data, filename)
         elif format == ExportFormat.EXCEL:
-            return await self._to_excel(data, filename)
+            result = await self._to_excel(data, filename)
         elif format == ExportFormat.PDF:
-            return await self._to_pdf(data, filename, name)
+            result = await self._to_pdf(data, filename, name)
         else:
             raise ValueError(f"Unsupported format: {format}")
 
+        result["truncated"] = truncated
+        if truncated:
+            logger.warning("Export truncated", export=name, max_records=settings.EXPORT_MAX_RECORDS)
+        return result
+
     async def _to_csv(self, data: list[dict], filename: str) -> dict[str, Any]:
         """Convert data to CSV format."""
         if not data:
@@ -315,6 +789,17 @@ class ExportService:
             "content_type": "application/json",
         }
 
+    async def _to_ndjson(self, data: list[dict], filename: str) -> dict[str, Any]:
+        """Convert data to newline-delimited JSON."""
+        content = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in data)
+        return {
+            "format": "ndjson",
+            "count": len(data),
+            "filename": f"{filename}.ndjson",
+            "content": content,
+            "content_type": CONTENT_TYPES[ExportFormat.NDJSON],
+        }
+
     async def _to_excel(self, data: list[dict], filename: str) -> dict[str, Any]:
         """Convert data to Excel format (using openpyxl if available)."""
         try:
@@ -11,7 +11,6 @@ Features:
 
 import os
 import json
-import httpx
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from enum import Enum
@@ -20,6 +19,7 @@ import asyncio
 from pathlib import Path
 import logging
 from logging.handlers import RotatingFileHandler
+from app.core.metrics import external_http_client
 
 # Loki Configuration
 LOKI_URL = os.getenv("LOKI_URL", "http://localhost:3100")
@@ -234,7 +234,7 @@ class LoggingService:
 
             payload = {"streams": streams}
 
-            async with httpx.AsyncClient() as client:
+            async with external_http_client() as client:
                 response = await client.post(
                     f"{self.loki_url}/loki/api/v1/push",
                     json=payload,
@@ -268,7 +268,7 @@ class LoggingService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with external_http_client() as client:
                 response = await client.get(
                     f"{self.loki_url}/loki/api/v1/query_range",
                     params=params,
@@ -20,11 +20,12 @@ from email.mime.base import MIMEBase
 from email import encoders
 from pathlib import Path
 from typing import Any
-from jinja2 import Environment, BaseLoader
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 
+from app.services.template_engine import template_engine
+
 
 # SMTP Configuration (environment variables)
 SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
@@ -496,9 +497,6 @@ EMAIL_TEMPLATES = {
 class EmailService:
     """SMTP-based email service."""
 
-    def __init__(self):
-        self.jinja_env = Environment(loader=BaseLoader())
-
     def send_email(self, message: EmailMessage) -> bool:
         """Send email via SMTP."""
         try:
@@ -572,18 +570,22 @@ class EmailService:
             raise ValueError(f"Unknown notification type: {notification_type}")
 
         # Render subject
-        subject_template = self.jinja_env.from_string(template["subject"])
-        subject = subject_template.render(**data)
+        template_id = f"email:{notification_type}"
+        subject = template_engine.render(
+            template["subject"], data, template_id=f"{template_id}:subject"
+        )
 
         # Render HTML body
-        html_template = self.jinja_env.from_string(template["body_html"])
-        body_html = html_template.render(**data)
+        body_html = template_engine.render(
+            template["body_html"], data, template_id=f"{template_id}:html"
+        )
 
         # Render text body if available
         body_text = None
         if "body_text" in template:
-            text_template = self.jinja_env.from_string(template["body_text"])
-            body_text = text_template.render(**data)
+            body_text = template_engine.render(
+                template["body_text"], data, template_id=f"{template_id}:text"
+            )
 
         message = EmailMessage(
             to=recipients,
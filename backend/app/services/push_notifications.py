@@ -11,13 +11,13 @@ Supports:
 """
 
 import os
-import httpx
 from typing import Optional, List, Dict, Any
 from enum import Enum
 from pydantic import BaseModel
 from datetime import datetime
 import asyncio
 import json
+from app.core.metrics import external_http_client
 
 # Ntfy Configuration
 NTFY_URL = os.getenv("NTFY_URL", "http://localhost:8090")
@@ -109,7 +109,7 @@ class PushNotificationService:
 
             url = f"{self.base_url}/{notification.topic}"
 
-            async with httpx.AsyncClient() as client:
+            async with external_http_client() as client:
                 response = await client.post(
                     url,
                     content=notification.message,
@@ -8,10 +8,14 @@ Features:
 - Permission inheritance
 - Resource-level access control
 - Audit logging of access decisions
+- Effective permissions compiled per (user, company) into a bit mask, so
+  checks are a dict lookup and an AND; compiled sets are dropped when
+  assignments or roles change
 """
 
-from typing import Optional, List, Dict, Set, Any
-from datetime import datetime
+import time
+from typing import Optional, List, Dict, Set, Any, Iterable, Tuple
+from datetime import UTC, datetime
 from enum import Enum
 from pydantic import BaseModel, Field
 from uuid import UUID, uuid4
@@ -82,6 +86,48 @@ class Permission(str, Enum):
     LOGS_EXPORT = "logs:export"
 
 
+# One bit per permission, in declaration order
+PERMISSION_BITS: Dict[Permission, int] = {p: 1 << i for i, p in enumerate(Permission)}
+ALL_PERMISSIONS_MASK = (1 << len(PERMISSION_BITS)) - 1
+
+# Mask of every permission of a resource, for "resource:*" grants
+RESOURCE_MASKS: Dict[str, int] = {}
+for _permission, _bit in PERMISSION_BITS.items():
+    _resource = _permission.value.split(":")[0]
+    RESOURCE_MASKS[_resource] = RESOURCE_MASKS.get(_resource, 0) | _bit
+
+
+def permission_bits(permissions: Iterable[Permission]) -> int:
+    """Bit mask of exactly the given permissions."""
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+
+def grant_mask(permissions: Iterable[Permission]) -> int:
+    """Bit mask granted by the permissions of a role, wildcards expanded."""
+    mask = 0
+    for permission in permissions:
+        if permission == Permission.ADMIN_FULL:
+            return ALL_PERMISSIONS_MASK
+        resource, _, action = permission.value.partition(":")
+        mask |= RESOURCE_MASKS[resource] if action == "*" else PERMISSION_BITS[permission]
+    return mask
+
+
+def mask_permissions(mask: int) -> Set[Permission]:
+    """Permissions whose bits are set in the mask."""
+    return {p for p, bit in PERMISSION_BITS.items() if mask & bit}
+
+
+def _timestamp(value: datetime) -> float:
+    """Epoch seconds of a naive UTC or an aware datetime."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
 class Role(BaseModel):
     id: UUID = Field(default_factory=uuid4)
     name: str
@@ -213,10 +259,19 @@ class RBACService:
     Role-Based Access Control service.
     """
 
-    def __init__(self):
+    def __init__(self, max_cached_users: int = 10000):
         self.roles: Dict[UUID, Role] = {r.id: r for r in SYSTEM_ROLES.values()}
         self.user_roles: Dict[str, List[UserRole]] = {}
 
+        # Compiled permission sets: user_id -> company_id -> (mask, valid until).
+        # An entry is valid until the earliest expiry of the assignments it
+        # was compiled from.
+        self.max_cached_users = max_cached_users
+        self._compiled: Dict[str, Dict[Optional[UUID], Tuple[int, float]]] = {}
+        self._role_masks: Dict[UUID, int] = {}
+        self.hits = 0
+        self.misses = 0
+
     # ==========================================================================
     # Role Management
     # ==========================================================================
@@ -275,6 +330,7 @@ class RBACService:
                 if hasattr(role, key):
                     setattr(role, key, value)
             self.roles[role_id] = role
+            self.invalidate_all()
             return role
         return None
 
@@ -283,6 +339,7 @@ class RBACService:
         role = self.roles.get(role_id)
         if role and not role.is_system:
             del self.roles[role_id]
+            self.invalidate_all()
             return True
         return False
 
@@ -316,6 +373,7 @@ class RBACService:
             if not (ur.role_id == role_id and ur.company_id == company_id)
         ]
         self.user_roles[user_id].append(user_role)
+        self.invalidate_user(user_id)
 
         return user_role
 
@@ -332,6 +390,7 @@ class RBACService:
                 ur for ur in self.user_roles[user_id]
                 if not (ur.role_id == role_id and ur.company_id == company_id)
             ]
+            self.invalidate_user(user_id)
             return len(self.user_roles[user_id]) < original_len
         return False
 
@@ -365,23 +424,8 @@ class RBACService:
         user_id: str,
         company_id: Optional[UUID] = None
     ) -> Set[Permission]:
-        """Get all permissions for a user."""
-        permissions: Set[Permission] = set()
-
-        user_roles = await self.get_user_roles(user_id, company_id)
-
-        for user_role in user_roles:
-            role = self.roles.get(user_role.role_id)
-            if role:
-                permissions.update(role.permissions)
-
-                # Add inherited permissions from parent role
-                if role.parent_role_id:
-                    parent = self.roles.get(role.parent_role_id)
-                    if parent:
-                        permissions.update(parent.permissions)
-
-        return permissions
+        """Get all permissions for a user (all of them for administrators)."""
+        return mask_permissions(self.permission_mask(user_id, company_id))
 
     async def check_permission(
         self,
@@ -390,20 +434,7 @@ class RBACService:
         company_id: Optional[UUID] = None
     ) -> bool:
         """Check if user has a specific permission."""
-        permissions = await self.get_user_permissions(user_id, company_id)
-
-        # Admin has all permissions
-        if Permission.ADMIN_FULL in permissions:
-            return True
-
-        # Check for wildcard permission (e.g., documents:* matches documents:view)
-        perm_parts = permission.value.split(":")
-        if len(perm_parts) == 2:
-            wildcard = f"{perm_parts[0]}:*"
-            if Permission(wildcard) in permissions:
-                return True
-
-        return permission in permissions
+        return bool(self.permission_mask(user_id, company_id) & PERMISSION_BITS[permission])
 
     async def check_permissions(
         self,
@@ -413,14 +444,137 @@ class RBACService:
         require_all: bool = True
     ) -> bool:
         """Check if user has multiple permissions."""
-        results = [
-            await self.check_permission(user_id, p, company_id)
-            for p in permissions
-        ]
-
+        required = permission_bits(permissions)
+        granted = self.permission_mask(user_id, company_id) & required
         if require_all:
-            return all(results)
-        return any(results)
+            return granted == required
+        return bool(granted)
+
+    async def check_permission_batch(
+        self,
+        user_id: str,
+        permission: Permission,
+        company_ids: Iterable[Optional[UUID]]
+    ) -> Dict[Optional[UUID], bool]:
+        """
+        Check one permission for many companies at once, e.g. to filter a
+        list endpoint's resources by their company.
+        """
+        company_ids = list(dict.fromkeys(company_ids))
+        masks = self.permission_masks(user_id, company_ids)
+        bit = PERMISSION_BITS[permission]
+        return {company_id: bool(masks[company_id] & bit) for company_id in company_ids}
+
+    # ==========================================================================
+    # Compiled Permission Sets
+    # ==========================================================================
+
+    def permission_mask(self, user_id: str, company_id: Optional[UUID] = None) -> int:
+        """Compiled permission bit mask of a user for a company."""
+        entry = self._compiled.get(user_id, {}).get(company_id)
+        if entry is not None and entry[1] > time.time():
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return self._compile(user_id, [company_id])[company_id]
+
+    def permission_masks(
+        self,
+        user_id: str,
+        company_ids: List[Optional[UUID]]
+    ) -> Dict[Optional[UUID], int]:
+        """
+        Compiled permission masks of a user for several companies; the ones
+        not cached are compiled together in one pass over the assignments.
+        """
+        now = time.time()
+        compiled = self._compiled.get(user_id, {})
+        masks: Dict[Optional[UUID], int] = {}
+        missing = []
+        for company_id in company_ids:
+            entry = compiled.get(company_id)
+            if entry is not None and entry[1] > now:
+                masks[company_id] = entry[0]
+                self.hits += 1
+            else:
+                missing.append(company_id)
+        if missing:
+            self.misses += len(missing)
+            masks.update(self._compile(user_id, missing))
+        return masks
+
+    def _compile(
+        self,
+        user_id: str,
+        company_ids: List[Optional[UUID]]
+    ) -> Dict[Optional[UUID], int]:
+        now = datetime.utcnow()
+        # Assignments for all companies apply everywhere; without a company,
+        # every assignment of the user counts (as in get_user_roles)
+        forever = float("inf")
+        all_mask, all_until = 0, forever
+        by_company: Dict[UUID, Tuple[int, float]] = {}
+        for user_role in self.user_roles.get(user_id, []):
+            if user_role.expires_at is not None and user_role.expires_at <= now:
+                continue
+            until = _timestamp(user_role.expires_at) if user_role.expires_at else forever
+            mask = self._role_mask(user_role.role_id)
+            if user_role.company_id is None:
+                all_mask, all_until = all_mask | mask, min(all_until, until)
+            else:
+                company_mask, company_until = by_company.get(user_role.company_id, (0, forever))
+                by_company[user_role.company_id] = (
+                    company_mask | mask, min(company_until, until)
+                )
+
+        if user_id not in self._compiled and len(self._compiled) >= self.max_cached_users:
+            # Drop the longest cached user
+            del self._compiled[next(iter(self._compiled))]
+        compiled = self._compiled.setdefault(user_id, {})
+        masks = {}
+        for company_id in company_ids:
+            if company_id is None:
+                mask, until = all_mask, all_until
+                for company_mask, company_until in by_company.values():
+                    mask, until = mask | company_mask, min(until, company_until)
+            else:
+                company_mask, company_until = by_company.get(company_id, (0, forever))
+                mask, until = all_mask | company_mask, min(all_until, company_until)
+            compiled[company_id] = (mask, until)
+            masks[company_id] = mask
+        return masks
+
+    def _role_mask(self, role_id: UUID) -> int:
+        """Granted mask of a role and its parent role."""
+        mask = self._role_masks.get(role_id)
+        if mask is None:
+            mask = 0
+            role = self.roles.get(role_id)
+            if role:
+                mask = grant_mask(role.permissions)
+                if role.parent_role_id:
+                    parent = self.roles.get(role.parent_role_id)
+                    if parent:
+                        mask |= grant_mask(parent.permissions)
+            self._role_masks[role_id] = mask
+        return mask
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop the compiled permission sets of a user."""
+        self._compiled.pop(user_id, None)
+
+    def invalidate_all(self) -> None:
+        """Drop every compiled permission set (after a role change)."""
+        self._compiled.clear()
+        self._role_masks.clear()
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {
+            "users": len(self._compiled),
+            "entries": sum(len(c) for c in self._compiled.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
 
     # ==========================================================================
     # Access Control Matrix
@@ -432,17 +586,17 @@ class RBACService:
         company_id: Optional[UUID] = None
     ) -> Dict[str, Dict[str, bool]]:
         """Get access control matrix for a user."""
-        permissions = await self.get_user_permissions(user_id, company_id)
+        mask = self.permission_mask(user_id, company_id)
 
         # Group by resource
         resources = {}
-        for perm in Permission:
+        for perm, bit in PERMISSION_BITS.items():
             parts = perm.value.split(":")
             if len(parts) == 2:
                 resource, action = parts
                 if resource not in resources:
                     resources[resource] = {}
-                resources[resource][action] = perm in permissions or Permission.ADMIN_FULL in permissions
+                resources[resource][action] = bool(mask & bit)
 
         return resources
 
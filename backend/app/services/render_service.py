@@ -0,0 +1,217 @@
+"""
+Document Rendering Service (Phase 7)
+Runs CPU-bound document rendering (WeasyPrint PDF, reportlab PDF, DOCX and
+batch template rendering) in a bounded process pool, off the event loop.
+
+- Workers are spawned once and warmed by an initializer: renderer modules
+  are imported and fonts, paragraph styles and the report CSS are loaded
+  before the first request.
+- At most DOCUMENT_RENDER_MAX_PENDING renders are queued or running; callers
+  beyond that wait, and every call is bounded by a request-level timeout.
+- Rendered documents are cached by a hash of their content, so exporting an
+  unchanged document again returns the cached bytes. A render that outlives
+  its request still completes and fills the cache.
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from enum import Enum
+from typing import Any
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+class RenderKind(str, Enum):
+    """Document renderers available in the pool."""
+
+    HTML_PDF = "html_pdf"  # WeasyPrint: html, css
+    TEXT_PDF = "text_pdf"  # reportlab: content, title, company_name
+    DOCX = "docx"  # python-docx: content, title, company_name
+
+
+class RenderError(RuntimeError):
+    """A document could not be rendered."""
+
+
+class RenderTimeoutError(RenderError, TimeoutError):
+    """Rendering did not finish within the request timeout."""
+
+
+def warm_renderers() -> None:
+    """Pool initializer: load renderer modules, fonts, styles and CSS once per worker."""
+    from app.services import document_export, reporting
+
+    document_export.warm_up()
+    reporting.warm_up()
+
+
+def render_document(kind: RenderKind, payload: dict[str, Any]) -> bytes:
+    """Render one document; runs in a pool worker."""
+    if kind == RenderKind.HTML_PDF:
+        from app.services.reporting import html_to_pdf
+
+        return html_to_pdf(**payload)
+
+    from app.services.document_export import document_export_service
+
+    if kind == RenderKind.DOCX:
+        return document_export_service.build_docx(**payload)
+    return document_export_service.build_pdf(**payload)
+
+
+def content_key(kind: RenderKind, payload: dict[str, Any]) -> str:
+    """Cache key: hash of the renderer and everything it renders from."""
+    raw = json.dumps([kind.value, payload], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class RenderCache:
+    """LRU of rendered documents, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._items[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+class RenderService:
+    """
+    Bounded, warm process pool for document rendering with a content cache.
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        workers: int | None = None,
+        max_pending: int | None = None,
+        timeout_seconds: float | None = None,
+        cache_bytes: int | None = None,
+    ):
+        self._executor = executor
+        self._owns_executor = executor is None
+        self.workers = workers or settings.DOCUMENT_RENDER_WORKERS
+        self.max_pending = max_pending or settings.DOCUMENT_RENDER_MAX_PENDING
+        self.timeout_seconds = timeout_seconds or settings.DOCUMENT_RENDER_TIMEOUT_SECONDS
+        self.cache = RenderCache(
+            cache_bytes
+            if cache_bytes is not None
+            else settings.DOCUMENT_RENDER_CACHE_MB * 1024 * 1024
+        )
+        self._pending: asyncio.Semaphore | None = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            # Spawned workers never inherit the event loop or open connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_renderers,
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: float | None = None,
+        on_done: Callable[[Future], None] | None = None,
+    ) -> Any:
+        """
+        Run fn(*args) in the pool. Waiting for a free slot counts towards the
+        timeout; on timeout the caller gets RenderTimeoutError while a render
+        that already started runs to completion (and still calls on_done).
+        """
+        if self._pending is None:
+            self._pending = asyncio.Semaphore(self.max_pending)
+        pending = self._pending
+        loop = asyncio.get_running_loop()
+        timeout = timeout or self.timeout_seconds
+        try:
+            async with asyncio.timeout(timeout):
+                await pending.acquire()
+                try:
+                    future = self.executor.submit(fn, *args)
+                except BaseException:
+                    pending.release()
+                    raise
+                # The slot is held until the worker is done, not until the caller gives up
+                future.add_done_callback(lambda _: loop.call_soon_threadsafe(pending.release))
+                if on_done is not None:
+                    future.add_done_callback(on_done)
+                return await asyncio.wrap_future(future)
+        except TimeoutError as e:
+            logger.warning("Document render timed out", fn=fn.__name__, timeout=timeout)
+            raise RenderTimeoutError(f"Rendering did not finish within {timeout:g}s") from e
+        except BrokenProcessPool as e:
+            # A worker died (e.g. out of memory); start a fresh pool next time
+            logger.error("Render pool broken, restarting", error=str(e))
+            self.shutdown()
+            raise RenderError("Render worker crashed") from e
+
+    async def render(
+        self,
+        kind: RenderKind,
+        payload: dict[str, Any],
+        timeout: float | None = None,
+    ) -> bytes:
+        """Render a document, or return the cached bytes for identical content."""
+        key = content_key(kind, payload)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        def store(future: Future) -> None:
+            if not future.cancelled() and future.exception() is None:
+                self.cache.put(key, future.result())
+
+        return await self.run(render_document, kind, payload, timeout=timeout, on_done=store)
+
+
+# Global instance
+render_service = RenderService()
@@ -10,38 +10,62 @@ No external services or sign-ups required.
 
 import io
 from datetime import datetime
+from functools import cache
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Any
-
-# PDF Generation (WeasyPrint)
-try:
-    from weasyprint import HTML, CSS
-    WEASYPRINT_AVAILABLE = True
-except ImportError:
-    WEASYPRINT_AVAILABLE = False
-
-# Excel Generation (openpyxl)
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-    from openpyxl.utils import get_column_letter
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
+from typing import TYPE_CHECKING, Any
 
 # HTML templating
-from jinja2 import Environment, BaseLoader
+from app.services.template_engine import template_engine
+
+# PDF rendering runs in the render pool
+from app.services.render_service import RenderKind, RenderTimeoutError, render_service
+
+if TYPE_CHECKING:
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+# PDF Generation (WeasyPrint) and Excel Generation (openpyxl) are imported
+# where they are used, so probing them does not load them at startup
+WEASYPRINT_AVAILABLE = find_spec("weasyprint") is not None
+OPENPYXL_AVAILABLE = find_spec("openpyxl") is not None
+
+
+@cache
+def _font_config() -> "FontConfiguration":
+    from weasyprint.text.fonts import FontConfiguration
+
+    return FontConfiguration()
+
+
+@cache
+def _stylesheet(css: str) -> "CSS":
+    """Parsed stylesheet, kept per process so each CSS string is loaded once."""
+    from weasyprint import CSS
+
+    return CSS(string=css, font_config=_font_config())
+
+
+def html_to_pdf(html: str, css: str | None = None) -> bytes:
+    """Render HTML to PDF with WeasyPrint (blocking; called in render pool workers)."""
+    from weasyprint import HTML
+
+    stylesheets = [_stylesheet(css)] if css else []
+    return HTML(string=html).write_pdf(stylesheets=stylesheets, font_config=_font_config())
+
+
+def warm_up() -> None:
+    """Load WeasyPrint, fonts and the report CSS (render pool initializer)."""
+    if WEASYPRINT_AVAILABLE:
+        _stylesheet(ComplianceReportGenerator.REPORT_CSS)
 
 
 class ComplianceReportGenerator:
     """Generate compliance reports in PDF and Excel formats."""
 
-    def __init__(self):
-        self.jinja_env = Environment(loader=BaseLoader())
-
     # ============ PDF GENERATION ============
 
-    def generate_compliance_report_pdf(
+    async def generate_compliance_report_pdf(
         self,
         company_data: dict[str, Any],
         compliance_data: dict[str, Any],
@@ -56,11 +80,10 @@ class ComplianceReportGenerator:
             # Fallback: return HTML if WeasyPrint not installed
             return html_content.encode("utf-8")
 
-        # Generate PDF
-        html = HTML(string=html_content)
-        css = CSS(string=self._get_report_css())
-        pdf_bytes = html.write_pdf(stylesheets=[css])
-        return pdf_bytes
+        # Generate PDF in the render pool
+        return await render_service.render(
+            RenderKind.HTML_PDF, {"html": html_content, "css": self.REPORT_CSS}
+        )
 
     def _render_compliance_report_html(
         self,
@@ -192,26 +215,27 @@ class ComplianceReportGenerator:
 </html>
         """
 
-        template = self.jinja_env.from_string(template_str)
+        template = template_engine.compile(template_str, template_id="report:compliance")
 
         # Prepare data
         score = compliance_data.get("overall_score", 0)
         score_class = "green" if score >= 80 else "yellow" if score >= 60 else "red"
 
         return template.render(
-            company=company_data,
-            compliance=compliance_data,
-            report_date=datetime.now().strftime("%d.%m.%Y"),
-            score_class=score_class,
-            frameworks=compliance_data.get("frameworks", []),
-            categories=compliance_data.get("categories", []),
-            recommendations=compliance_data.get("recommendations", []),
-            documents=compliance_data.get("documents", []),
+            {
+                "company": company_data,
+                "compliance": compliance_data,
+                "report_date": datetime.now().strftime("%d.%m.%Y"),
+                "score_class": score_class,
+                "frameworks": compliance_data.get("frameworks", []),
+                "categories": compliance_data.get("categories", []),
+                "recommendations": compliance_data.get("recommendations", []),
+                "documents": compliance_data.get("documents", []),
+            }
         )
 
-    def _get_report_css(self) -> str:
-        """Get CSS styles for PDF report."""
-        return """
+    # CSS styles for PDF report
+    REPORT_CSS = """
         @page {
             size: A4;
             margin: 2cm;
@@ -320,6 +344,8 @@ class ComplianceReportGenerator:
         if not OPENPYXL_AVAILABLE:
             raise ImportError("openpyxl is required for Excel generation")
 
+        from openpyxl import Workbook
+
         wb = Workbook()
 
         # Sheet 1: Summary
@@ -356,6 +382,8 @@ class ComplianceReportGenerator:
         compliance_data: dict[str, Any],
     ):
         """Create summary sheet in Excel."""
+        from openpyxl.styles import Font, PatternFill
+
         # Styles
         title_font = Font(size=16, bold=True, color="1E40AF")
         header_font = Font(size=12, bold=True)
@@ -417,6 +445,8 @@ class ComplianceReportGenerator:
 
     def _create_details_sheet(self, ws, compliance_data: dict[str, Any]):
         """Create detailed checks sheet."""
+        from openpyxl.styles import Font, PatternFill
+
         header_fill = PatternFill(start_color="F3F4F6", end_color="F3F4F6", fill_type="solid")
         pass_fill = PatternFill(start_color="D1FAE5", end_color="D1FAE5", fill_type="solid")
         warn_fill = PatternFill(start_color="FEF3C7", end_color="FEF3C7", fill_type="solid")
@@ -457,6 +487,8 @@ class ComplianceReportGenerator:
 
     def _create_documents_sheet(self, ws, compliance_data: dict[str, Any]):
         """Create documents status sheet."""
+        from openpyxl.styles import Font, PatternFill
+
         header_fill = PatternFill(start_color="F3F4F6", end_color="F3F4F6", fill_type="solid")
 
         headers = ["Документ", "Статус", "Дата создания", "Дата утверждения", "Ответственный"]
@@ -483,6 +515,8 @@ class ComplianceReportGenerator:
 
     def _create_recommendations_sheet(self, ws, compliance_data: dict[str, Any]):
         """Create recommendations sheet."""
+        from openpyxl.styles import Font, PatternFill
+
         header_fill = PatternFill(start_color="F3F4F6", end_color="F3F4F6", fill_type="solid")
         high_fill = PatternFill(start_color="FEE2E2", end_color="FEE2E2", fill_type="solid")
         medium_fill = PatternFill(start_color="FEF3C7", end_color="FEF3C7", fill_type="solid")
@@ -520,6 +554,8 @@ class ComplianceReportGenerator:
 
     def _create_measures_sheet(self, ws, compliance_data: dict[str, Any]):
         """Create security measures matrix sheet."""
+        from openpyxl.styles import Font, PatternFill
+
         header_fill = PatternFill(start_color="F3F4F6", end_color="F3F4F6", fill_type="solid")
 
         headers = ["Код", "Мера защиты", "УЗ-4", "УЗ-3", "УЗ-2", "УЗ-1", "Статус", "Средство реализации"]
@@ -552,15 +588,14 @@ class ComplianceReportGenerator:
 
     # ============ DOCUMENT GENERATION ============
 
-    def generate_document_pdf(
+    async def generate_document_pdf(
         self,
         template_content: str,
         form_data: dict[str, Any],
     ) -> bytes:
         """Generate a single document as PDF from template."""
         # Render template with form data
-        template = self.jinja_env.from_string(template_content)
-        html_content = template.render(**form_data)
+        html_content = template_engine.render(template_content, form_data)
 
         # Wrap in HTML document
         full_html = f"""
@@ -592,8 +627,7 @@ class ComplianceReportGenerator:
         if not WEASYPRINT_AVAILABLE:
             return full_html.encode("utf-8")
 
-        html = HTML(string=full_html)
-        return html.write_pdf()
+        return await render_service.render(RenderKind.HTML_PDF, {"html": full_html})
 
 
 # API Endpoints for Reporting
@@ -659,9 +693,12 @@ async def generate_report(request: ReportRequest):
             headers={"Content-Disposition": f"attachment; filename=compliance_report_{request.company_id}.xlsx"},
         )
     else:
-        content = report_generator.generate_compliance_report_pdf(
-            company_data, compliance_data, request.framework
-        )
+        try:
+            content = await report_generator.generate_compliance_report_pdf(
+                company_data, compliance_data, request.framework
+            )
+        except RenderTimeoutError as e:
+            raise HTTPException(status_code=504, detail=str(e))
         return Response(
             content=content,
             media_type="application/pdf",
@@ -679,7 +716,10 @@ async def generate_document(template_code: str, form_data: dict[str, Any]):
     <p>ИНН: {{inn}}</p>
     """
 
-    content = report_generator.generate_document_pdf(template_content, form_data)
+    try:
+        content = await report_generator.generate_document_pdf(template_content, form_data)
+    except RenderTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     return Response(
         content=content,
         media_type="application/pdf",
@@ -8,10 +8,11 @@ from datetime import date, datetime
 from typing import Any
 from uuid import UUID
 
-import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.metrics import external_http_client
+from app.services.template_engine import CompiledTemplate, TemplateSyntax, template_engine
 from app.models.compliance.russian import (
     ISPDNCategory,
     ProtectionLevel,
@@ -42,7 +43,7 @@ class EGRULService:
     RUSPROFILE_URL = "https://www.rusprofile.ru/api/search"
 
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = external_http_client(timeout=30.0)
 
     async def lookup_by_inn(self, inn: str) -> dict[str, Any] | None:
         """
@@ -425,6 +426,45 @@ class DocumentTemplateService:
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    @staticmethod
+    def company_fields(company: RuCompanyProfile) -> dict[str, str]:
+        """Placeholder values taken from a company profile."""
+        today = date.today()
+        return {
+            "company_name": company.full_name or "",
+            "company_short_name": company.short_name or company.full_name or "",
+            "inn": company.inn or "",
+            "kpp": company.kpp or "",
+            "ogrn": company.ogrn or "",
+            "legal_address": company.legal_address or "",
+            "actual_address": company.actual_address or company.legal_address or "",
+            "director_name": company.director_name or "",
+            "director_position": company.director_position or "Генеральный директор",
+            "current_date": today.strftime("%d.%m.%Y"),
+            "current_year": str(today.year),
+            "phone": company.phone or "",
+            "email": company.email or "",
+            "website": company.website or "",
+        }
+
+    @staticmethod
+    def compile_template(template: RuDocumentTemplate) -> CompiledTemplate:
+        """Compiled template, shared until the template's code, version or content changes."""
+        return template_engine.compile(
+            template.template_content,
+            TemplateSyntax.PLACEHOLDER,
+            template_id=template.template_code,
+            version=template.version,
+        )
+
+    def _template_data(
+        self, company: RuCompanyProfile, additional_data: dict | None
+    ) -> dict[str, str]:
+        data = self.company_fields(company)
+        if additional_data:
+            data.update({key: str(value) if value else "" for key, value in additional_data.items()})
+        return data
+
     async def populate_template(
         self,
         template: RuDocumentTemplate,
@@ -433,38 +473,22 @@ class DocumentTemplateService:
     ) -> str:
         """
         Populate a template with company data.
-        Returns filled template content.
+        Returns filled template content; placeholders without data are kept.
         """
-        content = template.template_content
-
-        # Build replacement data
-        replacements = {
-            "{{company_name}}": company.full_name or "",
-            "{{company_short_name}}": company.short_name or company.full_name or "",
-            "{{inn}}": company.inn or "",
-            "{{kpp}}": company.kpp or "",
-            "{{ogrn}}": company.ogrn or "",
-            "{{legal_address}}": company.legal_address or "",
-            "{{actual_address}}": company.actual_address or company.legal_address or "",
-            "{{director_name}}": company.director_name or "",
-            "{{director_position}}": company.director_position or "Генеральный директор",
-            "{{current_date}}": date.today().strftime("%d.%m.%Y"),
-            "{{current_year}}": str(date.today().year),
-            "{{phone}}": company.phone or "",
-            "{{email}}": company.email or "",
-            "{{website}}": company.website or "",
-        }
+        compiled = self.compile_template(template)
+        return compiled.render(self._template_data(company, additional_data))
 
-        # Add additional data
-        if additional_data:
-            for key, value in additional_data.items():
-                replacements[f"{{{{{key}}}}}"] = str(value) if value else ""
-
-        # Apply replacements
-        for placeholder, value in replacements.items():
-            content = content.replace(placeholder, value)
-
-        return content
+    async def populate_for_companies(
+        self,
+        template: RuDocumentTemplate,
+        companies: list[RuCompanyProfile],
+        additional_data: dict | None = None,
+    ) -> list[str]:
+        """Populate one template for many companies, in company order."""
+        compiled = self.compile_template(template)
+        return compiled.render_many(
+            self._template_data(company, additional_data) for company in companies
+        )
 
     async def create_document_from_template(
         self,
@@ -8,12 +8,12 @@ from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID, uuid4
 
-import httpx
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.metrics import external_http_client
 from app.models.compliance.customer import Customer
 from app.models.compliance.screening import (
     MatchStatus,
@@ -50,7 +50,7 @@ class ScreeningService:
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with external_http_client(timeout=self.timeout) as client:
             url = f"{self.base_url}{endpoint}"
             response = await client.request(method, url, headers=headers, **kwargs)
             response.raise_for_status()
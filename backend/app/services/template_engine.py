@@ -0,0 +1,272 @@
+"""
+Template Engine (Phase 7)
+Precompiled renderers for the three placeholder syntaxes used by document templates.
+
+- JinjaRenderer: SME corporate/HR templates (`{{ field|format_date }}`, `{% for %}`)
+- FormatRenderer: SME templates written for `str.format` (`{field}`)
+- PlaceholderRenderer: GRC packs (152-ФЗ, 187-ФЗ, ГОСТ 57580, ФСТЭК) with plain
+  `{{field}}` placeholders; placeholders without a value are left in place
+
+Each renderer parses its source once and exposes the fields it references,
+so rendering is a single pass over precomputed segments. TemplateEngine
+caches compiled templates by template id + version, checks required fields
+before rendering and renders one template for many data sets in a batch.
+"""
+
+import re
+import string
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from enum import Enum
+from functools import cache
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+
+def format_date(value: Any) -> str:
+    """Format date for Russian documents."""
+    if not value:
+        return "____.____.______"
+    if isinstance(value, str):
+        return value
+    return value.strftime("%d.%m.%Y") if hasattr(value, "strftime") else str(value)
+
+
+@cache
+def jinja_env() -> "Environment":
+    """Shared environment for all Jinja templates; jinja2 is imported on first use."""
+    from jinja2 import Environment
+
+    env = Environment()
+    env.filters["format_date"] = format_date
+    return env
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+def _unique(names: list[str]) -> tuple[str, ...]:
+    return tuple(dict.fromkeys(names))
+
+
+class TemplateRenderer(Protocol):
+    fields: tuple[str, ...]
+
+    def render(self, data: dict[str, Any]) -> str: ...
+
+
+class JinjaRenderer:
+    """Jinja template compiled once in the shared environment."""
+
+    def __init__(self, source: str):
+        from jinja2 import meta
+
+        env = jinja_env()
+        self.fields = tuple(sorted(meta.find_undeclared_variables(env.parse(source))))
+        self._template = env.from_string(source)
+
+    def render(self, data: dict[str, Any]) -> str:
+        return self._template.render(**data)
+
+
+class FormatRenderer:
+    """`str.format` template split into literal text and field names up front."""
+
+    def __init__(self, source: str):
+        self._segments = [
+            (literal, name) for literal, name, _, _ in string.Formatter().parse(source)
+        ]
+        self.fields = _unique([name for _, name in self._segments if name is not None])
+
+    def render(self, data: dict[str, Any]) -> str:
+        parts = []
+        for literal, name in self._segments:
+            parts.append(literal)
+            if name is not None:
+                try:
+                    parts.append(format(data[name], ""))
+                except KeyError as e:
+                    raise ValueError(f"Missing required field: {e}")
+        return "".join(parts)
+
+
+class PlaceholderRenderer:
+    """`{{field}}` substitution in one pass; missing fields keep their placeholder."""
+
+    def __init__(self, source: str):
+        # Alternating literal text and field names: [text, name, text, ..., text]
+        self._parts = _PLACEHOLDER.split(source)
+        self._placeholders = [m.group(0) for m in _PLACEHOLDER.finditer(source)]
+        self.fields = _unique(self._parts[1::2])
+
+    def render(self, data: dict[str, Any]) -> str:
+        parts = self._parts[:]
+        for i, placeholder in enumerate(self._placeholders):
+            value = data.get(parts[2 * i + 1])
+            parts[2 * i + 1] = placeholder if value is None else str(value)
+        return "".join(parts)
+
+
+class TemplateSyntax(str, Enum):
+    """Placeholder syntax of a template source."""
+
+    JINJA = "jinja"
+    FORMAT = "format"
+    PLACEHOLDER = "placeholder"
+
+
+RENDERERS: dict[TemplateSyntax, type] = {
+    TemplateSyntax.JINJA: JinjaRenderer,
+    TemplateSyntax.FORMAT: FormatRenderer,
+    TemplateSyntax.PLACEHOLDER: PlaceholderRenderer,
+}
+
+
+class MissingFieldsError(ValueError):
+    """Required template fields without a value."""
+
+    def __init__(self, template_id: str | None, fields: list[str], row: int | None = None):
+        self.template_id = template_id
+        self.fields = fields
+        self.row = row
+        where = f" (row {row})" if row is not None else ""
+        super().__init__(
+            f"Missing required fields for {template_id or 'template'}{where}: {', '.join(fields)}"
+        )
+
+
+class CompiledTemplate:
+    """
+    A compiled template with its required fields: the given names that the
+    template references, or every referenced field when None.
+    """
+
+    __slots__ = ("template_id", "version", "renderer", "required_fields", "_source_hash")
+
+    def __init__(
+        self,
+        renderer: TemplateRenderer,
+        template_id: str | None = None,
+        version: str | None = None,
+        required_fields: Iterable[str] | None = (),
+        source_hash: int = 0,
+    ):
+        self.template_id = template_id
+        self.version = version
+        self.renderer = renderer
+        if required_fields is None:
+            self.required_fields = renderer.fields
+        else:
+            self.required_fields = tuple(f for f in required_fields if f in renderer.fields)
+        self._source_hash = source_hash
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return self.renderer.fields
+
+    def missing_fields(self, data: dict[str, Any]) -> list[str]:
+        return [name for name in self.required_fields if data.get(name) is None]
+
+    def validate(self, data: dict[str, Any], row: int | None = None) -> None:
+        missing = self.missing_fields(data)
+        if missing:
+            raise MissingFieldsError(self.template_id, missing, row)
+
+    def render(self, data: dict[str, Any]) -> str:
+        self.validate(data)
+        return self.renderer.render(data)
+
+    def render_many(
+        self, rows: Iterable[dict[str, Any]], common: dict[str, Any] | None = None
+    ) -> list[str]:
+        """
+        Render once per row, each row layered over `common`. All rows are
+        validated before anything is rendered.
+        """
+        contexts = [{**common, **row} if common else row for row in rows]
+        for i, context in enumerate(contexts):
+            self.validate(context, row=i)
+        render = self.renderer.render
+        return [render(context) for context in contexts]
+
+
+class TemplateEngine:
+    """
+    Shared cache of compiled templates, keyed by template id + version.
+
+    A cached template is reused while its source is unchanged; a different
+    source under the same key (content edited without a version bump) is
+    recompiled. Templates without an id are keyed by their source.
+    """
+
+    def __init__(self, max_templates: int = 1024):
+        self.max_templates = max_templates
+        self._cache: OrderedDict[tuple, CompiledTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+        self.compilations = 0
+
+    def compile(
+        self,
+        source: str,
+        syntax: TemplateSyntax = TemplateSyntax.JINJA,
+        template_id: str | None = None,
+        version: str | None = None,
+        required_fields: Iterable[str] | None = (),
+    ) -> CompiledTemplate:
+        source_hash = hash(source)
+        key = (syntax, template_id, version) if template_id else (syntax, None, source_hash)
+        with self._lock:
+            compiled = self._cache.get(key)
+            if compiled is not None and compiled._source_hash == source_hash:
+                self._cache.move_to_end(key)
+                return compiled
+
+        compiled = CompiledTemplate(
+            RENDERERS[syntax](source),
+            template_id=template_id,
+            version=version,
+            required_fields=required_fields,
+            source_hash=source_hash,
+        )
+        with self._lock:
+            self.compilations += 1
+            self._cache[key] = compiled
+            while len(self._cache) > self.max_templates:
+                self._cache.popitem(last=False)
+        return compiled
+
+    def render(
+        self,
+        source: str,
+        data: dict[str, Any],
+        syntax: TemplateSyntax = TemplateSyntax.JINJA,
+        template_id: str | None = None,
+        version: str | None = None,
+    ) -> str:
+        return self.compile(source, syntax, template_id, version).render(data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+# Global instance
+template_engine = TemplateEngine()
+
+
+def render_batch(
+    templates: list[tuple[str, str | None, str]],
+    rows: list[dict[str, Any]],
+    syntax: TemplateSyntax = TemplateSyntax.PLACEHOLDER,
+) -> list[list[str]]:
+    """
+    Render every (template_id, version, source) for every row; result is
+    indexed [template][row]. Picklable entry point for process pools - each
+    worker keeps its own compiled templates between batches.
+    """
+    return [
+        template_engine.compile(source, syntax, template_id, version).render_many(rows)
+        for template_id, version, source in templates
+    ]
@@ -23,33 +23,43 @@ Plus GRC Compliance Templates:
 - 152-FZ Personal Data Protection
 - 187-FZ Critical Infrastructure
 - GOST R 57580 Financial Security
+- FSTEC Orders 17/21
+
+All templates are indexed once into a TemplateIndex: id -> template with
+its field list, per-category and lifecycle-stage lists, and an inverted
+index for Russian/English search. Templates are compiled (see
+template_engine) when first rendered.
+
+Template sources come from the newest bundle in TEMPLATE_STORE_PATH (see
+template_store), memory-mapped and read per template on first use, or from
+the template modules when no bundle has been published. A newer bundle is
+picked up without a restart. `build_store` converts the modules into a bundle.
 """
 
-from typing import Dict, Any, List, Optional, Union
+from bisect import bisect_left
 from datetime import date
 from enum import Enum
-from pydantic import BaseModel
+from functools import partial
+from itertools import islice
+from pathlib import Path
+import re
+import time
+from typing import Callable, Dict, Any, List, Optional, Set, Union
 
-# Import all template services
-from app.services.sme_templates_corporate import CorporateTemplateService, CorporateDocType
-from app.services.sme_templates_hr import HRTemplateService, HRDocType
-from app.services.sme_templates_contracts import ContractTemplateService, ContractType
-from app.services.sme_templates_financial import FinancialTemplateService, FinancialDocType
-from app.services.sme_templates_tax import TaxTemplateService, TaxDocType
-from app.services.sme_templates_legal import LegalTemplateService, LegalDocType
-from app.services.sme_templates_industry import IndustryTemplateService, IndustryDocType, Industry
-from app.services.sme_templates_specialized import (
-    SpecializedTemplateService,
-    RealEstateDocType,
-    BankingDocType,
-    GovTenderDocType,
-    LicenseDocType,
-    EnvironmentalDocType,
-    VehicleDocType,
-    QualityDocType,
-    CrisisDocType,
+from pydantic import BaseModel
+import structlog
+
+from app.core.config import settings
+from app.services.template_engine import CompiledTemplate, TemplateSyntax, template_engine
+from app.services.template_store import (
+    TemplateStore,
+    TemplateStoreError,
+    latest_bundle,
+    write_bundle,
 )
 
+logger = structlog.get_logger()
+
 
 class TemplateCategory(str, Enum):
     """Main template categories."""
@@ -96,22 +106,371 @@ class TemplateInfo(BaseModel):
     regulatory_refs: List[str] = []  # e.g., ["152-FZ", "GOST R 57580"]
 
 
+class RegisteredTemplate:
+    """
+    A template in the registry index. The source - a string, or a loader
+    reading it from the template store - is compiled on first render.
+    """
+
+    __slots__ = (
+        "id", "name", "name_en", "category", "description", "syntax", "version",
+        "regulatory_refs", "dated", "declared_required", "_source", "_fields", "_compiled",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        category: TemplateCategory,
+        source: Union[str, Callable[[], str]],
+        syntax: TemplateSyntax,
+        name_en: Optional[str] = None,
+        description: Optional[str] = None,
+        required_fields: Optional[List[str]] = None,
+        regulatory_refs: Optional[List[str]] = None,
+        dated: bool = False,
+        fields: Optional[List[str]] = None,
+        version: Optional[str] = None,
+    ):
+        self.id = id
+        self.name = name
+        self.name_en = name_en
+        self.category = category
+        self.description = description
+        self.syntax = syntax
+        self.version = version
+        # Declared required fields; every placeholder is required when none are declared
+        self.declared_required = required_fields
+        self.regulatory_refs = regulatory_refs or []
+        # str.format services fill day/month/year with today's date when "day" is missing
+        self.dated = dated
+        self._source = source
+        # Fields known up front (from the store index) spare compiling for listings
+        self._fields = tuple(fields) if fields is not None else None
+        self._compiled: Optional[CompiledTemplate] = None
+
+    @property
+    def source(self) -> str:
+        return self._source() if callable(self._source) else self._source
+
+    @property
+    def compiled(self) -> CompiledTemplate:
+        if self._compiled is None:
+            self._compiled = template_engine.compile(
+                self.source,
+                self.syntax,
+                f"registry:{self.category.value}:{self.id}",
+                self.version,
+                required_fields=self.declared_required,
+            )
+            self._fields = self._compiled.fields
+        return self._compiled
+
+    @property
+    def fields(self) -> List[str]:
+        """Fields referenced by the template body."""
+        if self._fields is None:
+            return list(self.compiled.fields)
+        return list(self._fields)
+
+    @property
+    def required_fields(self) -> List[str]:
+        if self.declared_required is None:
+            return self.fields
+        fields = set(self.fields)
+        return [f for f in self.declared_required if f in fields]
+
+    def store_entry(self) -> Dict[str, Any]:
+        """Index entry of the template in a template store bundle."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "name_en": self.name_en,
+            "category": self.category.value,
+            "description": self.description,
+            "syntax": self.syntax.value,
+            "required_fields": self.declared_required,
+            "fields": self.fields,
+            "regulatory_refs": self.regulatory_refs,
+            "dated": self.dated,
+        }
+
+    def render(self, data: Dict[str, Any]) -> str:
+        if self.dated and "day" not in data:
+            today = date.today()
+            data = {
+                **data,
+                "day": str(today.day).zfill(2),
+                "month": RUSSIAN_MONTHS[today.month],
+                "year": str(today.year),
+            }
+        return self.compiled.render(data)
+
+    def summary(self) -> Dict[str, str]:
+        return {"type": self.id, "name": self.name, "category": self.category.value}
+
+    def info(self) -> TemplateInfo:
+        return TemplateInfo(
+            id=self.id,
+            name=self.name,
+            name_en=self.name_en,
+            category=self.category,
+            description=self.description,
+            required_fields=self.required_fields,
+            lifecycle_stages=[
+                stage for stage, ids in TemplateRegistry.STAGE_TEMPLATES.items() if self.id in ids
+            ],
+            regulatory_refs=self.regulatory_refs,
+        )
+
+
+RUSSIAN_MONTHS = {
+    1: "января", 2: "февраля", 3: "марта", 4: "апреля",
+    5: "мая", 6: "июня", 7: "июля", 8: "августа",
+    9: "сентября", 10: "октября", 11: "ноября", 12: "декабря",
+}
+
+# Common Russian inflection endings, longest first, stripped from search terms
+_RU_ENDINGS = sorted(
+    [
+        "ами", "ями", "ого", "его", "ому", "ему", "ыми", "ими", "ой", "ей", "ий", "ый",
+        "ая", "яя", "ое", "ее", "ов", "ев", "ам", "ям", "ах", "ях", "ом", "ем",
+        "ы", "и", "а", "я", "о", "е", "у", "ю", "ь",
+    ],
+    key=len,
+    reverse=True,
+)
+_CYRILLIC = re.compile(r"[а-я]")
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens; ё is folded to е, ids split on underscores."""
+    return _TOKEN.findall(text.casefold().replace("ё", "е"))
+
+
+def stem(token: str) -> str:
+    """Strip one inflection ending from a Cyrillic word, keeping at least 3 letters."""
+    if len(token) > 4 and _CYRILLIC.match(token):
+        for ending in _RU_ENDINGS:
+            if token.endswith(ending) and len(token) - len(ending) >= 3:
+                return token[: -len(ending)]
+    return token
+
+
+class TemplateIndex:
+    """
+    All templates, built once: id lookup, per-category and per-stage lists
+    and an inverted index over names, ids, descriptions and regulatory refs.
+    """
+
+    def __init__(self, templates: List[RegisteredTemplate]):
+        self.templates = templates
+        self.by_id: Dict[str, RegisteredTemplate] = {}
+        self.by_category: Dict[TemplateCategory, List[RegisteredTemplate]] = {
+            category: [] for category in TemplateCategory
+        }
+        self._by_category_id: Dict[tuple, RegisteredTemplate] = {}
+        postings: Dict[str, Set[int]] = {}
+
+        for position, template in enumerate(templates):
+            # Ids shared between services resolve to the first registered one
+            self.by_id.setdefault(template.id, template)
+            self._by_category_id.setdefault((template.category, template.id), template)
+            self.by_category[template.category].append(template)
+            text = " ".join(
+                filter(None, [template.id, template.name, template.name_en,
+                              template.description, *template.regulatory_refs])
+            )
+            for token in tokenize(text):
+                postings.setdefault(token, set()).add(position)
+
+        self._postings = postings
+        self._tokens = sorted(postings)
+        self.by_stage = {
+            stage: [t for t in templates if t.id in ids]
+            for stage, ids in TemplateRegistry.STAGE_TEMPLATES.items()
+        }
+
+    def get(
+        self, template_id: str, category: Optional[TemplateCategory] = None
+    ) -> Optional[RegisteredTemplate]:
+        if category is not None:
+            template = self._by_category_id.get((category, template_id))
+            if template is not None:
+                return template
+        return self.by_id.get(template_id)
+
+    def _prefix_matches(self, term: str) -> Set[int]:
+        """Templates with a token starting with `term`."""
+        matches: Set[int] = set()
+        start = bisect_left(self._tokens, term)
+        for token in islice(self._tokens, start, None):
+            if not token.startswith(term):
+                break
+            matches |= self._postings[token]
+        return matches
+
+    def search(self, query: str) -> List[RegisteredTemplate]:
+        """Templates matching every word of the query (by stemmed prefix), in index order."""
+        positions: Optional[Set[int]] = None
+        for term in tokenize(query):
+            matches = self._prefix_matches(stem(term))
+            positions = matches if positions is None else positions & matches
+            if not positions:
+                return []
+        if positions is None:
+            return list(self.templates)
+        return [self.templates[i] for i in sorted(positions)]
+
+
+def _store_templates(store: TemplateStore) -> List[RegisteredTemplate]:
+    """Templates of a store bundle; sources stay in the mapping until rendered."""
+    version = f"store-v{store.version}"
+    return [
+        RegisteredTemplate(
+            id=entry["id"],
+            name=entry["name"],
+            name_en=entry.get("name_en"),
+            category=TemplateCategory(entry["category"]),
+            description=entry.get("description"),
+            required_fields=entry.get("required_fields"),
+            regulatory_refs=entry.get("regulatory_refs"),
+            source=partial(store.read, position),
+            syntax=TemplateSyntax(entry["syntax"]),
+            dated=entry.get("dated", False),
+            fields=entry["fields"],
+            version=version,
+        )
+        for position, entry in enumerate(store.entries)
+    ]
+
+
+def build_store(directory: Union[str, Path], version: Optional[int] = None) -> Path:
+    """
+    Convert the template modules into a new template store bundle.
+
+    Templates are compiled for their field lists, so a source that does not
+    parse never reaches a bundle. Returns the path of the published bundle.
+    """
+    templates = _build_templates()
+    return write_bundle(
+        directory,
+        [t.store_entry() for t in templates],
+        [t.source for t in templates],
+        version,
+    )
+
+
+def _build_templates() -> List[RegisteredTemplate]:
+    """Collect every template from the SME services and GRC packs."""
+    # Template packs are imported here, on the first index build, not at startup
+    from app.services.ru_templates_152fz import FZ152_DOCUMENT_TEMPLATES
+    from app.services.ru_templates_187fz import TEMPLATES_187FZ
+    from app.services.ru_templates_fstec import TEMPLATES_FSTEC
+    from app.services.ru_templates_gost57580 import TEMPLATES_GOST57580
+    from app.services.sme_templates_corporate import CORPORATE_TEMPLATES
+    from app.services.sme_templates_hr import HR_TEMPLATES
+    from app.services.sme_templates_contracts import ContractTemplateService
+    from app.services.sme_templates_financial import FinancialTemplateService
+    from app.services.sme_templates_tax import TaxTemplateService
+    from app.services.sme_templates_legal import LegalTemplateService
+    from app.services.sme_templates_industry import IndustryTemplateService
+    from app.services.sme_templates_specialized import SpecializedTemplateService
+
+    templates: List[RegisteredTemplate] = []
+
+    # Jinja templates with field metadata
+    for category, source in (
+        (TemplateCategory.CORPORATE, CORPORATE_TEMPLATES),
+        (TemplateCategory.HR, HR_TEMPLATES),
+    ):
+        for template_id, t in source.items():
+            templates.append(
+                RegisteredTemplate(
+                    id=template_id,
+                    name=t["name"],
+                    name_en=t.get("name_en"),
+                    category=category,
+                    description=t.get("description"),
+                    required_fields=[
+                        f["name"] for f in t.get("required_fields", []) if f.get("required")
+                    ],
+                    source=t.get("template_content", ""),
+                    syntax=TemplateSyntax.JINJA,
+                )
+            )
+
+    # str.format templates keyed by document type enums
+    for category, service in (
+        (TemplateCategory.CONTRACTS, ContractTemplateService),
+        (TemplateCategory.FINANCIAL, FinancialTemplateService),
+        (TemplateCategory.TAX, TaxTemplateService),
+        (TemplateCategory.LEGAL, LegalTemplateService),
+        (TemplateCategory.INDUSTRY, IndustryTemplateService),
+    ):
+        for doc_type, source in service.TEMPLATES.items():
+            templates.append(
+                RegisteredTemplate(
+                    id=doc_type.value,
+                    name=service.TEMPLATE_NAMES[doc_type],
+                    category=category,
+                    source=source,
+                    syntax=TemplateSyntax.FORMAT,
+                    dated=True,
+                )
+            )
+    for category, group in SpecializedTemplateService.get_all_templates().items():
+        for doc_type, source in group.items():
+            templates.append(
+                RegisteredTemplate(
+                    id=doc_type.value,
+                    name=SpecializedTemplateService.TEMPLATE_NAMES[doc_type],
+                    category=TemplateCategory(category),
+                    source=source,
+                    syntax=TemplateSyntax.FORMAT,
+                    dated=True,
+                )
+            )
+
+    # GRC compliance packs
+    for pack in (FZ152_DOCUMENT_TEMPLATES, TEMPLATES_187FZ, TEMPLATES_GOST57580, TEMPLATES_FSTEC):
+        for t in pack:
+            templates.append(
+                RegisteredTemplate(
+                    id=t["template_code"],
+                    name=t["title"],
+                    name_en=t.get("title_en"),
+                    category=TemplateCategory.GRC_COMPLIANCE,
+                    description=t.get("description"),
+                    required_fields=[
+                        f["name"] for f in t.get("form_fields", []) if f.get("required")
+                    ],
+                    regulatory_refs=[
+                        ref for ref in (t.get("framework"), t.get("requirement_ref")) if ref
+                    ],
+                    source=t["template_content"],
+                    syntax=TemplateSyntax.PLACEHOLDER,
+                )
+            )
+
+    return templates
+
+
 class TemplateRegistry:
     """
     Unified registry for all document templates.
     Provides single entry point for template discovery and generation.
+
+    Templates are indexed into a TemplateIndex on first use, so lookups,
+    listings and searches never rebuild template lists. The index is
+    rebuilt when a newer store bundle is published (checked at most every
+    TEMPLATE_STORE_CHECK_SECONDS).
     """
 
-    # Category to service mapping
-    CATEGORY_SERVICES = {
-        TemplateCategory.CORPORATE: CorporateTemplateService,
-        TemplateCategory.HR: HRTemplateService,
-        TemplateCategory.CONTRACTS: ContractTemplateService,
-        TemplateCategory.FINANCIAL: FinancialTemplateService,
-        TemplateCategory.TAX: TaxTemplateService,
-        TemplateCategory.LEGAL: LegalTemplateService,
-        TemplateCategory.INDUSTRY: IndustryTemplateService,
-    }
+    _index: Optional[TemplateIndex] = None
+    _store: Optional[TemplateStore] = None
+    _store_checked_at: float = 0.0
 
     # Lifecycle stage recommendations
     STAGE_TEMPLATES = {
@@ -175,6 +534,49 @@ class TemplateRegistry:
         ],
     }
 
+    @classmethod
+    def index(cls) -> TemplateIndex:
+        """The template index, built on first call and when the store changes."""
+        if cls._index is None or cls._store_changed():
+            store = cls._open_store()
+            templates = _store_templates(store) if store is not None else _build_templates()
+            cls._store, cls._index = store, TemplateIndex(templates)
+            cls._store_checked_at = time.monotonic()
+        return cls._index
+
+    @classmethod
+    def _open_store(cls) -> Optional[TemplateStore]:
+        """The newest store bundle; None falls back to the template modules."""
+        try:
+            store = TemplateStore.open_latest(settings.TEMPLATE_STORE_PATH)
+        except TemplateStoreError as e:
+            logger.error("Template store unusable, using template modules", error=str(e))
+            return None
+        if store is not None:
+            logger.info(
+                "Template store loaded",
+                path=str(store.path),
+                version=store.version,
+                templates=len(store),
+            )
+        return store
+
+    @classmethod
+    def _store_changed(cls) -> bool:
+        interval = settings.TEMPLATE_STORE_CHECK_SECONDS
+        now = time.monotonic()
+        if interval <= 0 or now - cls._store_checked_at < interval:
+            return False
+        cls._store_checked_at = now
+        current = cls._store.path if cls._store is not None else None
+        return latest_bundle(settings.TEMPLATE_STORE_PATH) != current
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the index; the next lookup rebuilds it."""
+        cls._index = None
+        cls._store = None
+
     @classmethod
     def get_categories(cls) -> List[Dict[str, Any]]:
         """Get all available template categories."""
@@ -213,110 +615,44 @@ class TemplateRegistry:
     @classmethod
     def _get_category_count(cls, category: TemplateCategory) -> int:
         """Get template count for category."""
-        counts = {
-            TemplateCategory.CORPORATE: 15,
-            TemplateCategory.HR: 20,
-            TemplateCategory.CONTRACTS: 25,
-            TemplateCategory.FINANCIAL: 18,
-            TemplateCategory.TAX: 15,
-            TemplateCategory.LEGAL: 12,
-            TemplateCategory.INDUSTRY: 40,
-            TemplateCategory.REAL_ESTATE: 12,
-            TemplateCategory.BANKING: 15,
-            TemplateCategory.GOV_TENDERS: 15,
-            TemplateCategory.LICENSES: 10,
-            TemplateCategory.ENVIRONMENTAL: 12,
-            TemplateCategory.VEHICLES: 8,
-            TemplateCategory.QUALITY: 10,
-            TemplateCategory.CRISIS: 8,
-            TemplateCategory.GRC_COMPLIANCE: 30,
-        }
-        return counts.get(category, 0)
+        return len(cls.index().by_category[category])
 
     @classmethod
     def list_templates(cls, category: Optional[TemplateCategory] = None) -> List[Dict[str, str]]:
         """List all templates, optionally filtered by category."""
-        templates = []
-
-        if category is None or category == TemplateCategory.CORPORATE:
-            templates.extend([
-                {"type": t["type"], "name": t["name"], "category": "corporate"}
-                for t in CorporateTemplateService.list_templates()
-            ])
-
-        if category is None or category == TemplateCategory.HR:
-            templates.extend([
-                {"type": t["type"], "name": t["name"], "category": "hr"}
-                for t in HRTemplateService.list_templates()
-            ])
-
-        if category is None or category == TemplateCategory.CONTRACTS:
-            templates.extend([
-                {"type": t["type"], "name": t["name"], "category": "contracts"}
-                for t in ContractTemplateService.list_templates()
-            ])
-
-        if category is None or category == TemplateCategory.FINANCIAL:
-            templates.extend([
-                {"type": t["type"], "name": t["name"], "category": "financial"}
-                for t in FinancialTemplateService.list_templates()
-            ])
-
-        if category is None or category == TemplateCategory.TAX:
-            templates.extend([
-                {"type": t["type"], "name": t["name"], "category": "tax"}
-                for t in TaxTemplateService.list_templates()
-            ])
-
-        if category is None or category == TemplateCategory.LEGAL:
-            templates.extend([
-                {"type": t["type"], "name": t["name"], "category": "legal"}
-                for t in LegalTemplateService.list_templates()
-            ])
-
-        if category is None or category == TemplateCategory.INDUSTRY:
-            templates.extend([
-                {"type": t["type"], "name": t["name"], "category": "industry"}
-                for t in IndustryTemplateService.list_templates()
-            ])
-
-        # Add specialized templates
-        if category is None or category in [
-            TemplateCategory.REAL_ESTATE,
-            TemplateCategory.BANKING,
-            TemplateCategory.GOV_TENDERS,
-            TemplateCategory.LICENSES,
-            TemplateCategory.ENVIRONMENTAL,
-            TemplateCategory.VEHICLES,
-            TemplateCategory.QUALITY,
-            TemplateCategory.CRISIS,
-        ]:
-            templates.extend([
-                {"type": t["type"], "name": t["name"], "category": "specialized"}
-                for t in SpecializedTemplateService.list_all_templates()
-            ])
-
-        return templates
+        index = cls.index()
+        templates = index.templates if category is None else index.by_category[category]
+        return [t.summary() for t in templates]
 
     @classmethod
     def get_templates_for_stage(cls, stage: CompanyLifecycleStage) -> List[Dict[str, str]]:
         """Get recommended templates for a company lifecycle stage."""
-        recommended_ids = cls.STAGE_TEMPLATES.get(stage, [])
-        all_templates = cls.list_templates()
-
-        return [t for t in all_templates if t["type"] in recommended_ids]
+        return [t.summary() for t in cls.index().by_stage.get(stage, [])]
 
     @classmethod
-    def search_templates(cls, query: str) -> List[Dict[str, str]]:
-        """Search templates by name or type."""
-        query_lower = query.lower()
-        all_templates = cls.list_templates()
+    def search_templates(
+        cls, query: str, category: Optional[TemplateCategory] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Search templates by name, id, description or regulatory reference.
 
+        Every word of the query must match the start of a word in the template
+        (case- and ё-insensitive, Russian endings ignored), so "договора
+        поставки" finds "Договор поставки".
+        """
         return [
-            t for t in all_templates
-            if query_lower in t["name"].lower() or query_lower in t["type"].lower()
+            t.summary()
+            for t in cls.index().search(query)
+            if category is None or t.category == category
         ]
 
+    @classmethod
+    def get_template(
+        cls, template_type: str, category: Optional[TemplateCategory] = None
+    ) -> Optional[RegisteredTemplate]:
+        """Look up a template by id; a category hint picks among ids shared by services."""
+        return cls.index().get(template_type, category)
+
     @classmethod
     def generate_document(
         cls,
@@ -330,77 +666,32 @@ class TemplateRegistry:
         Args:
             template_type: Template identifier (e.g., "charter_ooo", "employment_contract")
             data: Dictionary with field values
-            category: Optional category hint for faster lookup
+            category: Optional category hint for templates sharing an id
 
         Returns:
             Generated document as string
 
         Raises:
             ValueError: If template not found or missing required fields
+                (MissingFieldsError lists all of them)
         """
-        # Try each service until we find the template
-        services_to_try = []
-
-        if category:
-            service = cls.CATEGORY_SERVICES.get(category)
-            if service:
-                services_to_try.append(service)
-
-        # Add all services as fallback
-        services_to_try.extend([
-            CorporateTemplateService,
-            HRTemplateService,
-            ContractTemplateService,
-            FinancialTemplateService,
-            TaxTemplateService,
-            LegalTemplateService,
-            IndustryTemplateService,
-            SpecializedTemplateService,
-        ])
-
-        # Try to find and generate template
-        for service in services_to_try:
-            try:
-                # Different services have different enum types
-                if service == CorporateTemplateService:
-                    doc_type = CorporateDocType(template_type)
-                    return service.generate_document(doc_type, data)
-                elif service == HRTemplateService:
-                    doc_type = HRDocType(template_type)
-                    return service.generate_document(doc_type, data)
-                elif service == ContractTemplateService:
-                    doc_type = ContractType(template_type)
-                    return service.generate_document(doc_type, data)
-                elif service == FinancialTemplateService:
-                    doc_type = FinancialDocType(template_type)
-                    return service.generate_document(doc_type, data)
-                elif service == TaxTemplateService:
-                    doc_type = TaxDocType(template_type)
-                    return service.generate_document(doc_type, data)
-                elif service == LegalTemplateService:
-                    doc_type = LegalDocType(template_type)
-                    return service.generate_document(doc_type, data)
-                elif service == IndustryTemplateService:
-                    doc_type = IndustryDocType(template_type)
-                    return service.generate_document(doc_type, data)
-                elif service == SpecializedTemplateService:
-                    return service.generate_document(template_type, data)
-            except (ValueError, KeyError):
-                continue
-
-        raise ValueError(f"Template not found: {template_type}")
+        template = cls.get_template(template_type, category)
+        if template is None:
+            raise ValueError(f"Template not found: {template_type}")
+        return template.render(data)
 
     @classmethod
     def get_template_fields(cls, template_type: str) -> List[str]:
-        """Get required fields for a template."""
-        # This would be implemented by extracting {field} placeholders from templates
-        # For now, return empty list as placeholder
-        return []
+        """Get the fields referenced by a template."""
+        template = cls.get_template(template_type)
+        if template is None:
+            raise ValueError(f"Template not found: {template_type}")
+        return template.fields
 
     @classmethod
     def get_template_count(cls) -> int:
         """Get total number of available templates."""
-        return sum(cls._get_category_count(cat) for cat in TemplateCategory)
+        return len(cls.index().templates)
 
     @classmethod
     def get_statistics(cls) -> Dict[str, Any]:
@@ -0,0 +1,175 @@
+"""
+Template Store (Phase 7)
+Versioned on-disk bundle of document template sources, memory-mapped by
+every worker and decompressed one template at a time on first use.
+
+Bundle layout (`templates-v{N}.bundle`, little-endian):
+
+    magic (8 bytes) | format version (u32) | index length (u32)
+    index           - UTF-8 JSON: bundle version and per-template metadata,
+                      each entry with the offset and length of its source
+    sources         - zlib-compressed UTF-8 template sources
+
+The index carries everything needed to list, search and validate
+templates, so only the sources of templates that are rendered are ever
+read. Bundles are published with increasing version numbers into the store
+directory; the newest one is used, and older ones may stay in place until
+no worker maps them any more.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+import zlib
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+MAGIC = b"CXTPLBND"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sII")
+_BUNDLE_NAME = re.compile(r"templates-v(\d+)\.bundle")
+
+
+class TemplateStoreError(ValueError):
+    """A template bundle is missing, corrupt or of an unknown format."""
+
+
+def bundle_path(directory: str | Path, version: int) -> Path:
+    return Path(directory) / f"templates-v{version}.bundle"
+
+
+def bundle_versions(directory: str | Path) -> list[int]:
+    """Versions of the bundles in the store directory, ascending."""
+    if not directory or not Path(directory).is_dir():
+        return []
+    versions = []
+    for entry in os.scandir(directory):
+        match = _BUNDLE_NAME.fullmatch(entry.name)
+        if match:
+            versions.append(int(match.group(1)))
+    return sorted(versions)
+
+
+def latest_bundle(directory: str | Path) -> Path | None:
+    versions = bundle_versions(directory)
+    return bundle_path(directory, versions[-1]) if versions else None
+
+
+def write_bundle(
+    directory: str | Path,
+    entries: Sequence[dict[str, Any]],
+    sources: Sequence[str],
+    version: int | None = None,
+) -> Path:
+    """
+    Publish a new bundle of the given index entries and their sources.
+
+    The version defaults to one above the newest bundle in the directory.
+    The file is written under a temporary name and renamed into place, so
+    workers never see a partial bundle.
+    """
+    if len(entries) != len(sources):
+        raise ValueError("Every template entry needs exactly one source")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    if version is None:
+        versions = bundle_versions(directory)
+        version = versions[-1] + 1 if versions else 1
+    path = bundle_path(directory, version)
+    if path.exists():
+        raise TemplateStoreError(f"Template bundle version {version} already exists")
+
+    blobs = [zlib.compress(source.encode(), 9) for source in sources]
+    index_entries = []
+    offset = 0
+    for entry, blob in zip(entries, blobs, strict=True):
+        index_entries.append({**entry, "offset": offset, "length": len(blob)})
+        offset += len(blob)
+    index = json.dumps(
+        {
+            "version": version,
+            "created_at": datetime.now(UTC).isoformat(),
+            "templates": index_entries,
+        },
+        ensure_ascii=False,
+    ).encode()
+
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".templates-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(index)))
+            f.write(index)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+class TemplateStore:
+    """
+    A memory-mapped template bundle. The index is parsed on open; sources
+    are decompressed from the mapping when read.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise TemplateStoreError(f"Cannot open template bundle {self.path}: {e}") from e
+
+        if len(self._map) < _HEADER.size:
+            raise TemplateStoreError(f"Truncated template bundle {self.path}")
+        magic, format_version, index_length = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise TemplateStoreError(f"Not a template bundle: {self.path}")
+        if format_version != FORMAT_VERSION:
+            raise TemplateStoreError(
+                f"Unsupported template bundle format {format_version} in {self.path}"
+            )
+        data_start = _HEADER.size + index_length
+        try:
+            index = json.loads(self._map[_HEADER.size : data_start])
+        except ValueError as e:
+            raise TemplateStoreError(f"Corrupt template bundle index in {self.path}") from e
+
+        self.version: int = index["version"]
+        self.created_at: str | None = index.get("created_at")
+        self.entries: list[dict[str, Any]] = index["templates"]
+        self._data_start = data_start
+        if self.entries:
+            last = self.entries[-1]
+            if data_start + last["offset"] + last["length"] > len(self._map):
+                raise TemplateStoreError(f"Truncated template bundle {self.path}")
+
+    @classmethod
+    def open_latest(cls, directory: str | Path) -> "TemplateStore | None":
+        """The newest bundle in the directory, or None when there is none."""
+        path = latest_bundle(directory)
+        return cls(path) if path is not None else None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def read(self, position: int) -> str:
+        """Source of the template at `position` in the index."""
+        entry = self.entries[position]
+        start = self._data_start + entry["offset"]
+        try:
+            return zlib.decompress(self._map[start : start + entry["length"]]).decode()
+        except zlib.error as e:
+            raise TemplateStoreError(
+                f"Corrupt source of template {entry.get('id')} in {self.path}"
+            ) from e
+
+    def close(self) -> None:
+        self._map.close()
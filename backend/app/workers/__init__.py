@@ -3,6 +3,7 @@ Celery Worker Configuration for CORTEX-CI
 """
 
 from celery import Celery
+from celery.signals import task_postrun, task_prerun
 import os
 
 # Get Redis URL from environment
@@ -46,4 +47,35 @@ app.conf.beat_schedule = {
         "task": "app.workers.tasks.send_compliance_reminders",
         "schedule": 86400.0,  # Every 24 hours
     },
+    # Daily creation of upcoming partitions and risk score retention
+    "maintain-partitions-daily": {
+        "task": "app.workers.tasks.maintain_partitions",
+        "schedule": 86400.0,  # Every 24 hours
+    },
+    # Daily audit log archival (resumes an interrupted run first)
+    "archive-audit-logs-daily": {
+        "task": "app.workers.tasks.archive_audit_logs",
+        "schedule": 86400.0,  # Every 24 hours
+    },
 }
+
+
+# N+1 query detection per task (opt-in via QUERY_DETECTOR_MODE)
+_detector_scopes: dict[str, tuple] = {}
+
+
+@task_prerun.connect
+def _start_query_detection(task_id=None, task=None, **kwargs):
+    from app.core.query_detector import query_detector
+
+    if query_detector.enabled:
+        _detector_scopes[task_id] = query_detector.start(f"task {task.name}")
+
+
+@task_postrun.connect
+def _finish_query_detection(task_id=None, **kwargs):
+    from app.core.query_detector import query_detector
+
+    entry = _detector_scopes.pop(task_id, None)
+    if entry is not None:
+        query_detector.finish(*entry)
@@ -222,3 +222,63 @@ def fetch_company_by_inn(self, inn: str, force_refresh: bool = False):
     except Exception as e:
         logger.error("Company fetch failed", error=str(e), inn=inn)
         raise self.retry(exc=e, countdown=60, max_retries=3)
+
+
+@app.task(bind=True, name="app.workers.tasks.archive_audit_logs")
+def archive_audit_logs(self, job_id: str | None = None):
+    """
+    Archive old audit logs to NDJSON.gz files.
+
+    Continues the given job, or else the most recent interrupted or failed
+    archival, before starting a new run.
+    """
+    import asyncio
+
+    from app.core.database import AsyncSessionLocal
+
+    logger.info("Starting audit log archival", job_id=job_id)
+
+    async def _archive():
+        from app.core.job_registry import JobStatus, job_registry
+        from app.services.audit_archival import ARCHIVE_JOB_KIND, audit_archival
+
+        resume_id = job_id
+        if resume_id is None:
+            for job in await job_registry.recent(kind=ARCHIVE_JOB_KIND, limit=1):
+                if job.interrupted or job.status == JobStatus.FAILED:
+                    resume_id = job.job_id
+
+        async with AsyncSessionLocal() as db:
+            if resume_id:
+                await audit_archival.archive_old_logs(db, job_id=resume_id)
+            return await audit_archival.archive_old_logs(db)
+
+    try:
+        result = asyncio.run(_archive())
+        logger.info("Audit log archival completed", result=result)
+        return result
+    except Exception as e:
+        logger.error("Audit log archival failed", error=str(e))
+        raise self.retry(exc=e, countdown=600, max_retries=3)
+
+
+@app.task(bind=True, name="app.workers.tasks.maintain_partitions")
+def maintain_partitions(self):
+    """Create upcoming monthly partitions and drop expired risk score months."""
+    import asyncio
+
+    from app.core.database import AsyncSessionLocal
+
+    async def _maintain():
+        from app.core.partitions import maintain_partitions
+
+        async with AsyncSessionLocal() as db:
+            return await maintain_partitions(db)
+
+    try:
+        result = asyncio.run(_maintain())
+        logger.info("Partition maintenance completed", result=result)
+        return result
+    except Exception as e:
+        logger.error("Partition maintenance failed", error=str(e))
+        raise self.retry(exc=e, countdown=600, max_retries=3)
@@ -0,0 +1,138 @@
+"""
+Middleware Overhead Benchmark
+Measures per-request overhead of the security middleware stack by driving a
+trivial endpoint with a concurrent in-process load generator.
+
+Three stacks are compared:
+  - bare:     no middleware
+  - legacy:   the same number of BaseHTTPMiddleware layers (pre pure-ASGI stack)
+  - asgi:     the current pure ASGI stack from app.middleware
+
+Usage:
+    docker compose exec -w /app backend python scripts/benchmark_middleware.py
+    python scripts/benchmark_middleware.py --requests 5000 --concurrency 50
+"""
+import os
+import sys
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+import structlog
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.rate_limit import RateLimiter, RateLimitMiddleware
+from app.middleware.request_validation import RequestValidationMiddleware
+from app.middleware.security import (
+    SECURITY_HEADERS,
+    RequestLoggingMiddleware,
+    SecurityHeadersMiddleware,
+)
+
+STACK_DEPTH = 4
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """Rate limiter that never touches Redis, so only middleware cost is measured."""
+
+    async def is_rate_limited(self, identifier, endpoint, limit, window_seconds):
+        return False, {"limit": limit, "remaining": limit, "reset": 0}
+
+
+class LegacyHeadersMiddleware(BaseHTTPMiddleware):
+    """BaseHTTPMiddleware layer doing the same header work as the old stack."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS:
+            response.headers[name] = value
+        return response
+
+
+def build_app(stack: str) -> FastAPI:
+    """Build a benchmark app wrapped in the requested middleware stack."""
+    app = FastAPI()
+
+    @app.get("/v1/ping")
+    async def ping():
+        return JSONResponse({"status": "ok"})
+
+    if stack == "legacy":
+        for _ in range(STACK_DEPTH):
+            app.add_middleware(LegacyHeadersMiddleware)
+    elif stack == "asgi":
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(RequestLoggingMiddleware)
+        app.add_middleware(RequestValidationMiddleware)
+        app.add_middleware(RateLimitMiddleware, limiter=InMemoryRateLimiter())
+
+    return app
+
+
+async def run_load(app: FastAPI, total: int, concurrency: int) -> list[float]:
+    """Issue `total` requests with `concurrency` workers, returning latencies in ms."""
+    latencies: list[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                response = await client.get("/v1/ping?page=1")
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return latencies
+
+
+async def main(total: int, concurrency: int):
+    # Keep request logging output from dominating the measurement
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL))
+
+    results = {}
+    for stack in ("bare", "legacy", "asgi"):
+        app = build_app(stack)
+        await run_load(app, min(total, 200), concurrency)  # warm-up
+        started = time.perf_counter()
+        latencies = await run_load(app, total, concurrency)
+        elapsed = time.perf_counter() - started
+        results[stack] = {
+            "rps": total / elapsed,
+            "p50": statistics.median(latencies),
+            "p99": statistics.quantiles(latencies, n=100)[98],
+        }
+
+    bare_p50 = results["bare"]["p50"]
+    print(f"{'stack':<8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'overhead ms':>12}")
+    for stack, r in results.items():
+        print(
+            f"{stack:<8} {r['rps']:>10.0f} {r['p50']:>10.3f} {r['p99']:>10.3f} "
+            f"{r['p50'] - bare_p50:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark middleware overhead")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,107 @@
+"""
+RBAC Benchmark
+Measures permission checks/sec of the compiled permission masks against
+rebuilding the user's permission set from role assignments on every check.
+
+Compared paths:
+  - check:  one permission for one company
+  - batch:  one permission for every company of a list page, one check
+            per company (legacy) vs. check_permission_batch
+
+Usage:
+    docker compose exec -w /app backend python scripts/benchmark_rbac.py
+    python scripts/benchmark_rbac.py --iterations 50000 --companies 200
+"""
+
+import os
+import sys
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from uuid import UUID, uuid4
+
+from app.services.rbac import SYSTEM_ROLES, Permission, RBACService
+
+USER_ID = "benchmark-user"
+
+
+async def legacy_check(
+    rbac: RBACService, user_id: str, permission: Permission, company_id: UUID | None
+) -> bool:
+    """Previous check_permission: rebuild the permission set, then look it up."""
+    permissions: set[Permission] = set()
+    for user_role in await rbac.get_user_roles(user_id, company_id):
+        role = rbac.roles.get(user_role.role_id)
+        if role:
+            permissions.update(role.permissions)
+            if role.parent_role_id:
+                parent = rbac.roles.get(role.parent_role_id)
+                if parent:
+                    permissions.update(parent.permissions)
+    return Permission.ADMIN_FULL in permissions or permission in permissions
+
+
+async def rate(fn: Callable[[], Awaitable[object]], iterations: int) -> float:
+    """Awaited calls per second of fn."""
+    for _ in range(min(iterations, 100)):  # warm-up
+        await fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    return iterations / (time.perf_counter() - started)
+
+
+async def main(iterations: int, companies: int):
+    rbac = RBACService()
+    company_ids = [uuid4() for _ in range(companies)]
+    # A typical holding user: a global read-only role plus a role per company
+    await rbac.assign_role(USER_ID, SYSTEM_ROLES["viewer"].id)
+    roles = [SYSTEM_ROLES[name].id for name in ("dpo", "manager", "auditor", "employee")]
+    for i, company_id in enumerate(company_ids):
+        await rbac.assign_role(USER_ID, roles[i % len(roles)], company_id=company_id)
+    print(f"{len(rbac.user_roles[USER_ID])} assignments, {companies} companies\n")
+
+    company_id = company_ids[0]
+    permission = Permission.DOCUMENTS_APPROVE
+
+    async def legacy_batch():
+        return [await legacy_check(rbac, USER_ID, permission, c) for c in company_ids]
+
+    cases = [
+        (
+            "check",
+            lambda: legacy_check(rbac, USER_ID, permission, company_id),
+            lambda: rbac.check_permission(USER_ID, permission, company_id),
+            1,
+        ),
+        (
+            f"batch x{companies}",
+            legacy_batch,
+            lambda: rbac.check_permission_batch(USER_ID, permission, company_ids),
+            companies,
+        ),
+    ]
+
+    print(f"{'operation':<16} {'legacy checks/s':>16} {'compiled checks/s':>18} {'speedup':>9}")
+    for name, legacy, compiled, per_call in cases:
+        n = max(iterations // per_call, 1)
+        legacy_rate = await rate(legacy, n) * per_call
+        compiled_rate = await rate(compiled, n) * per_call
+        print(
+            f"{name:<16} {legacy_rate:>16,.0f} {compiled_rate:>18,.0f} "
+            f"{compiled_rate / legacy_rate:>8.1f}x"
+        )
+    print(f"\ncache: {rbac.cache_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark compiled RBAC permission checks")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--companies", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.companies))
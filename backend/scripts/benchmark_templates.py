@@ -0,0 +1,155 @@
+"""
+Template Registry Benchmark
+Measures template lookups/sec and renders/sec of the precompiled template
+index against the previous approach.
+
+Compared paths:
+  - lookup:  sequential enum construction across template services (legacy)
+             vs. TemplateIndex dict lookup
+  - render:  per-call str.format / jinja from_string (legacy)
+             vs. precompiled renderers
+  - search:  substring scan over a freshly built template list (legacy)
+             vs. the inverted index
+
+Usage:
+    docker compose exec -w /app backend python scripts/benchmark_templates.py
+    python scripts/benchmark_templates.py --iterations 20000
+"""
+
+import os
+import sys
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from collections.abc import Callable
+
+from jinja2 import Environment
+
+from app.services.sme_templates_contracts import ContractTemplateService, ContractType
+from app.services.sme_templates_corporate import CorporateDocType
+from app.services.sme_templates_financial import FinancialDocType
+from app.services.sme_templates_hr import HR_TEMPLATES, HRDocType
+from app.services.sme_templates_industry import IndustryDocType
+from app.services.sme_templates_legal import LegalDocType
+from app.services.sme_templates_tax import TaxDocType
+from app.services.template_engine import format_date
+from app.services.template_registry import TemplateRegistry
+
+LEGACY_ENUMS = [
+    CorporateDocType,
+    HRDocType,
+    ContractType,
+    FinancialDocType,
+    TaxDocType,
+    LegalDocType,
+    IndustryDocType,
+]
+
+# One id per service position, so the legacy scan depth varies
+LOOKUP_IDS = [
+    "charter_ooo",
+    "employment_contract",
+    "supply",
+    "invoice",
+    "usn_application",
+    "lawsuit",
+    "sla_agreement",
+    "waybill",
+]
+
+
+def legacy_lookup(template_id: str):
+    """Previous generate_document lookup: try each service's enum in turn."""
+    for enum in LEGACY_ENUMS:
+        try:
+            return enum(template_id)
+        except ValueError:
+            continue
+    return None
+
+
+def legacy_format_render(data: dict) -> str:
+    return ContractTemplateService.TEMPLATES[ContractType.SUPPLY].format(**data)
+
+
+def legacy_jinja_render(data: dict) -> str:
+    env = Environment()
+    env.filters["format_date"] = format_date
+    return env.from_string(HR_TEMPLATES["employment_contract"]["template_content"]).render(**data)
+
+
+def legacy_search(query: str) -> list:
+    query = query.lower()
+    templates = [
+        {"type": t["type"], "name": t["name"]} for t in ContractTemplateService.list_templates()
+    ] + [{"type": tid, "name": t["name"]} for tid, t in HR_TEMPLATES.items()]
+    return [t for t in templates if query in t["name"].lower() or query in t["type"].lower()]
+
+
+def rate(fn: Callable[[], object], iterations: int) -> float:
+    """Calls per second of fn."""
+    for _ in range(min(iterations, 100)):  # warm-up
+        fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def main(iterations: int):
+    started = time.perf_counter()
+    index = TemplateRegistry.index()
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"Index built in {build_ms:.1f} ms ({len(index.templates)} templates)\n")
+
+    supply = TemplateRegistry.get_template("supply")
+    employment = TemplateRegistry.get_template("employment_contract")
+    supply_data = dict.fromkeys(supply.fields, "X")
+    employment_data = dict.fromkeys(employment.fields, "X")
+
+    cases = [
+        (
+            "lookup",
+            lambda: [legacy_lookup(i) for i in LOOKUP_IDS],
+            lambda: [index.get(i) for i in LOOKUP_IDS],
+            len(LOOKUP_IDS),
+        ),
+        (
+            "render str.format",
+            lambda: legacy_format_render(supply_data),
+            lambda: supply.render(supply_data),
+            1,
+        ),
+        (
+            "render jinja",
+            lambda: legacy_jinja_render(employment_data),
+            lambda: employment.render(employment_data),
+            1,
+        ),
+        (
+            "search",
+            lambda: legacy_search("договор"),
+            lambda: index.search("договор"),
+            1,
+        ),
+    ]
+
+    print(f"{'operation':<20} {'legacy ops/s':>14} {'indexed ops/s':>14} {'speedup':>9}")
+    for name, legacy, indexed, per_call in cases:
+        n = max(iterations // per_call, 1)
+        legacy_rate = rate(legacy, n) * per_call
+        indexed_rate = rate(indexed, n) * per_call
+        print(
+            f"{name:<20} {legacy_rate:>14,.0f} {indexed_rate:>14,.0f} "
+            f"{indexed_rate / legacy_rate:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the template registry index")
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,148 @@
+"""
+WebSocket Fan-out Benchmark
+Measures alert delivery throughput through the Redis broker across several
+worker processes, each holding a number of in-memory WebSocket connections
+for the same tenant.
+
+One publisher process broadcasts alerts through its own WebSocketManager;
+every worker receives them via Redis pub/sub and delivers to its local
+connections. Reported throughput is total deliveries per second, from the
+first publish to the last delivery on any worker.
+
+Requires a reachable Redis (REDIS_URL or --redis-url).
+
+Usage:
+    docker compose exec -w /app backend python scripts/benchmark_websocket_fanout.py
+    python scripts/benchmark_websocket_fanout.py --workers 4 --connections 250 --messages 2000
+"""
+import os
+import sys
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import logging
+import multiprocessing as mp
+import time
+from uuid import UUID, uuid4
+
+import structlog
+from starlette.websockets import WebSocketState
+
+from app.core.websocket import Alert, AlertPriority, AlertType, WebSocketManager
+from app.core.websocket_broker import WebSocketBroker
+
+
+class CountingWebSocket:
+    """Stand-in for a client socket that only counts what it is sent."""
+
+    client_state = WebSocketState.CONNECTED
+
+    def __init__(self, counter: list[int]):
+        self.counter = counter
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        self.counter[0] += 1
+
+
+def quiet_logging() -> None:
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+
+def run_worker(redis_url, tenant_id, connections, expected, ready, results):
+    quiet_logging()
+
+    async def main():
+        manager = WebSocketManager(broker=WebSocketBroker(redis_url=redis_url))
+        counter = [0]
+        for _ in range(connections):
+            await manager.connect(CountingWebSocket(counter), uuid4(), UUID(tenant_id))
+        await manager.start()
+        while not manager.broker.connected:
+            await asyncio.sleep(0.01)
+        # Connect-time messages (confirmation, replay) are not part of the run
+        await manager.drain()
+        counter[0] = 0
+        ready.put(True)
+
+        last_delivery = None
+        deadline = time.time() + 120
+        while counter[0] < expected and time.time() < deadline:
+            before = counter[0]
+            await asyncio.sleep(0.005)
+            if counter[0] != before:
+                last_delivery = time.time()
+        await manager.stop()
+        results.put((counter[0], last_delivery))
+
+    asyncio.run(main())
+
+
+async def publish(redis_url, tenant_id, messages) -> float:
+    manager = WebSocketManager(broker=WebSocketBroker(redis_url=redis_url))
+    await manager.broker.get_redis()
+    started = time.time()
+    for i in range(messages):
+        await manager.broadcast_alert(
+            Alert(
+                type=AlertType.RISK_CHANGE,
+                priority=AlertPriority.MEDIUM,
+                title="Benchmark",
+                message=f"Alert {i}",
+                tenant_id=UUID(tenant_id),
+            )
+        )
+    await manager.stop()
+    return started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket fan-out via Redis")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--connections", type=int, default=100, help="Connections per worker")
+    parser.add_argument("--messages", type=int, default=1000)
+    args = parser.parse_args()
+    quiet_logging()
+
+    tenant_id = str(uuid4())
+    expected = args.connections * args.messages
+    ready, results = mp.Queue(), mp.Queue()
+    workers = [
+        mp.Process(
+            target=run_worker,
+            args=(args.redis_url, tenant_id, args.connections, expected, ready, results),
+        )
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    for _ in workers:
+        ready.get(timeout=60)
+
+    started = asyncio.run(publish(args.redis_url, tenant_id, args.messages))
+    published = time.time() - started
+
+    delivered = 0
+    finished = started
+    for _ in workers:
+        count, last_delivery = results.get(timeout=180)
+        delivered += count
+        finished = max(finished, last_delivery or finished)
+    for worker in workers:
+        worker.join()
+
+    elapsed = max(finished - started, 1e-9)
+    print(f"workers={args.workers} connections/worker={args.connections} messages={args.messages}")
+    print(f"published:  {args.messages / published:,.0f} msgs/sec")
+    print(f"delivered:  {delivered:,} / {expected * args.workers:,}")
+    print(f"throughput: {delivered / elapsed:,.0f} deliveries/sec ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Template Store Import Tool
+Converts the template modules (SME services and GRC packs) into a new
+versioned template bundle, which running workers pick up without a deploy.
+
+Usage:
+    docker compose exec -w /app backend python scripts/build_template_store.py
+    python scripts/build_template_store.py --output /srv/templates --version 12
+    python scripts/build_template_store.py --list
+"""
+
+import os
+import sys
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.template_registry import build_store
+from app.services.template_store import TemplateStore, bundle_path, bundle_versions
+
+
+def list_bundles(directory: Path) -> None:
+    versions = bundle_versions(directory)
+    if not versions:
+        print(f"No template bundles in {directory}")
+        return
+    for version in versions:
+        store = TemplateStore(bundle_path(directory, version))
+        size = store.path.stat().st_size
+        print(
+            f"v{store.version}: {len(store)} templates, {size / 1024:.0f} KiB, "
+            f"created {store.created_at}"
+        )
+        store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path(settings.TEMPLATE_STORE_PATH),
+        help="store directory (default: TEMPLATE_STORE_PATH)",
+    )
+    parser.add_argument("--version", type=int, help="bundle version (default: newest version + 1)")
+    parser.add_argument("--list", action="store_true", help="list bundles and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        list_bundles(args.output)
+        return
+
+    path = build_store(args.output, args.version)
+    store = TemplateStore(path)
+    source_bytes = sum(len(store.read(i).encode()) for i in range(len(store)))
+    print(
+        f"Wrote {path}: {len(store)} templates, "
+        f"{source_bytes / 1024:.0f} KiB of sources in {path.stat().st_size / 1024:.0f} KiB"
+    )
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
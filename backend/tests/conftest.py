@@ -4,6 +4,7 @@ Pytest configuration and fixtures for CORTEX-CI tests.
 
 import asyncio
 import os
+from contextlib import contextmanager
 from typing import AsyncGenerator, Generator
 from uuid import uuid4
 
@@ -15,6 +16,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from sqlalchemy.pool import NullPool
 
 from app.core.database import Base, get_db
+from app.core.query_detector import QueryDetectorMode, query_detector
+from app.core.query_detector import instrument_engine as instrument_query_detector
 from app.models import (
     User,
     Tenant,
@@ -48,6 +51,35 @@ def event_loop() -> Generator:
     loop.close()
 
 
+@contextmanager
+def fail_on_repeated_queries(label: str) -> Generator:
+    """Fail if a statement runs more than QUERY_DETECTOR_THRESHOLD times in the block."""
+    query_detector.reset()
+    scope, token = query_detector.start(label)
+    yield
+    query_detector.finish(scope, token)
+    if query_detector.recent:
+        findings = "\n".join(f"  {finding}" for finding in query_detector.recent)
+        pytest.fail(f"Repeated queries (possible N+1):\n{findings}", pytrace=False)
+
+
+@pytest.fixture(autouse=True)
+def n_plus_one_check(request) -> Generator:
+    """
+    Fail tests that execute the same statement more than
+    QUERY_DETECTOR_THRESHOLD times (run with QUERY_DETECTOR_MODE=raise).
+    """
+    if (
+        query_detector.mode != QueryDetectorMode.RAISE
+        or request.node.get_closest_marker("allow_repeated_queries")
+    ):
+        yield
+        return
+
+    with fail_on_repeated_queries(request.node.nodeid):
+        yield
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_db() -> AsyncGenerator[AsyncSession, None]:
     """Create a test database session with timeouts to prevent hanging."""
@@ -56,6 +88,8 @@ async def test_db() -> AsyncGenerator[AsyncSession, None]:
         echo=False,
         **ENGINE_OPTIONS
     )
+    # Statements of DB-backed tests feed the n_plus_one_check scope
+    instrument_query_detector(engine)
 
     try:
         async with asyncio.timeout(30):  # 30 second timeout for setup
@@ -0,0 +1,243 @@
+"""
+Tests for streaming audit log archival.
+"""
+
+import gzip
+import json
+from datetime import UTC, date, datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.job_registry import JobRecord, JobStatus, job_registry
+from app.models import AuditAction, AuditLog, Tenant
+from app.schemas.audit import AuditLogResponse
+from app.services.audit_archival import ARCHIVE_JOB_KIND, AuditArchivalService
+from app.services.audit_archive_index import (
+    ArchiveCatalog,
+    ArchiveQuery,
+    ArchiveWriter,
+    BloomFilter,
+    index_path,
+)
+
+# Fixed ids keep the bloom filter bits, and so the blocks read, deterministic
+TENANT_ID = UUID("5f0c6b1e-2d4a-4c1b-9a57-3e8f1d2c7b90")
+OTHER_TENANT_ID = UUID("a3d9e2f4-7b1c-4e65-8f20-1c4b7d9e6a35")
+
+
+@pytest.fixture
+def service(tmp_path):
+    return AuditArchivalService(archive_path=str(tmp_path), batch_size=2, delete_batch_size=2)
+
+
+def read_archive(path) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def make_entry(i, tenant_id, action="create", day=1):
+    return {
+        "id": str(uuid4()),
+        "created_at": datetime(2026, 1, day, 0, i, tzinfo=UTC).isoformat(),
+        "tenant_id": str(tenant_id),
+        "user_id": None,
+        "action": action,
+        "resource_type": "entity",
+        "resource_id": None,
+        "resource_name": f"ООО Ромашка {i}",
+        "description": f"event {i}",
+        "success": True,
+    }
+
+
+def write_archive(path, entries, block_records=2):
+    with open(path, "wb") as raw:
+        writer = ArchiveWriter(raw, block_records)
+        writer.write(entries)
+        writer.close()
+    writer.index(path).save(index_path(path))
+
+
+class TestArchiveIndex:
+    def test_bloom_filter(self):
+        bloom = BloomFilter.of(f"value-{i}" for i in range(100))
+        assert all(f"value-{i}" in bloom for i in range(100))
+        false_positives = sum(f"other-{i}" in bloom for i in range(1000))
+        assert false_positives < 50
+        assert "value-7" in BloomFilter.from_dict(bloom.to_dict())
+
+    def test_small_bloom_filter_keeps_target_rate(self):
+        bloom = BloomFilter.of(["tenant-1"])
+        assert (bloom.size, bloom.hashes) == (64, 7)
+        assert sum(f"other-{i}" in bloom for i in range(10000)) < 100
+
+    def test_double_hashed_filters_of_old_indexes_still_match(self):
+        legacy = BloomFilter(10, 7, double_hashing=True)
+        legacy.add("tenant-1")
+        data = legacy.to_dict()
+        del data["probes"]
+        assert "tenant-1" in BloomFilter.from_dict(data)
+
+    def test_blocks_are_seekable_and_readable_as_one_file(self, tmp_path):
+        tenant_id = uuid4()
+        entries = [make_entry(i, tenant_id) for i in range(5)]
+        path = tmp_path / "audit_2026-01-01.ndjson.gz"
+        write_archive(path, entries)
+
+        index = json.loads(index_path(path).read_text())
+        assert [b["records"] for b in index["blocks"]] == [2, 2, 1]
+        assert index["min_ts"] == entries[0]["created_at"]
+        assert read_archive(path) == entries
+
+    def test_search_reads_only_matching_blocks(self, tmp_path):
+        tenant_id, other_tenant = TENANT_ID, OTHER_TENANT_ID
+        write_archive(
+            tmp_path / "audit_2026-01-01.ndjson.gz",
+            [make_entry(i, tenant_id) for i in range(4)]
+            + [make_entry(i, other_tenant, action="delete") for i in range(4, 8)],
+        )
+        write_archive(
+            tmp_path / "audit_2026-01-02.ndjson.gz",
+            [make_entry(i, tenant_id, day=2) for i in range(4)],
+        )
+        catalog = ArchiveCatalog(tmp_path)
+
+        result = catalog.search(ArchiveQuery(tenant_id=str(other_tenant), actions=["delete"]), 3)
+        assert result.total == 4
+        assert [e["description"] for e in result.entries] == ["event 7", "event 6", "event 5"]
+        assert (result.blocks_read, result.blocks_total) == (2, 6)
+
+        # Time range excludes the second file without opening it
+        result = catalog.search(
+            ArchiveQuery(
+                tenant_id=str(tenant_id),
+                text="ромашка 3",
+                end=datetime(2026, 1, 1, 23, tzinfo=UTC),
+            ),
+            10,
+        )
+        assert [e["description"] for e in result.entries] == ["event 3"]
+        assert result.blocks_read == 2
+
+    def test_unindexed_archive_is_indexed_on_search(self, tmp_path):
+        tenant_id = uuid4()
+        path = tmp_path / "audit_2020-01-01.json.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump([make_entry(i, tenant_id) for i in range(3)], f)
+
+        result = ArchiveCatalog(tmp_path).search(ArchiveQuery(tenant_id=str(tenant_id)), 10)
+
+        assert result.total == 3
+        assert json.loads(index_path(path).read_text())["format"] == "json"
+
+
+class TestArchiveFiles:
+    def test_day_archived_again_gets_numbered_file(self, service, tmp_path):
+        tenant_id = uuid4()
+        first = service._archive_file(date(2026, 1, 2), tenant_id)
+        assert first.name == f"audit_2026-01-02_{tenant_id}.ndjson.gz"
+        first.touch()
+        assert service._archive_file(date(2026, 1, 2), tenant_id).name == (
+            f"audit_2026-01-02_{tenant_id}.1.ndjson.gz"
+        )
+
+    @pytest.mark.asyncio
+    async def test_cleanup_reads_dates_of_all_file_names(self, service, tmp_path):
+        old = ["audit_2020-01-01.json.gz", "audit_2020-01-01.1.ndjson.gz"]
+        index_path(tmp_path / old[1]).touch()
+        recent = f"audit_{datetime.utcnow().date().isoformat()}_{uuid4()}.ndjson.gz"
+        for name in [*old, recent]:
+            (tmp_path / name).touch()
+
+        result = await service.cleanup_old_archives()
+
+        assert result["deleted"] == 2
+        assert [p.name for p in tmp_path.iterdir()] == [recent]
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_cannot_be_resumed(self, service):
+        with pytest.raises(ValueError, match="Unknown archival job"):
+            await service.archive_old_logs(None, job_id="missing")
+
+
+class TestArchival:
+    """Day-by-day archival against PostgreSQL."""
+
+    @pytest.mark.asyncio
+    async def test_archives_whole_days_and_resumes_deletes(
+        self, test_db: AsyncSession, test_tenant: Tenant, service
+    ):
+        old = datetime.now(UTC) - timedelta(days=40)
+        test_db.add_all(
+            [
+                AuditLog(
+                    tenant_id=test_tenant.id,
+                    action=AuditAction.CREATE,
+                    description=f"event {i}",
+                    created_at=old + timedelta(days=i // 3, minutes=i),
+                )
+                for i in range(6)
+            ]
+            + [AuditLog(tenant_id=test_tenant.id, action=AuditAction.LOGIN)]
+        )
+        await test_db.commit()
+
+        result = await service.archive_old_logs(test_db, tenant_id=test_tenant.id)
+
+        assert (result["archived"], result["deleted"]) == (6, 6)
+        assert len(result["files"]) == 2
+        assert [e["description"] for e in read_archive(result["files"][0])] == [
+            "event 0",
+            "event 1",
+            "event 2",
+        ]
+        remaining = await test_db.scalar(
+            select(func.count()).select_from(AuditLog).where(AuditLog.tenant_id == test_tenant.id)
+        )
+        assert remaining == 1
+        assert (await job_registry.get(result["job_id"])).status == JobStatus.COMPLETED
+
+        # A run interrupted after writing a day's file only deletes on resume
+        day = (old + timedelta(days=5)).date()
+        test_db.add(
+            AuditLog(
+                tenant_id=test_tenant.id,
+                action=AuditAction.UPDATE,
+                created_at=datetime.combine(day, datetime.min.time(), tzinfo=UTC),
+            )
+        )
+        await test_db.commit()
+        cutoff = datetime.now(UTC) - timedelta(days=30)
+        job = JobRecord(
+            job_id=str(uuid4()),
+            kind=ARCHIVE_JOB_KIND,
+            status=JobStatus.FAILED,
+            tenant_id=str(test_tenant.id),
+            params={"tenant_id": str(test_tenant.id), "cutoff": cutoff.isoformat()},
+            checkpoint={"day": day.isoformat(), "phase": "delete", "file": "written"},
+        )
+        await job_registry.save(job)
+
+        resumed = await service.archive_old_logs(test_db, job_id=job.job_id)
+
+        assert (resumed["archived"], resumed["deleted"]) == (0, 1)
+
+        # Archived logs are found by search_logs next to live ones
+        found = await service.search_logs(test_db, test_tenant.id, page_size=5)
+        assert (found["total"], found["archived_total"]) == (7, 6)
+        assert found["results"][0]["action"] == "login"
+        assert found["results"][-1]["description"] == "event 2"
+        assert len(found["results"]) == 5
+        # Live entries keep the fields archives do not store
+        assert "context_data" in found["results"][0]
+        assert "context_data" not in found["results"][-1]
+        live = await service.search_logs(test_db, test_tenant.id, include_archived=False)
+        assert [e["action"] for e in live["results"]] == ["login"]
+        # Both kinds validate against the API response schema
+        items = [AuditLogResponse.model_validate(entry) for entry in found["results"]]
+        assert items[0].context_data is not None
+        found = await service.search_logs(test_db, test_tenant.id, query_text="EVENT 4")
+        assert [e["description"] for e in found["results"]] == ["event 4"]
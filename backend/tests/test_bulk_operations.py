@@ -0,0 +1,284 @@
+"""
+Tests for bulk entity import, update and delete.
+"""
+
+import io
+import json
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Entity, EntityType, Tenant, User
+from app.services.bulk_operations import (
+    BulkOperationsService,
+    BulkOperationStatus,
+    _chunks,
+    check_updatable_fields,
+    group_patches,
+    iter_csv_records,
+    iter_ndjson_records,
+    normalize_entity_row,
+)
+
+
+class TestStreamingParsers:
+    """CSV and NDJSON input is read lazily, row by row."""
+
+    def test_csv_records_are_streamed(self):
+        data = io.BytesIO(
+            b'name,type,aliases,criticality\nAcme,organization,"A1;A2",4\nGlobex,VENDOR,,\n'
+        )
+        records = iter_csv_records(data)
+        assert next(records) == {
+            "name": "Acme",
+            "type": "organization",
+            "aliases": "A1;A2",
+            "criticality": "4",
+        }
+        # Empty cells are treated as not provided
+        assert next(records) == {"name": "Globex", "type": "VENDOR"}
+
+    def test_csv_handles_bom_and_cyrillic(self):
+        data = io.BytesIO("﻿name,type\nПАО Ромашка,ORGANIZATION\n".encode())
+        assert list(iter_csv_records(data)) == [{"name": "ПАО Ромашка", "type": "ORGANIZATION"}]
+
+    def test_ndjson_skips_blank_lines(self):
+        data = io.BytesIO(b'{"name": "A", "type": "VENDOR"}\n\n{"name": "B", "type": "VENDOR"}\n')
+        assert [r["name"] for r in iter_ndjson_records(data)] == ["A", "B"]
+
+    def test_ndjson_malformed_lines_fail_as_rows(self):
+        data = io.BytesIO(b'[1, 2]\n{"name": "A", "type": "VENDOR"}\n{"name": \n')
+        records = list(iter_ndjson_records(data))
+        assert records[1] == {"name": "A", "type": "VENDOR"}
+        with pytest.raises(ValueError, match="Line 1: expected a JSON object"):
+            normalize_entity_row(1, records[0])
+        with pytest.raises(ValueError, match="Line 3: invalid JSON"):
+            normalize_entity_row(3, records[2])
+
+    def test_chunks_number_rows(self):
+        chunks = list(_chunks(({"n": i} for i in range(5)), 2))
+        assert [[row_no for row_no, _ in chunk] for chunk in chunks] == [[1, 2], [3, 4], [5]]
+
+
+class TestNormalizeEntityRow:
+    """Per-row validation into staging records."""
+
+    def test_valid_row(self):
+        record = normalize_entity_row(
+            7,
+            {"name": " Acme ", "type": "vendor", "aliases": "A;B", "custom_data": '{"k": 1}'},
+        )
+        assert record[0] == 7
+        assert record[2:5] == ("VENDOR", "Acme", ["A", "B"])
+        assert json.loads(record[14]) == {"k": 1}
+
+    def test_missing_columns_stay_null(self):
+        record = normalize_entity_row(1, {"name": "Acme", "type": "VENDOR"})
+        # aliases, tags, criticality and custom_data are not overwritten on update
+        assert record[4] is None
+        assert record[12] is None
+        assert record[13] is None
+        assert record[14] is None
+
+    def test_legacy_keys(self):
+        record = normalize_entity_row(
+            1,
+            {
+                "name": "Acme",
+                "type": "VENDOR",
+                "country": "RU",
+                "description": "Supplier",
+                "metadata": {"source": "egrul"},
+            },
+        )
+        assert record[8] == "RU"
+        assert record[15] == "Supplier"
+        assert json.loads(record[14]) == {"metadata": {"source": "egrul"}}
+
+    def test_input_is_not_modified(self):
+        item = {"name": "Acme", "type": "VENDOR", "country": "RU"}
+        normalize_entity_row(1, item)
+        assert item == {"name": "Acme", "type": "VENDOR", "country": "RU"}
+
+    @pytest.mark.parametrize(
+        "item, message",
+        [
+            ({"type": "VENDOR"}, "name"),
+            ({"name": "Acme"}, "type"),
+            ({"name": "Acme", "type": "SPACESHIP"}, "Invalid entity type"),
+            ({"name": "Acme", "type": "VENDOR", "criticality": "9"}, "between 1 and 5"),
+            ({"name": "Acme", "type": "VENDOR", "country_code": "RUSSIA"}, "country_code"),
+            ({"name": "Acme", "type": "VENDOR", "custom_data": "[1]"}, "custom_data"),
+        ],
+    )
+    def test_invalid_rows(self, item, message):
+        with pytest.raises(ValueError, match=message):
+            normalize_entity_row(1, item)
+
+
+class TestImportPipeline:
+    """End-to-end import against PostgreSQL."""
+
+    @pytest.mark.asyncio
+    async def test_import_skips_duplicates_and_reports_errors(
+        self, test_db: AsyncSession, test_tenant: Tenant, test_user: User
+    ):
+        service = BulkOperationsService()
+        service._import_chunk_size = 2
+        test_db.add(Entity(tenant_id=test_tenant.id, name="Existing", type=EntityType.VENDOR))
+        await test_db.commit()
+
+        records = [
+            {"name": "Existing", "type": "VENDOR"},
+            {"name": "New 1", "type": "VENDOR"},
+            {"name": "New 1", "type": "VENDOR"},
+            {"name": "Broken"},
+            {"name": "New 2", "type": "ORGANIZATION", "tags": ["a"]},
+        ]
+        progress = await service.import_entities_stream(
+            test_db, test_tenant.id, test_user.id, iter(records)
+        )
+
+        assert progress.status == BulkOperationStatus.COMPLETED
+        assert progress.processed_items == 5
+        assert progress.successful_items == 2
+        assert progress.skipped_items == 2
+        assert progress.failed_items == 1
+        assert progress.errors[0]["row"] == 4
+
+        count = await test_db.scalar(
+            select(func.count()).select_from(Entity).where(Entity.tenant_id == test_tenant.id)
+        )
+        assert count == 3
+
+    @pytest.mark.asyncio
+    async def test_repeated_names_fail_without_skip_duplicates(
+        self, test_db: AsyncSession, test_tenant: Tenant, test_user: User
+    ):
+        records = [
+            {"name": "New", "type": "VENDOR"},
+            {"name": "New", "type": "VENDOR"},
+            {"name": "Other", "type": "VENDOR"},
+        ]
+        progress = await BulkOperationsService().import_entities_stream(
+            test_db, test_tenant.id, test_user.id, iter(records), skip_duplicates=False
+        )
+
+        assert (progress.successful_items, progress.failed_items) == (2, 1)
+        assert progress.skipped_items == 0
+        assert progress.errors[0]["row"] == 2
+
+
+class TestPatchGrouping:
+    """Patches are grouped by changed fields for UPDATE ... FROM (VALUES ...)."""
+
+    def test_groups_by_field_set(self):
+        a, b, c = uuid4(), uuid4(), uuid4()
+        groups = group_patches(
+            [
+                {"id": a, "criticality": 4},
+                {"id": b, "tags": ["x"], "criticality": 2},
+                {"id": c, "criticality": 1},
+            ]
+        )
+        assert [p["id"] for p in groups[("criticality",)]] == [a, c]
+        assert [p["id"] for p in groups[("criticality", "tags")]] == [b]
+
+    def test_later_patch_for_same_id_wins(self):
+        a = uuid4()
+        groups = group_patches([{"id": a, "criticality": 4}, {"id": a, "notes": "x"}])
+        assert groups == {("notes",): [{"id": a, "notes": "x"}]}
+
+    @pytest.mark.parametrize(
+        "patch, message",
+        [
+            ({"criticality": 1}, "needs an id"),
+            ({"id": 1}, "changes no fields"),
+            ({"id": 1, "tenant_id": 2}, "tenant_id"),
+            ({"id": 1, "colour": "red"}, "colour"),
+        ],
+    )
+    def test_invalid_patches(self, patch, message):
+        with pytest.raises(ValueError, match=message):
+            group_patches([patch])
+
+    def test_protected_fields_rejected(self):
+        with pytest.raises(ValueError, match="created_at, id"):
+            check_updatable_fields({"id", "created_at", "name"})
+
+
+class TestSetBasedUpdates:
+    """Chunked UPDATE / DELETE ... RETURNING against PostgreSQL."""
+
+    @pytest.mark.asyncio
+    async def test_update_patch_and_delete_report_missing_ids(
+        self, test_db: AsyncSession, test_tenant: Tenant, test_user: User
+    ):
+        service = BulkOperationsService()
+        service._set_chunk_size = 2
+        entities = [
+            Entity(tenant_id=test_tenant.id, name=f"E{i}", type=EntityType.VENDOR) for i in range(3)
+        ]
+        test_db.add_all(entities)
+        await test_db.commit()
+        ids = [entity.id for entity in entities]
+        missing = uuid4()
+
+        progress = await service.bulk_update_entities(
+            test_db, test_tenant.id, test_user.id, [*ids, missing], {"criticality": 5}
+        )
+        assert progress.status == BulkOperationStatus.COMPLETED
+        assert (progress.successful_items, progress.failed_items) == (3, 1)
+        assert progress.errors[0]["entity_id"] == str(missing)
+
+        progress = await service.bulk_patch_entities(
+            test_db,
+            test_tenant.id,
+            test_user.id,
+            [
+                {"id": ids[0], "notes": "first", "custom_data": {"k": 1}},
+                {"id": ids[1], "notes": "second", "custom_data": {"k": 2}},
+                {"id": ids[2], "tags": ["t"]},
+                {"id": missing, "tags": ["t"]},
+            ],
+        )
+        assert (progress.successful_items, progress.failed_items) == (3, 1)
+
+        progress = await service.bulk_delete_entities(
+            test_db, test_tenant.id, test_user.id, [ids[0], missing], soft_delete=False
+        )
+        assert (progress.successful_items, progress.failed_items) == (1, 1)
+
+        test_db.expire_all()
+        rows = (
+            await test_db.execute(
+                select(
+                    Entity.name, Entity.notes, Entity.custom_data, Entity.tags, Entity.criticality
+                )
+                .where(Entity.tenant_id == test_tenant.id)
+                .order_by(Entity.name)
+            )
+        ).all()
+        assert [tuple(row) for row in rows] == [
+            ("E1", "second", {"k": 2}, [], 5),
+            ("E2", None, {}, ["t"], 5),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_changes_fail_the_operation(
+        self, test_db: AsyncSession, test_tenant: Tenant, test_user: User
+    ):
+        service = BulkOperationsService()
+        progress = await service.bulk_update_entities(
+            test_db, test_tenant.id, test_user.id, [uuid4()], {"tenant_id": uuid4()}
+        )
+        assert progress.status == BulkOperationStatus.FAILED
+        assert "tenant_id" in progress.errors[0]["error"]
+
+        progress = await service.bulk_patch_entities(
+            test_db, test_tenant.id, test_user.id, [{"id": uuid4()}]
+        )
+        assert progress.status == BulkOperationStatus.FAILED
+        assert "changes no fields" in progress.errors[0]["error"]
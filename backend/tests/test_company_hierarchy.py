@@ -0,0 +1,179 @@
+"""
+Tests for the company hierarchy closure table and incremental compliance rollups.
+"""
+
+import random
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models.compliance.russian import (
+    DocumentStatus,
+    RuCompanyHierarchy,
+    RuCompanyRollup,
+    RuComplianceDocument,
+)
+from app.services import company_hierarchy
+from app.services.company_hierarchy import (
+    DocumentDelta,
+    HierarchyError,
+    add_company,
+    apply_document_deltas,
+    document_score,
+    move_company,
+    remove_company,
+)
+
+
+@pytest.fixture
+def connection():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        # The models' PostgreSQL UUID columns have no SQLite DDL
+        conn.exec_driver_sql(
+            "CREATE TABLE ru_company_hierarchy (ancestor_id CHAR(32), descendant_id CHAR(32), "
+            "depth INTEGER NOT NULL, PRIMARY KEY (ancestor_id, descendant_id))"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE ru_company_rollups (company_id CHAR(32) PRIMARY KEY, "
+            "tenant_id CHAR(32) NOT NULL, documents_total INTEGER NOT NULL, "
+            "documents_approved INTEGER NOT NULL, subtree_documents_total INTEGER NOT NULL, "
+            "subtree_documents_approved INTEGER NOT NULL, subtree_companies INTEGER NOT NULL, "
+            "updated_at DATETIME)"
+        )
+        yield conn
+
+
+class Holding:
+    """Reference model: parents and own document counts, recomputed from scratch."""
+
+    def __init__(self):
+        self.parent = {}
+        self.documents = {}
+
+    def subtree(self, company_id):
+        children = [c for c, p in self.parent.items() if p == company_id]
+        return [company_id] + [d for child in children for d in self.subtree(child)]
+
+    def expected(self, company_id):
+        subtree = self.subtree(company_id)
+        return (
+            *self.documents[company_id],
+            sum(self.documents[c][0] for c in subtree),
+            sum(self.documents[c][1] for c in subtree),
+            len(subtree),
+        )
+
+    def closure(self):
+        pairs = set()
+        for company_id in self.parent:
+            ancestor, depth = company_id, 0
+            while ancestor is not None:
+                pairs.add((ancestor, company_id, depth))
+                ancestor, depth = self.parent[ancestor], depth + 1
+        return pairs
+
+
+def assert_matches(conn, holding: Holding):
+    rows = conn.execute(
+        select(
+            RuCompanyRollup.company_id,
+            RuCompanyRollup.documents_total,
+            RuCompanyRollup.documents_approved,
+            RuCompanyRollup.subtree_documents_total,
+            RuCompanyRollup.subtree_documents_approved,
+            RuCompanyRollup.subtree_companies,
+        )
+    ).all()
+    assert {row[0]: tuple(row[1:]) for row in rows} == {
+        c: holding.expected(c) for c in holding.parent
+    }
+    closure = conn.execute(
+        select(
+            RuCompanyHierarchy.ancestor_id,
+            RuCompanyHierarchy.descendant_id,
+            RuCompanyHierarchy.depth,
+        )
+    ).all()
+    assert {tuple(row) for row in closure} == holding.closure()
+
+
+class TestRollups:
+    def test_document_score(self):
+        assert document_score(0, 0) == 0.0
+        assert document_score(1, 3) == 33.3
+
+    def test_moves_and_deltas_match_recomputation(self, connection):
+        rng = random.Random(7)
+        tenant_id = uuid4()
+        holding = Holding()
+        companies = []
+        for _ in range(30):
+            company_id = uuid4()
+            parent_id = rng.choice(companies) if companies and rng.random() < 0.8 else None
+            add_company(connection, company_id, tenant_id, parent_id)
+            holding.parent[company_id] = parent_id
+            holding.documents[company_id] = (0, 0)
+            companies.append(company_id)
+
+        for _ in range(200):
+            company_id = rng.choice(companies)
+            if rng.random() < 0.3:
+                parent_id = rng.choice([None, *companies])
+                if parent_id in holding.subtree(company_id):
+                    with pytest.raises(HierarchyError):
+                        move_company(connection, company_id, parent_id)
+                    continue
+                move_company(connection, company_id, parent_id)
+                holding.parent[company_id] = parent_id
+            else:
+                total, approved = holding.documents[company_id]
+                delta = DocumentDelta(rng.randint(0, 3), rng.randint(0, 2))
+                delta.approved = min(delta.approved, total + delta.total - approved)
+                apply_document_deltas(connection, {company_id: delta})
+                holding.documents[company_id] = (total + delta.total, approved + delta.approved)
+        assert_matches(connection, holding)
+
+    def test_removed_company_leaves_ancestor_counts(self, connection):
+        tenant_id = uuid4()
+        root, middle, leaf = uuid4(), uuid4(), uuid4()
+        add_company(connection, root, tenant_id)
+        add_company(connection, middle, tenant_id, root)
+        add_company(connection, leaf, tenant_id, middle)
+        apply_document_deltas(connection, {middle: DocumentDelta(4, 1), leaf: DocumentDelta(2, 2)})
+
+        remove_company(connection, middle)
+        root_rollup = connection.execute(
+            select(RuCompanyRollup).where(RuCompanyRollup.company_id == root)
+        ).one()
+        assert (root_rollup.subtree_documents_total, root_rollup.subtree_companies) == (0, 1)
+        assert not company_hierarchy.is_in_subtree(connection, root, leaf)
+        assert company_hierarchy.is_in_subtree(connection, middle, leaf)
+
+
+class TestDocumentTracking:
+    def test_document_changes_are_collected_per_company(self):
+        session = Session()
+        company_id, other_id = uuid4(), uuid4()
+        new = RuComplianceDocument(
+            id=uuid4(), company_id=company_id, status=DocumentStatus.APPROVED
+        )
+        existing = RuComplianceDocument(
+            id=uuid4(), company_id=company_id, status=DocumentStatus.DRAFT
+        )
+        make_transient_to_detached(existing)
+        session.add_all([new, existing])
+        company_hierarchy._document_inserted(None, None, new)
+
+        # Approved and moved to another company in the same flush
+        existing.status = DocumentStatus.APPROVED
+        existing.company_id = other_id
+        company_hierarchy._document_updated(None, None, existing)
+
+        pending = session.info[company_hierarchy._PENDING_KEY]
+        assert pending == {company_id: DocumentDelta(0, 1), other_id: DocumentDelta(1, 1)}
+
+        company_hierarchy._discard_pending(session)
+        assert company_hierarchy._PENDING_KEY not in session.info
@@ -0,0 +1,80 @@
+"""
+Tests for batch document package generation.
+"""
+
+import io
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from uuid import uuid4
+
+import pytest
+
+from app.services.document_packages import (
+    BundleFormat,
+    DocumentPackageService,
+    PackageDocument,
+    bundle_chunks,
+)
+from app.services.render_service import RenderService
+from app.services.template_engine import render_batch
+
+TEMPLATES = [
+    ("POL-001", "1.0", "Политика {{company_name}}"),
+    ("ORD-002", None, "Приказ {{company_name}}, ИНН {{inn}} {{unknown}}"),
+]
+
+
+def test_render_batch_is_indexed_by_template_then_row():
+    rows = [{"company_name": "ООО А", "inn": "1"}, {"company_name": "ООО Б", "inn": "2"}]
+    assert render_batch(TEMPLATES, rows) == [
+        ["Политика ООО А", "Политика ООО Б"],
+        ["Приказ ООО А, ИНН 1 {{unknown}}", "Приказ ООО Б, ИНН 2 {{unknown}}"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_pool_matches_inline_rendering():
+    rows = [{"company_name": f"ООО {i}", "inn": str(i)} for i in range(7)]
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        renderer = RenderService(executor=pool, workers=3)
+        service = DocumentPackageService(None, renderer=renderer, pool_min_companies=2)
+        assert await service._render(TEMPLATES, rows) == render_batch(TEMPLATES, rows)
+
+
+@pytest.mark.asyncio
+async def test_bundle_has_one_folder_per_company():
+    documents = [
+        PackageDocument(uuid4(), "ООО А", inn, f"POL-001-{inn}", "Политика", "ТЕКСТ\nстрока")
+        for inn in ("7701", "7702")
+    ]
+    data = b"".join([chunk async for chunk in bundle_chunks(documents, BundleFormat.DOCX)])
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.namelist() == ["7701/POL-001-7701.docx", "7702/POL-001-7702.docx"]
+
+
+@pytest.mark.asyncio
+async def test_generate_skips_existing_documents(test_db, test_tenant):
+    from app.models.compliance.russian import RuCompanyProfile
+    from app.services.ru_templates_152fz import get_mandatory_templates
+
+    companies = [
+        RuCompanyProfile(tenant_id=test_tenant.id, inn=f"77010000{i:02d}", full_name=f"ООО {i}")
+        for i in range(3)
+    ]
+    test_db.add_all(companies)
+    await test_db.flush()
+    service = DocumentPackageService(test_db)
+    templates = len(get_mandatory_templates())
+
+    first = await service.generate([companies[0].id], test_tenant.id)
+    assert (first.documents_created, first.documents_skipped) == (templates, 0)
+
+    missing = uuid4()
+    second = await service.generate(
+        [c.id for c in companies] + [missing], test_tenant.id, include_documents=True
+    )
+    assert (second.documents_created, second.documents_skipped) == (2 * templates, templates)
+    assert second.missing_company_ids == [missing]
+    assert len(second.documents) == 3 * templates
+    assert second.documents[0].inn == companies[0].inn
+    assert second.documents[-1].company_name == "ООО 2"
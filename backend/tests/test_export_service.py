@@ -0,0 +1,237 @@
+"""
+Tests for streaming exports.
+"""
+
+import csv
+import io
+import json
+from datetime import UTC, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.models import EntityType, RiskLevel
+from app.services.export_service import (
+    ExportFormat,
+    ExportService,
+    _json_value,
+    _module_available,
+    _text_value,
+    _xlsx_value,
+    entities_dataset,
+    risk_scores_dataset,
+)
+
+
+class FakeStreamResult:
+    def __init__(self, rows, batch_size):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    async def partitions(self):
+        for i in range(0, len(self.rows), self.batch_size):
+            yield self.rows[i : i + self.batch_size]
+
+
+class FakeSession:
+    """Stands in for a server-side cursor; records the fetch size requested."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.yield_per = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream(self, query):
+        self.yield_per = query.get_execution_options()["yield_per"]
+        return FakeStreamResult(self.rows, self.yield_per)
+
+    async def execute(self, query):
+        return FakeResult(self.rows)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+def make_rows(n):
+    created = datetime(2026, 3, 1, 12, tzinfo=UTC)
+    return [
+        (
+            uuid4(),
+            f"ООО Поставщик {i}",
+            EntityType.VENDOR,
+            "RU",
+            None,
+            ["A", "B"],
+            created,
+            created,
+            Decimal("42.50"),
+            RiskLevel.HIGH,
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def session():
+    return FakeSession(make_rows(5))
+
+
+@pytest.fixture
+def service(session, tmp_path):
+    return ExportService(export_dir=str(tmp_path), session_factory=lambda: session, batch_size=2)
+
+
+async def collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream.body])
+
+
+class TestValueConversion:
+    def test_text_values(self):
+        assert _text_value(None) == ""
+        assert _text_value(RiskLevel.HIGH) == "HIGH"
+        assert _text_value(["a", "b"]) == "a, b"
+        assert _text_value(datetime(2026, 1, 1)) == "2026-01-01T00:00:00"
+
+    def test_json_values(self):
+        entity_id = uuid4()
+        assert _json_value(entity_id) == str(entity_id)
+        assert _json_value(Decimal("1.5")) == 1.5
+        assert _json_value([EntityType.VENDOR]) == ["VENDOR"]
+
+    def test_xlsx_datetimes_are_naive_utc(self):
+        moscow = timezone(timedelta(hours=3))
+        assert _xlsx_value(datetime(2026, 1, 1, 15, tzinfo=moscow)) == datetime(2026, 1, 1, 12)
+
+
+class TestStreaming:
+    @pytest.mark.asyncio
+    async def test_csv_is_written_per_batch(self, service, session):
+        stream = service.stream(entities_dataset(uuid4(), include_risks=True), ExportFormat.CSV)
+        chunks = [chunk async for chunk in stream.body]
+
+        # One chunk per cursor batch of 2 rows
+        assert len(chunks) == 3
+        assert session.yield_per == 2
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+        assert rows[0][:2] == ["id", "name"]
+        assert rows[0][-2:] == ["risk_score", "risk_level"]
+        assert rows[1][1:6] == ["ООО Поставщик 0", "VENDOR", "RU", "", "A, B"]
+        assert rows[1][-2:] == ["42.50", "HIGH"]
+        assert len(rows) == 6
+
+    @pytest.mark.asyncio
+    async def test_ndjson(self, service):
+        stream = service.stream(entities_dataset(uuid4(), include_risks=True), ExportFormat.NDJSON)
+        assert stream.filename.endswith(".ndjson")
+        lines = (await collect(stream)).decode().splitlines()
+        assert len(lines) == 5
+        item = json.loads(lines[0])
+        assert item["aliases"] == ["A", "B"]
+        assert item["risk_score"] == 42.5
+        assert item["created_at"] == "2026-03-01T12:00:00+00:00"
+
+    @pytest.mark.asyncio
+    async def test_empty_export_has_header(self, tmp_path):
+        service = ExportService(export_dir=str(tmp_path), session_factory=lambda: FakeSession([]))
+        stream = service.stream(entities_dataset(uuid4()), ExportFormat.CSV)
+        assert (await collect(stream)).decode().startswith("id,name,type")
+
+    def test_pdf_is_not_streamed(self, service):
+        with pytest.raises(ValueError, match="cannot be streamed"):
+            service.stream(entities_dataset(uuid4()), ExportFormat.PDF)
+
+    @pytest.mark.asyncio
+    async def test_xlsx(self, service):
+        stream = service.stream(entities_dataset(uuid4(), include_risks=True), ExportFormat.EXCEL)
+        content = await collect(stream)
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            # Without openpyxl the export falls back to CSV
+            assert stream.filename.endswith(".csv")
+            assert content.startswith(b"id,name")
+            return
+
+        sheet = load_workbook(io.BytesIO(content), read_only=True).active
+        rows = list(sheet.iter_rows(values_only=True))
+        assert rows[0][0] == "id"
+        assert rows[1][6] == datetime(2026, 3, 1, 12)
+        assert len(rows) == 6
+
+
+class TestInMemoryExport:
+    @pytest.mark.asyncio
+    async def test_capped_export_is_flagged(self, service, session, monkeypatch):
+        monkeypatch.setattr(settings, "EXPORT_MAX_RECORDS", 3)
+        result = await service.export_entities(
+            session, uuid4(), ExportFormat.NDJSON, include_risks=True
+        )
+        assert (result["count"], result["truncated"]) == (3, True)
+        assert len(result["content"].splitlines()) == 3
+
+        monkeypatch.setattr(settings, "EXPORT_MAX_RECORDS", 5)
+        result = await service.export_entities(
+            session, uuid4(), ExportFormat.JSON, include_risks=True
+        )
+        assert (result["count"], result["truncated"]) == (5, False)
+
+
+class TestColumnarExport:
+    """Parquet / Arrow IPC keep column types and are written in row groups."""
+
+    @pytest.mark.skipif(_module_available("pyarrow"), reason="pyarrow is installed")
+    def test_requires_pyarrow(self, service):
+        with pytest.raises(ValueError, match="requires pyarrow"):
+            service.stream(entities_dataset(uuid4()), ExportFormat.PARQUET)
+
+    @pytest.mark.asyncio
+    async def test_parquet_row_groups_and_types(self, service, session):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        service.row_group_size = 4
+
+        stream = service.stream(entities_dataset(uuid4(), include_risks=True), ExportFormat.PARQUET)
+        parquet = pq.ParquetFile(io.BytesIO(await collect(stream)))
+
+        # 5 rows in cursor batches of 2, flushed once 4 rows are buffered
+        assert [parquet.metadata.row_group(i).num_rows for i in range(2)] == [4, 1]
+        schema = parquet.schema_arrow
+        assert schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+        assert schema.field("aliases").type == pa.list_(pa.string())
+
+        table = parquet.read()
+        assert table.column("risk_score")[0].as_py() == Decimal("42.50")
+        assert table.column("type")[0].as_py() == "VENDOR"
+        first_id = table.column("id")[0].as_py()
+        # arrow.uuid reads back as UUID (pyarrow >= 18) or as its 16-byte storage
+        if isinstance(first_id, bytes):
+            first_id = UUID(bytes=first_id)
+        assert first_id == session.rows[0][0]
+
+    @pytest.mark.asyncio
+    async def test_arrow_ipc_decimal_precision(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        rows = [
+            (uuid4(), uuid4(), Decimal("12.34"), RiskLevel.LOW, *[Decimal("0")] * 4, None, None)
+        ]
+        service = ExportService(export_dir=str(tmp_path), session_factory=lambda: FakeSession(rows))
+
+        stream = service.stream(risk_scores_dataset(uuid4()), ExportFormat.ARROW)
+        assert stream.content_type == "application/vnd.apache.arrow.file"
+        table = pa.ipc.open_file(pa.BufferReader(await collect(stream))).read_all()
+
+        assert table.schema.field("score").type == pa.decimal128(5, 2)
+        assert table.column("level").to_pylist() == ["LOW"]
+        assert table.column("previous_score").to_pylist() == [None]
@@ -0,0 +1,145 @@
+"""
+Tests for the tenant/user identity cache used by API dependencies.
+"""
+
+import json
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1 import deps
+from app.core.identity_cache import IdentityCache, RecordCache
+from app.core.security import create_access_token
+from app.models import Tenant, User
+
+
+def make_tenant(**overrides) -> Tenant:
+    values = {
+        "id": uuid4(),
+        "name": "Acme",
+        "slug": f"acme-{uuid4().hex[:6]}",
+        "description": None,
+        "is_active": True,
+        "settings": {"theme": "dark"},
+        "risk_weights": {"direct_match": 1.0},
+    }
+    values.update(overrides)
+    return Tenant(**values)
+
+
+class TestRecordCache:
+    """Snapshot storage, expiry and session re-attachment."""
+
+    def test_put_and_get(self):
+        cache = RecordCache(Tenant, ttl=30)
+        tenant = make_tenant()
+        cache.put(tenant)
+        snapshot = cache.get(tenant.id)
+        assert snapshot["slug"] == tenant.slug
+        assert cache.stats()["hits"] == 1
+
+    def test_expired_entries_are_dropped(self):
+        cache = RecordCache(Tenant, ttl=-1)
+        tenant = make_tenant()
+        cache.put(tenant)
+        assert cache.get(tenant.id) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_snapshot_is_isolated_from_record(self):
+        cache = RecordCache(Tenant, ttl=30)
+        tenant = make_tenant()
+        cache.put(tenant)
+        tenant.settings["theme"] = "light"
+        assert cache.get(tenant.id)["settings"] == {"theme": "dark"}
+
+    def test_max_entries_evicts_oldest(self):
+        cache = RecordCache(Tenant, ttl=30, max_entries=2)
+        tenants = [make_tenant() for _ in range(3)]
+        for tenant in tenants:
+            cache.put(tenant)
+        assert cache.get(tenants[0].id) is None
+        assert cache.get(tenants[2].id) is not None
+
+    @pytest.mark.asyncio
+    async def test_restore_attaches_clean_persistent_instance(self):
+        cache = RecordCache(Tenant, ttl=30)
+        tenant = make_tenant()
+        cache.put(tenant)
+
+        db = AsyncSession()
+        restored = cache.restore(db, cache.get(tenant.id))
+        state = inspect(restored)
+        assert state.persistent
+        assert restored not in db.dirty
+
+        restored.settings = {"theme": "light"}
+        assert restored in db.dirty
+
+        # A second restore in the same session returns the same instance
+        assert cache.restore(db, cache.get(tenant.id)) is restored
+        await db.close()
+
+
+class TestIdentityCacheInvalidation:
+    """Local and pub/sub invalidation."""
+
+    def test_invalidate_tenant_drops_slug(self):
+        cache = IdentityCache(ttl=30, enabled=True)
+        tenant = make_tenant()
+        cache._remember_tenant(tenant)
+        cache.invalidate("tenant", tenant.id)
+        assert cache.tenants.get(tenant.id) is None
+        assert tenant.slug not in cache._tenant_slugs
+
+    def test_remote_message_invalidates(self):
+        cache = IdentityCache(ttl=30, enabled=True)
+        user = User(id=uuid4(), tenant_id=uuid4(), email="a@b.c", role="viewer", is_active=True)
+        cache.users.put(user)
+        cache._handle_message(json.dumps({"worker": "other", "keys": [["user", str(user.id)]]}))
+        assert cache.users.get(user.id) is None
+
+    def test_own_messages_are_ignored(self):
+        cache = IdentityCache(ttl=30, enabled=True)
+        user = User(id=uuid4(), tenant_id=uuid4(), email="a@b.c", role="viewer", is_active=True)
+        cache.users.put(user)
+        cache._handle_message(
+            json.dumps({"worker": cache._worker_id, "keys": [["user", str(user.id)]]})
+        )
+        assert cache.users.get(user.id) is not None
+
+
+class TestTokenDecodedOnce:
+    """The JWT is decoded once per request and shared across dependencies."""
+
+    @pytest.mark.asyncio
+    async def test_single_decode(self, monkeypatch):
+        calls = []
+        original = deps.decode_token
+
+        def counting_decode(token):
+            calls.append(time.monotonic())
+            return original(token)
+
+        monkeypatch.setattr(deps, "decode_token", counting_decode)
+
+        app = FastAPI()
+
+        @app.get("/probe")
+        async def probe(
+            payload=Depends(deps.get_token_payload),
+            optional=Depends(deps.get_optional_token_payload),
+        ):
+            return {"sub": payload.sub, "same": payload is optional}
+
+        token = create_access_token(uuid4(), uuid4(), "viewer")
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/probe", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert response.json()["same"] is True
+        assert len(calls) == 1
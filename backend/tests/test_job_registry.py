@@ -0,0 +1,222 @@
+"""
+Tests for the shared job registry.
+"""
+
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.core.job_registry import JobRecord, JobRegistry, JobStatus
+from app.services.advanced_simulation import (
+    AdvancedSimulationEngine,
+    SimulationResult,
+    SimulationStatus,
+    SimulationType,
+)
+from app.services.bulk_operations import (
+    BulkOperationProgress,
+    BulkOperationsService,
+    BulkOperationStatus,
+    BulkOperationType,
+    _progress_from_job,
+)
+
+
+@pytest.fixture
+async def registry():
+    """Registry whose Redis is unreachable, so the local fallback is used."""
+    registry = JobRegistry(redis_url="redis://127.0.0.1:1/0", local_max=3)
+    yield registry
+    await registry.close()
+
+
+def make_record(job_id="job-1", kind="bulk.import", **kwargs) -> JobRecord:
+    return JobRecord(job_id=job_id, kind=kind, status=JobStatus.RUNNING, **kwargs)
+
+
+class TestJobRecord:
+    """Serialization and derived metrics."""
+
+    def test_json_round_trip(self):
+        started = datetime(2026, 1, 1, tzinfo=UTC)
+        record = make_record(
+            tenant_id="t1", total=10, processed=4, started_at=started, checkpoint={"items_done": 4}
+        )
+        restored = JobRecord.from_json(record.to_json())
+        assert restored == record
+
+    def test_unknown_fields_are_ignored(self):
+        raw = make_record().to_json().replace('"kind"', '"future": 1, "kind"')
+        assert JobRecord.from_json(raw).kind == "bulk.import"
+
+    def test_throughput_and_eta(self):
+        now = datetime.now(UTC)
+        record = make_record(
+            total=1000, processed=250, started_at=now - timedelta(seconds=10), updated_at=now
+        )
+        assert record.items_per_second == pytest.approx(25)
+        assert record.eta_seconds == pytest.approx(30)
+        assert record.progress_percentage == 25
+
+    def test_interrupted_when_progress_stops(self):
+        stale = datetime.now(UTC) - timedelta(hours=1)
+        assert make_record(updated_at=stale).interrupted
+        assert not make_record(updated_at=datetime.now(UTC)).interrupted
+        done = make_record(updated_at=stale)
+        done.status = JobStatus.COMPLETED
+        assert not done.interrupted
+
+
+class TestLocalFallback:
+    """Without Redis the registry keeps a bounded in-process store."""
+
+    @pytest.mark.asyncio
+    async def test_save_get_and_filter(self, registry):
+        await registry.save(make_record("a", tenant_id="t1"))
+        await registry.save(make_record("b", kind="simulation.monte_carlo", tenant_id="t1"))
+        await registry.save(make_record("c", tenant_id="t2"))
+
+        assert (await registry.get("a")).updated_at is not None
+        assert [r.job_id for r in await registry.recent(tenant_id="t1", kind="bulk")] == ["a"]
+        assert {r.job_id for r in await registry.recent(kind="simulation")} == {"b"}
+
+    @pytest.mark.asyncio
+    async def test_retention_is_bounded(self, registry):
+        for i in range(5):
+            await registry.save(make_record(f"job-{i}"))
+        assert await registry.get("job-0") is None
+        assert await registry.get("job-4") is not None
+
+    @pytest.mark.asyncio
+    async def test_backs_off_after_redis_error(self, registry):
+        await registry.save(make_record())
+        assert await registry._client() is None
+
+
+class TestJobSnapshots:
+    """Bulk operations and simulations report in the common format."""
+
+    def test_bulk_progress_snapshot_and_resume(self):
+        tenant_id = uuid4()
+        progress = BulkOperationProgress(
+            operation_id="op-1",
+            operation_type=BulkOperationType.IMPORT,
+            status=BulkOperationStatus.PROCESSING,
+            total_items=100,
+            processed_items=40,
+            successful_items=35,
+            failed_items=5,
+            started_at=datetime.utcnow(),
+            tenant_id=tenant_id,
+        )
+        record = progress.to_job_record()
+        assert record.kind == "bulk.import"
+        assert record.status == JobStatus.RUNNING
+        assert record.checkpoint == {"items_done": 40}
+
+        resumed = _progress_from_job(
+            JobRecord.from_json(record.to_json()), BulkOperationType.IMPORT
+        )
+        assert (resumed.processed_items, resumed.successful_items) == (40, 35)
+        assert resumed.tenant_id == tenant_id
+
+    def test_simulation_snapshot_includes_result_when_finished(self):
+        result = SimulationResult(
+            simulation_id="sim-1",
+            simulation_type=SimulationType.MONTE_CARLO,
+            status=SimulationStatus.RUNNING,
+            started_at=datetime.utcnow(),
+            total_iterations=1000,
+            iterations=500,
+            params={"seed": 7},
+        )
+        record = result.to_job_record()
+        assert record.kind == "simulation.monte_carlo"
+        assert record.result is None
+        assert record.params == {"seed": 7}
+
+        result.status = SimulationStatus.COMPLETED
+        assert result.to_job_record().result["simulation_id"] == "sim-1"
+
+    def test_local_operations_are_bounded(self):
+        service = BulkOperationsService()
+        service._max_local_operations = 2
+        for i in range(4):
+            service._remember(
+                BulkOperationProgress(
+                    operation_id=f"op-{i}",
+                    operation_type=BulkOperationType.UPDATE,
+                    status=BulkOperationStatus.COMPLETED,
+                    started_at=datetime.utcnow() + timedelta(seconds=i),
+                )
+            )
+        assert list(service._operations) == ["op-2", "op-3"]
+
+
+class TestBulkImportResume:
+    """Only failed or interrupted imports can be picked up again."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [JobStatus.RUNNING, JobStatus.COMPLETED])
+    async def test_live_or_finished_import_is_not_resumed(self, registry, monkeypatch, status):
+        tenant_id = uuid4()
+        record = make_record(tenant_id=str(tenant_id))
+        record.status = status
+        await registry.save(record)
+        monkeypatch.setattr("app.services.bulk_operations.job_registry", registry)
+
+        with pytest.raises(ValueError, match="only interrupted or failed"):
+            await BulkOperationsService().import_entities_stream(
+                None, tenant_id, uuid4(), iter([]), resume_operation_id=record.job_id
+            )
+
+
+class TestSimulationLookup:
+    """Simulation results are only visible to the tenant that ran them."""
+
+    @pytest.mark.asyncio
+    async def test_other_tenant_gets_not_found(self, registry, monkeypatch):
+        from fastapi import HTTPException
+
+        from app.api.v1.endpoints.simulations import get_simulation
+        from app.models import User
+
+        owner = uuid4()
+        record = make_record("sim-1", kind="simulation.monte_carlo", tenant_id=str(owner))
+        record.status = JobStatus.COMPLETED
+        record.result = {"simulation_id": "sim-1"}
+        await registry.save(record)
+        monkeypatch.setattr("app.api.v1.endpoints.simulations.job_registry", registry)
+
+        assert await get_simulation("sim-1", current_user=User(tenant_id=owner)) == record.result
+        with pytest.raises(HTTPException) as exc_info:
+            await get_simulation("sim-1", current_user=User(tenant_id=uuid4()))
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_list_and_cancel_across_workers(self, registry, monkeypatch):
+        monkeypatch.setattr("app.services.advanced_simulation.job_registry", registry)
+        owner, other = uuid4(), uuid4()
+        worker, other_worker = AdvancedSimulationEngine(), AdvancedSimulationEngine()
+        run = SimulationResult(
+            simulation_id="sim-2",
+            simulation_type=SimulationType.MONTE_CARLO,
+            status=SimulationStatus.RUNNING,
+            started_at=datetime.utcnow(),
+            total_iterations=1000,
+        )
+        await worker._register(run, owner)
+
+        listed = await other_worker.list_simulations(owner)
+        assert [job["job_id"] for job in listed] == ["sim-2"]
+        assert await other_worker.list_simulations(other) == []
+        assert await worker.list_simulations(owner, simulation_type=SimulationType.CASCADE) == []
+
+        assert not await other_worker.cancel_simulation("sim-2", other)
+        assert not await worker.cancel_simulation("sim-2", other)
+        assert await other_worker.cancel_simulation("sim-2", owner)
+        # The owning worker stops at its next progress update
+        await worker._track(run)
+        assert run.status == SimulationStatus.CANCELLED
+        assert (await registry.get("sim-2")).status == JobStatus.CANCELLED
@@ -0,0 +1,100 @@
+"""
+Tests for request-level performance metrics.
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.metrics import (
+    Histogram,
+    MetricsRegistry,
+    RequestStats,
+    external_http_client,
+    metrics,
+)
+from app.middleware.security import RequestLoggingMiddleware
+
+
+class TestHistogram:
+    """Bucketed latency histograms."""
+
+    def test_observe_and_quantile(self):
+        histogram = Histogram((0.01, 0.1, 1.0))
+        for _ in range(90):
+            histogram.observe(0.005)
+        for _ in range(10):
+            histogram.observe(0.5)
+        assert histogram.count == 100
+        assert histogram.quantile(0.5) <= 0.01
+        assert 0.1 < histogram.quantile(0.95) <= 0.5
+        assert histogram.max == 0.5
+
+
+class TestRegistry:
+    """Aggregation, reporting and Prometheus rendering."""
+
+    def test_endpoint_report_sorted_by_queries(self):
+        registry = MetricsRegistry()
+        registry.observe_request("GET", "/v1/a", 200, 0.01, RequestStats(db_queries=2))
+        registry.observe_request("GET", "/v1/b", 200, 0.02, RequestStats(db_queries=40))
+        report = registry.endpoint_report(sort_by="avg_queries")
+        assert [row["route"] for row in report] == ["/v1/b", "/v1/a"]
+        assert report[0]["max_queries"] == 40
+
+    def test_invalid_sort_key(self):
+        with pytest.raises(ValueError):
+            MetricsRegistry().endpoint_report(sort_by="nope")
+
+    def test_prometheus_rendering(self):
+        registry = MetricsRegistry()
+        registry.observe_request("GET", "/v1/a", 200, 0.03, RequestStats(db_queries=3))
+        registry.record_cache(True)
+        text = registry.render_prometheus()
+        assert 'cortex_http_requests_total{method="GET",route="/v1/a",status="200"} 1' in text
+        assert (
+            'cortex_http_request_duration_seconds_bucket{method="GET",route="/v1/a",le="+Inf"} 1'
+            in text
+        )
+        assert 'cortex_http_request_db_queries_sum{method="GET",route="/v1/a"} 3.000000' in text
+        assert 'cortex_cache_requests_total{result="hit"} 1' in text
+
+
+class TestRequestInstrumentation:
+    """The logging middleware attributes per-request work to the route template."""
+
+    @pytest.mark.asyncio
+    async def test_db_queries_attributed_to_route(self):
+        metrics.reset()
+        app = FastAPI()
+
+        @app.get("/v1/items/{item_id}")
+        async def get_item(item_id: int):
+            for _ in range(3):
+                metrics.record_db_query(0.001)
+            metrics.record_cache(hit=True)
+            return {"id": item_id}
+
+        app.add_middleware(RequestLoggingMiddleware)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/v1/items/1")
+            await client.get("/v1/items/2")
+
+        stats = metrics.endpoints[("GET", "/v1/items/{item_id}")]
+        assert stats.requests == 2
+        assert stats.db_queries.sum == 6
+        assert stats.cache_hits == 2
+
+    @pytest.mark.asyncio
+    async def test_external_calls_recorded(self):
+        metrics.reset()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"ok": True})
+
+        async with external_http_client(transport=httpx.MockTransport(handler)) as client:
+            await client.get("https://egrul.example/api/company/7700000000")
+
+        assert metrics.external["egrul.example"].count == 1
@@ -0,0 +1,203 @@
+"""
+Tests for the pure ASGI security middleware stack.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.middleware.rate_limit import RateLimiter, RateLimitMiddleware
+from app.middleware.request_validation import RequestValidationMiddleware
+from app.middleware.security import RequestLoggingMiddleware, SecurityHeadersMiddleware
+
+
+class StubRateLimiter(RateLimiter):
+    """Rate limiter that answers from memory instead of Redis."""
+
+    def __init__(self, limited: bool = False):
+        super().__init__(redis_url="redis://unused")
+        self.limited = limited
+
+    async def is_rate_limited(self, identifier, endpoint, limit, window_seconds):
+        remaining = 0 if self.limited else limit - 1
+        return self.limited, {"limit": limit, "remaining": remaining, "reset": 0}
+
+
+def build_app(limiter: RateLimiter) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/v1/items")
+    async def items():
+        return {"ok": True}
+
+    @app.get("/v1/auth/me")
+    async def me():
+        return {"ok": True}
+
+    @app.get("/v1/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk{i}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.post("/v1/items")
+    async def create_item():
+        return {"ok": True}
+
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(RequestValidationMiddleware)
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    return app
+
+
+async def _client(limiter: RateLimiter | None = None) -> AsyncClient:
+    app = build_app(limiter or StubRateLimiter())
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+class TestSecurityHeaders:
+    """Security headers are added without BaseHTTPMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_headers_added(self):
+        async with await _client() as client:
+            response = await client.get("/v1/items")
+        assert response.status_code == 200
+        assert response.headers["X-Frame-Options"] == "SAMEORIGIN"
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert "default-src 'self'" in response.headers["Content-Security-Policy"]
+        assert "Cache-Control" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_no_store_on_auth_paths(self):
+        async with await _client() as client:
+            response = await client.get("/v1/auth/me")
+        assert response.headers["Cache-Control"].startswith("no-store")
+        assert response.headers["Pragma"] == "no-cache"
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_passes_through(self):
+        async with await _client() as client:
+            response = await client.get("/v1/stream")
+        assert response.text == "chunk0\nchunk1\nchunk2\n"
+        assert response.headers["X-Frame-Options"] == "SAMEORIGIN"
+
+
+class TestRequestValidation:
+    """Rejected requests short-circuit with a JSON error."""
+
+    @pytest.mark.asyncio
+    async def test_dangerous_query_rejected(self):
+        async with await _client() as client:
+            response = await client.get("/v1/items", params={"q": "1 UNION SELECT password"})
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid request parameters"}
+
+    @pytest.mark.asyncio
+    async def test_dangerous_url_rejected(self):
+        async with await _client() as client:
+            response = await client.get("/v1/items?file=../etc/passwd")
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid request"}
+
+    @pytest.mark.asyncio
+    async def test_invalid_content_type_rejected(self):
+        async with await _client() as client:
+            response = await client.post(
+                "/v1/items", content=b"<x/>", headers={"Content-Type": "application/xml"}
+            )
+        assert response.status_code == 415
+
+    @pytest.mark.asyncio
+    async def test_url_too_long_rejected(self):
+        async with await _client() as client:
+            response = await client.get("/v1/items", params={"q": "a" * 3000})
+        assert response.status_code == 414
+
+
+class TestRateLimit:
+    """Rate limit headers and 429 responses."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_headers_added(self):
+        async with await _client() as client:
+            response = await client.get("/v1/items")
+        assert response.headers["X-RateLimit-Limit"] == "60"
+        assert response.headers["X-RateLimit-Remaining"] == "59"
+
+    @pytest.mark.asyncio
+    async def test_limited_request_returns_429(self):
+        async with await _client(StubRateLimiter(limited=True)) as client:
+            response = await client.get("/v1/items")
+        assert response.status_code == 429
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+
+
+class TestValidationScanner:
+    """The combined single-pass scanner agrees with the individual patterns."""
+
+    SAMPLES = [
+        "/v1/entities?page=1&page_size=20",
+        "/v1/entities?q=1 UNION SELECT * FROM users",
+        "/v1/files?path=../../etc/passwd",
+        "/v1/files?path=%2e%2e/etc",
+        "/v1/search?q=<script>alert(1)</script>",
+        "/v1/search?q=javascript:alert(1)",
+        "/v1/search?name=O'Brien&country=IE",
+        "/v1/search?q=a OR 1=1",
+        "/v1/compliance/russian/templates?q=Положение",
+    ]
+
+    def test_combined_matches_sequential(self):
+        from app.middleware.request_validation import COMBINED_PATTERN, COMPILED_PATTERNS
+
+        for sample in self.SAMPLES:
+            sequential = any(p.search(sample) for p in COMPILED_PATTERNS)
+            assert (COMBINED_PATTERN.search(sample) is not None) == sequential, sample
+
+    def test_scan_view_includes_decoded_query(self):
+        from app.middleware.request_validation import build_scan_view
+
+        view, boundary = build_scan_view("/v1/items", "q=1+UNION+SELECT+1")
+        assert view[:boundary] == "/v1/items?q=1+UNION+SELECT+1"
+        assert view[boundary + 1 :] == "q=1 UNION SELECT 1"
+
+    @pytest.mark.asyncio
+    async def test_encoded_traversal_rejected(self):
+        async with await _client() as client:
+            response = await client.get("/v1/items?file=%2E%2E%2Fetc%2Fpasswd")
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid request parameters"}
+
+    @pytest.mark.asyncio
+    async def test_metrics_recorded(self):
+        from app.middleware.request_validation import validation_metrics
+
+        validation_metrics.reset()
+        async with await _client() as client:
+            await client.get("/v1/items?page=1")
+            await client.get("/v1/items?q=1 UNION SELECT 1")
+        snapshot = validation_metrics.snapshot()
+        assert snapshot["checks"]["dangerous_patterns"]["calls"] == 2
+        assert snapshot["checks"]["dangerous_patterns"]["rejected"] == 1
+        assert sum(snapshot["pattern_hits"].values()) == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_exposed(self):
+        from app.api.v1.endpoints.admin import get_endpoint_performance
+        from app.main import prometheus_metrics
+        from app.middleware.request_validation import validation_metrics
+
+        validation_metrics.reset()
+        async with await _client() as client:
+            await client.get("/v1/items?q=1 UNION SELECT 1")
+
+        text = (await prometheus_metrics()).body.decode()
+        assert 'cortex_request_validation_rejected_total{check="dangerous_patterns"} 1' in text
+        assert "cortex_request_validation_pattern_hits_total{pattern=" in text
+        report = await get_endpoint_performance(current_user=None, sort_by="p95_ms", limit=20)
+        assert report["request_validation"]["checks"]["dangerous_patterns"]["rejected"] == 1
@@ -0,0 +1,81 @@
+"""
+Tests for monthly partition maintenance.
+"""
+
+from datetime import UTC, date, datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import database, partitions
+from app.core.partitions import (
+    add_months,
+    drop_partitions_before,
+    ensure_partitions,
+    list_partitions,
+    partition_month,
+    partition_name,
+)
+from app.models import AuditAction, AuditLog, RiskScore, Tenant
+
+
+class TestPartitionNames:
+    def test_month_arithmetic(self):
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_names_round_trip(self):
+        name = partition_name("audit_log", date(2026, 3, 1))
+        assert name == "audit_log_y2026m03"
+        assert partition_month(name) == date(2026, 3, 1)
+        assert partition_month("audit_log_default") is None
+
+    def test_models_are_partitioned_with_timestamp_in_primary_key(self):
+        for model, column in ((AuditLog, "created_at"), (RiskScore, "calculated_at")):
+            table = model.__table__
+            assert table.dialect_options["postgresql"]["partition_by"] == f"RANGE ({column})"
+            assert {c.name for c in table.primary_key} == {"id", column}
+            # The ORM still identifies rows by id alone
+            assert [c.name for c in model.__mapper__.primary_key] == ["id"]
+
+
+class TestStartup:
+    @pytest.mark.asyncio
+    async def test_partition_failure_does_not_stop_startup(self, monkeypatch):
+        attempted = []
+
+        async def ensure_partitions(db, table):
+            attempted.append(table)
+            raise RuntimeError("updated partition constraint for default partition is violated")
+
+        monkeypatch.setattr(partitions, "ensure_partitions", ensure_partitions)
+        await database._ensure_partitions()
+        assert attempted == list(partitions.PARTITIONED_TABLES)
+
+
+class TestPartitionMaintenance:
+    """Partition DDL against PostgreSQL."""
+
+    @pytest.mark.asyncio
+    async def test_create_route_and_drop(self, test_db: AsyncSession, test_tenant: Tenant):
+        created = await ensure_partitions(
+            test_db, "audit_log", months_ahead=1, today=date(2026, 1, 15)
+        )
+        assert created == ["audit_log_y2026m01", "audit_log_y2026m02"]
+        assert await ensure_partitions(test_db, "audit_log", 1, today=date(2026, 1, 15)) == []
+
+        test_db.add(
+            AuditLog(
+                tenant_id=test_tenant.id,
+                action=AuditAction.LOGIN,
+                created_at=datetime(2026, 1, 20, tzinfo=UTC),
+            )
+        )
+        await test_db.commit()
+        rows = await test_db.scalar(text("SELECT count(*) FROM audit_log_y2026m01"))
+        assert rows == 1
+
+        dropped = await drop_partitions_before(test_db, "audit_log", date(2026, 2, 1))
+        assert dropped == ["audit_log_y2026m01"]
+        assert list(await list_partitions(test_db, "audit_log")) == [date(2026, 2, 1)]
@@ -0,0 +1,110 @@
+"""
+Tests for the N+1 query detector.
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.query_detector import (
+    NPlusOneDetected,
+    QueryScope,
+    detect_queries,
+    instrument_engine,
+    query_detector,
+)
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+async def load_one_by_one(engine, ids):
+    async with engine.connect() as conn:
+        for row_id in ids:
+            await conn.execute(text("SELECT :id AS id"), {"id": row_id})
+
+
+class TestQueryScope:
+    """Grouping by statement text."""
+
+    def test_groups_identical_statements(self):
+        scope = QueryScope("test", threshold=2)
+        for _ in range(3):
+            scope.record("SELECT * FROM entities WHERE id = $1")
+        scope.record("SELECT * FROM tenants WHERE id = $1")
+        findings = scope.findings()
+        assert len(findings) == 1
+        assert findings[0].count == 3
+
+    def test_at_threshold_is_not_reported(self):
+        scope = QueryScope("test", threshold=2)
+        scope.record("SELECT 1")
+        scope.record("SELECT 1")
+        assert scope.findings() == []
+
+
+class TestDetectQueries:
+    """Detection through SQLAlchemy engine events."""
+
+    async def test_repeated_statement_raises_with_origin(self, engine):
+        with pytest.raises(NPlusOneDetected) as exc_info, detect_queries("loop", threshold=3):
+            await load_one_by_one(engine, range(5))
+
+        (finding,) = exc_info.value.findings
+        assert finding.count == 5
+        assert finding.scope == "loop"
+        # Points at the application code, not SQLAlchemy or the detector
+        assert finding.origin.startswith("tests/test_query_detector.py:")
+        assert finding.origin.endswith("in load_one_by_one")
+
+    async def test_below_threshold_passes(self, engine):
+        with detect_queries("few", threshold=5) as scope:
+            await load_one_by_one(engine, range(3))
+        assert scope.findings() == []
+
+    async def test_executemany_is_not_counted(self, engine):
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE t (id INTEGER)"))
+            with detect_queries("bulk", threshold=1) as scope:
+                await conn.execute(
+                    text("INSERT INTO t VALUES (:id)"), [{"id": i} for i in range(10)]
+                )
+        assert scope.groups == {}
+
+    @pytest.mark.allow_repeated_queries
+    async def test_statements_outside_scope_are_ignored(self, engine):
+        await load_one_by_one(engine, range(10))
+        with detect_queries("empty", threshold=1) as scope:
+            pass
+        assert scope.groups == {}
+
+    async def test_findings_kept_for_report(self, engine):
+        query_detector.reset()
+        with detect_queries("report", threshold=1, raise_on_findings=False):
+            await load_one_by_one(engine, range(3))
+        report = query_detector.report()
+        assert report[0]["scope"] == "report"
+        assert report[0]["count"] == 3
+        query_detector.reset()
+
+
+class TestTestDatabase:
+    """The test_db fixture's engine feeds the n_plus_one_check scope."""
+
+    @pytest.mark.allow_repeated_queries
+    async def test_repeated_queries_through_test_db_fail_the_test(self, test_db, monkeypatch):
+        from tests.conftest import fail_on_repeated_queries
+
+        monkeypatch.setattr(query_detector, "threshold", 3)
+        with (
+            pytest.raises(pytest.fail.Exception, match="possible N\\+1"),
+            fail_on_repeated_queries("test_db"),
+        ):
+            for row_id in range(5):
+                await test_db.execute(text("SELECT :id AS id"), {"id": row_id})
+        query_detector.reset()
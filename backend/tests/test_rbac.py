@@ -0,0 +1,83 @@
+"""
+Tests for compiled RBAC permission sets.
+"""
+
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.services.rbac import (
+    ALL_PERMISSIONS_MASK,
+    SYSTEM_ROLES,
+    Permission,
+    RBACService,
+    grant_mask,
+    mask_permissions,
+)
+
+ADMIN = SYSTEM_ROLES["admin"].id
+VIEWER = SYSTEM_ROLES["viewer"].id
+AUDITOR = SYSTEM_ROLES["auditor"].id
+
+
+class TestPermissionMasks:
+    def test_wildcards_expand(self):
+        assert grant_mask({Permission.ADMIN_FULL}) == ALL_PERMISSIONS_MASK
+        assert mask_permissions(grant_mask({Permission.USERS_VIEW})) == {Permission.USERS_VIEW}
+
+    async def test_company_scoped_and_global_assignments(self):
+        rbac = RBACService()
+        company, other = uuid4(), uuid4()
+        await rbac.assign_role("u1", VIEWER)
+        await rbac.assign_role("u1", AUDITOR, company_id=company)
+
+        assert await rbac.check_permission("u1", Permission.REPORTS_VIEW, other)
+        assert await rbac.check_permission("u1", Permission.AUDIT_REPORT, company)
+        assert not await rbac.check_permission("u1", Permission.AUDIT_REPORT, other)
+        # Without a company every assignment counts
+        assert await rbac.check_permission("u1", Permission.AUDIT_REPORT)
+        assert not await rbac.check_permission("u1", Permission.USERS_DELETE, company)
+
+        assert await rbac.check_permissions(
+            "u1", [Permission.DOCUMENTS_VIEW, Permission.AUDIT_CONDUCT], company
+        )
+        assert not await rbac.check_permissions(
+            "u1", [Permission.DOCUMENTS_VIEW, Permission.AUDIT_CONDUCT], other
+        )
+        assert await rbac.check_permissions(
+            "u1", [Permission.DOCUMENTS_VIEW, Permission.AUDIT_CONDUCT], other, require_all=False
+        )
+
+        assert await rbac.check_permission_batch(
+            "u1", Permission.AUDIT_CONDUCT, [company, other, company]
+        ) == {company: True, other: False}
+
+    async def test_changes_invalidate_compiled_sets(self):
+        rbac = RBACService()
+        company = uuid4()
+        role = await rbac.create_role("Custom", "Своя", "d", "d", [Permission.TASKS_VIEW.value])
+        await rbac.assign_role("u1", role.id, company_id=company)
+        assert await rbac.check_permission("u1", Permission.TASKS_VIEW, company)
+        assert await rbac.check_permission("u1", Permission.TASKS_VIEW, company)
+        assert rbac.hits == 1
+
+        await rbac.update_role(role.id, {"permissions": [Permission.TASKS_CREATE.value]})
+        assert not await rbac.check_permission("u1", Permission.TASKS_VIEW, company)
+        assert await rbac.check_permission("u1", Permission.TASKS_CREATE, company)
+
+        await rbac.assign_role("u1", ADMIN)
+        assert await rbac.get_user_permissions("u1", company) == set(Permission)
+
+        await rbac.revoke_role("u1", ADMIN)
+        await rbac.delete_role(role.id)
+        assert await rbac.get_user_permissions("u1", company) == set()
+
+    async def test_compiled_set_ends_with_the_earliest_expiry(self):
+        rbac = RBACService()
+        await rbac.assign_role("u1", VIEWER)
+        await rbac.assign_role("u1", AUDITOR, expires_at=datetime.utcnow() + timedelta(seconds=0.2))
+        assert await rbac.check_permission("u1", Permission.AUDIT_REPORT)
+
+        time.sleep(0.3)
+        assert not await rbac.check_permission("u1", Permission.AUDIT_REPORT)
+        assert await rbac.check_permission("u1", Permission.COMPLIANCE_VIEW)
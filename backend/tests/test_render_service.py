@@ -0,0 +1,82 @@
+"""
+Tests for the pooled document rendering service.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from app.services.render_service import (
+    RenderCache,
+    RenderKind,
+    RenderService,
+    RenderTimeoutError,
+    content_key,
+    warm_renderers,
+)
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+PAYLOAD = {"content": "ПОЛИТИКА\nТекст", "title": "Политика", "company_name": "ООО А"}
+
+
+def test_cache_evicts_by_size():
+    cache = RenderCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    assert cache.get("a") == b"12345"  # a is now most recent
+    cache.put("c", b"1")
+    assert cache.get("b") is None
+    assert (len(cache), cache.size) == (2, 6)
+    cache.put("huge", b"x" * 11)
+    assert cache.get("huge") is None
+
+
+def test_content_key_depends_on_content_only():
+    assert content_key(RenderKind.DOCX, PAYLOAD) == content_key(RenderKind.DOCX, dict(PAYLOAD))
+    assert content_key(RenderKind.DOCX, PAYLOAD) != content_key(RenderKind.TEXT_PDF, PAYLOAD)
+    assert content_key(RenderKind.DOCX, PAYLOAD) != content_key(
+        RenderKind.DOCX, {**PAYLOAD, "content": "Изменено"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_unchanged_document_is_rendered_once():
+    with CountingExecutor(max_workers=1) as pool:
+        service = RenderService(executor=pool)
+        first = await service.render(RenderKind.DOCX, PAYLOAD)
+        assert first.startswith(b"PK")
+        assert await service.render(RenderKind.DOCX, PAYLOAD) == first
+        assert pool.submitted == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_frees_caller_and_late_result_is_cached():
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        service = RenderService(executor=pool, max_pending=1)
+        stored = []
+        with pytest.raises(RenderTimeoutError):
+            await service.run(time.sleep, 0.3, timeout=0.05, on_done=stored.append)
+        # The slot stays taken until the worker finishes
+        with pytest.raises(RenderTimeoutError):
+            await service.run(time.sleep, 0, timeout=0.05)
+        await asyncio.sleep(0.4)
+        assert len(stored) == 1
+        assert await service.run(time.sleep, 0, timeout=1) is None
+
+
+@pytest.mark.asyncio
+async def test_warm_process_pool_renders_pdf():
+    with ProcessPoolExecutor(max_workers=1, initializer=warm_renderers) as pool:
+        service = RenderService(executor=pool, timeout_seconds=60)
+        pdf = await service.render(RenderKind.TEXT_PDF, PAYLOAD)
+        assert pdf.startswith(b"%PDF")
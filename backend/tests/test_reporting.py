@@ -0,0 +1,28 @@
+"""
+Tests for compliance report rendering.
+"""
+
+from app.services.reporting import ComplianceReportGenerator
+
+
+def test_compliance_report_html_renders_company_and_findings():
+    html = ComplianceReportGenerator()._render_compliance_report_html(
+        {"name": "ООО Ромашка", "inn": "7701234567"},
+        {
+            "overall_score": 72,
+            "total_checks": 10,
+            "passed": 7,
+            "warnings": 1,
+            "failed": 2,
+            "frameworks": [{"name": "152-ФЗ", "score": 72, "requirements": []}],
+            "recommendations": [{"priority": "high", "action": "Назначить ответственного"}],
+            "documents": [{"title": "Политика ПДн", "status": "approved", "date": "01.10.2026"}],
+        },
+        "152-FZ",
+    )
+    assert "ООО Ромашка" in html
+    assert "ИНН: 7701234567" in html
+    assert "score-yellow" in html
+    assert "152-ФЗ" in html
+    assert "Назначить ответственного" in html
+    assert "Политика ПДн" in html
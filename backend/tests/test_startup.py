@@ -0,0 +1,82 @@
+"""
+Startup profile of the API: import-time tree and peak RSS of `import app.main`.
+
+Run with `pytest tests/test_startup.py -s` to print the report.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Optional heavy libraries and template packs, imported on first use only
+LAZY_MODULES = ("numpy", "pandas", "docx", "reportlab", "openpyxl", "weasyprint", "jinja2")
+LAZY_PREFIXES = ("app.services.sme_templates_", "app.services.ru_templates_")
+
+# Peak RSS after importing the app; generous, to catch a heavy import creeping back
+STARTUP_RSS_BUDGET_MB = 250
+
+PROBE = """
+import json, resource, sys
+import app.main
+print(json.dumps({
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, float, float, str]]:
+    """(depth, self ms, cumulative ms, module) per `-X importtime` line."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append((depth, int(self_us) / 1000, int(cumulative_us) / 1000, name.strip()))
+    return entries
+
+
+def format_report(entries: list[tuple[int, float, float, str]], rss_mb: float) -> str:
+    """Import tree of the app's own modules (plus slow top-level libraries) and RSS."""
+    total = max((e[2] for e in entries if e[0] == 0 and e[3] == "app.main"), default=0)
+    lines = [f"import app.main: {total:.0f} ms, peak RSS {rss_mb:.0f} MB"]
+    # -X importtime prints children before their parent; reverse for a top-down tree
+    for depth, self_ms, cumulative_ms, name in reversed(entries):
+        own = name.startswith("app") and cumulative_ms >= 20
+        if own or (depth <= 3 and cumulative_ms >= 50):
+            lines.append(f"{'  ' * depth}{name}  {cumulative_ms:.0f} ms (self {self_ms:.0f})")
+    return "\n".join(lines)
+
+
+@pytest.fixture(scope="module")
+def startup_profile():
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True,
+    )
+    profile = json.loads(completed.stdout.strip().splitlines()[-1])
+    profile["imports"] = parse_importtime(completed.stderr)
+    return profile
+
+
+def test_heavy_modules_load_on_first_use(startup_profile):
+    modules = startup_profile["modules"]
+    eager = [m for m in modules if m.split(".")[0] in LAZY_MODULES or m.startswith(LAZY_PREFIXES)]
+    assert eager == []
+
+
+def test_startup_report(startup_profile):
+    report = format_report(startup_profile["imports"], startup_profile["rss_mb"])
+    print(f"\n{report}")
+    assert startup_profile["rss_mb"] < STARTUP_RSS_BUDGET_MB
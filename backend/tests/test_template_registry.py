@@ -0,0 +1,142 @@
+"""
+Tests for the precompiled template registry index.
+"""
+
+import pytest
+
+from app.services.template_engine import (
+    FormatRenderer,
+    MissingFieldsError,
+    PlaceholderRenderer,
+    TemplateEngine,
+    TemplateSyntax,
+)
+from app.services.template_registry import (
+    CompanyLifecycleStage,
+    TemplateCategory,
+    TemplateRegistry,
+    stem,
+    tokenize,
+)
+
+
+class TestRenderers:
+    def test_format_renderer(self):
+        renderer = FormatRenderer("Договор № {number} от {day}.{month} ({number}) {{x}}")
+        assert renderer.fields == ("number", "day", "month")
+        assert renderer.render({"number": 7, "day": "01", "month": "марта"}) == (
+            "Договор № 7 от 01.марта (7) {x}"
+        )
+        with pytest.raises(ValueError, match="Missing required field: 'month'"):
+            renderer.render({"number": 7, "day": "01"})
+
+    def test_placeholder_renderer_keeps_unknown_placeholders(self):
+        renderer = PlaceholderRenderer("{{company_name}}, ИНН {{ inn }}; {{company_name}}")
+        assert renderer.fields == ("company_name", "inn")
+        assert renderer.render({"company_name": "ООО Ромашка"}) == (
+            "ООО Ромашка, ИНН {{ inn }}; ООО Ромашка"
+        )
+
+
+class TestTemplateEngine:
+    def test_compiled_once_per_id_and_version(self):
+        engine = TemplateEngine()
+        source = "{{ company_name }} {{ inn }}"
+        first = engine.compile(source, template_id="policy", version="1.0")
+        assert engine.compile(source, template_id="policy", version="1.0") is first
+        assert engine.compile(source, template_id="policy", version="1.1") is not first
+        # Content edited without a version bump is recompiled
+        edited = engine.compile(source + "!", template_id="policy", version="1.0")
+        assert edited is not first
+        assert engine.compilations == 3
+
+    def test_batch_validates_every_row_before_rendering(self):
+        compiled = TemplateEngine().compile(
+            "{{company_name}}, ИНН {{inn}}",
+            TemplateSyntax.PLACEHOLDER,
+            "FZ152-POL-001",
+            required_fields=["company_name", "inn", "unused"],
+        )
+        rows = [{"company_name": "ООО А", "inn": "1"}, {"company_name": "ООО Б", "inn": "2"}]
+        assert compiled.render_many(rows, common={"inn": "0"}) == ["ООО А, ИНН 1", "ООО Б, ИНН 2"]
+        with pytest.raises(MissingFieldsError, match=r"\(row 1\): inn"):
+            compiled.render_many([{"company_name": "ООО А", "inn": "1"}, {"company_name": "ООО Б"}])
+
+
+class TestIndex:
+    def test_every_listed_template_resolves(self):
+        templates = TemplateRegistry.list_templates()
+        assert len(templates) == TemplateRegistry.get_template_count()
+        for t in templates:
+            assert TemplateRegistry.get_template(t["type"], TemplateCategory(t["category"]))
+
+    def test_categories(self):
+        counts = {c["id"]: c["template_count"] for c in TemplateRegistry.get_categories()}
+        assert counts["grc_compliance"] == len(
+            TemplateRegistry.list_templates(TemplateCategory.GRC_COMPLIANCE)
+        )
+        assert [t["type"] for t in TemplateRegistry.list_templates(TemplateCategory.VEHICLES)] == [
+            "fleet_management",
+            "waybill",
+        ]
+
+    def test_template_fields(self):
+        assert "contract_number" in TemplateRegistry.get_template_fields("supply")
+        assert "company_name" in TemplateRegistry.get_template_fields("charter_ooo")
+        with pytest.raises(ValueError, match="Template not found"):
+            TemplateRegistry.get_template_fields("missing")
+
+    def test_stage_templates(self):
+        growth = {
+            t["type"]
+            for t in TemplateRegistry.get_templates_for_stage(CompanyLifecycleStage.GROWTH)
+        }
+        assert {"supply", "employment_contract", "leasing"} <= growth
+
+
+class TestSearch:
+    def test_tokenize_and_stem(self):
+        assert tokenize("Ёмкость charter_ooo, 152-ФЗ") == ["емкость", "charter", "ooo", "152", "фз"]
+        assert stem("договора") == "договор"
+        assert stem("ооо") == "ооо"
+
+    def test_russian_search_ignores_case_and_endings(self):
+        for query in ("договор поставки", "ДОГОВОРА ПОСТАВКИ", "постав"):
+            assert "supply" in [t["type"] for t in TemplateRegistry.search_templates(query)]
+
+    def test_search_by_regulation_and_category(self):
+        results = TemplateRegistry.search_templates(
+            "152-ФЗ политика", TemplateCategory.GRC_COMPLIANCE
+        )
+        assert results and all(t["type"].startswith("FZ152") for t in results)
+        assert TemplateRegistry.search_templates("несуществующий") == []
+
+
+class TestGenerate:
+    def test_format_template_defaults_date_without_mutating_data(self):
+        template = TemplateRegistry.get_template("nda")
+        data = {field: "X" for field in template.fields if field not in ("day", "month", "year")}
+        content = TemplateRegistry.generate_document("nda", data)
+        assert "day" not in data
+        assert content
+
+    def test_corporate_template_outside_doc_type_enum(self):
+        template = TemplateRegistry.get_template("director_poa")
+        data = {**dict.fromkeys(template.required_fields, "X"), "company_name": "ООО Ромашка"}
+        content = TemplateRegistry.generate_document("director_poa", data)
+        assert "ООО Ромашка" in content
+
+    def test_grc_template(self):
+        template = TemplateRegistry.get_template("KII_POLICY")
+        data = {**dict.fromkeys(template.required_fields, "X"), "company_name": "АО Энерго"}
+        content = TemplateRegistry.generate_document("KII_POLICY", data)
+        assert "АО Энерго" in content
+
+    def test_missing_required_fields_are_reported_together(self):
+        with pytest.raises(MissingFieldsError) as error:
+            TemplateRegistry.generate_document("KII_POLICY", {"company_name": "АО Энерго"})
+        assert error.value.fields == ["director_name", "security_responsible"]
+
+    def test_unknown_template(self):
+        with pytest.raises(ValueError, match="Template not found"):
+            TemplateRegistry.generate_document("missing", {})
@@ -0,0 +1,115 @@
+"""
+Tests for the memory-mapped template store and its use by the registry.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.services.template_registry import TemplateCategory, TemplateRegistry, build_store
+from app.services.template_store import (
+    TemplateStore,
+    TemplateStoreError,
+    bundle_versions,
+    latest_bundle,
+    write_bundle,
+)
+
+
+def entry(template_id: str, **extra):
+    return {
+        "id": template_id,
+        "name": template_id,
+        "category": "grc_compliance",
+        "syntax": "placeholder",
+        "required_fields": None,
+        "fields": ["company_name"],
+        **extra,
+    }
+
+
+@pytest.fixture
+def store_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TEMPLATE_STORE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "TEMPLATE_STORE_CHECK_SECONDS", 30.0)
+    TemplateRegistry.reset()
+    yield tmp_path
+    TemplateRegistry.reset()
+
+
+class TestTemplateStore:
+    def test_round_trip_and_versions(self, tmp_path):
+        sources = ["Политика {{company_name}}", "Приказ " * 1000]
+        first = write_bundle(tmp_path, [entry("policy"), entry("order")], sources)
+        second = write_bundle(tmp_path, [entry("policy")], ["v2"])
+        assert bundle_versions(tmp_path) == [1, 2]
+        assert latest_bundle(tmp_path) == second
+
+        store = TemplateStore(first)
+        assert store.version == 1
+        assert [e["id"] for e in store.entries] == ["policy", "order"]
+        assert store.read(1) == sources[1]
+        assert store.read(0) == sources[0]
+        store.close()
+
+        with pytest.raises(TemplateStoreError, match="already exists"):
+            write_bundle(tmp_path, [entry("policy")], ["v2"], version=2)
+
+    def test_corrupt_bundles_are_rejected(self, tmp_path):
+        (tmp_path / "templates-v1.bundle").write_bytes(b"not a bundle at all")
+        with pytest.raises(TemplateStoreError, match="Not a template bundle"):
+            TemplateStore.open_latest(tmp_path)
+
+        path = write_bundle(tmp_path, [entry("policy")], ["x" * 100])
+        path.write_bytes(path.read_bytes()[:-5])
+        with pytest.raises(TemplateStoreError, match="Truncated"):
+            TemplateStore(path)
+
+    def test_empty_directory(self, tmp_path):
+        assert TemplateStore.open_latest(tmp_path) is None
+        assert TemplateStore.open_latest(tmp_path / "missing") is None
+
+
+class TestRegistryStore:
+    def test_registry_from_store_matches_modules(self, store_path):
+        from_modules = TemplateRegistry.index().templates
+        build_store(store_path)
+        TemplateRegistry.reset()
+        from_store = TemplateRegistry.index().templates
+
+        assert TemplateRegistry._store is not None
+        assert [(t.id, t.category, t.fields, t.required_fields) for t in from_store] == [
+            (t.id, t.category, t.fields, t.required_fields) for t in from_modules
+        ]
+        # Listing does not compile; rendering reads the source from the mapping
+        grc = from_store[-1]
+        assert grc._compiled is None
+        data = dict.fromkeys(grc.fields, "X")
+        assert grc.render(data) == next(
+            t for t in from_modules if (t.id, t.category) == (grc.id, grc.category)
+        ).render(data)
+
+    def test_newer_bundle_is_picked_up(self, store_path):
+        write_bundle(store_path, [entry("policy")], ["Старая политика {{company_name}}"])
+        assert (
+            TemplateRegistry.generate_document(
+                "policy", {"company_name": "ООО А"}, TemplateCategory.GRC_COMPLIANCE
+            )
+            == "Старая политика ООО А"
+        )
+
+        write_bundle(store_path, [entry("policy")], ["Новая политика {{company_name}}"])
+        # Checked at most every TEMPLATE_STORE_CHECK_SECONDS
+        assert TemplateRegistry.index().get("policy").source.startswith("Старая")
+        TemplateRegistry._store_checked_at -= 60
+        assert (
+            TemplateRegistry.generate_document(
+                "policy", {"company_name": "ООО А"}, TemplateCategory.GRC_COMPLIANCE
+            )
+            == "Новая политика ООО А"
+        )
+        assert TemplateRegistry._store.version == 2
+
+    def test_unusable_bundle_falls_back_to_modules(self, store_path):
+        (store_path / "templates-v1.bundle").write_bytes(b"garbage")
+        assert TemplateRegistry._open_store() is None
+        assert TemplateRegistry.get_template("charter_ooo") is not None
@@ -0,0 +1,279 @@
+"""
+Tests for WebSocket delivery and cross-worker fan-out.
+"""
+
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from starlette.websockets import WebSocketState
+
+from app.core.websocket import (
+    Alert,
+    AlertPriority,
+    AlertType,
+    SlowConsumerPolicy,
+    WebSocketManager,
+)
+from app.core.websocket_broker import WebSocketBroker, parse_payload, stream_id_key
+
+
+class RecordingWebSocket:
+    """Client socket that records what it is sent."""
+
+    client_state = WebSocketState.CONNECTED
+
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        await self.unblocked.wait()
+        self.sent.append(json.loads(data))
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+    def alerts(self):
+        return [m["alert"] for m in self.sent if m.get("type") == "alert"]
+
+
+class InProcessBroker(WebSocketBroker):
+    """Broker that fans out to managers in this process instead of Redis."""
+
+    def __init__(self, hub: list):
+        super().__init__(redis_url="redis://unused")
+        self.hub = hub
+        self.stored = []
+
+    async def publish(self, envelope, tenant_id=None, durable=False):
+        event_id = None
+        if durable:
+            event_id = f"{len(self.stored) + 1}-0"
+            self.stored.append((event_id, envelope))
+        for manager in self.hub:
+            tenant = envelope.get("tenant_id")
+            if tenant is None or tenant in manager._tenant_connections:
+                await manager._deliver(event_id, envelope)
+        return event_id
+
+    async def join_tenant(self, tenant_id):
+        pass
+
+    async def leave_tenant(self, tenant_id):
+        pass
+
+
+@pytest.fixture
+async def make_manager():
+    """WebSocketManager factory; writer tasks are stopped after the test."""
+    managers = []
+
+    def factory(**kwargs) -> WebSocketManager:
+        manager = WebSocketManager(**kwargs)
+        managers.append(manager)
+        return manager
+
+    yield factory
+    for manager in managers:
+        await manager.stop()
+
+
+def make_alert(tenant_id=None, user_id=None, title="Risk") -> Alert:
+    return Alert(
+        type=AlertType.RISK_CHANGE,
+        priority=AlertPriority.HIGH,
+        title=title,
+        message="changed",
+        tenant_id=tenant_id,
+        user_id=user_id,
+    )
+
+
+class TestLocalDelivery:
+    """Without a broker, delivery and history stay in-process."""
+
+    @pytest.mark.asyncio
+    async def test_tenant_alert_reaches_only_tenant(self, make_manager):
+        manager = make_manager()
+        tenant_a, tenant_b = uuid4(), uuid4()
+        ws_a, ws_b = RecordingWebSocket(), RecordingWebSocket()
+        await manager.connect(ws_a, uuid4(), tenant_a)
+        await manager.connect(ws_b, uuid4(), tenant_b)
+
+        await manager.broadcast_alert(make_alert(tenant_a))
+        await manager.drain()
+        assert len(ws_a.alerts()) == 1
+        assert ws_b.alerts() == []
+
+    @pytest.mark.asyncio
+    async def test_user_alert_not_replayed_to_others(self, make_manager):
+        manager = make_manager()
+        tenant, user = uuid4(), uuid4()
+        await manager.broadcast_alert(make_alert(tenant, user, title="Private"))
+        await manager.broadcast_alert(make_alert(tenant, title="Shared"))
+
+        ws = RecordingWebSocket()
+        await manager.connect(ws, uuid4(), tenant)
+        await manager.drain()
+        recent = [m for m in ws.sent if m["type"] == "recent_alerts"][0]["alerts"]
+        assert [a["title"] for a in recent] == ["Shared"]
+
+
+class TestBrokerFanOut:
+    """Messages published on one worker reach clients on every worker."""
+
+    @pytest.mark.asyncio
+    async def test_alert_reaches_other_worker_with_event_id(self, make_manager):
+        hub = []
+        worker_1 = make_manager(broker=InProcessBroker(hub))
+        worker_2 = make_manager(broker=InProcessBroker(hub))
+        hub.extend([worker_1, worker_2])
+        tenant = uuid4()
+        ws = RecordingWebSocket()
+        await worker_2.connect(ws, uuid4(), tenant)
+
+        await worker_1.broadcast_alert(make_alert(tenant))
+        await worker_2.drain()
+        (alert,) = ws.alerts()
+        assert alert["id"] == "1-0"
+        # Published alerts are not kept in process memory
+        assert worker_1._alert_history == []
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_falls_back_to_local(self, make_manager):
+        class FailingBroker(InProcessBroker):
+            async def publish(self, envelope, tenant_id=None, durable=False):
+                raise ConnectionError("redis down")
+
+        manager = make_manager(broker=FailingBroker([]))
+        tenant = uuid4()
+        ws = RecordingWebSocket()
+        await manager.connect(ws, uuid4(), tenant)
+        await manager.broadcast_to_tenant(tenant, {"type": "progress"})
+        await manager.drain()
+        assert {"type": "progress"} in ws.sent
+
+
+class TestConnections:
+    """Several connections per user, and the channel index."""
+
+    @pytest.mark.asyncio
+    async def test_second_tab_does_not_replace_first(self, make_manager):
+        manager = make_manager()
+        tenant, user = uuid4(), uuid4()
+        tabs = [RecordingWebSocket(), RecordingWebSocket()]
+        ids = [await manager.connect(ws, user, tenant) for ws in tabs]
+        assert ids[0] != ids[1]
+        assert manager.get_user_connection_count(user) == 2
+
+        await manager.send_to_user(user, {"type": "notice"})
+        await manager.drain()
+        assert all({"type": "notice"} in ws.sent for ws in tabs)
+
+        await manager.disconnect(ids[0])
+        assert manager.get_user_connection_count(user) == 1
+        assert manager.get_tenant_connection_count(tenant) == 1
+
+    @pytest.mark.asyncio
+    async def test_channel_broadcast_uses_subscriptions(self, make_manager):
+        manager = make_manager()
+        tenant = uuid4()
+        subscribed, other = RecordingWebSocket(), RecordingWebSocket()
+        connection_id = await manager.connect(subscribed, uuid4(), tenant)
+        await manager.connect(other, uuid4(), tenant)
+        await manager.subscribe(connection_id, "risk_alerts")
+
+        await manager.broadcast_to_channel("risk_alerts", {"type": "risk"})
+        await manager.drain()
+        assert {"type": "risk"} in subscribed.sent
+        assert {"type": "risk"} not in other.sent
+
+        await manager.disconnect(connection_id)
+        assert "risk_alerts" not in manager._channel_connections
+
+
+class TestBackpressure:
+    """A slow client never delays delivery to the others."""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_tenant(self, make_manager):
+        manager = make_manager(queue_size=4)
+        tenant = uuid4()
+        slow, fast = RecordingWebSocket(blocked=True), RecordingWebSocket()
+        await manager.connect(slow, uuid4(), tenant)
+        await manager.connect(fast, uuid4(), tenant)
+
+        def fast_ticks():
+            return [m["n"] for m in fast.sent if m["type"] == "tick"]
+
+        async def received(count):
+            while len(fast_ticks()) < count:
+                await asyncio.sleep(0)
+
+        # Every message reaches the fast client while the slow one is stuck
+        for i in range(10):
+            await manager.broadcast_to_tenant(tenant, {"type": "tick", "n": i})
+            await asyncio.wait_for(received(i + 1), timeout=1)
+        assert fast_ticks() == list(range(10))
+
+        # Oldest messages were dropped for the slow client
+        slow.unblocked.set()
+        await manager.drain()
+        ticks = [m["n"] for m in slow.sent if m["type"] == "tick"]
+        assert ticks[-1] == 9
+        assert len(ticks) < 10
+
+    @pytest.mark.asyncio
+    async def test_coalesced_messages_keep_latest(self, make_manager):
+        manager = make_manager()
+        tenant = uuid4()
+        ws = RecordingWebSocket(blocked=True)
+        await manager.connect(ws, uuid4(), tenant)
+
+        for i in range(5):
+            await manager.broadcast_to_tenant(
+                tenant, {"type": "progress", "done": i}, coalesce_key="op-1"
+            )
+        ws.unblocked.set()
+        await manager.drain()
+
+        progress = [m["done"] for m in ws.sent if m["type"] == "progress"]
+        assert progress == [4]
+        assert manager.get_queue_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_slow_client(self, make_manager):
+        manager = make_manager(queue_size=2, slow_consumer_policy=SlowConsumerPolicy.DISCONNECT)
+        tenant = uuid4()
+        ws = RecordingWebSocket(blocked=True)
+        await manager.connect(ws, uuid4(), tenant)
+
+        for i in range(5):
+            await manager.broadcast_to_tenant(tenant, {"type": "tick", "n": i})
+
+        assert manager.get_connection_count() == 0
+        assert ws.closed_with == 1013
+
+
+class TestBrokerPayloads:
+    """Pub/sub payload and stream id helpers."""
+
+    def test_parse_payload(self):
+        assert parse_payload('1700000000000-3 {"kind": "alert"}') == (
+            "1700000000000-3",
+            {"kind": "alert"},
+        )
+        assert parse_payload('- {"kind": "message"}') == (None, {"kind": "message"})
+        assert parse_payload("- not json") is None
+
+    def test_stream_ids_sort_numerically(self):
+        ids = ["1700000000000-10", "1700000000000-9", "999-0"]
+        assert sorted(ids, key=stream_id_key) == ["999-0", "1700000000000-9", "1700000000000-10"]
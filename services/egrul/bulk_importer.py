@@ -12,6 +12,9 @@ import xml.etree.ElementTree as ET
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pathlib import Path
+from uuid import uuid4
+
+from jobs import JobTracker, utcnow
 
 
 class BulkImporter:
@@ -24,9 +27,11 @@ class BulkImporter:
 
     DEFAULT_SOURCE = "https://data.gov.ru/opendata/7707329152-egrul"
 
-    def __init__(self, db):
+    def __init__(self, db, jobs: Optional[JobTracker] = None):
         self.db = db
+        self.jobs = jobs
         self.is_running = False
+        self.job: Optional[Dict[str, Any]] = None
         self.status = {
             "status": "idle",
             "total_records": 0,
@@ -37,14 +42,23 @@ class BulkImporter:
         }
 
     def get_status(self) -> Dict[str, Any]:
-        return self.status
+        status = dict(self.status)
+        if self.job:
+            status["job_id"] = self.job["job_id"]
+            status["records_done"] = self.job["checkpoint"]["records_done"]
+        return status
 
-    async def import_from_dump(self, source_url: Optional[str] = None):
+    async def import_from_dump(self, source_url: Optional[str] = None,
+                               resume_job_id: Optional[str] = None):
         """
         Import companies from EGRUL dump.
 
         The dump contains XML files with company data.
         We parse and import in batches for efficiency.
+
+        Progress is recorded in the shared job registry after every batch;
+        with `resume_job_id` an interrupted import skips the records it had
+        already processed.
         """
         if self.is_running:
             return
@@ -58,25 +72,72 @@ class BulkImporter:
             "started_at": datetime.now(),
             "completed_at": None
         }
+        previous = await self.jobs.get(resume_job_id) if self.jobs and resume_job_id else None
+        if previous and previous.get("kind") == "egrul.import":
+            self.job = previous
+            self.job["status"] = "running"
+            self.job["completed_at"] = None
+            self.status["imported"] = previous["succeeded"]
+            self.status["errors"] = previous["failed"]
+        else:
+            self.job = {
+                "job_id": str(uuid4()),
+                "kind": "egrul.import",
+                "status": "running",
+                "tenant_id": None,
+                "total": 0,
+                "processed": 0,
+                "succeeded": 0,
+                "failed": 0,
+                "skipped": 0,
+                "started_at": utcnow().isoformat(),
+                "completed_at": None,
+                "checkpoint": {"records_done": 0},
+                "params": {"source_url": source_url or self.DEFAULT_SOURCE},
+                "errors": [],
+                "result": None,
+            }
+        await self._save_job()
 
         try:
             # For demo, we'll create sample data since actual data.gov.ru
             # requires navigating their portal
-            await self._import_sample_data()
+            await self._import_sample_data(skip=self.job["checkpoint"]["records_done"])
 
             self.status["status"] = "completed"
             self.status["completed_at"] = datetime.now()
+            self.job["status"] = "completed"
 
         except Exception as e:
             self.status["status"] = f"error: {str(e)}"
             self.status["errors"] += 1
+            self.job["status"] = "failed"
+            self.job["errors"] = (self.job["errors"] + [{"error": str(e)}])[-20:]
         finally:
             self.is_running = False
+            self.job["completed_at"] = utcnow().isoformat()
+            await self._save_job()
 
-    async def _import_sample_data(self):
+    async def _save_job(self):
+        """Copy counters into the job record and store it."""
+        if not self.job:
+            return
+        self.job.update(
+            total=self.status["total_records"],
+            processed=self.job["checkpoint"]["records_done"],
+            succeeded=self.status["imported"],
+            failed=self.status["errors"],
+        )
+        if self.jobs:
+            await self.jobs.save(self.job)
+
+    async def _import_sample_data(self, skip: int = 0):
         """
         Import sample Russian company data for demonstration.
         In production, this would parse actual EGRUL XML dumps.
+
+        The first `skip` records (already processed by an interrupted run)
+        are not imported again.
         """
 
         # Sample companies (real Russian companies, public data)
@@ -278,7 +339,7 @@ class BulkImporter:
 
         # Import in batches
         batch_size = 10
-        for i in range(0, len(sample_companies), batch_size):
+        for i in range(skip, len(sample_companies), batch_size):
             batch = sample_companies[i:i + batch_size]
 
             for company in batch:
@@ -288,6 +349,11 @@ class BulkImporter:
                 except Exception as e:
                     self.status["errors"] += 1
 
+            # Checkpoint: records before this point are done
+            if self.job:
+                self.job["checkpoint"]["records_done"] = i + len(batch)
+                await self._save_job()
+
             # Small delay to not overwhelm the database
             await asyncio.sleep(0.1)
 
@@ -0,0 +1,65 @@
+"""
+Job tracking in the shared CORTEX job registry (Redis).
+
+Records use the same JSON format and keys as the backend's
+app.core.job_registry, so EGRUL imports show up in the backend's
+/api/v1/jobs API next to bulk operations and simulations.
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import redis.asyncio as redis
+
+JOB_KEY_PREFIX = "cortex:jobs:"
+JOB_INDEX_KEY = JOB_KEY_PREFIX + "index"
+# EGRUL jobs are not tenant specific
+GLOBAL_INDEX_KEY = JOB_KEY_PREFIX + "tenant:global"
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobTracker:
+    """Writes and reads job records; never raises on Redis errors."""
+
+    def __init__(self, redis_url: str, retention_seconds: int = 7 * 24 * 3600, max_jobs: int = 1000):
+        self.redis_url = redis_url
+        self.retention_seconds = retention_seconds
+        self.max_jobs = max_jobs
+        self._redis: Optional[redis.Redis] = None
+
+    def _client(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(self.redis_url, encoding="utf-8", decode_responses=True)
+        return self._redis
+
+    async def save(self, record: Dict[str, Any]) -> None:
+        record["updated_at"] = utcnow().isoformat()
+        started = datetime.fromisoformat(record["started_at"])
+        try:
+            async with self._client().pipeline(transaction=False) as pipe:
+                pipe.set(JOB_KEY_PREFIX + record["job_id"], json.dumps(record, default=str),
+                         ex=self.retention_seconds)
+                for index in (JOB_INDEX_KEY, GLOBAL_INDEX_KEY):
+                    pipe.zadd(index, {record["job_id"]: started.timestamp()})
+                    pipe.zremrangebyrank(index, 0, -self.max_jobs - 1)
+                    pipe.expire(index, self.retention_seconds)
+                await pipe.execute()
+        except Exception as e:
+            print(f"Job registry save failed for {record['job_id']}: {e}")
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self._client().get(JOB_KEY_PREFIX + job_id)
+        except Exception as e:
+            print(f"Job registry lookup failed for {job_id}: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None